@@ -56,6 +56,12 @@ append_update_log() {
   local summary="${4:-}"
   local esc_summary
 
+  if [[ "${STATE_BACKEND:-files}" == "sqlite" ]]; then
+    run_state update "--timestamp=$(timestamp_utc)" \
+      "--source=$source" "--task=$task_id" "--status=$status" "--summary=$summary"
+    return
+  fi
+
   ensure_updates_file
   esc_summary="$(echo "$summary" | sed 's/|/\\|/g')"
   echo "| $(timestamp_utc) | $source | $task_id | $status | $esc_summary |" >> "$UPDATES_FILE"
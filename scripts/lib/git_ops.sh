@@ -148,13 +148,20 @@ quarantine_orphan_worktree_path() {
     die "Worktree path already exists and is attached to $attached_branch (expected $expected_branch): $worktree_path"
   fi
 
-  local timestamp quarantine_path attempt
+  local timestamp quarantine_base quarantine_path attempt trash_dir=""
   timestamp="$(date -u +%Y%m%dT%H%M%SZ)"
-  quarantine_path="${worktree_path}.orphan-${timestamp}"
+  quarantine_base="$worktree_path"
+  if [[ "${WORKTREE_REMOVAL:-sync}" == "trash" ]]; then
+    # Leftovers go to the same trash dir (and reaper) as removed worktrees.
+    trash_dir="$(dirname "$worktree_path")/.trash"
+    mkdir -p "$trash_dir"
+    quarantine_base="$trash_dir/$(basename "$worktree_path")"
+  fi
+  quarantine_path="${quarantine_base}.orphan-${timestamp}"
   attempt=0
   while [[ -e "$quarantine_path" ]]; do
     attempt=$((attempt + 1))
-    quarantine_path="${worktree_path}.orphan-${timestamp}-${attempt}"
+    quarantine_path="${quarantine_base}.orphan-${timestamp}-${attempt}"
   done
 
   if ! mv "$worktree_path" "$quarantine_path"; then
@@ -162,6 +169,9 @@ quarantine_orphan_worktree_path() {
   fi
 
   echo "[WARN] quarantined stale worktree path: $worktree_path -> $quarantine_path" >&2
+  if [[ -n "$trash_dir" ]]; then
+    start_trash_reaper "$trash_dir"
+  fi
 }
 
 ensure_task_worktree() {
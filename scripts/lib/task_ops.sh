@@ -45,29 +45,32 @@ resolve_python_bin() {
 
 load_runtime_context() {
   PYTHON_BIN="${PYTHON_BIN:-$(resolve_python_bin)}"
+  # Nested CLI calls (worktree start -> task lock/update) inherit the probe result.
+  export PYTHON_BIN
   TEAM_CONFIG_EFFECTIVE="${TEAM_CONFIG_ARG:-}"
+  ENGINE_SOCKET=""
 
-  if [[ -z "${TEAM_CONFIG_EFFECTIVE:-}" ]]; then
-    local state_hint=""
-    local repo_base state_abs
+  local state_hint=""
+  local repo_base state_abs
 
-    if [[ -n "${TEAM_STATE_DIR_ARG:-}" ]]; then
-      state_hint="$TEAM_STATE_DIR_ARG"
-    elif [[ -n "${AI_STATE_DIR:-}" ]]; then
-      state_hint="$AI_STATE_DIR"
-    fi
+  if [[ -n "${TEAM_STATE_DIR_ARG:-}" ]]; then
+    state_hint="$TEAM_STATE_DIR_ARG"
+  elif [[ -n "${AI_STATE_DIR:-}" ]]; then
+    state_hint="$AI_STATE_DIR"
+  fi
 
-    if [[ -n "$state_hint" ]]; then
-      repo_base="${TEAM_REPO_ARG:-$PWD}"
-      if [[ "$state_hint" == /* ]]; then
-        state_abs="$state_hint"
-      else
-        state_abs="$(cd "$repo_base" && printf '%s/%s\n' "$(pwd -P)" "$state_hint")"
-      fi
-      if [[ -f "$state_abs/orchestrator.toml" ]]; then
-        TEAM_CONFIG_EFFECTIVE="$state_abs/orchestrator.toml"
-      fi
+  if [[ -n "$state_hint" ]]; then
+    repo_base="${TEAM_REPO_ARG:-$PWD}"
+    if [[ "$state_hint" == /* ]]; then
+      state_abs="$state_hint"
+    else
+      state_abs="$(cd "$repo_base" && printf '%s/%s\n' "$(pwd -P)" "$state_hint")"
     fi
+    if [[ -z "${TEAM_CONFIG_EFFECTIVE:-}" && -f "$state_abs/orchestrator.toml" ]]; then
+      TEAM_CONFIG_EFFECTIVE="$state_abs/orchestrator.toml"
+    fi
+    # With a known state dir the paths lookup itself can go through the daemon.
+    ENGINE_SOCKET="$state_abs/orchestrator/engine.sock"
   fi
 
   local -a cmd=(paths)
@@ -83,14 +86,52 @@ load_runtime_context() {
   cmd+=(--format env)
 
   local env_dump
-  env_dump="$("$PYTHON_BIN" "$PY_ENGINE" "${cmd[@]}")"
+  env_dump="$(run_engine "${cmd[@]}")"
   eval "$env_dump"
 
+  ENGINE_SOCKET="$ORCH_DIR/engine.sock"
   ACTIVE_PID_FILE="$ORCH_DIR/active_pids.tsv"
   mkdir -p "$ORCH_DIR"
   [[ -f "$ACTIVE_PID_FILE" ]] || : > "$ACTIVE_PID_FILE"
 }
 
+engine_command_reads_stdin() {
+  case "${1:-} ${2:-}" in
+    "todo-apply "*|"state create"|"state put"|"state append") return 0 ;;
+  esac
+  return 1
+}
+
+run_engine() {
+  # Prefer a running `engine.py serve` for this state dir; the client exits 75
+  # when nothing answered (or the daemon declined), so spawn the engine then.
+  local sock="${ENGINE_SOCKET:-}"
+  if engine_command_reads_stdin "$@"; then
+    # Buffer stdin so the fallback sees it too.
+    local input
+    input="$(cat)"
+    if [[ -n "$sock" && -S "$sock" ]]; then
+      local rc=0
+      "$PYTHON_BIN" "$PY_DAEMON" call --stdin "$sock" -- "$@" <<< "$input" || rc=$?
+      if [[ "$rc" -ne 75 ]]; then
+        return "$rc"
+      fi
+    fi
+    "$PYTHON_BIN" "$PY_ENGINE" "$@" <<< "$input"
+    return
+  fi
+
+  if [[ -n "$sock" && -S "$sock" ]]; then
+    local rc=0
+    "$PYTHON_BIN" "$PY_DAEMON" call "$sock" -- "$@" || rc=$?
+    if [[ "$rc" -ne 75 ]]; then
+      return "$rc"
+    fi
+  fi
+
+  "$PYTHON_BIN" "$PY_ENGINE" "$@"
+}
+
 is_primary_worktree() {
   local repo="${1:-}"
   local gd cd
@@ -134,148 +175,27 @@ todo_status_by_schema() {
   local status="${3:-}"
   local task_branch="${4:-}"
 
-  "$PYTHON_BIN" - "$TODO_FILE" "$TODO_SCHEMA_JSON" "$mode" "$task_id" "$status" "$task_branch" <<'PY'
-import json
-import sys
-from pathlib import Path
-
-todo_file = Path(sys.argv[1])
-schema = json.loads(sys.argv[2])
-mode = sys.argv[3]
-task_id = (sys.argv[4] or "").strip()
-status_value = (sys.argv[5] or "").strip()
-task_branch = (sys.argv[6] or "").strip()
-
-
-def parse_markdown_row(line: str) -> list[str] | None:
-    text = line.strip()
-    if not text.startswith("|") or not text.endswith("|"):
-        return None
-
-    cells: list[str] = []
-    buf: list[str] = []
-    escaped = False
-    for ch in text[1:-1]:
-        if escaped:
-            if ch == "|":
-                buf.append("|")
-            else:
-                buf.append("\\")
-                buf.append(ch)
-            escaped = False
-            continue
-        if ch == "\\":
-            escaped = True
-            continue
-        if ch == "|":
-            cells.append("".join(buf).strip())
-            buf = []
-            continue
-        buf.append(ch)
-    if escaped:
-        buf.append("\\")
-    cells.append("".join(buf).strip())
-    return cells
-
-
-def serialize_markdown_row(cells: list[str]) -> str:
-    escaped_cells = [str(cell).strip().replace("|", "\\|") for cell in cells]
-    return "| " + " | ".join(escaped_cells) + " |"
-
-
-def col_to_cell_index(col_no: int) -> int:
-    # Column numbers follow split('|') semantics with leading/trailing empty cells.
-    return col_no - 2
-
-
-def cell_at(cells: list[str], col_no: int) -> str:
-    idx = col_to_cell_index(col_no)
-    if idx < 0 or idx >= len(cells):
-        return ""
-    return cells[idx].strip()
-
-
-def set_cell(cells: list[str], col_no: int, value: str) -> None:
-    idx = col_to_cell_index(col_no)
-    if idx < 0:
-        raise ValueError(f"invalid column index: {col_no}")
-    if idx >= len(cells):
-        cells.extend([""] * (idx + 1 - len(cells)))
-    cells[idx] = value
-
-
-if mode not in {"get", "set"}:
-    print(f"unsupported mode: {mode}", file=sys.stderr)
-    raise SystemExit(3)
-if not task_id:
-    print("task id missing", file=sys.stderr)
-    raise SystemExit(3)
-
-id_col = int(schema["id_col"])
-branch_col = int(schema.get("branch_col", 0) or 0)
-status_col = int(schema["status_col"])
-
-
-def resolve_columns(lines: list[str]) -> tuple[int, int, int]:
-    resolved_id = id_col
-    resolved_branch = branch_col
-    resolved_status = status_col
-    for line in lines:
-        cells = parse_markdown_row(line)
-        if cells is None:
-            continue
-        header_map: dict[str, int] = {}
-        # Markdown row parser returns cell-only list (without split("|")
-        # leading/trailing empties). split-style column numbers start at 2.
-        for col_no in range(2, len(cells) + 2):
-            label = cell_at(cells, col_no).strip().lower()
-            if label and label not in header_map:
-                header_map[label] = col_no
-        if "id" not in header_map or "status" not in header_map:
-            continue
-        resolved_id = header_map["id"]
-        resolved_status = header_map["status"]
-        resolved_branch = header_map.get("branch", 0)
-        break
-    return resolved_id, resolved_branch, resolved_status
-
-lines = todo_file.read_text(encoding="utf-8").splitlines()
-id_col, branch_col, status_col = resolve_columns(lines)
-matches: list[tuple[int, list[str], str]] = []
-for idx, line in enumerate(lines):
-    cells = parse_markdown_row(line)
-    if cells is None:
-        continue
-
-    candidate_id = cell_at(cells, id_col)
-    if not candidate_id or candidate_id == "ID" or set(candidate_id) == {"-"}:
-        continue
-    if candidate_id != task_id:
-        continue
-    candidate_branch = cell_at(cells, branch_col) if branch_col > 0 else ""
-    if branch_col > 0 and task_branch and candidate_branch != task_branch:
-        continue
-    matches.append((idx, cells, candidate_branch))
-
-if not matches:
-    print("task not found in TODO board", file=sys.stderr)
-    raise SystemExit(2)
-
-if branch_col > 0 and not task_branch and len(matches) > 1:
-    print("task id is ambiguous across branches; pass --branch", file=sys.stderr)
-    raise SystemExit(4)
-
-idx, cells, _ = matches[0]
-if mode == "get":
-    print(cell_at(cells, status_col))
-    raise SystemExit(0)
+  case "$mode" in
+    get|set) ;;
+    *)
+      echo "unsupported mode: $mode" >&2
+      return 3
+      ;;
+  esac
+  if [[ -z "$(trim "$task_id")" ]]; then
+    echo "task id missing" >&2
+    return 3
+  fi
 
-set_cell(cells, status_col, status_value)
-lines[idx] = serialize_markdown_row(cells)
-todo_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
-raise SystemExit(0)
+  local -a cmd=(todo-status "$mode" "--task=$task_id" "--todo-file=$TODO_FILE" "--schema-json=$TODO_SCHEMA_JSON")
+  if [[ -n "$task_branch" ]]; then
+    cmd+=("--branch=$task_branch")
+  fi
+  if [[ "$mode" == "set" ]]; then
+    cmd+=("--status=$status")
+  fi
 
-PY
+  run_engine "${cmd[@]}"
 }
 
 update_todo_status() {
@@ -307,7 +227,8 @@ update_todo_status() {
 
 initialize_task_state() {
   mkdir -p "$LOCK_DIR"
-  ensure_updates_file
+  # The sqlite backend keeps the updates journal in STATE_DB.
+  state_backend_is_sqlite || ensure_updates_file
   ensure_todo_template
   mkdir -p "$SPEC_DIR"
 }
@@ -347,6 +268,108 @@ ensure_ownerless_runtime_state() {
   fi
 }
 
+# Lock and pid metadata are addressed by their file-layout path under both
+# state backends. With runtime.state_backend = "sqlite" the path is only the
+# record key in $STATE_DB and nothing is written under LOCK_DIR/ORCH_DIR.
+state_backend_is_sqlite() {
+  [[ "${STATE_BACKEND:-files}" == "sqlite" ]]
+}
+
+run_state() {
+  # state_cli.py loads only the state store, far cheaper than engine.py for
+  # the single-record reads and writes below.
+  "$PYTHON_BIN" "$PY_STATE" "$@" --db "$STATE_DB"
+}
+
+meta_read() {
+  # Prints the key=value text of a lock/pid record; fails when it is absent.
+  local path="${1:-}"
+  if state_backend_is_sqlite; then
+    run_state get "$path" 2>/dev/null
+    return
+  fi
+  [[ -f "$path" ]] || return 1
+  cat "$path"
+}
+
+meta_value() {
+  # read_field over text returned by meta_read.
+  printf '%s\n' "${1:-}" | awk -F'=' -v k="${2:-}" '$1 == k {sub(/^[[:space:]]+/, "", $2); print $2; exit}'
+}
+
+meta_exists() {
+  local path="${1:-}"
+  if state_backend_is_sqlite; then
+    meta_read "$path" >/dev/null
+    return
+  fi
+  [[ -f "$path" ]]
+}
+
+meta_create() {
+  # Stores stdin as a new record; fails when one already exists.
+  local path="${1:-}"
+  if state_backend_is_sqlite; then
+    run_state create "$path"
+    return
+  fi
+  (
+    set -o noclobber
+    cat > "$path"
+  )
+}
+
+meta_put() {
+  local path="${1:-}"
+  if state_backend_is_sqlite; then
+    run_state put "$path"
+    return
+  fi
+  cat > "$path"
+}
+
+meta_set_field() {
+  local path="${1:-}"
+  local key="${2:-}"
+  local value="${3:-}"
+  if state_backend_is_sqlite; then
+    run_state set "$path" "--field=$key" "--value=$value"
+    return
+  fi
+  awk -F'=' -v k="$key" -v v="$value" 'BEGIN{OFS="="} $1==k{$2=v} {print}' "$path" > "$path.tmp"
+  mv "$path.tmp" "$path"
+}
+
+meta_remove() {
+  local path="${1:-}"
+  if [[ "$path" == *.lock ]]; then
+    # The heartbeat file vouches for the lock; it must not outlive it.
+    rm -f "$(lock_heartbeat_path "$path")"
+  fi
+  if state_backend_is_sqlite; then
+    run_state remove "$path" >/dev/null
+    return
+  fi
+  rm -f "$path"
+}
+
+lock_heartbeat_path() {
+  # Touched by `task heartbeat --file`; lives on disk under both backends.
+  local lock_file="${1:-}"
+  printf '%s\n' "${lock_file%.lock}.heartbeat"
+}
+
+meta_glob() {
+  # Record paths directly under <dir> whose name matches <pattern>, sorted.
+  local dir="${1:-}"
+  local pattern="${2:-}"
+  if state_backend_is_sqlite; then
+    run_state glob "$dir" --pattern "$pattern" 2>/dev/null || true
+    return 0
+  fi
+  find "$dir" -maxdepth 1 -type f -name "$pattern" 2>/dev/null | sort
+}
+
 canonical_path_if_exists() {
   local path="${1:-}"
   [[ -n "$path" ]] || {
@@ -541,7 +564,7 @@ cmd_task_scaffold_specs() {
   done
 
   local selected_rows
-  if ! selected_rows="$("$PYTHON_BIN" - "$SCRIPT_DIR/py" "$TODO_FILE" "$TODO_SCHEMA_JSON" "$target_task" "$target_branch" <<'PY'
+  if ! selected_rows="$("$PYTHON_BIN" - "$SCRIPT_DIR/py" "$TODO_FILE" "$TODO_SCHEMA_JSON" "$target_task" "$target_branch" "$STATE_DIR/cache" <<'PY'
 import json
 import sys
 from pathlib import Path
@@ -551,12 +574,13 @@ todo_file = Path(sys.argv[2]).resolve()
 schema = json.loads(sys.argv[3])
 target_task = (sys.argv[4] or "").strip()
 target_branch = (sys.argv[5] or "").strip()
+cache_dir = sys.argv[6]
 
 sys.path.insert(0, str(py_dir))
 from todo_parser import TodoError, parse_todo
 
 try:
-    tasks, _ = parse_todo(todo_file, schema)
+    tasks, _ = parse_todo(todo_file, schema, cache_dir=cache_dir)
 except TodoError as exc:
     print(str(exc), file=sys.stderr)
     raise SystemExit(2)
@@ -667,6 +691,31 @@ EOF
   echo "Spec scaffold summary: generated=$generated skipped=$skipped dry_run=$dry_run force=$force"
 }
 
+cmd_task_spec_index() {
+  load_runtime_context
+
+  local -a cmd=(spec-index --repo "$REPO_ROOT" --state-dir "$STATE_DIR")
+  while [[ $# -gt 0 ]]; do
+    case "$1" in
+      --rebuild)
+        cmd+=(--rebuild)
+        ;;
+      --json)
+        cmd+=(--format json)
+        ;;
+      *)
+        die "Unknown task spec-index option: $1"
+        ;;
+    esac
+    shift || true
+  done
+  if [[ -n "${TEAM_CONFIG_EFFECTIVE:-}" ]]; then
+    cmd+=(--config "$TEAM_CONFIG_EFFECTIVE")
+  fi
+
+  "$PYTHON_BIN" "$PY_ENGINE" "${cmd[@]}"
+}
+
 cmd_task_new() {
   load_runtime_context
   initialize_task_state
@@ -737,12 +786,16 @@ cmd_task_new() {
   [[ "$task_id" != *"|"* ]] || die "task_id must not contain '|': $task_id"
   git -C "$REPO_ROOT" check-ref-format --branch "$task_branch" >/dev/null 2>&1 || die "Invalid branch name: $task_branch"
 
-  if ! "$PYTHON_BIN" - "$TODO_FILE" "$TODO_SCHEMA_JSON" "$task_id" "$summary" "$task_branch" "$deps_raw" "$task_status" <<'PY'
+  if ! "$PYTHON_BIN" - "$TODO_FILE" "$TODO_SCHEMA_JSON" "$task_id" "$summary" "$task_branch" "$deps_raw" "$task_status" "$SCRIPT_DIR/py" <<'PY'
 import json
 import re
 import sys
+from contextlib import ExitStack
 from pathlib import Path
 
+sys.path.insert(0, sys.argv[8])
+from todo_parser import board_write_lock
+
 todo_file = Path(sys.argv[1])
 schema = json.loads(sys.argv[2])
 task_id = sys.argv[3].strip()
@@ -855,6 +908,11 @@ if deps_input and deps_input != "-":
     if dep_values:
         deps_value = ",".join(dep_values)
 
+# Held until the script exits so the duplicate check and the append see the
+# same board as concurrent status writers.
+board_lock = ExitStack()
+board_lock.enter_context(board_write_lock(todo_file))
+
 lines = todo_file.read_text(encoding="utf-8").splitlines()
 table_rows = [idx for idx, line in enumerate(lines) if line.startswith("|")]
 if not table_rows:
@@ -1085,13 +1143,14 @@ assert_lock_matches_task_context() {
   local expected_worktree_input="${5:-$REPO_ROOT}"
 
   [[ -n "$task_id" ]] || die "Missing task id for ${context}"
-  [[ -f "$lock_file" ]] || die "No lock: task=$task_id"
+  local lock_meta
+  lock_meta="$(meta_read "$lock_file")" || die "No lock: task=$task_id"
 
   local lock_task lock_branch lock_key lock_worktree expected_key expected_worktree
-  lock_task="$(read_field "$lock_file" "task_id")"
-  lock_branch="$(read_field "$lock_file" "task_branch")"
-  lock_key="$(read_field "$lock_file" "task_key")"
-  lock_worktree="$(read_field "$lock_file" "worktree")"
+  lock_task="$(meta_value "$lock_meta" "task_id")"
+  lock_branch="$(meta_value "$lock_meta" "task_branch")"
+  lock_key="$(meta_value "$lock_meta" "task_key")"
+  lock_worktree="$(meta_value "$lock_meta" "worktree")"
 
   [[ "$lock_task" == "$task_id" ]] || die "${context} denied: task=$task_id lock_task=$lock_task"
   if [[ -n "$task_branch" && "$lock_branch" != "$task_branch" ]]; then
@@ -1128,7 +1187,7 @@ lock_meta_path_for_task() {
 
   # Legacy single-id lock path.
   candidate="$LOCK_DIR/task-${task_slug}.lock"
-  if [[ -f "$candidate" ]]; then
+  if meta_exists "$candidate"; then
     echo "$candidate"
     return 0
   fi
@@ -1138,7 +1197,7 @@ lock_meta_path_for_task() {
   while IFS= read -r path; do
     [[ -n "$path" ]] || continue
     matches+=("$path")
-  done < <(find "$LOCK_DIR" -maxdepth 1 -type f -name "task-*--${task_slug}.lock" 2>/dev/null | sort)
+  done < <(meta_glob "$LOCK_DIR" "task-*--${task_slug}.lock")
 
   if [[ "${#matches[@]}" -eq 1 ]]; then
     echo "${matches[0]}"
@@ -1216,9 +1275,7 @@ cmd_task_lock() {
 
   local create_error=""
   if ! create_error="$(
-    (
-      set -o noclobber
-      cat > "$lock_file" <<LOCK_META
+    meta_create "$lock_file" 2>&1 <<LOCK_META
 scope=$scope
 task_id=$task_id
 task_branch=$task_branch
@@ -1228,13 +1285,13 @@ worktree=$worktree
 created_at=$now
 heartbeat_at=$now
 LOCK_META
-    ) 2>&1
   )"; then
-    if [[ -f "$lock_file" ]]; then
+    local existing_meta
+    if existing_meta="$(meta_read "$lock_file")"; then
       local existing_scope existing_task created
-      existing_scope="$(read_field "$lock_file" "scope")"
-      existing_task="$(read_field "$lock_file" "task_id")"
-      created="$(read_field "$lock_file" "created_at")"
+      existing_scope="$(meta_value "$existing_meta" "scope")"
+      existing_task="$(meta_value "$existing_meta" "task_id")"
+      created="$(meta_value "$existing_meta" "created_at")"
       die "Lock exists: task=$task_id scope=${existing_scope:-N/A} lock_task=$existing_task created_at=$created"
     fi
 
@@ -1242,7 +1299,12 @@ LOCK_META
     die "Failed to create lock metadata: task=$task_id file=$lock_file${create_error:+ detail=$create_error}"
   fi
 
+  local heartbeat_file
+  heartbeat_file="$(lock_heartbeat_path "$lock_file")"
+  : > "$heartbeat_file"
+
   echo "Locked: task=$task_id branch=${task_branch:-N/A} scope=$scope"
+  echo "Heartbeat file: $heartbeat_file"
 }
 
 cmd_task_unlock() {
@@ -1280,16 +1342,20 @@ cmd_task_unlock() {
   lock_file="$(resolve_lock_meta_path_or_die "$task_id" "$task_branch" "task unlock")"
   task_branch="$(assert_lock_matches_task_context "$task_id" "$task_branch" "$lock_file" "Unlock")"
 
-  rm -f "$lock_file"
+  meta_remove "$lock_file"
   echo "Unlocked: task=$task_id branch=${task_branch:-N/A} by=$(task_update_source)"
 }
 
 cmd_task_heartbeat() {
-  load_runtime_context
-
   local task_id="${1:-}"
   shift || true
   local task_branch=""
+  local heartbeat_file=""
+
+  if [[ "$task_id" == --file || "$task_id" == --file=* ]]; then
+    set -- "$task_id" "$@"
+    task_id=""
+  fi
 
   while [[ $# -gt 0 ]]; do
     case "$1" in
@@ -1302,6 +1368,15 @@ cmd_task_heartbeat() {
         task_branch="${1#--branch=}"
         [[ -n "$task_branch" ]] || die "Missing value for --branch"
         ;;
+      --file)
+        shift || true
+        [[ $# -gt 0 ]] || die "Missing value for --file"
+        heartbeat_file="$1"
+        ;;
+      --file=*)
+        heartbeat_file="${1#--file=}"
+        [[ -n "$heartbeat_file" ]] || die "Missing value for --file"
+        ;;
       *)
         die "Unknown task heartbeat option: $1"
         ;;
@@ -1309,8 +1384,21 @@ cmd_task_heartbeat() {
     shift || true
   done
 
-  [[ -n "$task_id" ]] || die "Usage: codex-tasks task heartbeat <task_id> [--branch <name>]"
+  if [[ -n "$heartbeat_file" ]]; then
+    # Fast path: the lock was validated when this file was created (task lock
+    # or a full heartbeat) and the file goes away with the lock, so touching
+    # it needs no context, git or engine call. `touch -c` never recreates a
+    # file removed by a concurrent unlock.
+    [[ "$heartbeat_file" == *.heartbeat && -f "$heartbeat_file" ]] ||
+      die "Heartbeat file not found (lock released?): $heartbeat_file"
+    touch -c "$heartbeat_file" || die "Failed to touch heartbeat file: $heartbeat_file"
+    echo "Heartbeat updated: file=$heartbeat_file"
+    return 0
+  fi
 
+  [[ -n "$task_id" ]] || die "Usage: codex-tasks task heartbeat <task_id> [--branch <name>] | --file <heartbeat_file>"
+
+  load_runtime_context
   require_agent_worktree_context
   initialize_task_state
   ensure_ownerless_runtime_state "task heartbeat"
@@ -1321,10 +1409,12 @@ cmd_task_heartbeat() {
   local now
 
   now="$(timestamp_utc)"
-  awk -F'=' -v now="$now" 'BEGIN{OFS="="} $1=="heartbeat_at"{$2=now} {print}' "$lock_file" > "$lock_file.tmp"
-  mv "$lock_file.tmp" "$lock_file"
+  meta_set_field "$lock_file" "heartbeat_at" "$now"
+  heartbeat_file="$(lock_heartbeat_path "$lock_file")"
+  : > "$heartbeat_file"
 
   echo "Heartbeat updated: task=$task_id branch=${task_branch:-N/A} at=$now"
+  echo "Heartbeat file: $heartbeat_file"
 }
 
 cmd_task_update() {
@@ -1404,7 +1494,7 @@ merge_task_branch_into_primary() {
     if [[ "$attached_branch" == "$base_branch" ]]; then
       merge_repo="$merge_worktree_path"
     elif [[ "$attached_branch" == "DETACHED" ]]; then
-      if ! git -C "$primary_repo" worktree remove --force "$merge_worktree_path" >/dev/null 2>&1; then
+      if ! remove_worktree_dir "$primary_repo" "$merge_worktree_path"; then
         die "Failed to recycle detached merge worktree: $merge_worktree_path"
       fi
     elif [[ -n "$attached_branch" ]]; then
@@ -1496,7 +1586,7 @@ ready_task_exists_for_base_branch() {
   fi
 
   ready_json_file="$(mktemp)"
-  if ! "$PYTHON_BIN" "$PY_ENGINE" "${ready_cmd[@]}" > "$ready_json_file"; then
+  if ! run_engine "${ready_cmd[@]}" > "$ready_json_file"; then
     rm -f "$ready_json_file" >/dev/null 2>&1 || true
     return 2
   fi
@@ -1563,7 +1653,7 @@ cleanup_merge_worktree_when_branch_idle() {
 
   attached_branch="$(find_branch_for_worktree_path "$primary_repo" "$merge_worktree_path" || true)"
   if [[ "$attached_branch" == "$base_branch" ]]; then
-    if git -C "$primary_repo" worktree remove --force "$merge_worktree_path" >/dev/null 2>&1; then
+    if remove_worktree_dir "$primary_repo" "$merge_worktree_path"; then
       echo "Removed temporary merge worktree: $merge_worktree_path"
     else
       echo "[WARN] Failed to remove temporary merge worktree: $merge_worktree_path"
@@ -1629,6 +1719,63 @@ release_task_complete_merge_lock() {
   rmdir "$lock_dir" >/dev/null 2>&1 || true
 }
 
+# Runs "$@" detached under `nice -n 19` (plus `ionice -c 3` where available),
+# appending its output to <log_file>. Used for background housekeeping that
+# must not compete with workers.
+spawn_low_priority() {
+  local log_file="$1"
+  shift
+
+  local -a cmd=(nice -n 19)
+  if command -v ionice >/dev/null 2>&1 && ionice -c 3 true >/dev/null 2>&1; then
+    cmd+=(ionice -c 3)
+  fi
+  spawn_detached_process "$log_file" "${cmd[@]}" "$@" >/dev/null 2>&1 || true
+}
+
+# Starts a detached, low-priority reaper for <trash_dir>. A reaper that is
+# already running there picks up new entries itself, so this is cheap to call
+# after every trashed worktree.
+start_trash_reaper() {
+  local trash_dir="${1:-}"
+  [[ -n "$trash_dir" && -d "$trash_dir" ]] || return 0
+
+  spawn_low_priority "$ORCH_DIR/logs/trash-reaper.log" "$PYTHON_BIN" "$PY_ENGINE" trash reap --trash-dir "$trash_dir"
+}
+
+# Starts a detached, low-priority `engine.py logs gc` pass over ORCH_DIR/logs
+# ([logs] rotation/retention). A pass already running makes this one exit.
+start_log_gc() {
+  [[ -d "$ORCH_DIR/logs" ]] || return 0
+
+  local -a cmd=("$PYTHON_BIN" "$PY_ENGINE" logs gc --repo "$REPO_ROOT" --state-dir "$STATE_DIR")
+  if [[ -n "${TEAM_CONFIG_EFFECTIVE:-}" ]]; then
+    cmd+=(--config "$TEAM_CONFIG_EFFECTIVE")
+  fi
+  spawn_low_priority "$ORCH_DIR/logs/log-gc.log" "${cmd[@]}"
+}
+
+# Removes a linked worktree. With runtime.worktree_removal = "trash" the
+# checkout is renamed into <parent>/.trash and detached from git right away,
+# and the reaper deletes the files later; if that is not possible (another
+# filesystem, locked worktree) it falls back to `git worktree remove --force`.
+remove_worktree_dir() {
+  local repo_root="${1:-}"
+  local worktree="${2:-}"
+  [[ -n "$repo_root" && -n "$worktree" ]] || return 1
+
+  if [[ "${WORKTREE_REMOVAL:-sync}" == "trash" ]]; then
+    local trash_dir
+    trash_dir="$(dirname "$worktree")/.trash"
+    if "$PYTHON_BIN" "$PY_ENGINE" trash detach "$worktree" --trash-dir "$trash_dir" >/dev/null 2>&1; then
+      start_trash_reaper "$trash_dir"
+      return 0
+    fi
+  fi
+
+  git -C "$repo_root" worktree remove --force "$worktree" >/dev/null 2>&1
+}
+
 remove_completed_worktree_and_branch() {
   local primary_repo="${1:-}"
   local worktree_path="${2:-}"
@@ -1641,7 +1788,7 @@ remove_completed_worktree_and_branch() {
   fi
 
   if [[ -d "$worktree_path" ]]; then
-    if ! git -C "$primary_repo" worktree remove --force "$worktree_path" >/dev/null 2>&1; then
+    if ! remove_worktree_dir "$primary_repo" "$worktree_path"; then
       die "Failed to remove completed worktree: $worktree_path"
     fi
     echo "Removed completed worktree: $worktree_path"
@@ -1817,7 +1964,7 @@ cmd_task_complete() {
   release_task_complete_merge_lock "$merge_lock_dir"
   trap - EXIT
 
-  rm -f "$lock_file"
+  meta_remove "$lock_file"
   echo "Unlocked: task=$task_id branch=${task_branch:-N/A} by=$(task_update_source)"
 
   remove_completed_worktree_and_branch "$primary_repo" "$REPO_ROOT" "$branch_name"
@@ -1891,8 +2038,8 @@ cmd_worktree_start() {
 
   (cd "$worktree_path" && AI_STATE_DIR="$shared_state" "${cli_base[@]}" task init)
 
-  if [[ -f "$lock_file" ]]; then
-    task_branch="$(assert_lock_matches_task_context "$task_id" "$task_branch" "$lock_file" "worktree start" "$worktree_path")"
+  if STATE_DB="$shared_state/state.db" meta_exists "$lock_file"; then
+    task_branch="$(STATE_DB="$shared_state/state.db" assert_lock_matches_task_context "$task_id" "$task_branch" "$lock_file" "worktree start" "$worktree_path")"
     echo "Lock already held: task=$task_id"
   else
     if [[ -n "$task_branch" ]]; then
@@ -1924,51 +2071,24 @@ cmd_worktree_list() {
 }
 
 refresh_active_pid_registry() {
-  mkdir -p "$ORCH_DIR"
-  local tmp_file
-  tmp_file="$(mktemp)"
-
-  shopt -s nullglob
-  local pid_meta pid task_id scope started backend label session worktree alive
-  for pid_meta in "$ORCH_DIR"/*.pid; do
-    [[ -f "$pid_meta" ]] || continue
-
-    pid="$(read_field "$pid_meta" "pid")"
-    [[ "$pid" =~ ^[0-9]+$ ]] || continue
-
-    task_id="$(read_field "$pid_meta" "task_id")"
-    scope="$(read_field "$pid_meta" "scope")"
-    started="$(read_field "$pid_meta" "started_at")"
-    backend="$(read_field "$pid_meta" "launch_backend")"
-    label="$(read_field "$pid_meta" "launch_label")"
-    session="$(read_field "$pid_meta" "tmux_session")"
-    worktree="$(read_field "$pid_meta" "worktree")"
-
-    if kill -0 "$pid" >/dev/null 2>&1; then
-      alive=1
-    else
-      alive=0
-    fi
-
-    printf "%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\n" \
-      "$pid" "$alive" "$task_id" "$scope" "$started" "$backend" "$label" "$session" "$worktree" >> "$tmp_file"
-  done
-  shopt -u nullglob
-
-  mv "$tmp_file" "$ACTIVE_PID_FILE"
+  # One engine pass over the pid records; the file is replaced atomically.
+  local -a cmd=(pid-registry --repo "$REPO_ROOT" --state-dir "$STATE_DIR" --output "$ACTIVE_PID_FILE")
+  if [[ -n "${TEAM_CONFIG_EFFECTIVE:-}" ]]; then
+    cmd+=(--config "$TEAM_CONFIG_EFFECTIVE")
+  fi
+  run_engine "${cmd[@]}"
 }
 
 print_active_pid_registry() {
-  refresh_active_pid_registry
-
-  local total alive
-  total="$(awk 'NF > 0 {count++} END {print count+0}' "$ACTIVE_PID_FILE")"
-  alive="$(awk -F'\t' 'NF > 0 && $2 == "1" {count++} END {print count+0}' "$ACTIVE_PID_FILE")"
+  local summary
+  summary="$(refresh_active_pid_registry)"
 
   echo "Active pid registry: $ACTIVE_PID_FILE"
-  echo "Registry entries: total=$total alive=$alive"
+  echo "$summary"
 
-  if [[ "$total" -eq 0 ]]; then
+  # The registry is written with one line per worker, so an empty file means
+  # there is nothing to tabulate.
+  if [[ ! -s "$ACTIVE_PID_FILE" ]]; then
     return
   fi
 
@@ -1985,24 +2105,112 @@ print_active_pid_registry() {
   ' "$ACTIVE_PID_FILE"
 }
 
+process_start_time() {
+  # Field 22 of /proc/<pid>/stat (start time in clock ticks since boot);
+  # empty where /proc is unavailable. comm may contain spaces, so fields are
+  # counted after the last ')'.
+  local pid="${1:-}"
+  local stat
+  local -a fields=()
+  [[ "$pid" =~ ^[0-9]+$ && -r "/proc/$pid/stat" ]] || return 0
+  stat="$(cat "/proc/$pid/stat" 2>/dev/null)" || return 0
+  read -r -a fields <<< "${stat##*) }"
+  printf '%s\n' "${fields[19]:-}"
+}
+
+process_command_line() {
+  local pid="${1:-}"
+  [[ "$pid" =~ ^[0-9]+$ && -r "/proc/$pid/cmdline" ]] || return 0
+  tr '\0\n' '  ' < "/proc/$pid/cmdline" 2>/dev/null | sed 's/ *$//'
+}
+
+pid_matches_start() {
+  # Live only while the process holding the pid has the recorded start time,
+  # so a reused pid does not pass for the worker.
+  local pid="${1:-}"
+  local start="${2:-}"
+  local current
+  [[ "$pid" =~ ^[0-9]+$ ]] || return 1
+  kill -0 "$pid" >/dev/null 2>&1 || return 1
+  [[ -n "$start" ]] || return 0
+  current="$(process_start_time "$pid")"
+  [[ -z "$current" || "$current" == "$start" ]]
+}
+
+# kill -0 also succeeds for a zombie, which has already exited and is only
+# waiting for its parent to reap it; treat that as gone.
+pid_running() {
+  local pid="${1:-}"
+  kill -0 "$pid" >/dev/null 2>&1 || return 1
+
+  local stat=""
+  if [[ -r "/proc/$pid/stat" ]]; then
+    stat="$(cat "/proc/$pid/stat" 2>/dev/null || true)"
+    stat="${stat##*) }"
+  else
+    stat="$(ps -o stat= -p "$pid" 2>/dev/null | tr -d ' ' || true)"
+  fi
+  [[ "${stat:0:1}" != "Z" ]]
+}
+
 terminate_pid() {
   local pid="${1:-}"
   [[ "$pid" =~ ^[0-9]+$ ]] || return 1
 
-  if ! kill -0 "$pid" >/dev/null 2>&1; then
+  if ! pid_running "$pid"; then
     return 0
   fi
 
   kill "$pid" >/dev/null 2>&1 || true
   for _ in 1 2 3 4 5; do
-    if ! kill -0 "$pid" >/dev/null 2>&1; then
+    if ! pid_running "$pid"; then
       return 0
     fi
     sleep 1
   done
 
   kill -9 "$pid" >/dev/null 2>&1 || true
-  ! kill -0 "$pid" >/dev/null 2>&1
+  sleep 1
+  ! pid_running "$pid"
+}
+
+# Batch form of terminate_pid: signals every pid up front and waits on all of
+# them against one shared deadline before escalating to SIGKILL, so stopping N
+# workers costs one grace period instead of N. Prints the pids that survived.
+terminate_pids() {
+  local -a pending=()
+  local -a alive=()
+  local pid
+  for pid in "$@"; do
+    [[ "$pid" =~ ^[0-9]+$ ]] || continue
+    if pid_running "$pid"; then
+      kill "$pid" >/dev/null 2>&1 || true
+      pending+=("$pid")
+    fi
+  done
+
+  for _ in 1 2 3 4 5; do
+    alive=()
+    for pid in ${pending[@]+"${pending[@]}"}; do
+      if pid_running "$pid"; then
+        alive+=("$pid")
+      fi
+    done
+    pending=(${alive[@]+"${alive[@]}"})
+    [[ "${#pending[@]}" -gt 0 ]] || return 0
+    sleep 1
+  done
+
+  for pid in "${pending[@]}"; do
+    kill -9 "$pid" >/dev/null 2>&1 || true
+  done
+  sleep 1
+  for pid in "${pending[@]}"; do
+    if pid_running "$pid"; then
+      echo "$pid"
+    fi
+  done
+  return 0
 }
 
 kill_tmux_session_if_any() {
@@ -2105,7 +2313,7 @@ remove_worktree_and_branch() {
     if [[ -d "$worktree" ]]; then
       local removed=0
       for _ in 1 2 3 4 5; do
-        if git -C "$REPO_ROOT" worktree remove --force "$worktree" >/dev/null 2>&1; then
+        if remove_worktree_dir "$REPO_ROOT" "$worktree"; then
           removed=1
           break
         fi
@@ -2122,7 +2330,21 @@ remove_worktree_and_branch() {
     branch_name="$(branch_name_for "$task_id" "$task_branch" || true)"
   fi
   if [[ -n "$branch_name" ]] && git -C "$REPO_ROOT" rev-parse --verify "$branch_name" >/dev/null 2>&1; then
-    if ! git -C "$REPO_ROOT" branch -D "$branch_name" >/dev/null 2>&1; then
+    # Teardown removes several worktrees at once; a concurrent packed-refs
+    # rewrite can hold the ref lock briefly, so retry like the removal above.
+    local deleted=0
+    for _ in 1 2 3 4 5; do
+      if git -C "$REPO_ROOT" branch -D "$branch_name" >/dev/null 2>&1; then
+        deleted=1
+        break
+      fi
+      git -C "$REPO_ROOT" rev-parse --verify "$branch_name" >/dev/null 2>&1 || {
+        deleted=1
+        break
+      }
+      sleep 1
+    done
+    if [[ "$deleted" -eq 0 ]]; then
       echo "failed to delete branch: $branch_name"
       return 1
     fi
@@ -2131,7 +2353,10 @@ remove_worktree_and_branch() {
   return 0
 }
 
-apply_actions_for_record() {
+# First apply phase for one selected record: report the worker's termination
+# (already done for every record by terminate_pids) and drop its lock. The
+# TODO rollback for every record is batched afterwards.
+stop_record_runtime() {
   local task_id="${1:-}"
   local task_branch="${2:-}"
   local task_key="${3:-}"
@@ -2141,22 +2366,21 @@ apply_actions_for_record() {
   local pid_alive="${7:-0}"
   local pid_file="${8:-}"
   local lock_file="${9:-}"
-  local worktree="${10:-}"
-  local reason="${11:-manual stop}"
-  local skip_done_rollback="${12:-0}"
+  local pid_survived="${10:-0}"
   local failed=0
 
   local tmux_session=""
   local launch_label=""
-  if [[ -n "$pid_file" && -f "$pid_file" ]]; then
-    tmux_session="$(read_field "$pid_file" "tmux_session")"
-    launch_label="$(read_field "$pid_file" "launch_label")"
+  local pid_text
+  if [[ -n "$pid_file" ]] && pid_text="$(meta_read "$pid_file")"; then
+    tmux_session="$(meta_value "$pid_text" "tmux_session")"
+    launch_label="$(meta_value "$pid_text" "launch_label")"
   fi
 
   echo "- task=$task_id branch=${task_branch:-N/A} key=${task_key:-N/A} scope=${scope:-N/A} state=$state"
 
   if [[ -n "$pid_file" && "$pid_alive" == "1" ]]; then
-    if terminate_pid "$pid"; then
+    if [[ "$pid_survived" != "1" ]]; then
       echo "  [OK] pid terminated: $pid"
     else
       echo "  [ERROR] failed to terminate pid: $pid"
@@ -2186,8 +2410,8 @@ apply_actions_for_record() {
     fi
   fi
 
-  if [[ -n "$lock_file" && -f "$lock_file" ]]; then
-    if rm -f "$lock_file"; then
+  if [[ -n "$lock_file" ]] && meta_exists "$lock_file"; then
+    if meta_remove "$lock_file"; then
       echo "  [OK] lock removed: $lock_file"
     else
       echo "  [ERROR] failed to remove lock: $lock_file"
@@ -2199,33 +2423,17 @@ apply_actions_for_record() {
     echo "  [SKIP] no lock metadata"
   fi
 
-  local skip_rollback=0
-  if [[ "$skip_done_rollback" == "1" ]]; then
-    local task_status_raw task_status_upper
-    task_status_raw="$(task_status_for_id "$task_id" "$task_branch" 2>/dev/null || true)"
-    task_status_upper="$(printf '%s' "$task_status_raw" | tr '[:lower:]' '[:upper:]')"
-    if [[ "$task_status_upper" == "DONE" ]]; then
-      echo "  [SKIP] TODO rollback skipped: task status is DONE"
-      skip_rollback=1
-    fi
-  fi
+  return "$failed"
+}
 
-  if [[ "$skip_rollback" -eq 0 ]]; then
-    local rollback_note
-    if rollback_note="$(rollback_task_to_todo "$task_id" "OrchestratorSuite" "$reason" "$task_branch" 2>&1)"; then
-      echo "  [OK] TODO rollback: $rollback_note"
-    else
-      case "$?" in
-        2)
-          echo "  [SKIP][unsupported] TODO rollback: $rollback_note"
-          ;;
-        *)
-          echo "  [ERROR] TODO rollback failed: $rollback_note"
-          failed=1
-          ;;
-      esac
-    fi
-  fi
+# Last apply phase for one selected record: remove its worktree/branch and
+# pid metadata. Runs as a background job, several records at a time.
+cleanup_record_worktree() {
+  local task_id="${1:-}"
+  local task_branch="${2:-}"
+  local pid_file="${3:-}"
+  local worktree="${4:-}"
+  local failed=0
 
   local cleanup_note
   if cleanup_note="$(remove_worktree_and_branch "$worktree" "$task_id" "$task_branch" 2>&1)"; then
@@ -2235,8 +2443,8 @@ apply_actions_for_record() {
     failed=1
   fi
 
-  if [[ -n "$pid_file" && -f "$pid_file" ]]; then
-    if rm -f "$pid_file"; then
+  if [[ -n "$pid_file" ]] && meta_exists "$pid_file"; then
+    if meta_remove "$pid_file"; then
       echo "  [OK] pid metadata removed: $pid_file"
     else
       echo "  [ERROR] failed to remove pid metadata: $pid_file"
@@ -2290,6 +2498,29 @@ PY
     echo "Mode: APPLY"
   fi
 
+  # Apply runs in three phases. Every live worker is signalled at once and
+  # waited on under one deadline, then locks are dropped per record; every
+  # TODO rollback lands in one locked board write; worktrees are removed by
+  # up to <parallel> concurrent jobs. Output is buffered per record and
+  # printed in record order.
+  local record_count=0
+  local rollback_batch=""
+  local -a rec_output=()
+  local -a rec_failed=()
+  local -a rec_task_id=()
+  local -a rec_task_branch=()
+  local -a rec_task_key=()
+  local -a rec_scope=()
+  local -a rec_state=()
+  local -a rec_pid=()
+  local -a rec_pid_alive=()
+  local -a rec_pid_file=()
+  local -a rec_lock_file=()
+  local -a rec_worktree=()
+  local -a rec_batch_row=()
+  local -a live_pids=()
+  local batch_rows=0
+
   while IFS=$'\t' read -r key task_id task_branch task_key scope state pid pid_alive pid_file lock_file worktree tmux_session worktree_exists; do
     [[ -n "${key:-}" ]] || continue
 
@@ -2311,15 +2542,148 @@ PY
       continue
     fi
 
-    if apply_actions_for_record "$task_id" "$task_branch" "$task_key" "$scope" "$state" "$pid" "$pid_alive" "$pid_file" "$lock_file" "$worktree" "$reason_text" "$skip_done_rollback"; then
-      success=$((success + 1))
-    else
-      failed=$((failed + 1))
+    local idx="$record_count"
+    record_count=$((record_count + 1))
+    rec_task_id[idx]="$task_id"
+    rec_task_branch[idx]="$task_branch"
+    rec_task_key[idx]="$task_key"
+    rec_scope[idx]="$scope"
+    rec_state[idx]="$state"
+    rec_pid[idx]="$pid"
+    rec_pid_alive[idx]="$pid_alive"
+    rec_pid_file[idx]="$pid_file"
+    rec_lock_file[idx]="$lock_file"
+    rec_worktree[idx]="$worktree"
+    rec_failed[idx]=0
+    rec_batch_row[idx]=-1
+    if [[ -n "$pid_file" && "$pid_alive" == "1" ]]; then
+      live_pids+=("$pid")
     fi
   done <<< "$normalized_tsv"
 
+  if [[ "$record_count" -gt 0 ]]; then
+    local survivors=""
+    if [[ "${#live_pids[@]}" -gt 0 ]]; then
+      survivors="$(terminate_pids "${live_pids[@]}")"
+    fi
+
+    local idx
+    for ((idx = 0; idx < record_count; idx++)); do
+      local survived=0
+      if [[ -n "$survivors" ]] && printf '%s\n' "$survivors" | grep -qx "${rec_pid[idx]}"; then
+        survived=1
+      fi
+
+      local stop_output
+      if ! stop_output="$(stop_record_runtime "${rec_task_id[idx]}" "${rec_task_branch[idx]}" "${rec_task_key[idx]}" "${rec_scope[idx]}" "${rec_state[idx]}" "${rec_pid[idx]}" "${rec_pid_alive[idx]}" "${rec_pid_file[idx]}" "${rec_lock_file[idx]}" "$survived")"; then
+        rec_failed[idx]=1
+      fi
+      rec_output[idx]="$stop_output"
+
+      local task_id="${rec_task_id[idx]}"
+      if [[ -n "$task_id" && "$task_id" != "N/A" ]]; then
+        rollback_batch+="${task_id}"$'\t'"${rec_task_branch[idx]:-__EMPTY__}"$'\t'"TODO"$'\n'
+        rec_batch_row[idx]="$batch_rows"
+        batch_rows=$((batch_rows + 1))
+      else
+        rec_output[idx]+=$'\n'"  [SKIP][unsupported] TODO rollback: task id missing"
+      fi
+    done
+
+    local -a rollback_results=()
+    local rollback_error=""
+    if [[ "$batch_rows" -gt 0 ]]; then
+      ensure_todo_template
+      local -a apply_cmd=(todo-apply "--todo-file=$TODO_FILE" "--schema-json=$TODO_SCHEMA_JSON")
+      if [[ "$skip_done_rollback" == "1" ]]; then
+        apply_cmd+=(--keep-status DONE)
+      fi
+      local apply_output=""
+      if apply_output="$(printf '%s' "$rollback_batch" | run_engine "${apply_cmd[@]}" 2>&1)"; then
+        local result_line
+        while IFS= read -r result_line; do
+          [[ -n "$result_line" ]] || continue
+          rollback_results+=("$result_line")
+        done <<< "$apply_output"
+      else
+        rollback_error="${apply_output:-todo-apply failed}"
+      fi
+    fi
+
+    local parallel="${CODEX_TASKS_TEARDOWN_PARALLEL:-8}"
+    [[ "$parallel" =~ ^[1-9][0-9]*$ ]] || parallel=8
+    local teardown_dir
+    teardown_dir="$(mktemp -d "${TMPDIR:-/tmp}/codex-tasks-teardown.XXXXXX")"
+    local -a rec_job=()
+    local -a rec_job_rc=()
+
+    for ((idx = 0; idx < record_count; idx++)); do
+      local row="${rec_batch_row[idx]}"
+      if [[ "$row" -ge 0 ]]; then
+        local r_task r_branch r_result r_previous r_status r_detail
+        r_result=""
+        r_detail=""
+        if [[ -z "$rollback_error" && "$row" -lt "${#rollback_results[@]}" ]]; then
+          IFS=$'\t' read -r r_task r_branch r_result r_previous r_status r_detail <<< "${rollback_results[row]}"
+          [[ "$r_detail" == "__EMPTY__" ]] && r_detail=""
+        fi
+        case "$r_result" in
+          updated|unchanged)
+            append_update_log "OrchestratorSuite" "${rec_task_id[idx]}" "TODO" "Stopped by codex-tasks: $reason_text"
+            rec_output[idx]+=$'\n'"  [OK] TODO rollback: updated TODO to TODO"
+            ;;
+          kept)
+            rec_output[idx]+=$'\n'"  [SKIP] TODO rollback skipped: $r_detail"
+            ;;
+          not_found|ambiguous)
+            rec_output[idx]+=$'\n'"  [SKIP][unsupported] TODO rollback: $r_detail"
+            ;;
+          *)
+            rec_output[idx]+=$'\n'"  [ERROR] TODO rollback failed: ${rollback_error:-${r_detail:-missing todo-apply result}}"
+            rec_failed[idx]=1
+            ;;
+        esac
+      fi
+
+      # Sliding window: before starting job <idx>, reap job <idx - parallel>.
+      local oldest=$((idx - parallel))
+      if [[ "$oldest" -ge 0 ]]; then
+        if wait "${rec_job[oldest]}"; then
+          rec_job_rc[oldest]=0
+        else
+          rec_job_rc[oldest]=1
+        fi
+      fi
+      cleanup_record_worktree "${rec_task_id[idx]}" "${rec_task_branch[idx]}" "${rec_pid_file[idx]}" "${rec_worktree[idx]}" > "$teardown_dir/$idx.out" 2>&1 &
+      rec_job[idx]="$!"
+    done
+
+    for ((idx = 0; idx < record_count; idx++)); do
+      if [[ -z "${rec_job_rc[idx]:-}" ]]; then
+        if wait "${rec_job[idx]}"; then
+          rec_job_rc[idx]=0
+        else
+          rec_job_rc[idx]=1
+        fi
+      fi
+      [[ "${rec_job_rc[idx]}" -eq 0 ]] || rec_failed[idx]=1
+      rec_output[idx]+=$'\n'"$(cat "$teardown_dir/$idx.out" 2>/dev/null || true)"
+
+      printf '%s\n' "${rec_output[idx]}"
+      if [[ "${rec_failed[idx]}" -eq 0 ]]; then
+        success=$((success + 1))
+      else
+        failed=$((failed + 1))
+      fi
+    done
+    rm -rf "$teardown_dir" >/dev/null 2>&1 || true
+  fi
+
   echo "Summary: success=$success failed=$failed"
-  refresh_active_pid_registry
+  refresh_active_pid_registry >/dev/null || echo "[WARN] Failed to refresh active pid registry: $ACTIVE_PID_FILE"
+  if [[ "$record_count" -gt 0 ]]; then
+    start_log_gc
+  fi
   [[ "$failed" -eq 0 ]]
 }
 
@@ -2389,7 +2753,7 @@ cmd_task_stop() {
   fi
 
   local selected_tsv
-  selected_tsv="$("$PYTHON_BIN" "$PY_ENGINE" "${cmd[@]}")"
+  selected_tsv="$(run_engine "${cmd[@]}")"
   [[ -n "$selected_tsv" ]] || die "No matching records for task stop target"
 
   run_selected_actions "$selected_tsv" "task-stop" "$reason" "$apply"
@@ -2417,7 +2781,7 @@ cmd_task_cleanup_stale() {
   fi
 
   local selected_tsv
-  selected_tsv="$("$PYTHON_BIN" "$PY_ENGINE" "${cmd[@]}")"
+  selected_tsv="$(run_engine "${cmd[@]}")"
   if [[ -z "$selected_tsv" ]]; then
     echo "No stale records found."
     return
@@ -2461,20 +2825,27 @@ cmd_task_auto_cleanup_exit() {
   [[ -n "$task_id" ]] || die "Usage: codex-tasks task auto-cleanup-exit <task_id> <expected_pid> [--branch <name>] [--reason <text>]"
   [[ "$expected_pid" =~ ^[0-9]+$ ]] || die "task auto-cleanup-exit requires numeric expected_pid"
 
-  local pid_meta
+  local pid_meta pid_text
   pid_meta="$(resolve_pid_meta_path_or_die "$task_id" "$task_branch" "task auto-cleanup-exit")"
-  if [[ -z "$pid_meta" || ! -f "$pid_meta" ]]; then
+  if [[ -z "$pid_meta" ]] || ! pid_text="$(meta_read "$pid_meta")"; then
     echo "[AUTO-CLEANUP] no pid metadata for task=$task_id"
     return 0
   fi
 
   local current_pid
-  current_pid="$(read_field "$pid_meta" "pid")"
+  current_pid="$(meta_value "$pid_text" "pid")"
   if [[ "$current_pid" != "$expected_pid" ]]; then
     echo "[AUTO-CLEANUP] pid changed for task=$task_id current=${current_pid:-N/A} expected=$expected_pid; skip"
     return 0
   fi
 
+  # The pid record names the exact task, so the lookup below only reads
+  # that task's pid/lock metadata (and never touches same-id tasks on other
+  # branches).
+  if [[ -z "$task_branch" ]]; then
+    task_branch="$(meta_value "$pid_text" "task_branch")"
+  fi
+
   local -a cmd=(select-stop --repo "$REPO_ROOT" --state-dir "$STATE_DIR" --task "$task_id" --format tsv)
   if [[ -n "$task_branch" ]]; then
     cmd+=(--branch "$task_branch")
@@ -2484,18 +2855,15 @@ cmd_task_auto_cleanup_exit() {
   fi
 
   local selected_tsv
-  selected_tsv="$("$PYTHON_BIN" "$PY_ENGINE" "${cmd[@]}")"
+  selected_tsv="$(run_engine "${cmd[@]}")"
   if [[ -z "$selected_tsv" ]]; then
     local scope worktree tmux_session lock_file worktree_exists
-    scope="$(read_field "$pid_meta" "scope")"
+    scope="$(meta_value "$pid_text" "scope")"
     if [[ -z "$scope" ]]; then
       scope="$(task_scope_for_id "$task_id" "$task_branch")"
     fi
-    worktree="$(read_field "$pid_meta" "worktree")"
-    tmux_session="$(read_field "$pid_meta" "tmux_session")"
-    if [[ -z "$task_branch" ]]; then
-      task_branch="$(read_field "$pid_meta" "task_branch")"
-    fi
+    worktree="$(meta_value "$pid_text" "worktree")"
+    tmux_session="$(meta_value "$pid_text" "tmux_session")"
     lock_file="$(lock_meta_path_for_task "$task_id" "$task_branch" || true)"
     local task_key
     task_key="$(task_identity_key "$task_id" "$task_branch")"
@@ -2568,7 +2936,7 @@ pid_meta_path_for_task() {
   fi
 
   candidate="$ORCH_DIR/${task_slug}.pid"
-  if [[ -f "$candidate" ]]; then
+  if meta_exists "$candidate"; then
     echo "$candidate"
     return 0
   fi
@@ -2577,7 +2945,7 @@ pid_meta_path_for_task() {
   while IFS= read -r path; do
     [[ -n "$path" ]] || continue
     matches+=("$path")
-  done < <(find "$ORCH_DIR" -maxdepth 1 -type f -name "*--${task_slug}.pid" 2>/dev/null | sort)
+  done < <(meta_glob "$ORCH_DIR" "*--${task_slug}.pid")
 
   if [[ "${#matches[@]}" -eq 1 ]]; then
     echo "${matches[0]}"
@@ -2619,8 +2987,8 @@ remove_pid_metadata_for_task() {
   pid_meta="$(pid_meta_path_for_task "$task_id" "$task_branch" || true)"
   [[ -n "$pid_meta" ]] || return 0
 
-  if [[ -f "$pid_meta" ]]; then
-    rm -f "$pid_meta" >/dev/null 2>&1 || true
+  if meta_exists "$pid_meta"; then
+    meta_remove "$pid_meta" >/dev/null 2>&1 || true
     echo "Removed pid metadata for task=$task_id"
     return 0
   fi
@@ -2859,35 +3227,37 @@ has_codex_reasoning_effort_config() {
   return 1
 }
 
-spawn_exit_cleanup_watcher() {
-  local task_id="${1:-}"
-  local task_branch="${2:-}"
-  local expected_pid="${3:-}"
-  local reason="${4:-worker exited}"
-  [[ -n "$task_id" && "$expected_pid" =~ ^[0-9]+$ ]] || return 1
+running_worker_supervisor_pid() {
+  # supervisor.lock holds "<pid> <proc_start>" while a supervisor owns it;
+  # the supervisor empties it before letting go of the lock.
+  local lock_file="$ORCH_DIR/supervisor.lock"
+  local pid="" start=""
+  [[ -s "$lock_file" ]] || return 1
+  read -r pid start < "$lock_file" || true
+  pid_matches_start "$pid" "$start" || return 1
+  pid_running "$pid" || return 1
+  printf '%s\n' "$pid"
+}
 
-  local logs_dir task_slug watcher_log cleanup_cmd_str watcher_script watcher_pid
-  logs_dir="$ORCH_DIR/logs"
-  mkdir -p "$logs_dir"
-  task_slug="$(task_identity_slug "$task_id" "$task_branch")"
-  [[ -n "$task_slug" ]] || task_slug="task"
-  watcher_log="$logs_dir/watch-${task_slug}-$(date -u +%Y%m%dT%H%M%SZ).log"
+ensure_worker_supervisor() {
+  # One supervisor per state dir waits on every tmux worker pid and runs
+  # `task auto-cleanup-exit` on exit. When one already runs it is only sent
+  # SIGHUP to rescan pid metadata; no engine process is started.
+  local supervisor_pid
+  supervisor_pid="$(running_worker_supervisor_pid || true)"
+  if [[ -n "$supervisor_pid" ]] && kill -HUP "$supervisor_pid" >/dev/null 2>&1; then
+    printf '%s' "$supervisor_pid"
+    return 0
+  fi
 
-  local -a cleanup_cmd=("$TEAM_BIN" --repo "$REPO_ROOT" --state-dir "$STATE_DIR")
+  local -a cmd=("$PYTHON_BIN" "$PY_ENGINE" supervise --repo "$REPO_ROOT" --state-dir "$STATE_DIR" --team-bin "$TEAM_BIN")
   if [[ -n "${TEAM_CONFIG_EFFECTIVE:-}" ]]; then
-    cleanup_cmd+=(--config "$TEAM_CONFIG_EFFECTIVE")
-  fi
-  if [[ -n "$task_branch" ]]; then
-    cleanup_cmd+=(task auto-cleanup-exit "$task_id" "$expected_pid" --branch "$task_branch" --reason "$reason")
-  else
-    cleanup_cmd+=(task auto-cleanup-exit "$task_id" "$expected_pid" --reason "$reason")
+    cmd+=(--config "$TEAM_CONFIG_EFFECTIVE")
   fi
-  cleanup_cmd_str="$(join_shell_words "${cleanup_cmd[@]}")"
-  watcher_script="while kill -0 ${expected_pid} >/dev/null 2>&1; do sleep 1; done; ${cleanup_cmd_str}"
 
-  watcher_pid="$(spawn_detached_process "$watcher_log" bash -lc "$watcher_script" || true)"
-  [[ "$watcher_pid" =~ ^[0-9]+$ ]] || return 1
-  printf '%s' "$watcher_pid"
+  supervisor_pid="$(spawn_detached_process "$ORCH_DIR/logs/supervisor.log" "${cmd[@]}" || true)"
+  [[ "$supervisor_pid" =~ ^[0-9]+$ ]] || return 1
+  printf '%s' "$supervisor_pid"
 }
 
 launch_codex_tmux_worker() {
@@ -2907,7 +3277,7 @@ launch_codex_tmux_worker() {
   command -v codex >/dev/null 2>&1 || die "codex command not found. Install Codex CLI or use --no-launch."
   command -v tmux >/dev/null 2>&1 || die "tmux command not found. Install tmux or use --no-launch."
 
-  local pid_meta logs_dir log_file pid started_at prompt primary_repo session_name session_slug task_key
+  local pid_meta logs_dir log_file pid started_at proc_start proc_cmd prompt primary_repo session_name session_slug task_key
   pid_meta="$(pid_meta_path_for_task "$task_id" "$task_branch" || true)"
   [[ -n "$pid_meta" ]] || {
     echo "[ERROR] Failed to resolve pid metadata path for task=$task_id"
@@ -2918,14 +3288,15 @@ launch_codex_tmux_worker() {
   mkdir -p "$logs_dir"
   log_file="$logs_dir/$(basename "${pid_meta%.pid}")-$(date -u +%Y%m%dT%H%M%SZ).log"
 
-  if [[ -f "$pid_meta" ]]; then
+  local existing_meta
+  if existing_meta="$(meta_read "$pid_meta")"; then
     local existing_pid
-    existing_pid="$(read_field "$pid_meta" "pid")"
-    if [[ "$existing_pid" =~ ^[0-9]+$ ]] && kill -0 "$existing_pid" >/dev/null 2>&1; then
+    existing_pid="$(meta_value "$existing_meta" "pid")"
+    if pid_matches_start "$existing_pid" "$(meta_value "$existing_meta" "proc_start")"; then
       echo "[ERROR] Active pid metadata already exists for task=$task_id pid=$existing_pid file=$pid_meta"
       return 1
     fi
-    rm -f "$pid_meta"
+    meta_remove "$pid_meta"
   fi
 
   local -a codex_flags=()
@@ -2990,8 +3361,12 @@ launch_codex_tmux_worker() {
   session_slug="${session_slug//./_}"
   session_name="codex-tasks-${session_slug}-$(date -u +%Y%m%d%H%M%S)-$$"
 
-  local codex_cmd_str pipe_cmd
+  local codex_cmd_str pipe_cmd exit_file
+  exit_file="${log_file%.log}.exit"
   codex_cmd_str="$(join_shell_words "${codex_cmd[@]}")"
+  # The pane pid is not our child, so the worker records its own exit status
+  # for the supervisor.
+  codex_cmd_str="${codex_cmd_str}; printf '%s\n' \"\$?\" > $(printf '%q' "$exit_file")"
   if ! tmux new-session -d -s "$session_name" -c "$worktree_path" "$codex_cmd_str"; then
     echo "[ERROR] Failed to create tmux session: task=$task_id"
     return 1
@@ -3028,8 +3403,12 @@ launch_codex_tmux_worker() {
 
   task_key="$(task_identity_key "$task_id" "$task_branch")"
   started_at="$(timestamp_utc)"
-  if ! cat > "$pid_meta" <<PID_META
+  proc_start="$(process_start_time "$pid")"
+  proc_cmd="$(process_command_line "$pid")"
+  if ! meta_put "$pid_meta" <<PID_META
 pid=$pid
+proc_start=$proc_start
+proc_cmd=$proc_cmd
 task_id=$task_id
 task_branch=$task_branch
 task_key=$task_key
@@ -3040,6 +3419,7 @@ launch_backend=tmux
 launch_label=N/A
 tmux_session=$session_name
 log_file=$log_file
+exit_file=$exit_file
 trigger=$trigger
 PID_META
   then
@@ -3048,17 +3428,14 @@ PID_META
     return 1
   fi
 
-  local watcher_pid watcher_reason
-  watcher_reason="worker exited (backend=tmux)"
-  watcher_pid="$(spawn_exit_cleanup_watcher "$task_id" "$task_branch" "$pid" "$watcher_reason" || true)"
-  if [[ ! "$watcher_pid" =~ ^[0-9]+$ ]]; then
-    echo "[ERROR] Failed to launch cleanup watcher: task=$task_id session=$session_name"
+  if ! ensure_worker_supervisor >/dev/null; then
+    echo "[ERROR] Failed to start worker supervisor: task=$task_id session=$session_name"
     kill_tmux_session_if_any "$session_name" >/dev/null 2>&1 || true
-    rm -f "$pid_meta" >/dev/null 2>&1 || true
+    meta_remove "$pid_meta" >/dev/null 2>&1 || true
     return 1
   fi
 
-  echo "Launched codex worker: task=$task_id branch=${task_branch:-N/A} pid=$pid session=$session_name watcher=$watcher_pid log=$log_file"
+  echo "Launched codex worker: task=$task_id branch=${task_branch:-N/A} pid=$pid session=$session_name log=$log_file"
 }
 
 launch_codex_exec_worker() {
@@ -3077,7 +3454,7 @@ launch_codex_exec_worker() {
   [[ -n "$task_id" && -n "$scope" && -n "$worktree_path" ]] || return 1
   command -v codex >/dev/null 2>&1 || die "codex command not found. Install Codex CLI or use --no-launch."
 
-  local pid_meta logs_dir log_file pid started_at prompt primary_repo task_key
+  local pid_meta logs_dir log_file pid started_at proc_start proc_cmd prompt primary_repo task_key
   pid_meta="$(pid_meta_path_for_task "$task_id" "$task_branch" || true)"
   [[ -n "$pid_meta" ]] || {
     echo "[ERROR] Failed to resolve pid metadata path for task=$task_id"
@@ -3088,14 +3465,15 @@ launch_codex_exec_worker() {
   mkdir -p "$logs_dir"
   log_file="$logs_dir/$(basename "${pid_meta%.pid}")-$(date -u +%Y%m%dT%H%M%SZ).log"
 
-  if [[ -f "$pid_meta" ]]; then
+  local existing_meta
+  if existing_meta="$(meta_read "$pid_meta")"; then
     local existing_pid
-    existing_pid="$(read_field "$pid_meta" "pid")"
-    if [[ "$existing_pid" =~ ^[0-9]+$ ]] && kill -0 "$existing_pid" >/dev/null 2>&1; then
+    existing_pid="$(meta_value "$existing_meta" "pid")"
+    if pid_matches_start "$existing_pid" "$(meta_value "$existing_meta" "proc_start")"; then
       echo "[ERROR] Active pid metadata already exists for task=$task_id pid=$existing_pid file=$pid_meta"
       return 1
     fi
-    rm -f "$pid_meta"
+    meta_remove "$pid_meta"
   fi
 
   local -a codex_flags=()
@@ -3175,8 +3553,12 @@ launch_codex_exec_worker() {
 
   task_key="$(task_identity_key "$task_id" "$task_branch")"
   started_at="$(timestamp_utc)"
-  if ! cat > "$pid_meta" <<PID_META
+  proc_start="$(process_start_time "$pid")"
+  proc_cmd="$(process_command_line "$pid")"
+  if ! meta_put "$pid_meta" <<PID_META
 pid=$pid
+proc_start=$proc_start
+proc_cmd=$proc_cmd
 task_id=$task_id
 task_branch=$task_branch
 task_key=$task_key
@@ -3207,14 +3589,14 @@ rollback_start_attempt() {
   local preferred_worktree_path="${6:-}"
   local reason="${7:-start failed}"
 
-  local pid_meta pid tmux_session launch_label
+  local pid_meta pid_text pid tmux_session launch_label
   pid_meta="$(pid_meta_path_for_task "$task_id" "$task_branch" || true)"
 
-  if [[ -n "$pid_meta" && -f "$pid_meta" ]]; then
-    pid="$(read_field "$pid_meta" "pid")"
-    tmux_session="$(read_field "$pid_meta" "tmux_session")"
-    launch_label="$(read_field "$pid_meta" "launch_label")"
-    if [[ "$pid" =~ ^[0-9]+$ ]] && kill -0 "$pid" >/dev/null 2>&1; then
+  if [[ -n "$pid_meta" ]] && pid_text="$(meta_read "$pid_meta")"; then
+    pid="$(meta_value "$pid_text" "pid")"
+    tmux_session="$(meta_value "$pid_text" "tmux_session")"
+    launch_label="$(meta_value "$pid_text" "launch_label")"
+    if pid_matches_start "$pid" "$(meta_value "$pid_text" "proc_start")"; then
       if terminate_pid "$pid"; then
         echo "[ROLLBACK] terminated codex pid: $pid"
       else
@@ -3223,18 +3605,18 @@ rollback_start_attempt() {
     fi
     kill_tmux_session_if_any "$tmux_session" >/dev/null 2>&1 || true
     kill_launch_label_if_any "$launch_label" >/dev/null 2>&1 || true
-    rm -f "$pid_meta" >/dev/null 2>&1 || true
+    meta_remove "$pid_meta" >/dev/null 2>&1 || true
   fi
 
-  local lock_file lock_task lock_branch lock_task_key expected_task_key
+  local lock_file lock_text lock_task lock_branch lock_task_key expected_task_key
   lock_file="$(lock_meta_path_for_task "$task_id" "$task_branch" || true)"
-  if [[ -n "$lock_file" && -f "$lock_file" ]]; then
-    lock_task="$(read_field "$lock_file" "task_id")"
-    lock_branch="$(read_field "$lock_file" "task_branch")"
-    lock_task_key="$(read_field "$lock_file" "task_key")"
+  if [[ -n "$lock_file" ]] && lock_text="$(meta_read "$lock_file")"; then
+    lock_task="$(meta_value "$lock_text" "task_id")"
+    lock_branch="$(meta_value "$lock_text" "task_branch")"
+    lock_task_key="$(meta_value "$lock_text" "task_key")"
     expected_task_key="$(task_identity_key "$task_id" "$task_branch")"
     if [[ "$lock_task" == "$task_id" && "$lock_branch" == "$task_branch" && "$lock_task_key" == "$expected_task_key" ]]; then
-      rm -f "$lock_file" >/dev/null 2>&1 || true
+      meta_remove "$lock_file" >/dev/null 2>&1 || true
     fi
   fi
 
@@ -3251,7 +3633,7 @@ rollback_start_attempt() {
 
   if [[ "$worktree_existed_before" -eq 0 ]]; then
     if [[ -n "$worktree_path" && -d "$worktree_path" && "$worktree_path" != "$REPO_ROOT" ]]; then
-      git -C "$REPO_ROOT" worktree remove --force "$worktree_path" >/dev/null 2>&1 || true
+      remove_worktree_dir "$REPO_ROOT" "$worktree_path" || true
     fi
   fi
 
@@ -3296,9 +3678,10 @@ for item in excluded:
     task_id = item.get('task_id', '')
     task_branch = item.get('task_branch', '')
     task_label = f"{task_branch}:{task_id}" if task_branch else task_id
-    print(
-        f"  - {task_label} | reason={item.get('reason', '')} source={item.get('source', '')}"
-    )
+    line = f"  - {task_label} | reason={item.get('reason', '')} source={item.get('source', '')}"
+    if item.get('blocked_by'):
+        line += f" blocked_by={item['blocked_by']}"
+    print(line)
 PY
 }
 
@@ -3336,11 +3719,120 @@ acquire_scheduler_lock() {
   return 0
 }
 
+# Prepares the worktree for one ready task and launches its worker. Returns
+# non-zero after rolling back a failed attempt. Runs in a background subshell
+# under `run start --parallel`, so it must not touch caller state.
+start_ready_task() {
+  local dry_run="${1:-0}"
+  local no_launch="${2:-0}"
+  local launch_backend="${3:-}"
+  local trigger="${4:-manual}"
+  local task_id="${5:-}"
+  local task_branch="${6:-}"
+  local task_base_branch="${7:-}"
+  local task_title="${8:-}"
+  local scope="${9:-}"
+  local spec_path="${10:-}"
+  local goal_summary="${11:-}"
+  local in_scope_summary="${12:-}"
+  local acceptance_summary="${13:-}"
+  local subtasks_summary="${14:-}"
+
+  local summary start_output worktree_path
+  local branch_name expected_worktree_path
+  local branch_existed_before=0
+  local worktree_existed_before=0
+  local -a start_cmd
+
+  summary="Auto-start by scheduler (${trigger})"
+  branch_name="$(branch_name_for "$task_id" "$task_branch" || true)"
+  expected_worktree_path="$(default_worktree_path_for "$REPO_NAME" "$task_id" "$WORKTREE_PARENT_DIR" "$task_branch")"
+
+  if [[ -n "$branch_name" ]] && git -C "$REPO_ROOT" rev-parse --verify "$branch_name" >/dev/null 2>&1; then
+    branch_existed_before=1
+  fi
+  if [[ -n "$branch_name" && -n "$(find_worktree_for_branch "$REPO_ROOT" "$branch_name" || true)" ]]; then
+    worktree_existed_before=1
+  fi
+
+  if [[ "$dry_run" -eq 1 ]]; then
+    echo "[DRY-RUN] $TEAM_BIN --repo $REPO_ROOT --state-dir $STATE_DIR worktree start $task_id $task_base_branch $WORKTREE_PARENT_DIR '$summary' '$task_branch'"
+    return 0
+  fi
+
+  start_cmd=("$TEAM_BIN" --repo "$REPO_ROOT" --state-dir "$STATE_DIR")
+  if [[ -n "${TEAM_CONFIG_EFFECTIVE:-}" ]]; then
+    start_cmd+=(--config "$TEAM_CONFIG_EFFECTIVE")
+  fi
+  start_cmd+=(worktree start "$task_id" "$task_base_branch" "$WORKTREE_PARENT_DIR" "$summary" "$task_branch")
+
+  if ! start_output="$(AI_STATE_DIR="$STATE_DIR" "${start_cmd[@]}" 2>&1)"; then
+    echo "$start_output"
+    echo "[ERROR] Failed to start task=$task_id"
+    rollback_start_attempt "$task_id" "$task_branch" "$branch_name" "$branch_existed_before" "$worktree_existed_before" "$expected_worktree_path" "worktree start failed"
+    return 1
+  fi
+
+  echo "$start_output"
+
+  worktree_path="$(printf '%s\n' "$start_output" | awk -F'=' '/^worktree=/{print substr($0,10)}' | tail -n1)"
+  if [[ -z "$worktree_path" || ! -d "$worktree_path" ]]; then
+    echo "[ERROR] Missing worktree path after start: task=$task_id"
+    rollback_start_attempt "$task_id" "$task_branch" "$branch_name" "$branch_existed_before" "$worktree_existed_before" "$expected_worktree_path" "worktree path missing"
+    return 1
+  fi
+
+  if [[ "$no_launch" -eq 0 ]]; then
+    local launch_ok=0
+    if [[ "$launch_backend" == "tmux" ]]; then
+      if launch_codex_tmux_worker "$task_id" "$task_branch" "$task_title" "$scope" "$trigger" "$worktree_path" "$spec_path" "$goal_summary" "$in_scope_summary" "$acceptance_summary" "$subtasks_summary"; then
+        launch_ok=1
+      fi
+    else
+      if launch_codex_exec_worker "$task_id" "$task_branch" "$task_title" "$scope" "$trigger" "$worktree_path" "$spec_path" "$goal_summary" "$in_scope_summary" "$acceptance_summary" "$subtasks_summary"; then
+        launch_ok=1
+      fi
+    fi
+    if [[ "$launch_ok" -eq 0 ]]; then
+      echo "[ERROR] Failed to launch codex worker: task=$task_id"
+      rollback_start_attempt "$task_id" "$task_branch" "$branch_name" "$branch_existed_before" "$worktree_existed_before" "$worktree_path" "codex launch failed"
+      return 1
+    fi
+  fi
+
+  return 0
+}
+
+# Waits for background start_ready_task jobs, oldest first, until at most
+# <keep> are still running, replaying each job's buffered output in launch
+# order. Uses cmd_run_start's pool_pids/pool_logs/started_count (bash has no
+# `wait -n` before 4.3, so the pool is drained FIFO).
+reap_start_pool() {
+  local keep="${1:-0}"
+  while [[ "${#pool_pids[@]}" -gt "$keep" ]]; do
+    local pid="${pool_pids[0]}"
+    local log_file="${pool_logs[0]}"
+    if wait "$pid"; then
+      started_count=$((started_count + 1))
+    fi
+    cat "$log_file" 2>/dev/null || true
+    rm -f "$log_file" >/dev/null 2>&1 || true
+    if [[ "${#pool_pids[@]}" -gt 1 ]]; then
+      pool_pids=("${pool_pids[@]:1}")
+      pool_logs=("${pool_logs[@]:1}")
+    else
+      pool_pids=()
+      pool_logs=()
+    fi
+  done
+}
+
 cmd_run_start() {
   local dry_run=0
   local no_launch=""
   local trigger="manual"
   local max_start_arg=""
+  local parallel=1
 
   while [[ $# -gt 0 ]]; do
     case "$1" in
@@ -3350,6 +3842,11 @@ cmd_run_start() {
       --no-launch)
         no_launch=1
         ;;
+      --parallel)
+        shift || true
+        [[ $# -gt 0 ]] || die "Missing value for --parallel"
+        parallel="$1"
+        ;;
       --trigger)
         shift || true
         [[ $# -gt 0 ]] || die "Missing value for --trigger"
@@ -3366,6 +3863,7 @@ cmd_run_start() {
     esac
     shift || true
   done
+  [[ "$parallel" =~ ^[1-9][0-9]*$ ]] || die "--parallel must be a positive integer: $parallel"
 
   load_runtime_context
   ensure_ownerless_runtime_state "run start"
@@ -3413,13 +3911,22 @@ cmd_run_start() {
   fi
 
   local ready_json
-  ready_json="$("$PYTHON_BIN" "$PY_ENGINE" "${ready_cmd[@]}")"
+  ready_json="$(run_engine "${ready_cmd[@]}")"
   print_scheduler_snapshot "$ready_json"
 
   local ready_tsv
-  ready_tsv="$("$PYTHON_BIN" "$PY_ENGINE" "${ready_cmd[@]}" --format tsv)"
+  ready_tsv="$(run_engine "${ready_cmd[@]}" --format tsv)"
 
   local started_count=0
+  local pool_dir=""
+  local pool_seq=0
+  local -a pool_pids=()
+  local -a pool_logs=()
+  if [[ "$dry_run" -eq 0 && "$parallel" -gt 1 ]]; then
+    pool_dir="$(mktemp -d "${TMPDIR:-/tmp}/codex-tasks-start.XXXXXX")"
+    echo "Launch pool: parallel=$parallel"
+  fi
+
   while IFS=$'\t' read -r task_id task_branch task_base_branch task_title scope deps status spec_path goal_summary in_scope_summary acceptance_summary subtasks_summary; do
     [[ "$task_id" == "__EMPTY__" ]] && task_id=""
     [[ "$task_branch" == "__EMPTY__" ]] && task_branch=""
@@ -3435,72 +3942,28 @@ cmd_run_start() {
     [[ "$subtasks_summary" == "__EMPTY__" ]] && subtasks_summary=""
     [[ -n "${task_id:-}" ]] || continue
 
-    local summary start_output worktree_path
-    local branch_name expected_worktree_path
-    local branch_existed_before=0
-    local worktree_existed_before=0
-    local -a start_cmd
-
-    summary="Auto-start by scheduler (${trigger})"
-    branch_name="$(branch_name_for "$task_id" "$task_branch" || true)"
-    expected_worktree_path="$(default_worktree_path_for "$REPO_NAME" "$task_id" "$WORKTREE_PARENT_DIR" "$task_branch")"
-
-    if [[ -n "$branch_name" ]] && git -C "$REPO_ROOT" rev-parse --verify "$branch_name" >/dev/null 2>&1; then
-      branch_existed_before=1
-    fi
-    if [[ -n "$branch_name" && -n "$(find_worktree_for_branch "$REPO_ROOT" "$branch_name" || true)" ]]; then
-      worktree_existed_before=1
-    fi
-
-    if [[ "$dry_run" -eq 1 ]]; then
-      echo "[DRY-RUN] $TEAM_BIN --repo $REPO_ROOT --state-dir $STATE_DIR worktree start $task_id $task_base_branch $WORKTREE_PARENT_DIR '$summary' '$task_branch'"
-      started_count=$((started_count + 1))
-      continue
-    fi
-
-    start_cmd=("$TEAM_BIN" --repo "$REPO_ROOT" --state-dir "$STATE_DIR")
-    if [[ -n "${TEAM_CONFIG_EFFECTIVE:-}" ]]; then
-      start_cmd+=(--config "$TEAM_CONFIG_EFFECTIVE")
-    fi
-    start_cmd+=(worktree start "$task_id" "$task_base_branch" "$WORKTREE_PARENT_DIR" "$summary" "$task_branch")
-
-    if ! start_output="$(AI_STATE_DIR="$STATE_DIR" "${start_cmd[@]}" 2>&1)"; then
-      echo "$start_output"
-      echo "[ERROR] Failed to start task=$task_id"
-      rollback_start_attempt "$task_id" "$task_branch" "$branch_name" "$branch_existed_before" "$worktree_existed_before" "$expected_worktree_path" "worktree start failed"
-      continue
-    fi
-
-    echo "$start_output"
-
-    worktree_path="$(printf '%s\n' "$start_output" | awk -F'=' '/^worktree=/{print substr($0,10)}' | tail -n1)"
-    if [[ -z "$worktree_path" || ! -d "$worktree_path" ]]; then
-      echo "[ERROR] Missing worktree path after start: task=$task_id"
-      rollback_start_attempt "$task_id" "$task_branch" "$branch_name" "$branch_existed_before" "$worktree_existed_before" "$expected_worktree_path" "worktree path missing"
+    if [[ -n "$pool_dir" ]]; then
+      if [[ "${#pool_pids[@]}" -ge "$parallel" ]]; then
+        reap_start_pool "$((parallel - 1))"
+      fi
+      pool_seq=$((pool_seq + 1))
+      local pool_log="$pool_dir/$pool_seq.log"
+      start_ready_task "$dry_run" "$no_launch" "$launch_backend" "$trigger" "$task_id" "$task_branch" "$task_base_branch" "$task_title" "$scope" "$spec_path" "$goal_summary" "$in_scope_summary" "$acceptance_summary" "$subtasks_summary" > "$pool_log" 2>&1 &
+      pool_pids+=("$!")
+      pool_logs+=("$pool_log")
       continue
     fi
 
-    if [[ "$no_launch" -eq 0 ]]; then
-      local launch_ok=0
-      if [[ "$launch_backend" == "tmux" ]]; then
-        if launch_codex_tmux_worker "$task_id" "$task_branch" "$task_title" "$scope" "$trigger" "$worktree_path" "$spec_path" "$goal_summary" "$in_scope_summary" "$acceptance_summary" "$subtasks_summary"; then
-          launch_ok=1
-        fi
-      else
-        if launch_codex_exec_worker "$task_id" "$task_branch" "$task_title" "$scope" "$trigger" "$worktree_path" "$spec_path" "$goal_summary" "$in_scope_summary" "$acceptance_summary" "$subtasks_summary"; then
-          launch_ok=1
-        fi
-      fi
-      if [[ "$launch_ok" -eq 0 ]]; then
-        echo "[ERROR] Failed to launch codex worker: task=$task_id"
-        rollback_start_attempt "$task_id" "$task_branch" "$branch_name" "$branch_existed_before" "$worktree_existed_before" "$worktree_path" "codex launch failed"
-        continue
-      fi
+    if start_ready_task "$dry_run" "$no_launch" "$launch_backend" "$trigger" "$task_id" "$task_branch" "$task_base_branch" "$task_title" "$scope" "$spec_path" "$goal_summary" "$in_scope_summary" "$acceptance_summary" "$subtasks_summary"; then
+      started_count=$((started_count + 1))
     fi
-
-    started_count=$((started_count + 1))
   done <<< "$ready_tsv"
 
+  if [[ -n "$pool_dir" ]]; then
+    reap_start_pool 0
+    rm -rf "$pool_dir" >/dev/null 2>&1 || true
+  fi
+
   echo "Started tasks: $started_count"
 
   rm -f "$run_lock_dir/pid" >/dev/null 2>&1 || true
@@ -3572,3 +4035,95 @@ cmd_unified_status() {
 
   "$PYTHON_BIN" "$PY_ENGINE" "${cmd[@]}"
 }
+
+cmd_daemon_start() {
+  load_runtime_context
+
+  local idle_timeout="0"
+  while [[ $# -gt 0 ]]; do
+    case "$1" in
+      --idle-timeout)
+        shift || true
+        [[ $# -gt 0 ]] || die "Missing value for --idle-timeout"
+        idle_timeout="$1"
+        ;;
+      *)
+        die "Unknown daemon start option: $1"
+        ;;
+    esac
+    shift || true
+  done
+  [[ "$idle_timeout" =~ ^[0-9]+$ ]] || die "--idle-timeout must be a non-negative integer (seconds)"
+
+  local running_pid
+  if running_pid="$("$PYTHON_BIN" "$PY_DAEMON" ping "$ENGINE_SOCKET" 2>/dev/null)"; then
+    echo "Engine daemon already running: pid=$running_pid socket=$ENGINE_SOCKET"
+    return 0
+  fi
+
+  local -a cmd=("$PYTHON_BIN" "$PY_ENGINE" serve --repo "$REPO_ROOT" --state-dir "$STATE_DIR" --idle-timeout "$idle_timeout")
+  if [[ -n "${TEAM_CONFIG_EFFECTIVE:-}" ]]; then
+    cmd+=(--config "$TEAM_CONFIG_EFFECTIVE")
+  fi
+
+  local log_file="$ORCH_DIR/logs/engine-serve.log"
+  local daemon_pid
+  daemon_pid="$(spawn_detached_process "$log_file" "${cmd[@]}")" || die "Failed to start engine daemon"
+
+  local _
+  for _ in $(seq 1 50); do
+    if "$PYTHON_BIN" "$PY_DAEMON" ping "$ENGINE_SOCKET" >/dev/null 2>&1; then
+      echo "Engine daemon started: pid=$daemon_pid socket=$ENGINE_SOCKET"
+      return 0
+    fi
+    if ! kill -0 "$daemon_pid" >/dev/null 2>&1; then
+      break
+    fi
+    sleep 0.1
+  done
+
+  die "Engine daemon did not start (log: $log_file)"
+}
+
+cmd_daemon_stop() {
+  load_runtime_context
+  [[ $# -eq 0 ]] || die "Unknown daemon stop option: $1"
+
+  if "$PYTHON_BIN" "$PY_DAEMON" shutdown "$ENGINE_SOCKET" >/dev/null 2>&1; then
+    echo "Engine daemon stopped: socket=$ENGINE_SOCKET"
+    return 0
+  fi
+
+  rm -f "$ENGINE_SOCKET" >/dev/null 2>&1 || true
+  echo "Engine daemon not running"
+}
+
+cmd_daemon_status() {
+  load_runtime_context
+  [[ $# -eq 0 ]] || die "Unknown daemon status option: $1"
+
+  local running_pid
+  if running_pid="$("$PYTHON_BIN" "$PY_DAEMON" ping "$ENGINE_SOCKET" 2>/dev/null)"; then
+    echo "Engine daemon: running pid=$running_pid socket=$ENGINE_SOCKET"
+    return 0
+  fi
+
+  echo "Engine daemon: not running"
+  return 1
+}
+
+cmd_state_transfer() {
+  # migrate: locks/*.lock, orchestrator/*.pid and LATEST_UPDATES.md -> STATE_DB.
+  # export: STATE_DB -> the file layout, before switching back to "files".
+  local action="${1:-}"
+  shift || true
+  load_runtime_context
+  [[ $# -eq 0 ]] || die "Unknown state $action option: $1"
+  state_backend_is_sqlite || die "state $action requires runtime.state_backend = \"sqlite\" (config: $CONFIG_PATH)"
+
+  local -a cmd=(state "$action" --repo "$REPO_ROOT" --state-dir "$STATE_DIR")
+  if [[ -n "${TEAM_CONFIG_EFFECTIVE:-}" ]]; then
+    cmd+=(--config "$TEAM_CONFIG_EFFECTIVE")
+  fi
+  run_engine "${cmd[@]}"
+}
@@ -209,9 +209,20 @@ DEFAULT_CONFIG: dict[str, Any] = {
     "runtime": {
         "max_start": 0,
         "launch_backend": "tmux",
+        "schedule_policy": "board",
         "auto_no_launch": False,
+        "state_backend": "files",
+        "heartbeat_ttl_seconds": 0,
+        "worktree_removal": "sync",
         "codex_flags": "--full-auto -m gpt-5.3-codex -c model_reasoning_effort=\"medium\"",
     },
+    "logs": {
+        "rotate_bytes": 64 * 1024 * 1024,
+        "rotate_idle_hours": 24,
+        "compression": "gzip",
+        "retention_days": 14,
+        "max_total_bytes": 0,
+    },
     "todo": {
         "id_col": 2,
         "branch_col": 3,
@@ -224,6 +235,18 @@ DEFAULT_CONFIG: dict[str, Any] = {
 }
 
 
+SCHEDULE_POLICIES: tuple[str, ...] = ("board", "critical_path")
+
+STATE_BACKENDS: tuple[str, ...] = ("files", "sqlite")
+
+WORKTREE_REMOVAL_MODES: tuple[str, ...] = ("sync", "trash")
+
+LOG_COMPRESSIONS: tuple[str, ...] = ("gzip", "zstd")
+
+# [logs] keys that are byte/time limits; 0 disables each of them.
+_LOG_LIMIT_KEYS: tuple[str, ...] = ("rotate_bytes", "rotate_idle_hours", "retention_days", "max_total_bytes")
+
+
 class ConfigError(RuntimeError):
     pass
 
@@ -267,9 +290,20 @@ worktree_parent = {q(default_worktree_parent)}
 [runtime]
 max_start = {int(DEFAULT_CONFIG["runtime"]["max_start"])}
 launch_backend = {q(str(DEFAULT_CONFIG["runtime"]["launch_backend"]))}
+schedule_policy = {q(str(DEFAULT_CONFIG["runtime"]["schedule_policy"]))}
 auto_no_launch = {str(bool(DEFAULT_CONFIG["runtime"]["auto_no_launch"])).lower()}
+state_backend = {q(str(DEFAULT_CONFIG["runtime"]["state_backend"]))}
+heartbeat_ttl_seconds = {int(DEFAULT_CONFIG["runtime"]["heartbeat_ttl_seconds"])}
+worktree_removal = {q(str(DEFAULT_CONFIG["runtime"]["worktree_removal"]))}
 codex_flags = {q(str(DEFAULT_CONFIG["runtime"]["codex_flags"]))}
 
+[logs]
+rotate_bytes = {int(DEFAULT_CONFIG["logs"]["rotate_bytes"])}
+rotate_idle_hours = {int(DEFAULT_CONFIG["logs"]["rotate_idle_hours"])}
+compression = {q(str(DEFAULT_CONFIG["logs"]["compression"]))}
+retention_days = {int(DEFAULT_CONFIG["logs"]["retention_days"])}
+max_total_bytes = {int(DEFAULT_CONFIG["logs"]["max_total_bytes"])}
+
 [todo]
 id_col = {int(DEFAULT_CONFIG["todo"]["id_col"])}
 branch_col = {int(DEFAULT_CONFIG["todo"]["branch_col"])}
@@ -353,6 +387,43 @@ def load_config(repo_root: Path, config_path: str | None = None) -> tuple[dict[s
         )
     merged["runtime"]["launch_backend"] = launch_backend
 
+    schedule_policy = str(merged["runtime"].get("schedule_policy", "")).strip().lower()
+    if schedule_policy not in SCHEDULE_POLICIES:
+        raise ConfigError(
+            "runtime.schedule_policy must be one of: " + ", ".join(SCHEDULE_POLICIES)
+        )
+    merged["runtime"]["schedule_policy"] = schedule_policy
+
+    state_backend = str(merged["runtime"].get("state_backend", "")).strip().lower()
+    if state_backend not in STATE_BACKENDS:
+        raise ConfigError(
+            "runtime.state_backend must be one of: " + ", ".join(STATE_BACKENDS)
+        )
+    merged["runtime"]["state_backend"] = state_backend
+
+    heartbeat_ttl = merged["runtime"].get("heartbeat_ttl_seconds", 0)
+    if isinstance(heartbeat_ttl, bool) or not isinstance(heartbeat_ttl, int) or heartbeat_ttl < 0:
+        raise ConfigError("runtime.heartbeat_ttl_seconds must be an integer >= 0 (0 disables)")
+
+    worktree_removal = str(merged["runtime"].get("worktree_removal", "")).strip().lower()
+    if worktree_removal not in WORKTREE_REMOVAL_MODES:
+        raise ConfigError(
+            "runtime.worktree_removal must be one of: " + ", ".join(WORKTREE_REMOVAL_MODES)
+        )
+    merged["runtime"]["worktree_removal"] = worktree_removal
+
+    logs = merged.get("logs")
+    if not isinstance(logs, dict):
+        raise ConfigError("[logs] must be a table")
+    for key in _LOG_LIMIT_KEYS:
+        value = logs.get(key)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ConfigError(f"logs.{key} must be an integer >= 0 (0 disables)")
+    compression = str(logs.get("compression", "")).strip().lower()
+    if compression not in LOG_COMPRESSIONS:
+        raise ConfigError("logs.compression must be one of: " + ", ".join(LOG_COMPRESSIONS))
+    logs["compression"] = compression
+
     config_repo_root = _repo_root_from_config_path(cfg_path, repo_root)
     merged["repo"]["worktree_parent"] = _expand_repo_placeholder(
         str(merged["repo"]["worktree_parent"]), config_repo_root.name
@@ -383,11 +454,16 @@ def resolve_context(
     lock_dir = state_dir / "locks"
     orch_dir = state_dir / "orchestrator"
     updates_file = state_dir / "LATEST_UPDATES.md"
+    state_db = state_dir / "state.db"
 
     runtime = {
         "max_start": int(config["runtime"]["max_start"]),
         "launch_backend": str(config["runtime"]["launch_backend"]),
+        "schedule_policy": str(config["runtime"]["schedule_policy"]),
         "auto_no_launch": bool(config["runtime"]["auto_no_launch"]),
+        "state_backend": str(config["runtime"]["state_backend"]),
+        "heartbeat_ttl_seconds": int(config["runtime"]["heartbeat_ttl_seconds"]),
+        "worktree_removal": str(config["runtime"]["worktree_removal"]),
         "codex_flags": str(config["runtime"]["codex_flags"]),
     }
 
@@ -402,7 +478,9 @@ def resolve_context(
         "lock_dir": str(lock_dir),
         "orch_dir": str(orch_dir),
         "updates_file": str(updates_file),
+        "state_db": str(state_db),
         "worktree_parent": str(worktree_parent),
         "runtime": runtime,
+        "logs": {key: config["logs"][key] for key in (*_LOG_LIMIT_KEYS, "compression")},
         "todo": config["todo"],
     }
@@ -2,13 +2,19 @@
 from __future__ import annotations
 
 import argparse
+import io
 import json
+import os
 import shlex
+import signal
 import subprocess
 import sys
-from datetime import datetime
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 _SCRIPTS_DIR = Path(__file__).resolve().parents[1]
 
@@ -20,17 +26,56 @@ def _read_version() -> str:
     except FileNotFoundError:
         return "dev"
 
-from config import ConfigError, load_config, resolve_context
-from session_parser import SessionBlock, SessionView, parse_session_structured, read_tail_text
+from config import SCHEDULE_POLICIES, ConfigError, load_config, resolve_context
+from engine_daemon import serve as serve_socket
+from engine_daemon import socket_path_for
+from fs_watch import InotifyWatcher, PollingWatcher, ProbeWatcher, WatchTarget, open_watcher
+from log_rotation import LogRotationError, effective_compression, gc_logs, rotate_log
+from proc_table import ProcessTable
+from session_parser import (
+    SESSION_INDEX_EVERY,
+    SessionBlock,
+    SessionIndex,
+    SessionLogTail,
+    SessionParser,
+    SessionView,
+    parse_session_structured,
+)
+from state_cli import RECORD_ACTIONS, add_record_arguments, run_action as run_state_action
 from state_model import (
     classify_records,
+    diff_records,
     is_active_state,
+    legacy_owner_metadata_files,
     load_lock_inventory,
     load_pid_inventory,
+    lookup_task_records,
+    pid_row,
+    record_matches_task,
     summarize,
 )
-from task_spec import evaluate_task_spec, task_spec_abs_path
-from todo_parser import TodoError, build_indexes, deps_ready, make_task_key, parse_todo
+from state_store import UPDATES_HEADER, StateStore, StateStoreError, escape_update_cell, open_state_store
+from task_graph import TaskGraph
+from task_spec import SpecIndex, evaluate_task_spec, spec_index_path, task_spec_abs_path
+from todo_parser import (
+    TodoError,
+    TodoTaskAmbiguous,
+    TodoTaskNotFound,
+    apply_task_statuses,
+    get_task_status,
+    make_task_key,
+    parse_todo,
+    set_task_status,
+)
+from worker_supervisor import Supervisor, signal_running
+from worktree_trash import TrashError, detach_worktree, move_to_trash, reap, trash_dir_for
+
+# Populated only by `engine.py serve`: one-shot invocations always resolve
+# context and parse the board from scratch.
+_CTX_CACHE: dict[tuple[Any, ...], dict[str, Any]] | None = None
+_BOARD_CACHE: dict[str, dict[str, Any]] | None = None
+# Log bytes the worker overlay feeds its session index per refresh tick.
+_SESSION_INDEX_TICK_BYTES = 4 << 20
 
 
 def die(msg: str, code: int = 1) -> None:
@@ -53,12 +98,39 @@ def resolve_repo_root(repo_arg: str | None) -> Path:
     return Path(proc.stdout.strip()).resolve()
 
 
+def _file_signature(path: str | Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 def load_ctx(args: argparse.Namespace) -> tuple[dict[str, Any], dict[str, Any], Path]:
+    cache_key = (args.repo, args.state_dir, args.config, os.getenv("AI_STATE_DIR"))
+    if _CTX_CACHE is not None:
+        cached = _CTX_CACHE.get(cache_key)
+        if (
+            cached is not None
+            and Path(cached["repo_root"]).is_dir()
+            and _file_signature(cached["config_path"]) == cached["config_sig"]
+        ):
+            return cached["config"], cached["ctx"], cached["repo_root"]
+
     repo_root = resolve_repo_root(args.repo)
     config, config_path = load_config(repo_root, args.config)
     ctx = resolve_context(
         repo_root, config, args.state_dir, config_path=config_path)
     ctx["config_path"] = str(config_path)
+
+    if _CTX_CACHE is not None:
+        _CTX_CACHE[cache_key] = {
+            "config": config,
+            "ctx": ctx,
+            "repo_root": repo_root,
+            "config_path": config_path,
+            "config_sig": _file_signature(config_path),
+        }
     return config, ctx, repo_root
 
 
@@ -74,9 +146,14 @@ def to_env(ctx: dict[str, Any]) -> str:
         "LOCK_DIR": ctx["lock_dir"],
         "ORCH_DIR": ctx["orch_dir"],
         "UPDATES_FILE": ctx["updates_file"],
+        "STATE_BACKEND": ctx["runtime"]["state_backend"],
+        "HEARTBEAT_TTL_SECONDS": str(ctx["runtime"]["heartbeat_ttl_seconds"]),
+        "STATE_DB": ctx["state_db"],
         "WORKTREE_PARENT_DIR": ctx["worktree_parent"],
+        "WORKTREE_REMOVAL": ctx["runtime"]["worktree_removal"],
         "MAX_START": str(ctx["runtime"]["max_start"]),
         "LAUNCH_BACKEND": ctx["runtime"]["launch_backend"],
+        "SCHEDULE_POLICY": ctx["runtime"]["schedule_policy"],
         "AUTO_NO_LAUNCH": "1" if ctx["runtime"]["auto_no_launch"] else "0",
         "CODEX_FLAGS": ctx["runtime"]["codex_flags"],
         "CONFIG_PATH": ctx["config_path"],
@@ -126,6 +203,81 @@ def ensure_todo_file(todo_path: str | Path) -> Path:
     return path
 
 
+def _load_board(ctx: dict[str, Any]) -> tuple[list[dict[str, str]], dict[str, str]]:
+    todo_file = ensure_todo_file(ctx["todo_file"])
+    cache_dir = Path(ctx["state_dir"]) / "cache"
+    if _BOARD_CACHE is None:
+        return parse_todo(todo_file, ctx["todo"], cache_dir=cache_dir)
+
+    # Compare raw bytes rather than (mtime, size): a TODO -> DONE flip keeps the
+    # size and can land within one mtime tick.
+    raw = todo_file.read_bytes()
+    schema_key = json.dumps(ctx["todo"], sort_keys=True)
+    cached = _BOARD_CACHE.get(str(todo_file))
+    if cached is not None and cached["raw"] == raw and cached["schema"] == schema_key:
+        return cached["tasks"], cached["gates"]
+
+    tasks, gates = parse_todo(todo_file, ctx["todo"], cache_dir=cache_dir)
+    _BOARD_CACHE[str(todo_file)] = {"raw": raw, "schema": schema_key, "tasks": tasks, "gates": gates}
+    return tasks, gates
+
+
+class StatusSnapshot:
+    # One context resolution per refresh; the board and the pid/lock inventory
+    # are loaded on first use and shared by every payload section.
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.config, self.ctx, self.repo_root = load_ctx(args)
+        self._board: tuple[list[dict[str, str]], dict[str, str]] | None = None
+        self._inventory: tuple[list[dict[str, str]], list[dict[str, str]], list[dict[str, Any]]] | None = None
+        self._spec_index: SpecIndex | None = None
+        self._graph: TaskGraph | None = None
+        self.store = open_state_store(self.ctx)
+
+    def board(self) -> tuple[list[dict[str, str]], dict[str, str]]:
+        if self._board is None:
+            self._board = _load_board(self.ctx)
+        return self._board
+
+    def inventory(self) -> tuple[list[dict[str, str]], list[dict[str, str]], list[dict[str, Any]]]:
+        ttl = self.ctx["runtime"]["heartbeat_ttl_seconds"]
+        if self._inventory is None and self.store is not None:
+            self._inventory = self.store.inventory(heartbeat_ttl=ttl)
+        elif self._inventory is None:
+            lock_rows = load_lock_inventory(self.ctx["lock_dir"])
+            pid_rows = load_pid_inventory(self.ctx["orch_dir"])
+            self._inventory = (pid_rows, lock_rows, classify_records(pid_rows, lock_rows, heartbeat_ttl=ttl))
+        return self._inventory
+
+    def task_records(self, task_id: str, task_branch: str | None = None) -> list[dict[str, Any]]:
+        # One task's classified records without building the whole inventory.
+        # Metadata that does not follow the slug file naming is only found
+        # by the full scan, so an empty lookup falls back to it.
+        ttl = self.ctx["runtime"]["heartbeat_ttl_seconds"]
+        if self._inventory is None:
+            if self.store is not None:
+                records = self.store.task_inventory(task_id, task_branch, heartbeat_ttl=ttl)
+            else:
+                records = lookup_task_records(
+                    self.ctx["orch_dir"], self.ctx["lock_dir"], task_id, task_branch, heartbeat_ttl=ttl
+                )
+            if records:
+                return records
+        _, _, records = self.inventory()
+        return [record for record in records if record_matches_task(record, task_id, task_branch)]
+
+    def spec_index(self) -> SpecIndex:
+        if self._spec_index is None:
+            self._spec_index = SpecIndex(spec_index_path(self.ctx["state_dir"]))
+        return self._spec_index
+
+    def graph(self) -> TaskGraph:
+        if self._graph is None:
+            tasks, gates = self.board()
+            self._graph = TaskGraph(tasks, gates)
+        return self._graph
+
+
 def cmd_paths(args: argparse.Namespace) -> None:
     _, ctx, _ = load_ctx(args)
     if args.format == "env":
@@ -178,16 +330,19 @@ def _active_maps(records: list[dict[str, Any]]) -> tuple[dict[str, dict[str, str
     return active_by_task, conflict_by_task
 
 
-def _ready_payload(args: argparse.Namespace) -> dict[str, Any]:
-    _, ctx, _ = load_ctx(args)
+def _ready_payload(
+    args: argparse.Namespace,
+    snapshot: StatusSnapshot | None = None,
+    with_rank: bool = False,
+) -> dict[str, Any]:
+    snap = snapshot or StatusSnapshot(args)
+    ctx = snap.ctx
 
-    ensure_todo_file(ctx["todo_file"])
-    tasks, gates = parse_todo(ctx["todo_file"], ctx["todo"])
-    task_status = build_indexes(tasks)
+    tasks, _ = snap.board()
+    graph = snap.graph()
 
-    lock_rows = load_lock_inventory(ctx["lock_dir"])
-    pid_rows = load_pid_inventory(ctx["orch_dir"])
-    records = classify_records(pid_rows, lock_rows)
+    _, lock_rows, records = snap.inventory()
+    spec_index = snap.spec_index()
 
     active_by_task, conflict_by_task = _active_maps(records)
 
@@ -204,13 +359,19 @@ def _ready_payload(args: argparse.Namespace) -> dict[str, Any]:
 
     max_start = args.max_start if args.max_start is not None else int(
         ctx["runtime"]["max_start"])
+    schedule_policy = getattr(args, "policy", None) or ctx["runtime"]["schedule_policy"]
 
-    ready_tasks: list[dict[str, str]] = []
+    candidates = [task for task in tasks if task["status"] == "TODO"]
+    metrics: dict[str, tuple[int, int]] | None = None
+    if schedule_policy == "critical_path" or with_rank:
+        metrics = graph.rank_metrics()
+    if schedule_policy == "critical_path":
+        candidates = graph.schedule_order(candidates)
+
+    ready_tasks: list[dict[str, Any]] = []
     excluded_tasks: list[dict[str, str]] = []
 
-    for task in tasks:
-        if task["status"] != "TODO":
-            continue
+    for task in candidates:
 
         task_id = task["id"]
         task_branch = str(task.get("branch") or "")
@@ -251,7 +412,7 @@ def _ready_payload(args: argparse.Namespace) -> dict[str, Any]:
             )
             continue
 
-        spec = evaluate_task_spec(
+        spec = spec_index.evaluate(
             ctx["repo_root"], task_id, spec_dir=ctx["spec_dir"], task_branch=task_branch
         )
         if not spec["exists"]:
@@ -285,7 +446,8 @@ def _ready_payload(args: argparse.Namespace) -> dict[str, Any]:
             )
             continue
 
-        if not deps_ready(task["deps"], task_status, gates, task_branch=task_branch):
+        deps_reason, blocked_by = graph.blocked(task_key)
+        if deps_reason:
             excluded_tasks.append(
                 {
                     "task_id": task_id,
@@ -295,40 +457,48 @@ def _ready_payload(args: argparse.Namespace) -> dict[str, Any]:
                     "scope": scope,
                     "deps": task["deps"],
                     "status": task["status"],
-                    "reason": "deps_not_ready",
+                    "reason": deps_reason,
                     "source": "scheduler",
+                    "blocked_by": ",".join(blocked_by),
                 }
             )
             continue
 
-        ready_tasks.append(
-            {
-                "task_id": task_id,
-                "task_branch": task_branch,
-                "task_key": task_key,
-                "base_branch": task_base_branch,
-                "title": task["title"],
-                "scope": scope,
-                "deps": task["deps"],
-                "status": task["status"],
-                "spec_rel_path": str(spec.get("spec_rel_path") or ""),
-                "spec_path": str(spec.get("spec_path") or ""),
-                "goal_summary": str(spec.get("goal_summary") or ""),
-                "in_scope_summary": str(spec.get("in_scope_summary") or ""),
-                "acceptance_summary": str(spec.get("acceptance_summary") or ""),
-                "subtasks_summary": str(spec.get("subtasks_summary") or ""),
-            }
-        )
+        ready_task: dict[str, Any] = {
+            "task_id": task_id,
+            "task_branch": task_branch,
+            "task_key": task_key,
+            "base_branch": task_base_branch,
+            "title": task["title"],
+            "scope": scope,
+            "deps": task["deps"],
+            "status": task["status"],
+            "spec_rel_path": str(spec.get("spec_rel_path") or ""),
+            "spec_path": str(spec.get("spec_path") or ""),
+            "goal_summary": str(spec.get("goal_summary") or ""),
+            "in_scope_summary": str(spec.get("in_scope_summary") or ""),
+            "acceptance_summary": str(spec.get("acceptance_summary") or ""),
+            "subtasks_summary": str(spec.get("subtasks_summary") or ""),
+        }
+        if metrics is not None:
+            critical_path, fanout = metrics.get(task_key, (1, 0))
+            ready_task.update(
+                {"rank": len(ready_tasks) + 1, "critical_path": critical_path, "fanout": fanout}
+            )
+        ready_tasks.append(ready_task)
 
         if max_start > 0 and len(ready_tasks) >= max_start:
             break
 
+    spec_index.save()
+
     return {
         "trigger": args.trigger,
         "repo_root": ctx["repo_root"],
         "spec_dir": ctx["spec_dir"],
         "state_dir": ctx["state_dir"],
         "max_start": max_start,
+        "schedule_policy": schedule_policy,
         "running_locks": running_locks,
         "ready_tasks": ready_tasks,
         "excluded_tasks": excluded_tasks,
@@ -336,7 +506,20 @@ def _ready_payload(args: argparse.Namespace) -> dict[str, Any]:
 
 
 def cmd_ready(args: argparse.Namespace) -> None:
-    payload = _ready_payload(args)
+    payload = _ready_payload(args, with_rank=args.format == "rank")
+
+    if args.format == "rank":
+        print(f"Schedule policy: {payload['schedule_policy']}")
+        for task in payload["ready_tasks"]:
+            task_label = str(task.get("task_id", ""))
+            if task.get("task_branch"):
+                task_label = f"{task['task_branch']}:{task_label}"
+            print(
+                f"  {task['rank']:>3}. {task_label} "
+                f"critical_path={task['critical_path']} fanout={task['fanout']} "
+                f"| {task.get('title', '')}"
+            )
+        return
 
     if args.format == "tsv":
         placeholder = "__EMPTY__"
@@ -368,12 +551,12 @@ def cmd_ready(args: argparse.Namespace) -> None:
     print(json.dumps(payload, ensure_ascii=False, indent=2))
 
 
-def _inventory_payload(args: argparse.Namespace) -> dict[str, Any]:
-    _, ctx, repo_root = load_ctx(args)
+def _inventory_payload(args: argparse.Namespace, snapshot: StatusSnapshot | None = None) -> dict[str, Any]:
+    snap = snapshot or StatusSnapshot(args)
+    ctx = snap.ctx
+    repo_root = snap.repo_root
 
-    pid_rows = load_pid_inventory(ctx["orch_dir"])
-    lock_rows = load_lock_inventory(ctx["lock_dir"])
-    records = classify_records(pid_rows, lock_rows)
+    _, _, records = snap.inventory()
 
     return {
         "repo_root": str(repo_root),
@@ -386,7 +569,81 @@ def _inventory_payload(args: argparse.Namespace) -> dict[str, Any]:
     }
 
 
+def _inventory_event(
+    before: dict[str, Any] | None,
+    after: dict[str, Any] | None,
+    ts: str,
+) -> dict[str, Any]:
+    record = after if after is not None else before
+    assert record is not None
+    if before is None:
+        event = "added"
+    elif after is None:
+        event = "removed"
+    else:
+        event = "transition"
+    return {
+        "ts": ts,
+        "event": event,
+        "key": record["key"],
+        "task_id": record["task_id"],
+        "task_branch": record.get("task_branch") or "",
+        "from": before["state"] if before is not None else None,
+        "to": after["state"] if after is not None else None,
+        "stale": bool(after and after["stale"]),
+        "record": record,
+    }
+
+
+def _inventory_watch(args: argparse.Namespace) -> None:
+    # NDJSON: one "snapshot" line, then one line per record whose state
+    # changed. Lock/pid (or state.db) changes trigger a rescan; between them
+    # the timer only re-classifies the rows already loaded, which re-probes
+    # pids and worktrees without listing any directory.
+    watcher = _open_status_watcher(args, ("locks", "workers", "store"))
+    interval = max(0.1, args.interval)
+
+    def emit(item: dict[str, Any]) -> None:
+        sys.stdout.write(json.dumps(item, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+    def now() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    snapshot = StatusSnapshot(args)
+    heartbeat_ttl = snapshot.ctx["runtime"]["heartbeat_ttl_seconds"]
+    pid_rows, lock_rows, records = snapshot.inventory()
+    emit({"ts": now(), "event": "snapshot", "workers": records, "summary": summarize(records)})
+    previous = {row["key"]: row for row in records}
+    try:
+        while True:
+            sources = watcher.wait(interval)
+            if sources:
+                # Writers touch the lock and pid in a row; fold them together.
+                time.sleep(0.1)
+                watcher.wait(0)
+                pid_rows, lock_rows, records = StatusSnapshot(args).inventory()
+            else:
+                records = classify_records(pid_rows, lock_rows, heartbeat_ttl=heartbeat_ttl)
+            changes = diff_records(previous, records)
+            if not changes:
+                continue
+            ts = now()
+            for before, after in changes:
+                emit(_inventory_event(before, after, ts))
+            previous = {row["key"]: row for row in records}
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        watcher.close()
+
+
 def cmd_inventory(args: argparse.Namespace) -> None:
+    if args.watch:
+        if args.format != "json":
+            die("inventory --watch emits NDJSON; --format tsv is not supported")
+        _inventory_watch(args)
+        return
     payload = _inventory_payload(args)
     if args.format == "tsv":
         for row in payload["workers"]:
@@ -415,11 +672,10 @@ def cmd_inventory(args: argparse.Namespace) -> None:
     print(json.dumps(payload, ensure_ascii=False, indent=2))
 
 
-def _task_board_payload(args: argparse.Namespace) -> dict[str, Any]:
-    _, ctx, _ = load_ctx(args)
+def _task_board_payload(args: argparse.Namespace, snapshot: StatusSnapshot | None = None) -> dict[str, Any]:
+    snap = snapshot or StatusSnapshot(args)
 
-    ensure_todo_file(ctx["todo_file"])
-    tasks, _ = parse_todo(ctx["todo_file"], ctx["todo"])
+    tasks, _ = snap.board()
 
     rows: list[dict[str, str]] = []
     status_counts: dict[str, int] = {}
@@ -480,33 +736,46 @@ def _parse_markdown_row(line: str) -> list[str] | None:
     return cells
 
 
-def _updates_payload(args: argparse.Namespace, limit: int = 200) -> dict[str, Any]:
-    _, ctx, _ = load_ctx(args)
-    updates_file = Path(ctx["updates_file"])
+def _read_updates_file(updates_file: Path) -> list[dict[str, str]]:
     entries: list[dict[str, str]] = []
-
-    if updates_file.exists():
-        try:
-            lines = updates_file.read_text(encoding="utf-8").splitlines()
-        except OSError:
-            lines = []
-        for line in lines:
-            cells = _parse_markdown_row(line)
-            if not cells or len(cells) < 5:
-                continue
-            if cells[0].lower().startswith("timestamp"):
-                continue
-            if all(not cell or set(cell) <= {"-"} for cell in cells):
-                continue
-            entries.append(
-                {
-                    "timestamp": cells[0],
-                    "source": cells[1],
-                    "task_id": cells[2],
-                    "status": cells[3],
-                    "summary": cells[4],
-                }
-            )
+    if not updates_file.exists():
+        return entries
+    try:
+        lines = updates_file.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        lines = []
+    for line in lines:
+        cells = _parse_markdown_row(line)
+        if not cells or len(cells) < 5:
+            continue
+        if cells[0].lower().startswith("timestamp"):
+            continue
+        if all(not cell or set(cell) <= {"-"} for cell in cells):
+            continue
+        entries.append(
+            {
+                "timestamp": cells[0],
+                "source": cells[1],
+                "task_id": cells[2],
+                "status": cells[3],
+                "summary": cells[4],
+            }
+        )
+    return entries
+
+
+def _updates_payload(
+    args: argparse.Namespace,
+    limit: int = 200,
+    snapshot: StatusSnapshot | None = None,
+) -> dict[str, Any]:
+    snap = snapshot or StatusSnapshot(args)
+    if snap.store is not None:
+        updates_file = snap.store.path
+        entries = snap.store.updates(limit)
+    else:
+        updates_file = Path(snap.ctx["updates_file"])
+        entries = _read_updates_file(updates_file)
 
     if limit > 0:
         entries = entries[-limit:]
@@ -521,35 +790,65 @@ def _updates_payload(args: argparse.Namespace, limit: int = 200) -> dict[str, An
     }
 
 
-def _status_payload(args: argparse.Namespace) -> dict[str, Any]:
-    ready_payload = _ready_payload(args)
-    inventory_payload = _inventory_payload(args)
-    task_board_payload = _task_board_payload(args)
-    updates_payload = _updates_payload(args)
-
-    counts = inventory_payload.get("summary", {}).get("state_counts", {})
-    stale_total = sum(
-        counts.get(k, 0)
-        for k in ["LOCK_STALE", "FINALIZING_EXITED", "ORPHAN_LOCK", "ORPHAN_PID", "MISSING_WORKTREE"]
-    )
-    active_total = sum(counts.get(k, 0)
-                       for k in ["RUNNING", "LOCKED", "FINALIZING"])
-
-    return {
-        "repo_root": ready_payload["repo_root"],
-        "spec_dir": ready_payload.get("spec_dir", ""),
-        "state_dir": ready_payload["state_dir"],
-        "scheduler": {
+STATUS_SECTIONS = ("scheduler", "runtime", "task_board", "updates")
+
+# Which payload sections depend on each watched input; see
+# _status_watch_targets().
+_STATUS_SECTIONS_BY_SOURCE: dict[str, tuple[str, ...]] = {
+    "todo": ("scheduler", "task_board"),
+    "specs": ("scheduler",),
+    "locks": ("scheduler", "runtime"),
+    "workers": ("scheduler", "runtime"),
+    "updates": ("updates",),
+    "store": ("scheduler", "runtime", "updates"),
+    "config": STATUS_SECTIONS,
+}
+
+
+def _status_payload(
+    args: argparse.Namespace,
+    previous: dict[str, Any] | None = None,
+    sections: Iterable[str] | None = None,
+) -> dict[str, Any]:
+    # With `previous`, only `sections` are rebuilt and the rest is carried
+    # over as-is, so an updates-log append does not re-parse the board.
+    wanted = set(STATUS_SECTIONS if previous is None or sections is None else sections)
+    payload: dict[str, Any] = dict(previous or {})
+    snapshot = StatusSnapshot(args)
+
+    if "scheduler" in wanted:
+        ready_payload = _ready_payload(args, snapshot)
+        payload["repo_root"] = ready_payload["repo_root"]
+        payload["spec_dir"] = ready_payload.get("spec_dir", "")
+        payload["state_dir"] = ready_payload["state_dir"]
+        payload["scheduler"] = {
             "trigger": ready_payload["trigger"],
             "max_start": ready_payload["max_start"],
+            "schedule_policy": ready_payload["schedule_policy"],
             "ready_tasks": ready_payload["ready_tasks"],
             "excluded_tasks": ready_payload["excluded_tasks"],
             "summary": {
                 "ready": len(ready_payload["ready_tasks"]),
                 "excluded": len(ready_payload["excluded_tasks"]),
             },
-        },
-        "runtime": {
+        }
+        payload["coordination"] = {
+            "active_locks": ready_payload["running_locks"],
+            "summary": {
+                "locks": len(ready_payload["running_locks"]),
+            },
+        }
+
+    if "runtime" in wanted:
+        inventory_payload = _inventory_payload(args, snapshot)
+        counts = inventory_payload.get("summary", {}).get("state_counts", {})
+        stale_total = sum(
+            counts.get(k, 0)
+            for k in ["LOCK_STALE", "HEARTBEAT_STALE", "FINALIZING_EXITED", "ORPHAN_LOCK", "ORPHAN_PID", "MISSING_WORKTREE"]
+        )
+        active_total = sum(counts.get(k, 0)
+                           for k in ["RUNNING", "LOCKED", "FINALIZING"])
+        payload["runtime"] = {
             "summary": {
                 "total": inventory_payload.get("summary", {}).get("total", 0),
                 "active": active_total,
@@ -557,16 +856,52 @@ def _status_payload(args: argparse.Namespace) -> dict[str, Any]:
                 "state_counts": counts,
             },
             "workers": inventory_payload.get("workers", []),
-        },
-        "coordination": {
-            "active_locks": ready_payload["running_locks"],
-            "summary": {
-                "locks": len(ready_payload["running_locks"]),
-            },
-        },
-        "task_board": task_board_payload,
-        "updates": updates_payload,
-    }
+        }
+
+    if "task_board" in wanted:
+        payload["task_board"] = _task_board_payload(args, snapshot)
+
+    if "updates" in wanted:
+        payload["updates"] = _updates_payload(args, snapshot=snapshot)
+
+    return payload
+
+
+def _status_watch_targets(args: argparse.Namespace) -> list[WatchTarget]:
+    # The SQLite store has no file targets; _open_status_watcher() polls its
+    # change counter instead.
+    _, ctx, _ = load_ctx(args)
+    targets = [
+        WatchTarget("todo", Path(ctx["todo_file"])),
+        WatchTarget("specs", Path(ctx["spec_dir"]), "tree", ".md"),
+    ]
+    if ctx["runtime"]["state_backend"] != "sqlite":
+        targets.extend(
+            [
+                WatchTarget("locks", Path(ctx["lock_dir"]), "dir", ".lock"),
+                WatchTarget("workers", Path(ctx["orch_dir"]), "dir", ".pid"),
+                WatchTarget("updates", Path(ctx["updates_file"])),
+            ]
+        )
+    targets.append(WatchTarget("config", Path(ctx["config_path"])))
+    return targets
+
+
+def _open_status_watcher(
+    args: argparse.Namespace,
+    tags: Iterable[str] | None = None,
+) -> InotifyWatcher | PollingWatcher | ProbeWatcher:
+    # Watches the status inputs (only `tags`, when given). Every connection
+    # to state.db rewrites its WAL files, the dashboard's own reads included,
+    # so the "store" source is the store's change counter, polled once a
+    # second, and never a file event.
+    _, ctx, _ = load_ctx(args)
+    wanted = set(_STATUS_SECTIONS_BY_SOURCE if tags is None else tags)
+    watcher = open_watcher([target for target in _status_watch_targets(args) if target.tag in wanted])
+    store = open_state_store(ctx)
+    if store is not None and "store" in wanted:
+        return ProbeWatcher(watcher, "store", store.change_counter)
+    return watcher
 
 
 def _render_status_text(payload: dict[str, Any]) -> str:
@@ -583,6 +918,7 @@ def _render_status_text(payload: dict[str, Any]) -> str:
     lines.append(f"State dir: {payload.get('state_dir', '')}")
     lines.append(f"Trigger: {scheduler.get('trigger', 'manual')}")
     lines.append(f"Max start: {scheduler.get('max_start', 0)}")
+    lines.append(f"Schedule policy: {scheduler.get('schedule_policy', 'board')}")
     lines.append("")
 
     lines.append(
@@ -602,10 +938,10 @@ def _render_status_text(payload: dict[str, Any]) -> str:
         task_branch = str(item.get("task_branch", "")).strip()
         if task_branch:
             task_label = f"{task_branch}:{task_label}"
-        lines.append(
-            f"  [EXCLUDED] {task_label} "
-            f"reason={item.get('reason', '')} source={item.get('source', '')}"
-        )
+        line = f"  [EXCLUDED] {task_label} reason={item.get('reason', '')} source={item.get('source', '')}"
+        if item.get("blocked_by"):
+            line += f" blocked_by={item['blocked_by']}"
+        lines.append(line)
 
     lines.append("")
     lines.append(
@@ -651,7 +987,11 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
     except ImportError:
         Markdown = None  # type: ignore[assignment]
 
-    refresh_seconds = 2.0
+    # Board/spec/lock/pid/updates changes arrive through the file watcher;
+    # the timer only catches workers whose process died without touching
+    # any watched file.
+    liveness_seconds = 5.0
+    watch_debounce_seconds = 0.1
 
     class ActionConfirmModal(ModalScreen[bool]):
         CSS = """
@@ -862,6 +1202,8 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
             ("pagedown", "scroll_page_down", "Page Down"),
             ("home", "scroll_top", "Top"),
             ("end", "scroll_bottom", "Bottom"),
+            ("left_square_bracket", "history_older", "Older Page"),
+            ("right_square_bracket", "history_newer", "Newer Page"),
         ]
 
         def __init__(self, worker: dict[str, Any]) -> None:
@@ -873,6 +1215,14 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
             self.launch_backend = str(worker.get("launch_backend") or "").strip().lower()
             self.tmux_session = str(worker.get("tmux_session") or "").strip()
             self.log_file = str(worker.get("log_file") or "").strip()
+            self.log_tail = SessionLogTail(self.log_file) if self.log_file and self.log_file != "N/A" else None
+            self.session_parser = SessionParser(max_blocks=220)
+            self.session_generation = 0
+            # Scroll-back beyond the tail window goes through the log's sidecar
+            # index; history_page is None while following the live tail.
+            self.session_index = SessionIndex(self.log_file) if self.log_tail is not None else None
+            self.history_page: int | None = None
+            self.history_view: SessionView | None = None
             self.view_mode = "structured"
             self.auto_scroll_enabled = True
             self.last_parse_source = "transcript"
@@ -896,6 +1246,9 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
             log_display = self.log_file or "N/A"
             view_display = self.view_mode
             auto_scroll_display = "ON" if self.auto_scroll_enabled else "OFF"
+            history_display = "live ([ older)"
+            if self.history_page is not None and self.session_index is not None:
+                history_display = f"page {self.history_page + 1}/{self.session_index.page_count()} ([ older, ] newer)"
             return (
                 f"Scope: {self.scope}\n"
                 f"Task: {self.task_id}\n"
@@ -904,6 +1257,7 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
                 f"Session: {session_display}\n"
                 f"Log: {log_display}\n"
                 f"View: {view_display}\n"
+                f"History: {history_display}\n"
                 f"Auto-scroll: {auto_scroll_display}"
             )
 
@@ -1310,19 +1664,52 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
                 content = "(No output yet)"
 
             self._set_raw_body(content)
+            if self.session_index is not None:
+                # Catch the history index up a bounded slice per tick, so the
+                # first `[` on a long session does not index it all at once.
+                try:
+                    self.session_index.update(max_bytes=_SESSION_INDEX_TICK_BYTES)
+                except OSError:
+                    pass
             if self.view_mode == "raw":
                 self.last_parse_source = "ansi"
                 self.last_parsed_events = 0
                 self._set_meta()
                 return
 
-            log_tail = read_tail_text(self.log_file) if self.log_file and self.log_file != "N/A" else ""
-            structured = parse_session_structured(
-                content,
-                log_tail=log_tail,
-                max_blocks=220,
-                max_lines=1200,
-            )
+            if self.history_page is not None and self.session_index is not None:
+                # A history page is a fixed slice of the log; render it once.
+                if self.history_view is None:
+                    self.history_view = self.session_index.render_page(self.history_page)
+                    self.last_parse_source = "index"
+                    self.last_parsed_events = self.history_view.parsed_events
+                    self._set_structured_body(self.history_view)
+                self._set_meta()
+                return
+
+            # The tail only decodes lines appended since the previous refresh
+            # and the parser only folds those new events into its blocks.
+            structured: SessionView | None = None
+            if self.log_tail is not None:
+                new_events = self.log_tail.poll()
+                if self.log_tail.generation != self.session_generation:
+                    # Truncated or rotated log: poll() returned the new window.
+                    self.session_parser = SessionParser(max_blocks=220)
+                    self.session_generation = self.log_tail.generation
+                self.session_parser.ingest(new_events)
+                blocks = self.session_parser.view(220)
+                if blocks:
+                    structured = SessionView(
+                        source="jsonl", parsed_events=self.session_parser.events_seen, blocks=blocks
+                    )
+            if structured is None:
+                structured = parse_session_structured(
+                    content,
+                    log_tail=self.log_tail.text() if self.log_tail is not None else "",
+                    max_blocks=220,
+                    max_lines=1200,
+                    events=[],
+                )
             self.last_parse_source = structured.source
             self.last_parsed_events = structured.parsed_events
             self._set_structured_body(structured)
@@ -1335,6 +1722,26 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
                 self._scroll_to_latest()
             self._set_meta()
 
+        def _show_history_page(self, page: int | None) -> None:
+            self.history_page = page
+            self.history_view = None
+            self._refresh_body()
+
+        def action_history_older(self) -> None:
+            if self.session_index is None:
+                return
+            pages = self.session_index.page_count()
+            if pages == 0:
+                return
+            current = pages if self.history_page is None else self.history_page
+            self._show_history_page(max(0, current - 1))
+
+        def action_history_newer(self) -> None:
+            if self.session_index is None or self.history_page is None:
+                return
+            page = self.history_page + 1
+            self._show_history_page(page if page < self.session_index.page_count() else None)
+
         def action_scroll_up(self) -> None:
             self._active_scroll().scroll_relative(y=-3, animate=False)
 
@@ -1470,7 +1877,10 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
         def __init__(self) -> None:
             super().__init__()
             self.current_payload: dict[str, Any] = initial_payload
-            self.last_payload_signature = ""
+            self.pending_sections: set[str] = set()
+            self.watcher: Any = None
+            self.watch_thread: threading.Thread | None = None
+            self.watch_stop = threading.Event()
             self.last_error: str = ""
             self.last_action: str = ""
             self.refresh_in_flight = False
@@ -1608,10 +2018,6 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
                     return task_id, branch.strip()
             return text, ""
 
-        @staticmethod
-        def _payload_signature(payload: dict[str, Any]) -> str:
-            return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
-
         @staticmethod
         def _ratio_bar(segments: list[tuple[str, int, str]], width: int = 32) -> Text:
             total = sum(max(0, count) for _, count, _ in segments)
@@ -1855,7 +2261,7 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
                     ]
                 )
             meta_right.update(Group(*palette_lines))
-            meta.border_subtitle = f"{refresh_seconds:.0f}s interval"
+            meta.border_subtitle = self._refresh_label()
 
             ready_table = self.query_one("#ready_table", DataTable)
             ready_rows = []
@@ -1892,6 +2298,7 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
             task_table = self.query_one("#task_table", DataTable)
             task_rows: list[tuple[Any, ...]] = []
             repo_root_path = Path(repo_root) if repo_root else None
+            spec_dir_raw = str(payload.get("spec_dir", "")).strip() or ".codex-tasks/planning/specs"
             for item in reversed(task_items):
                 task_id = str(item.get("task_id", ""))
                 task_branch = str(item.get("task_branch", ""))
@@ -1905,10 +2312,13 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
                     item.get("status", ""))
                 spec_mark = "-"
                 if repo_root_path is not None and task_id:
+                    # Existence only: the ready pass already validated specs
+                    # through the spec index, so avoid re-reading every file.
                     try:
-                        spec_exists = bool(evaluate_task_spec(
-                            repo_root_path, task_id, task_branch=task_branch).get("exists"))
-                    except Exception:
+                        spec_exists = task_spec_abs_path(
+                            repo_root_path, task_id, spec_dir=spec_dir_raw, task_branch=task_branch
+                        ).is_file()
+                    except OSError:
                         spec_exists = False
                     spec_mark = "O" if spec_exists else "-"
                 task_rows.append(
@@ -1939,7 +2349,7 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
 
             subtitle = (
                 f"Press q to quit | Panel: {active_label} (1=Task, 2=Log) | "
-                f"Auto-refresh: {refresh_seconds:.0f}s"
+                f"Auto-refresh: {self._refresh_label()}"
             )
             if self.active_bottom_tab == "tasks_tab":
                 subtitle = f"{subtitle} | Enter: open task spec"
@@ -2004,21 +2414,38 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
             self._render_payload()
             self._refresh_payload()
 
-        def _refresh_payload(self) -> None:
+        def _refresh_label(self) -> str:
+            if isinstance(getattr(self.watcher, "inner", self.watcher), InotifyWatcher):
+                return "on change"
+            if self.watcher is not None:
+                return "polling 1s"
+            return "starting"
+
+        def _refresh_payload(self, sections: Iterable[str] | None = None) -> None:
+            requested = set(STATUS_SECTIONS if sections is None else sections)
             if self.refresh_in_flight:
+                self.pending_sections |= requested
                 return
             self.refresh_in_flight = True
             previous_error = self.last_error
             try:
-                next_payload = _status_payload(args)
-                next_signature = self._payload_signature(next_payload)
-                data_changed = next_signature != self.last_payload_signature
-                had_error = bool(previous_error)
-                self.current_payload = next_payload
-                self.last_payload_signature = next_signature
-                self.last_error = ""
-                if data_changed or had_error:
-                    self._render_payload()
+                while requested:
+                    next_payload = _status_payload(args, self.current_payload, requested)
+                    # Plain dict comparison of the rebuilt sections replaces
+                    # serializing the whole payload on every tick.
+                    data_changed = any(
+                        next_payload.get(section) != self.current_payload.get(section)
+                        for section in requested
+                    )
+                    forced = "specs" in self.pending_sections
+                    self.pending_sections.discard("specs")
+                    self.current_payload = next_payload
+                    self.last_error = ""
+                    if data_changed or previous_error or forced:
+                        self._render_payload()
+                    previous_error = ""
+                    requested = self.pending_sections & set(STATUS_SECTIONS)
+                    self.pending_sections -= requested
             except SystemExit as err:
                 next_error = str(err) or "status refresh failed"
                 if next_error != self.last_error:
@@ -2032,6 +2459,64 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
             finally:
                 self.refresh_in_flight = False
 
+        def _on_watch_change(self, sources: set[str]) -> None:
+            sections: set[str] = set()
+            for source in sources:
+                sections.update(_STATUS_SECTIONS_BY_SOURCE.get(source, ()))
+            if "specs" in sources:
+                # The task table's Spec column is rendered from disk.
+                self.pending_sections.add("specs")
+            self._refresh_payload(sections)
+
+        def _check_liveness(self) -> None:
+            # Only probes pids already on screen; an idle board costs nothing.
+            workers = self.current_payload.get("runtime", {}).get("workers", [])
+            pids = [str(w.get("pid") or "") for w in workers if w.get("pid_file")]
+            processes = ProcessTable.snapshot(pids)
+            for worker in workers:
+                pid = str(worker.get("pid") or "")
+                if not pid.isdigit() or not worker.get("pid_file"):
+                    continue
+                alive = processes.alive(pid, worker.get("proc_start") or "")
+                if alive != bool(worker.get("pid_alive")):
+                    self._refresh_payload(("scheduler", "runtime"))
+                    return
+
+        def _watch_loop(self) -> None:
+            watcher = self.watcher
+            while not self.watch_stop.is_set():
+                try:
+                    sources = watcher.wait(5.0)
+                    if not sources:
+                        continue
+                    # Writers usually touch several files in a row (lock,
+                    # pid, board, updates); fold them into one refresh.
+                    time.sleep(watch_debounce_seconds)
+                    sources |= watcher.wait(0)
+                except OSError:
+                    return
+                if self.watch_stop.is_set():
+                    return
+                try:
+                    self.call_from_thread(self._on_watch_change, sources)
+                except RuntimeError:
+                    return
+
+        def _start_watcher(self) -> None:
+            try:
+                self.watcher = _open_status_watcher(args)
+            except (OSError, SystemExit) as exc:
+                self.last_error = f"file watcher unavailable: {exc}"
+                self.set_interval(2.0, self._refresh_payload)
+                return
+            self.watch_thread = threading.Thread(
+                target=self._watch_loop, name="status-watch", daemon=True)
+            self.watch_thread.start()
+
+        def on_unmount(self) -> None:
+            # The watch thread notices within one wait() timeout and exits.
+            self.watch_stop.set()
+
         def _selected_task_ref(self) -> tuple[str, str]:
             task_table = self.query_one("#task_table", DataTable)
             if not task_table.is_valid_row_index(task_table.cursor_row):
@@ -2175,10 +2660,9 @@ def _run_status_tui(args: argparse.Namespace, initial_payload: dict[str, Any]) -
             log_table.add_columns("Timestamp (UTC)", "Source",
                                   "Task", "Status", "Summary")
 
-            self.last_payload_signature = self._payload_signature(
-                self.current_payload)
+            self._start_watcher()
             self._render_payload()
-            self.set_interval(refresh_seconds, self._refresh_payload)
+            self.set_interval(liveness_seconds, self._check_liveness)
 
         def action_show_tasks(self) -> None:
             tabs = self.query_one("#bottom_tabs", TabbedContent)
@@ -2282,16 +2766,13 @@ def cmd_status(args: argparse.Namespace) -> None:
 
 
 def cmd_select_stop(args: argparse.Namespace) -> None:
-    payload = _inventory_payload(args)
-    workers = payload["workers"]
-
     selected: list[dict[str, Any]] = []
     if args.task:
-        selected = [w for w in workers if w["task_id"] == args.task]
-        if args.branch is not None:
-            selected = [w for w in selected if str(w.get("task_branch") or "") == args.branch]
+        # Keyed lookup: `task auto-cleanup-exit` runs this once per exiting
+        # worker, so it must not scale with the number of workers.
+        selected = StatusSnapshot(args).task_records(args.task, args.branch)
     elif args.all:
-        selected = workers
+        selected = _inventory_payload(args)["workers"]
 
     if args.format == "tsv":
         for row in selected:
@@ -2349,6 +2830,514 @@ def cmd_select_stale(args: argparse.Namespace) -> None:
     print(json.dumps({"workers": selected}, ensure_ascii=False, indent=2))
 
 
+# Column order of active_pids.tsv.
+PID_REGISTRY_FIELDS = (
+    "pid",
+    "alive",
+    "task_id",
+    "scope",
+    "started_at",
+    "launch_backend",
+    "launch_label",
+    "tmux_session",
+    "worktree",
+)
+
+
+def _pid_registry_rows(snapshot: StatusSnapshot) -> list[dict[str, str]]:
+    # One row per pid record with a numeric pid, in path order, probed
+    # against a single ProcessTable snapshot.
+    if snapshot.store is not None:
+        pid_rows = [pid_row(path, meta) for path, meta in snapshot.store.records("workers")]
+    else:
+        pid_rows = load_pid_inventory(snapshot.ctx["orch_dir"])
+    pid_rows = [row for row in pid_rows if row["pid"].isdigit()]
+    processes = ProcessTable.snapshot(row["pid"] for row in pid_rows)
+    return [
+        {
+            **{field: str(row.get(field) or "") for field in PID_REGISTRY_FIELDS},
+            "alive": "1" if processes.alive(row["pid"], row["proc_start"]) else "0",
+        }
+        for row in pid_rows
+    ]
+
+
+def _render_pid_registry(rows: list[dict[str, str]], fmt: str) -> bytes:
+    if fmt == "json":
+        return (json.dumps({"workers": rows}, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+    if fmt == "nul":
+        # Binary-safe: every field NUL-terminated, len(PID_REGISTRY_FIELDS)
+        # fields per row, values passed through untouched.
+        return b"".join(
+            row[field].encode("utf-8", "surrogateescape") + b"\0" for row in rows for field in PID_REGISTRY_FIELDS
+        )
+    lines = [
+        "\t".join(row[field].replace("\t", " ").replace("\n", " ") for field in PID_REGISTRY_FIELDS)
+        for row in rows
+    ]
+    return "".join(line + "\n" for line in lines).encode("utf-8")
+
+
+def cmd_pid_registry(args: argparse.Namespace) -> None:
+    # Replaces the per-field shell rebuild of active_pids.tsv: one pass over
+    # the pid records, written atomically when --output is given.
+    rows = _pid_registry_rows(StatusSnapshot(args))
+    data = _render_pid_registry(rows, args.format)
+    if not args.output:
+        buffer = getattr(sys.stdout, "buffer", None)
+        if buffer is None:
+            # Daemon requests capture stdout as text.
+            sys.stdout.write(data.decode("utf-8", "replace"))
+        else:
+            sys.stdout.flush()
+            buffer.write(data)
+        return
+
+    target = Path(args.output)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{target.name}.", dir=str(target.parent))
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    alive = sum(1 for row in rows if row["alive"] == "1")
+    print(f"Registry entries: total={len(rows)} alive={alive}")
+
+
+def cmd_trash(args: argparse.Namespace) -> None:
+    if args.trash_dir:
+        trash_dir = Path(args.trash_dir)
+    else:
+        _, ctx, _ = load_ctx(args)
+        trash_dir = trash_dir_for(ctx["worktree_parent"])
+
+    if args.action in ("detach", "move") and not args.target:
+        die(f"trash {args.action} requires a path")
+    try:
+        if args.action == "detach":
+            print(detach_worktree(args.target, trash_dir))
+        elif args.action == "move":
+            print(move_to_trash(args.target, trash_dir))
+        else:
+            reaped = reap(trash_dir, batch=args.batch, pause=args.pause)
+            if reaped is None:
+                print(f"Trash reaper already running: {trash_dir}")
+            else:
+                print(f"Trash reaped: entries={reaped} dir={trash_dir}")
+    except (OSError, TrashError) as exc:
+        die(str(exc))
+
+
+def _recorded_log_files(ctx: dict[str, Any]) -> list[str]:
+    # Logs named by a worker's pid metadata: the worker's writer may still
+    # hold them open, so gc must not unlink them even when empty and idle.
+    store = open_state_store(ctx)
+    if store is not None:
+        rows = [pid_row(path, meta) for path, meta in store.records("workers")]
+    else:
+        rows = load_pid_inventory(ctx["orch_dir"])
+    return [row["log_file"] for row in rows if row["log_file"]]
+
+
+def _log_gc_pass(ctx: dict[str, Any], logs_dir: Path) -> dict[str, Any] | None:
+    return gc_logs(logs_dir, ctx["logs"], in_use=_recorded_log_files(ctx))
+
+
+def cmd_logs(args: argparse.Namespace) -> None:
+    # Rotation and retention for ORCH_DIR/logs under the [logs] policy.
+    _, ctx, _ = load_ctx(args)
+    logs_dir = Path(args.logs_dir) if args.logs_dir else Path(ctx["orch_dir"]) / "logs"
+    compression = ctx["logs"]["compression"]
+    if effective_compression(compression) != compression:
+        print(
+            f"[WARN] logs.compression = {compression} needs the zstandard module; rotating with gzip",
+            file=sys.stderr,
+        )
+    try:
+        if args.action == "rotate":
+            if not args.target:
+                die("logs rotate requires a log path")
+            segment = rotate_log(args.target, ctx["logs"]["compression"])
+            print(segment if segment is not None else f"Log is empty: {args.target}")
+            return
+        report = _log_gc_pass(ctx, logs_dir)
+    except (OSError, LogRotationError) as exc:
+        die(str(exc))
+    if report is None:
+        print(f"Logs gc already running: {logs_dir}")
+        return
+    counters = " ".join(f"{key}={value}" for key, value in report.items())
+    print(f"Logs gc: {counters} dir={logs_dir}")
+
+
+def cmd_session(args: argparse.Namespace) -> None:
+    # Pages through a worker log via its sidecar index (brought up to date
+    # first); negative pages count from the newest, -1 being the default.
+    log_file = args.log
+    if not log_file:
+        if not args.task:
+            die("session requires a log path or --task")
+        logs = [str(r["log_file"]) for r in StatusSnapshot(args).task_records(args.task, args.branch) if r.get("log_file")]
+        if not logs:
+            die(f"No worker log recorded for task: {args.task}")
+        log_file = logs[0]
+    if not Path(log_file).is_file():
+        die(f"Log file not found: {log_file}")
+
+    index = SessionIndex(log_file, every=args.page_size)
+    try:
+        index.update()
+    except OSError as exc:
+        die(str(exc))
+    pages = index.page_count()
+    if args.item:
+        found = index.find_item(args.item)
+        if found is None:
+            die(f"Item not found in {log_file}: {args.item}")
+        page = found
+    else:
+        page = args.page if args.page >= 0 else pages + args.page
+    if pages and not 0 <= page < pages:
+        die(f"Page out of range: {args.page} (pages={pages})")
+
+    view = index.render_page(page, args.max_blocks) if pages else SessionView("jsonl", 0, [])
+    first, last = index.page_span(page) if pages else (0, 0)
+    if args.format == "json":
+        payload = {
+            "log_file": log_file,
+            "page": page if pages else None,
+            "pages": pages,
+            "events": index.events,
+            "first_event": first,
+            "last_event": last,
+            "blocks": [vars(block) for block in view.blocks],
+        }
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        return
+
+    if not pages:
+        print(f"Session page 0/0: no events ({log_file})")
+        return
+    print(f"Session page {page + 1}/{pages}: events {first}-{last - 1} of {index.events} ({log_file})")
+    for block in view.blocks:
+        label = f"{block.label} [{block.item_id}]" if block.item_id else block.label
+        print(f"\n--- {label}")
+        print(block.body or "(no content)")
+
+
+def cmd_spec_index(args: argparse.Namespace) -> None:
+    _, ctx, _ = load_ctx(args)
+    index = SpecIndex(spec_index_path(ctx["state_dir"]))
+    if args.rebuild:
+        index.rebuild(ctx["spec_dir"])
+        index.save()
+
+    results = [entry.get("result", {}) for entry in index.entries.values()]
+    payload = {
+        "index_file": str(index.index_file),
+        "spec_dir": ctx["spec_dir"],
+        "rebuilt": bool(args.rebuild),
+        "summary": {
+            "entries": len(results),
+            "valid": sum(1 for r in results if r.get("valid")),
+            "invalid": sum(1 for r in results if r.get("exists") and not r.get("valid")),
+        },
+    }
+    if args.format == "json":
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        return
+
+    summary = payload["summary"]
+    label = "Spec index rebuilt" if args.rebuild else "Spec index"
+    print(
+        f"{label}: entries={summary['entries']} valid={summary['valid']} "
+        f"invalid={summary['invalid']} file={payload['index_file']}"
+    )
+
+
+def _todo_target(args: argparse.Namespace) -> tuple[str, dict[str, Any]]:
+    if args.todo_file and args.schema_json:
+        try:
+            return args.todo_file, json.loads(args.schema_json)
+        except json.JSONDecodeError as exc:
+            die(f"invalid --schema-json: {exc}", 3)
+    _, ctx, _ = load_ctx(args)
+    return str(ensure_todo_file(ctx["todo_file"])), ctx["todo"]
+
+
+def cmd_todo_status(args: argparse.Namespace) -> None:
+    todo_file, schema = _todo_target(args)
+
+    task_branch = args.branch or ""
+    try:
+        if args.mode == "get":
+            print(get_task_status(todo_file, schema, args.task, task_branch))
+            return
+        if not (args.status or "").strip():
+            die("todo-status set requires --status", 3)
+        set_task_status(todo_file, schema, args.task, args.status, task_branch)
+    except TodoTaskNotFound as exc:
+        die(str(exc), 2)
+    except TodoTaskAmbiguous as exc:
+        die(str(exc), 4)
+
+
+def cmd_todo_apply(args: argparse.Namespace) -> None:
+    todo_file, schema = _todo_target(args)
+
+    placeholder = "__EMPTY__"
+    mutations: list[tuple[str, str, str]] = []
+    for line in sys.stdin.read().splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        cols = [("" if col == placeholder else col) for col in line.split("\t")]
+        cols += [""] * max(0, 3 - len(cols))
+        mutations.append((cols[0], cols[1], cols[2]))
+
+    results = apply_task_statuses(todo_file, schema, mutations, tuple(args.keep_status or ()))
+
+    if args.format == "json":
+        print(json.dumps({"todo_file": todo_file, "results": results}, ensure_ascii=False, indent=2))
+        return
+
+    def f(value: Any) -> str:
+        text = str(value or "")
+        return text if text else placeholder
+
+    for result in results:
+        print(
+            "\t".join(
+                [
+                    f(result["task_id"]),
+                    f(result["task_branch"]),
+                    f(result["result"]),
+                    f(result["previous"]),
+                    f(result["status"]),
+                    f(result["detail"]),
+                ]
+            )
+        )
+
+
+def _migrate_state_files(ctx: dict[str, Any], store: StateStore) -> None:
+    lock_dir = Path(ctx["lock_dir"])
+    orch_dir = Path(ctx["orch_dir"])
+    if legacy_owner_metadata_files(orch_dir, lock_dir):
+        die(
+            "Legacy owner metadata detected. Run 'codex-tasks task stop --all --apply' "
+            "then 'codex-tasks task cleanup-stale --apply' before state migrate."
+        )
+
+    meta_paths = sorted(lock_dir.glob("*.lock")) + sorted(orch_dir.glob("*.pid"))
+    meta_files = [(path, path.read_text(encoding="utf-8")) for path in meta_paths if path.is_file()]
+    updates_file = Path(ctx["updates_file"])
+    updates = _read_updates_file(updates_file)
+
+    store.import_files(meta_files, updates)
+    for path, _ in meta_files:
+        path.unlink(missing_ok=True)
+    updates_file.unlink(missing_ok=True)
+    print(
+        f"Migrated to {store.path}: locks={sum(1 for p, _ in meta_files if p.suffix == '.lock')} "
+        f"workers={sum(1 for p, _ in meta_files if p.suffix == '.pid')} updates={len(updates)}"
+    )
+
+
+def _export_state_files(ctx: dict[str, Any], store: StateStore) -> None:
+    updates_file = Path(ctx["updates_file"])
+    counts = {"records": 0, "updates": 0}
+
+    def write_files(meta_files: list[tuple[Path, str]], updates: list[dict[str, str]]) -> None:
+        for path, _ in meta_files:
+            if path.exists():
+                raise StateStoreError(f"export target exists: {path}")
+        for path, text in meta_files:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+        if updates:
+            updates_file.parent.mkdir(parents=True, exist_ok=True)
+            if not updates_file.exists():
+                updates_file.write_text(UPDATES_HEADER, encoding="utf-8")
+            with updates_file.open("a", encoding="utf-8") as fh:
+                for u in updates:
+                    fh.write(
+                        f"| {u['timestamp']} | {u['source']} | {u['task_id']} | {u['status']} "
+                        f"| {escape_update_cell(u['summary'])} |\n"
+                    )
+        counts["records"] = len(meta_files)
+        counts["updates"] = len(updates)
+
+    store.drain(write_files)
+    print(f"Exported {store.path}: records={counts['records']} updates={counts['updates']}")
+
+
+def cmd_state(args: argparse.Namespace) -> None:
+    action = args.action
+    ctx: dict[str, Any] = {}
+    if args.db and action not in ("migrate", "export"):
+        store: StateStore | None = StateStore(args.db)
+    else:
+        _, ctx, _ = load_ctx(args)
+        store = open_state_store(ctx)
+    if store is None:
+        die('state commands require runtime.state_backend = "sqlite"')
+
+    if action in RECORD_ACTIONS:
+        code = run_state_action(store, args)
+        if code:
+            raise SystemExit(code)
+        return
+    try:
+        if action == "migrate":
+            _migrate_state_files(ctx, store)
+        elif action == "export":
+            _export_state_files(ctx, store)
+    except StateStoreError as exc:
+        die(str(exc))
+
+
+_DAEMON_COMMANDS = {
+    "paths",
+    "ready",
+    "inventory",
+    "select-stop",
+    "select-stale",
+    "pid-registry",
+    "todo-status",
+    "todo-apply",
+    "state",
+}
+
+
+class _RequestStream:
+    # Installed as sys.stdin/stdout/stderr by `serve`: each request thread
+    # binds its own buffer, other threads see the daemon's own stream.
+    def __init__(self, default: Any) -> None:
+        self._default = default
+        self._local = threading.local()
+
+    def bind(self, stream: Any) -> None:
+        self._local.stream = stream
+
+    def _target(self) -> Any:
+        stream = getattr(self._local, "stream", None)
+        return self._default if stream is None else stream
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target(), name)
+
+    def __iter__(self) -> Any:
+        return iter(self._target())
+
+
+def _serve_request(parser: argparse.ArgumentParser, request: dict[str, Any]) -> dict[str, Any]:
+    # Runs on a connection thread of engine_daemon.serve(): everything
+    # request-specific (stdio, AI_STATE_DIR, cwd) stays in this call.
+    argv = [str(item) for item in request.get("argv") or []]
+    if not argv or argv[0] not in _DAEMON_COMMANDS or "--watch" in argv:
+        # Anything else (status TUI, serve itself, streaming watches) runs as
+        # a normal process.
+        return {"ok": False, "error": f"unsupported daemon command: {argv[0] if argv else ''}"}
+
+    cwd = str(request.get("cwd") or "")
+    env = request.get("env") or {}
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    streams = [(sys.stdin, io.StringIO(str(request.get("stdin") or ""))), (sys.stdout, stdout), (sys.stderr, stderr)]
+    for proxy, buffer in streams:
+        proxy.bind(buffer)
+    code = 0
+    try:
+        try:
+            args = parser.parse_args(argv)
+            if not args.repo and cwd:
+                args.repo = cwd
+            # Same precedence and base dir as AI_STATE_DIR in resolve_context,
+            # without touching the daemon's environment.
+            if not getattr(args, "state_dir", None) and env.get("AI_STATE_DIR"):
+                args.state_dir = str(env["AI_STATE_DIR"])
+            run_command(args)
+        except SystemExit as exc:
+            if isinstance(exc.code, int):
+                code = exc.code
+            elif exc.code is not None:
+                print(exc.code, file=sys.stderr)
+                code = 1
+        except Exception as exc:  # keep the daemon alive on command bugs
+            print(f"Error: {exc}", file=sys.stderr)
+            code = 1
+    finally:
+        for proxy, _ in streams:
+            proxy.bind(None)
+
+    return {"ok": True, "code": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def cmd_serve(args: argparse.Namespace) -> None:
+    global _CTX_CACHE, _BOARD_CACHE
+
+    _, ctx, _ = load_ctx(args)
+    _CTX_CACHE = {}
+    _BOARD_CACHE = {}
+    # Requests bring their own AI_STATE_DIR; the daemon's must not leak into
+    # those that have none.
+    os.environ.pop("AI_STATE_DIR", None)
+    sys.stdin = _RequestStream(sys.stdin)
+    sys.stdout = _RequestStream(sys.stdout)
+    sys.stderr = _RequestStream(sys.stderr)
+
+    sock_path = socket_path_for(ctx["orch_dir"])
+    parser = build_parser()
+    print(f"engine daemon listening: {sock_path} (pid={os.getpid()})", flush=True)
+    try:
+        serve_socket(
+            sock_path,
+            lambda request: _serve_request(parser, request),
+            idle_timeout=float(args.idle_timeout),
+        )
+    except (OSError, RuntimeError) as exc:
+        die(str(exc))
+
+
+def cmd_supervise(args: argparse.Namespace) -> None:
+    _, ctx, _ = load_ctx(args)
+
+    cleanup_argv = [args.team_bin, "--repo", ctx["repo_root"], "--state-dir", ctx["state_dir"]]
+    if args.config:
+        cleanup_argv.extend(["--config", args.config])
+    logs_dir = Path(ctx["orch_dir"]) / "logs"
+    supervisor = Supervisor(
+        ctx["orch_dir"],
+        cleanup_argv,
+        idle_timeout=float(args.idle_timeout),
+        poll_interval=float(args.poll_interval),
+        store=open_state_store(ctx),
+        log_gc=lambda: _log_gc_pass(ctx, logs_dir),
+        log_gc_interval=float(args.log_gc_interval),
+    )
+
+    # A launcher nudges a running supervisor with SIGHUP; until run()
+    # installs its handler that must not terminate this process.
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    for _ in range(20):
+        if supervisor.acquire():
+            supervisor.run()
+            return
+        running_pid = signal_running(ctx["orch_dir"])
+        if running_pid:
+            print(f"worker supervisor already running: pid={running_pid}")
+            return
+        time.sleep(0.05)
+    die("worker supervisor lock is held but no supervisor answered")
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="codex-tasks python engine")
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -2368,7 +3357,9 @@ def build_parser() -> argparse.ArgumentParser:
     add_common(p_ready)
     p_ready.add_argument("--trigger", default="manual")
     p_ready.add_argument("--max-start", type=int)
-    p_ready.add_argument("--format", choices=["json", "tsv"], default="json")
+    p_ready.add_argument("--policy", choices=list(SCHEDULE_POLICIES),
+                         help="Override runtime.schedule_policy")
+    p_ready.add_argument("--format", choices=["json", "tsv", "rank"], default="json")
     p_ready.set_defaults(fn=cmd_ready)
 
     p_status = sub.add_parser("status")
@@ -2383,6 +3374,10 @@ def build_parser() -> argparse.ArgumentParser:
     add_common(p_inventory)
     p_inventory.add_argument(
         "--format", choices=["json", "tsv"], default="json")
+    p_inventory.add_argument("--watch", action="store_true",
+                             help="Stream state transitions as NDJSON until interrupted")
+    p_inventory.add_argument("--interval", type=float, default=5.0,
+                             help="Seconds between liveness re-checks in --watch mode")
     p_inventory.set_defaults(fn=cmd_inventory)
 
     p_stop = sub.add_parser("select-stop")
@@ -2398,13 +3393,108 @@ def build_parser() -> argparse.ArgumentParser:
     p_stale.add_argument("--format", choices=["json", "tsv"], default="json")
     p_stale.set_defaults(fn=cmd_select_stale)
 
-    return parser
+    p_pid_registry = sub.add_parser("pid-registry")
+    add_common(p_pid_registry)
+    p_pid_registry.add_argument("--format", choices=["tsv", "nul", "json"], default="tsv")
+    p_pid_registry.add_argument("--output", help="Write the registry here (atomically) instead of stdout")
+    p_pid_registry.set_defaults(fn=cmd_pid_registry)
+
+    p_trash = sub.add_parser("trash")
+    add_common(p_trash)
+    p_trash.add_argument("action", choices=["detach", "move", "reap"])
+    p_trash.add_argument("target", nargs="?")
+    p_trash.add_argument("--trash-dir", dest="trash_dir",
+                         help="Trash directory (default: <worktree_parent>/.trash)")
+    p_trash.add_argument("--batch", type=int, default=500,
+                         help="Unlinks between reaper pauses")
+    p_trash.add_argument("--pause", type=float, default=0.01,
+                         help="Seconds the reaper yields after each batch")
+    p_trash.set_defaults(fn=cmd_trash)
+
+    p_logs = sub.add_parser("logs")
+    add_common(p_logs)
+    p_logs.add_argument("action", choices=["gc", "rotate"])
+    p_logs.add_argument("target", nargs="?", help="Log to rotate now (rotate)")
+    p_logs.add_argument("--logs-dir", dest="logs_dir", help="Logs directory (default: ORCH_DIR/logs)")
+    p_logs.set_defaults(fn=cmd_logs)
+
+    p_session = sub.add_parser("session")
+    add_common(p_session)
+    p_session.add_argument("log", nargs="?", help="Worker log path (default: the log recorded for --task)")
+    p_session.add_argument("--task")
+    p_session.add_argument("--branch")
+    p_session.add_argument("--page", type=int, default=-1,
+                           help="Page number from the oldest (0) or newest (-1)")
+    p_session.add_argument("--item", help="Show the page where this item id starts")
+    p_session.add_argument("--page-size", dest="page_size", type=int, default=SESSION_INDEX_EVERY,
+                           help="Events per page (a different size rebuilds the index)")
+    p_session.add_argument("--max-blocks", dest="max_blocks", type=int, default=220)
+    p_session.add_argument("--format", choices=["text", "json"], default="text")
+    p_session.set_defaults(fn=cmd_session)
+
+    p_spec_index = sub.add_parser("spec-index")
+    add_common(p_spec_index)
+    p_spec_index.add_argument("--rebuild", action="store_true",
+                              help="Re-evaluate every spec under spec_dir")
+    p_spec_index.add_argument("--format", choices=["text", "json"], default="text")
+    p_spec_index.set_defaults(fn=cmd_spec_index)
+
+    p_todo_status = sub.add_parser("todo-status")
+    add_common(p_todo_status)
+    p_todo_status.add_argument("mode", choices=["get", "set"])
+    p_todo_status.add_argument("--task", required=True)
+    p_todo_status.add_argument("--branch")
+    p_todo_status.add_argument("--status")
+    p_todo_status.add_argument("--todo-file", dest="todo_file",
+                               help="TODO file override (skips context resolution with --schema-json)")
+    p_todo_status.add_argument("--schema-json", dest="schema_json",
+                               help="TODO schema as JSON (see paths TODO_SCHEMA_JSON)")
+    p_todo_status.set_defaults(fn=cmd_todo_status)
+
+    # Reads task_id<TAB>branch<TAB>status rows from stdin.
+    p_todo_apply = sub.add_parser("todo-apply")
+    add_common(p_todo_apply)
+    p_todo_apply.add_argument("--keep-status", action="append", dest="keep_status",
+                              help="Leave rows currently in this status untouched (repeatable)")
+    p_todo_apply.add_argument("--format", choices=["tsv", "json"], default="tsv")
+    p_todo_apply.add_argument("--todo-file", dest="todo_file",
+                              help="TODO file override (skips context resolution with --schema-json)")
+    p_todo_apply.add_argument("--schema-json", dest="schema_json",
+                              help="TODO schema as JSON (see paths TODO_SCHEMA_JSON)")
+    p_todo_apply.set_defaults(fn=cmd_todo_apply)
+
+    # Runtime state records under runtime.state_backend = "sqlite"; `target`
+    # is a lock/pid metadata path (a directory for glob). create/put/append
+    # read key=value lines from stdin.
+    p_state = sub.add_parser("state")
+    add_common(p_state)
+    p_state.add_argument("action", choices=[*RECORD_ACTIONS, "migrate", "export"])
+    p_state.add_argument("--db", help="State database path (skips context resolution, like todo-status --todo-file)")
+    add_record_arguments(p_state)
+    p_state.set_defaults(fn=cmd_state)
+
+    p_supervise = sub.add_parser("supervise")
+    add_common(p_supervise)
+    p_supervise.add_argument("--team-bin", dest="team_bin", required=True,
+                             help="codex-tasks executable used for auto-cleanup-exit")
+    p_supervise.add_argument("--idle-timeout", type=float, default=60.0,
+                             help="Exit after this many seconds with no worker to watch (0 = never)")
+    p_supervise.add_argument("--poll-interval", type=float, default=1.0,
+                             help="Liveness probe interval when pidfd is unavailable")
+    p_supervise.add_argument("--log-gc-interval", dest="log_gc_interval", type=float, default=300.0,
+                             help="Seconds between ORCH_DIR/logs rotation/retention passes")
+    p_supervise.set_defaults(fn=cmd_supervise)
+
+    p_serve = sub.add_parser("serve")
+    add_common(p_serve)
+    p_serve.add_argument("--idle-timeout", type=float, default=0.0,
+                         help="Exit after this many idle seconds (0 = never)")
+    p_serve.set_defaults(fn=cmd_serve)
 
+    return parser
 
-def main() -> None:
-    parser = build_parser()
-    args = parser.parse_args()
 
+def run_command(args: argparse.Namespace) -> None:
     if getattr(args, "cmd", "") == "select-stop":
         selected = [bool(args.task), bool(args.all)]
         if sum(selected) != 1:
@@ -2418,5 +3508,10 @@ def main() -> None:
         die(str(exc))
 
 
+def main() -> None:
+    parser = build_parser()
+    run_command(parser.parse_args())
+
+
 if __name__ == "__main__":
     main()
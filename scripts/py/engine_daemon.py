@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+# Keep this module stdlib-only: the shell client runs it on every call, so it
+# must not pay for the engine imports it is meant to avoid.
+
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+SOCKET_NAME = "engine.sock"
+
+# Exit code returned by the client when no daemon answered. Callers treat it
+# as "spawn the engine directly" rather than as a command failure.
+EXIT_UNAVAILABLE = 75
+
+# How often the accept loop wakes to notice shutdown and idle_timeout.
+_ACCEPT_TICK = 0.2
+
+# sockaddr_un.sun_path is 104 bytes on macOS and 108 on Linux.
+_MAX_SUN_PATH = 100
+
+
+def socket_path_for(orch_dir: str | Path) -> Path:
+    return Path(orch_dir) / SOCKET_NAME
+
+
+@contextmanager
+def _socket_address(path: Path) -> Iterator[str]:
+    # Long state dirs overflow sun_path; bind/connect relative to the socket
+    # directory instead.
+    if len(str(path)) <= _MAX_SUN_PATH:
+        yield str(path)
+        return
+
+    prev = os.getcwd()
+    os.chdir(path.parent)
+    try:
+        yield path.name
+    finally:
+        os.chdir(prev)
+
+
+def _recv_line(conn: socket.socket) -> bytes:
+    chunks: list[bytes] = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if b"\n" in chunk:
+            break
+    return b"".join(chunks).split(b"\n", 1)[0]
+
+
+def request(path: str | Path, payload: dict[str, Any], timeout: float = 30.0) -> dict[str, Any]:
+    sock_path = Path(path)
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(timeout)
+    try:
+        with _socket_address(sock_path) as address:
+            conn.connect(address)
+        conn.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        line = _recv_line(conn)
+    finally:
+        conn.close()
+
+    if not line:
+        raise ConnectionError(f"empty response from {sock_path}")
+    response = json.loads(line.decode("utf-8"))
+    if not isinstance(response, dict):
+        raise ConnectionError(f"invalid response from {sock_path}")
+    return response
+
+
+def is_serving(path: str | Path) -> bool:
+    try:
+        response = request(path, {"op": "ping"}, timeout=2.0)
+    except (OSError, ValueError):
+        return False
+    return bool(response.get("ok"))
+
+
+def _remove_socket(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _serve_connection(
+    conn: socket.socket,
+    sock_path: Path,
+    handler: Callable[[dict[str, Any]], dict[str, Any]],
+    stop: threading.Event,
+) -> None:
+    with conn:
+        conn.settimeout(30.0)
+        try:
+            line = _recv_line(conn)
+            req = json.loads(line.decode("utf-8")) if line else {}
+        except (OSError, ValueError):
+            return
+        if not isinstance(req, dict):
+            req = {}
+
+        op = str(req.get("op") or "")
+        if op == "shutdown":
+            # Gone before the reply, so the caller never sees a socket that
+            # will not answer; the accept loop stops on its next tick.
+            stop.set()
+            _remove_socket(sock_path)
+        if op in ("ping", "shutdown"):
+            response: dict[str, Any] = {"ok": True, "pid": os.getpid()}
+        else:
+            response = handler(req)
+
+        try:
+            conn.sendall(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+        except OSError:
+            pass
+
+
+def serve(
+    path: str | Path,
+    handler: Callable[[dict[str, Any]], dict[str, Any]],
+    idle_timeout: float = 0.0,
+) -> None:
+    # Each connection gets its own thread, so a slow command or a client that
+    # stalls before sending its request never holds up the others. handler
+    # must therefore keep per-request state off process globals.
+    sock_path = Path(path)
+    sock_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if sock_path.exists() or sock_path.is_symlink():
+        if is_serving(sock_path):
+            raise RuntimeError(f"engine daemon already running: {sock_path}")
+        sock_path.unlink()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with _socket_address(sock_path) as address:
+        server.bind(address)
+    server.listen(64)
+    server.settimeout(_ACCEPT_TICK)
+
+    stop = threading.Event()
+    workers: list[threading.Thread] = []
+    last_active = time.monotonic()
+    try:
+        while not stop.is_set():
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                workers = [worker for worker in workers if worker.is_alive()]
+                if workers:
+                    last_active = time.monotonic()
+                elif idle_timeout > 0 and time.monotonic() - last_active >= idle_timeout:
+                    break
+                continue
+
+            last_active = time.monotonic()
+            worker = threading.Thread(target=_serve_connection, args=(conn, sock_path, handler, stop), daemon=True)
+            worker.start()
+            workers.append(worker)
+    finally:
+        server.close()
+        if not stop.is_set():
+            _remove_socket(sock_path)
+        for worker in workers:
+            worker.join()
+
+
+def _cmd_call(args: argparse.Namespace) -> int:
+    engine_argv = list(args.argv)
+    if engine_argv and engine_argv[0] == "--":
+        engine_argv = engine_argv[1:]
+
+    env = {}
+    if "AI_STATE_DIR" in os.environ:
+        env["AI_STATE_DIR"] = os.environ["AI_STATE_DIR"]
+
+    payload: dict[str, Any] = {"op": "run", "argv": engine_argv, "cwd": os.getcwd(), "env": env}
+    if args.stdin:
+        payload["stdin"] = sys.stdin.read()
+
+    try:
+        response = request(args.socket, payload, timeout=args.timeout)
+    except (OSError, ValueError):
+        return EXIT_UNAVAILABLE
+
+    if not response.get("ok"):
+        return EXIT_UNAVAILABLE
+
+    sys.stdout.write(str(response.get("stdout") or ""))
+    sys.stderr.write(str(response.get("stderr") or ""))
+    return int(response.get("code") or 0)
+
+
+def _cmd_ping(args: argparse.Namespace) -> int:
+    try:
+        response = request(args.socket, {"op": "ping"}, timeout=args.timeout)
+    except (OSError, ValueError):
+        return 1
+    if not response.get("ok"):
+        return 1
+    print(response.get("pid", ""))
+    return 0
+
+
+def _cmd_shutdown(args: argparse.Namespace) -> int:
+    try:
+        response = request(args.socket, {"op": "shutdown"}, timeout=args.timeout)
+    except (OSError, ValueError):
+        return 1
+    return 0 if response.get("ok") else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="codex-tasks engine daemon client")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_call = sub.add_parser("call")
+    p_call.add_argument("socket")
+    p_call.add_argument("--timeout", type=float, default=60.0)
+    p_call.add_argument("--stdin", action="store_true",
+                        help="Forward stdin to the engine command")
+    p_call.add_argument("argv", nargs=argparse.REMAINDER)
+    p_call.set_defaults(fn=_cmd_call)
+
+    p_ping = sub.add_parser("ping")
+    p_ping.add_argument("socket")
+    p_ping.add_argument("--timeout", type=float, default=2.0)
+    p_ping.set_defaults(fn=_cmd_ping)
+
+    p_shutdown = sub.add_parser("shutdown")
+    p_shutdown.add_argument("socket")
+    p_shutdown.add_argument("--timeout", type=float, default=5.0)
+    p_shutdown.set_defaults(fn=_cmd_shutdown)
+
+    args = parser.parse_args()
+    raise SystemExit(args.fn(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+# Change notification for the status dashboard: inotify on Linux, stat
+# polling elsewhere. Callers get back the tags of the targets that changed
+# and decide what to rebuild.
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+# IN_MODIFY is left out on purpose: it fires per write() while a file is
+# being rewritten, IN_CLOSE_WRITE once when the writer is done.
+_WATCH_MASK = (
+    _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+_EVENT = struct.Struct("iIII")
+
+
+class WatchTarget(NamedTuple):
+    tag: str
+    path: Path
+    # "file": one file, watched through its parent directory so atomic
+    # replaces are seen; "dir": direct children; "tree": every descendant.
+    kind: str = "file"
+    # Only names ending with this suffix count for "dir"/"tree" targets.
+    suffix: str = ""
+
+
+def _matches(target: WatchTarget, name: str) -> bool:
+    if target.kind == "file":
+        return name == target.path.name
+    return not target.suffix or name.endswith(target.suffix)
+
+
+def _watch_dirs(target: WatchTarget) -> list[Path]:
+    if target.kind == "file":
+        return [target.path.parent]
+    if target.kind == "dir":
+        return [target.path]
+    dirs = [target.path]
+    for root, subdirs, _ in os.walk(target.path):
+        dirs.extend(Path(root) / name for name in subdirs)
+    return dirs
+
+
+class InotifyWatcher:
+    def __init__(self, targets: list[WatchTarget], poll_interval: float = 1.0) -> None:
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+        self._targets = list(targets)
+        self._poll_interval = poll_interval
+        # wd -> (directory, targets interested in it)
+        self._watches: dict[int, tuple[Path, list[WatchTarget]]] = {}
+        self._missing: list[WatchTarget] = []
+        for target in self._targets:
+            if not self._arm(target):
+                self._missing.append(target)
+
+    @staticmethod
+    def available() -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+        libc_name = ctypes.util.find_library("c")
+        try:
+            libc = ctypes.CDLL(libc_name, use_errno=True)
+        except OSError:
+            return False
+        return hasattr(libc, "inotify_init1")
+
+    def _add_dir(self, directory: Path, target: WatchTarget) -> bool:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), _WATCH_MASK)
+        if wd < 0:
+            return False
+        _, interested = self._watches.setdefault(wd, (directory, []))
+        if target not in interested:
+            interested.append(target)
+        return True
+
+    def _arm(self, target: WatchTarget) -> bool:
+        dirs = _watch_dirs(target)
+        if not dirs[0].is_dir() or not self._add_dir(dirs[0], target):
+            return False
+        for directory in dirs[1:]:
+            self._add_dir(directory, target)
+        return True
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def _rearm_missing(self) -> set[str]:
+        changed: set[str] = set()
+        still_missing: list[WatchTarget] = []
+        for target in self._missing:
+            if self._arm(target):
+                changed.add(target.tag)
+            else:
+                still_missing.append(target)
+        self._missing = still_missing
+        return changed
+
+    def _drain(self) -> set[str]:
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                wd, mask, _, name_len = _EVENT.unpack_from(data, offset)
+                raw_name = data[offset + _EVENT.size:offset + _EVENT.size + name_len]
+                offset += _EVENT.size + name_len
+                name = os.fsdecode(raw_name.rstrip(b"\0"))
+                watch = self._watches.get(wd)
+                if watch is None:
+                    continue
+                directory, interested = watch
+
+                if mask & _IN_IGNORED:
+                    # The directory itself went away; re-arm once it returns.
+                    del self._watches[wd]
+                    for target in interested:
+                        changed.add(target.tag)
+                        if target not in self._missing and not any(
+                            target in other for _, other in self._watches.values()
+                        ):
+                            self._missing.append(target)
+                    continue
+                if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                    continue
+
+                for target in interested:
+                    if target.kind == "tree" and mask & _IN_ISDIR:
+                        if mask & (_IN_CREATE | _IN_MOVED_TO):
+                            sub = WatchTarget(target.tag, directory / name, "tree", target.suffix)
+                            for sub_dir in _watch_dirs(sub):
+                                self._add_dir(sub_dir, target)
+                        changed.add(target.tag)
+                    elif name and _matches(target, name):
+                        changed.add(target.tag)
+        return changed
+
+    def wait(self, timeout: float | None = None) -> set[str]:
+        changed = self._rearm_missing()
+        if changed:
+            return changed | self._drain()
+        if self._missing:
+            timeout = self._poll_interval if timeout is None else min(timeout, self._poll_interval)
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if ready:
+            changed = self._drain()
+        return changed | self._rearm_missing()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def _signature(target: WatchTarget) -> tuple:
+    if target.kind == "file":
+        try:
+            st = target.path.stat()
+        except OSError:
+            return ()
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    entries: list[tuple[str, int, int]] = []
+    for directory in _watch_dirs(target) if target.path.is_dir() else []:
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            if not _matches(target, name):
+                continue
+            try:
+                st = (directory / name).stat()
+            except OSError:
+                continue
+            entries.append((str(directory / name), st.st_mtime_ns, st.st_size))
+    return tuple(sorted(entries))
+
+
+class PollingWatcher:
+    def __init__(self, targets: list[WatchTarget], poll_interval: float = 1.0) -> None:
+        self._targets = list(targets)
+        self._poll_interval = max(0.05, poll_interval)
+        self._signatures = {target: _signature(target) for target in self._targets}
+
+    def fileno(self) -> int:
+        return -1
+
+    def _changed(self) -> set[str]:
+        changed: set[str] = set()
+        for target in self._targets:
+            sig = _signature(target)
+            if sig != self._signatures[target]:
+                self._signatures[target] = sig
+                changed.add(target.tag)
+        return changed
+
+    def wait(self, timeout: float | None = None) -> set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self._changed()
+            if changed:
+                return changed
+            if deadline is None:
+                time.sleep(self._poll_interval)
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return changed
+            time.sleep(min(self._poll_interval, remaining))
+
+    def close(self) -> None:
+        return
+
+
+class ProbeWatcher:
+    # Adds a source whose files give no usable events (every SQLite
+    # connection, read-only ones included, rewrites the WAL files): `probe`
+    # runs every poll_interval and `tag` is reported only when its value moves.
+    def __init__(
+        self,
+        inner: InotifyWatcher | PollingWatcher,
+        tag: str,
+        probe: Callable[[], Any],
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.inner = inner
+        self._tag = tag
+        self._probe = probe
+        self._poll_interval = max(0.05, poll_interval)
+        self._last = probe()
+        self._next = time.monotonic() + self._poll_interval
+
+    def fileno(self) -> int:
+        return self.inner.fileno()
+
+    def _changed(self) -> set[str]:
+        now = time.monotonic()
+        if now < self._next:
+            return set()
+        self._next = now + self._poll_interval
+        value = self._probe()
+        if value == self._last:
+            return set()
+        self._last = value
+        return {self._tag}
+
+    def wait(self, timeout: float | None = None) -> set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self._changed()
+            now = time.monotonic()
+            step = 0.0 if changed else max(0.0, self._next - now)
+            if deadline is not None:
+                step = min(step, max(0.0, deadline - now))
+            changed |= self.inner.wait(step)
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def open_watcher(targets: list[WatchTarget], poll_interval: float = 1.0) -> InotifyWatcher | PollingWatcher:
+    if InotifyWatcher.available():
+        try:
+            return InotifyWatcher(targets, poll_interval)
+        except OSError:
+            pass
+    return PollingWatcher(targets, poll_interval)
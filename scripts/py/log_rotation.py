@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+# Size/idle rotation and retention for ORCH_DIR/logs. Every writer keeps its
+# log open with O_APPEND (tmux `pipe-pane 'cat >>'`, spawn_detached_process),
+# so a log is rotated by copying it into a compressed segment
+# <name>.log.<UTC stamp>.gz|.zst and truncating it in place: the writer
+# carries on at offset 0 and the recorded log_file path stays valid.
+
+import errno
+import fcntl
+import gzip
+import os
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable
+
+try:
+    import zstandard as _zstd  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    _zstd = None
+
+SEGMENT_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+GC_LOCK_NAME = ".gc.lock"
+_SESSION_INDEX_SUFFIX = ".idx"  # session_parser.SESSION_INDEX_SUFFIX
+_SEGMENT_RE = re.compile(r"^(?P<log>.+\.log)\.(?P<stamp>\d{8}T\d{6}Z)(?:-(?P<seq>\d+))?\.(?:gz|zst)$")
+_TMP_PREFIX = ".rotate-"
+_STALE_TMP_SECONDS = 3600
+_COPY_CHUNK = 1 << 20
+# Decompressed segment tails by (path, inode, size, mtime, max_bytes); segments
+# never change once written.
+_TAIL_CACHE: dict[tuple[Any, ...], bytes] = {}
+_TAIL_CACHE_SIZE = 8
+
+
+class LogRotationError(RuntimeError):
+    pass
+
+
+_SEGMENT_ERRORS: tuple[type[BaseException], ...] = (OSError, EOFError, ValueError, LogRotationError)
+if _zstd is not None:  # pragma: no cover - depends on runtime
+    _SEGMENT_ERRORS += (_zstd.ZstdError,)
+
+
+def zstd_available() -> bool:
+    return _zstd is not None
+
+
+def effective_compression(compression: str) -> str:
+    # What rotate_log() actually writes for a configured codec: zstd falls
+    # back to gzip without the zstandard module.
+    if compression not in SEGMENT_SUFFIXES or (compression == "zstd" and _zstd is None):
+        return "gzip"
+    return compression
+
+
+def _segment_key(name: str) -> tuple[str, int]:
+    match = _SEGMENT_RE.match(name)
+    if match is None:
+        return name, 0
+    return match.group("stamp"), int(match.group("seq") or 0)
+
+
+def segment_paths(log_path: str | Path) -> list[Path]:
+    # Archived segments of <log_path>, oldest first.
+    path = Path(log_path)
+    try:
+        names = os.listdir(path.parent)
+    except OSError:
+        return []
+    found = []
+    for name in names:
+        match = _SEGMENT_RE.match(name)
+        if match is not None and match.group("log") == path.name:
+            found.append(name)
+    return [path.parent / name for name in sorted(found, key=_segment_key)]
+
+
+def open_segment(path: str | Path) -> BinaryIO:
+    if str(path).endswith(".zst"):
+        if _zstd is None:
+            raise LogRotationError(f"zstandard is not installed; cannot read {path}")
+        return _zstd.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True, closefd=True)
+    return gzip.open(path, "rb")  # type: ignore[return-value]
+
+
+def read_segment_tail(path: str | Path, max_bytes: int) -> bytes:
+    st = os.stat(path)
+    key = (str(path), st.st_ino, st.st_size, st.st_mtime_ns, max_bytes)
+    cached = _TAIL_CACHE.get(key)
+    if cached is not None:
+        return cached
+    tail = b""
+    with open_segment(path) as stream:
+        while True:
+            chunk = stream.read(_COPY_CHUNK)
+            if not chunk:
+                break
+            tail = (tail + chunk)[-max_bytes:] if max_bytes > 0 else b""
+    while len(_TAIL_CACHE) >= _TAIL_CACHE_SIZE:
+        del _TAIL_CACHE[next(iter(_TAIL_CACHE))]
+    _TAIL_CACHE[key] = tail
+    return tail
+
+
+def archived_tail(log_path: str | Path, max_bytes: int) -> bytes:
+    # Up to <max_bytes> from the end of the newest segment of <log_path>
+    # (b"" without one or when it cannot be read). Starts at a line boundary
+    # unless the whole segment fits.
+    segments = segment_paths(log_path)
+    if not segments or max_bytes <= 0:
+        return b""
+    try:
+        tail = read_segment_tail(segments[-1], max_bytes + 1)
+    except _SEGMENT_ERRORS:
+        return b""
+    if len(tail) <= max_bytes:
+        return tail
+    cut = tail.find(b"\n", 1)
+    return tail[cut + 1 :] if cut >= 0 else b""
+
+
+def read_log_tail(log_path: str | Path, max_bytes: int) -> bytes:
+    # The last <max_bytes> of a log's history: the active file, preceded by
+    # the newest segment when the active file alone is shorter.
+    active = b""
+    try:
+        with open(log_path, "rb") as handle:
+            handle.seek(0, 2)
+            size = handle.tell()
+            handle.seek(max(0, size - max_bytes))
+            active = handle.read()
+    except OSError:
+        pass
+    if len(active) >= max_bytes:
+        return active
+    segments = segment_paths(log_path)
+    if not segments:
+        return active
+    try:
+        older = read_segment_tail(segments[-1], max_bytes - len(active))
+    except _SEGMENT_ERRORS:
+        return active
+    return older + active
+
+
+def _open_writer(path: Path, compression: str, mode: str) -> BinaryIO:
+    if compression == "zstd" and _zstd is not None:
+        return _zstd.ZstdCompressor(level=3).stream_writer(open(path, mode), closefd=True)
+    return gzip.open(path, mode, compresslevel=6)  # type: ignore[return-value]
+
+
+def _drop_session_index(log: Path) -> None:
+    # Offsets in the sidecar indexes (<log>.idx.<every>, one per page size)
+    # point into the truncated file; readers rebuild them for the new segment.
+    prefix = log.name + _SESSION_INDEX_SUFFIX + "."
+    try:
+        names = os.listdir(log.parent)
+    except OSError:
+        return
+    for name in names:
+        if name.startswith(prefix):
+            try:
+                os.unlink(log.parent / name)
+            except FileNotFoundError:
+                pass
+
+
+def rotate_log(log_path: str | Path, compression: str = "gzip", now: float | None = None) -> Path | None:
+    # Moves the current contents of <log_path> into a new segment and
+    # truncates the log; returns the segment, or None for an empty log. Only
+    # bytes appended between the final read and the truncate can be lost.
+    # zstd falls back to gzip when the zstandard module is not installed.
+    log = Path(log_path)
+    compression = effective_compression(compression)
+    stamp = datetime.fromtimestamp(time.time() if now is None else now, timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    suffix = SEGMENT_SUFFIXES[compression]
+    tmp = log.with_name(f"{_TMP_PREFIX}{log.name}.{os.getpid()}{suffix}")
+
+    copied = 0
+    with open(log, "rb") as src:
+        try:
+            mode = "xb"
+            chunk = src.read(_COPY_CHUNK)
+            while chunk:
+                # Each pass closes a complete gzip member / zstd frame (readers
+                # decode them as one stream); what was appended meanwhile goes
+                # into the next one.
+                with _open_writer(tmp, compression, mode) as out:
+                    while chunk:
+                        out.write(chunk)
+                        copied += len(chunk)
+                        chunk = src.read(_COPY_CHUNK)
+                mode = "ab"
+                chunk = src.read(_COPY_CHUNK)
+            if not copied:
+                return None
+
+            target = log.with_name(f"{log.name}.{stamp}{suffix}")
+            seq = 0
+            while True:
+                try:
+                    # Never overwrites a segment rotated in the same second.
+                    os.link(tmp, target)
+                    break
+                except FileExistsError:
+                    seq += 1
+                    target = log.with_name(f"{log.name}.{stamp}-{seq}{suffix}")
+            os.truncate(log, 0)
+        finally:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+    _drop_session_index(log)
+    return target
+
+
+def _remove(path: Path) -> int:
+    try:
+        size = path.stat().st_size
+        os.unlink(path)
+    except FileNotFoundError:
+        return 0
+    return size
+
+
+def gc_logs(
+    logs_dir: str | Path,
+    policy: dict[str, Any],
+    now: float | None = None,
+    in_use: Iterable[str | Path] = (),
+) -> dict[str, Any] | None:
+    # One pass over <logs_dir> with the [logs] policy from orchestrator.toml:
+    # rotate logs over rotate_bytes or idle for rotate_idle_hours, delete
+    # segments older than retention_days (with empty logs idle that long and
+    # the .exit files of removed logs), then delete the oldest segments until
+    # the directory fits in max_total_bytes. Logs in <in_use> (recorded in a
+    # worker's pid metadata) are never deleted, since a silent worker may
+    # still hold them open. Returns counters plus the codec used, or None
+    # when another gc holds the lock.
+    root = Path(logs_dir)
+    compression = effective_compression(str(policy.get("compression", "gzip")))
+    if not root.is_dir():
+        return {"rotated": 0, "removed": 0, "freed_bytes": 0, "total_bytes": 0, "compression": compression}
+    now = time.time() if now is None else now
+    rotate_bytes = int(policy.get("rotate_bytes", 0))
+    idle_seconds = int(policy.get("rotate_idle_hours", 0)) * 3600
+    retention_seconds = int(policy.get("retention_days", 0)) * 86400
+    max_total = int(policy.get("max_total_bytes", 0))
+    keep = {os.path.realpath(path) for path in in_use if path}
+
+    fd = os.open(str(root / GC_LOCK_NAME), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as exc:
+            if exc.errno in (errno.EAGAIN, errno.EACCES):
+                return None
+            raise
+
+        report: dict[str, Any] = {"rotated": 0, "removed": 0, "freed_bytes": 0, "total_bytes": 0}
+        logs: list[tuple[Path, os.stat_result]] = []
+        exits: list[tuple[Path, os.stat_result]] = []
+        for entry in os.scandir(root):
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            if entry.name.startswith(_TMP_PREFIX):
+                # Left behind by an interrupted rotation.
+                if now - entry.stat().st_mtime > _STALE_TMP_SECONDS:
+                    report["freed_bytes"] += _remove(Path(entry.path))
+                continue
+            if entry.name.endswith(".log"):
+                logs.append((Path(entry.path), entry.stat()))
+            elif entry.name.endswith(".exit"):
+                exits.append((Path(entry.path), entry.stat()))
+
+        for log, st in logs:
+            idle = now - st.st_mtime
+            if st.st_size and ((rotate_bytes and st.st_size >= rotate_bytes) or (idle_seconds and idle >= idle_seconds)):
+                try:
+                    if rotate_log(log, compression, now) is not None:
+                        report["rotated"] += 1
+                except OSError:
+                    continue
+            elif (
+                not st.st_size
+                and retention_seconds
+                and idle >= retention_seconds
+                and os.path.realpath(log) not in keep
+                and not segment_paths(log)
+            ):
+                report["freed_bytes"] += _remove(log)
+                _drop_session_index(log)
+                report["removed"] += 1
+
+        for exit_file, st in exits:
+            # A tmux worker's exit status (<name>.exit next to <name>.log)
+            # goes with its log, or once it has outlived retention_days.
+            expired = retention_seconds and now - st.st_mtime >= retention_seconds
+            if expired or not exit_file.with_suffix(".log").exists():
+                report["freed_bytes"] += _remove(exit_file)
+                report["removed"] += 1
+
+        segments: list[tuple[float, Path, int]] = []
+        total = 0
+        for entry in os.scandir(root):
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            st = entry.stat()
+            total += st.st_size
+            if _SEGMENT_RE.match(entry.name):
+                segments.append((st.st_mtime, Path(entry.path), st.st_size))
+        segments.sort(key=lambda item: (item[0], _segment_key(item[1].name)))
+
+        kept: list[tuple[float, Path, int]] = []
+        for mtime, path, size in segments:
+            if retention_seconds and now - mtime >= retention_seconds:
+                report["freed_bytes"] += _remove(path)
+                report["removed"] += 1
+                total -= size
+            else:
+                kept.append((mtime, path, size))
+        for _, path, size in kept:
+            if not max_total or total <= max_total:
+                break
+            report["freed_bytes"] += _remove(path)
+            report["removed"] += 1
+            total -= size
+        report["total_bytes"] = total
+        report["compression"] = compression
+        return report
+    finally:
+        os.close(fd)
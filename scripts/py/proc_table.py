@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+# Process liveness with pid-reuse protection. Launchers record the worker's
+# start time (`proc_start`, /proc/<pid>/stat field 22) next to its pid; a pid
+# only counts as live while the process holding it has that same start time.
+# Where /proc is unavailable (macOS) this degrades to a signal-0 probe.
+
+import os
+from pathlib import Path
+from typing import Iterable
+
+PROC_ROOT = Path("/proc")
+
+
+def proc_available() -> bool:
+    return (PROC_ROOT / "self" / "stat").exists()
+
+
+def read_proc_stat(pid: int) -> tuple[str, str] | None:
+    # (state, starttime) or None when the pid does not exist. comm may hold
+    # spaces and parentheses, so fields are counted after the last ')'.
+    try:
+        text = (PROC_ROOT / str(pid) / "stat").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    fields = text[text.rfind(")") + 2 :].split()
+    if len(fields) < 20:
+        return None
+    return fields[0], fields[19]
+
+
+def signal_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class ProcessTable:
+    # One snapshot per refresh: every pid of interest is read once, then all
+    # records are classified against the same view.
+    def __init__(self, entries: dict[int, str | None], has_start_times: bool) -> None:
+        # pid -> start time ("" when unknown); None marks a pid seen dead.
+        self._entries = entries
+        self.has_start_times = has_start_times
+
+    @classmethod
+    def snapshot(cls, pids: Iterable[str | int]) -> "ProcessTable":
+        wanted = {int(p) for p in pids if str(p).isdigit()}
+        entries: dict[int, str | None] = {}
+        if proc_available():
+            for pid in wanted:
+                stat = read_proc_stat(pid)
+                # A zombie has exited; it only waits for its parent to reap it.
+                entries[pid] = stat[1] if stat is not None and stat[0] != "Z" else None
+            return cls(entries, True)
+        for pid in wanted:
+            entries[pid] = "" if signal_alive(pid) else None
+        return cls(entries, False)
+
+    def alive(self, pid_value: str | int, start_time: str = "") -> bool:
+        pid_text = str(pid_value or "")
+        if not pid_text.isdigit():
+            return False
+        pid = int(pid_text)
+        if pid not in self._entries:
+            # Not part of the snapshot: probe it on its own.
+            self._entries.update(ProcessTable.snapshot([pid])._entries)
+        current = self._entries[pid]
+        if current is None:
+            return False
+        if start_time and self.has_start_times:
+            return current == start_time
+        return True
+
+
+def process_matches(pid_value: str | int, start_time: str = "") -> bool:
+    return ProcessTable.snapshot([pid_value]).alive(pid_value, start_time)
+
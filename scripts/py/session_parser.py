@@ -1,11 +1,42 @@
 from __future__ import annotations
 
+import fcntl
 import json
+import os
 import re
 import shlex
-from dataclasses import dataclass
+from array import array
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass, replace
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
+
+from log_rotation import archived_tail, read_log_tail
+
+# Optional fast JSON decoders; the stdlib decoder is always the fallback.
+try:
+    import orjson as _orjson  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    _orjson = None
+try:
+    import msgspec as _msgspec  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    _msgspec = None
+
+if _orjson is not None:
+    JSON_DECODER = "orjson"
+    _json_loads = _orjson.loads
+    _JSON_ERRORS: tuple[type[Exception], ...] = (ValueError,)
+elif _msgspec is not None:
+    JSON_DECODER = "msgspec"
+    _json_loads = _msgspec.json.Decoder().decode
+    _JSON_ERRORS = (ValueError, _msgspec.DecodeError)
+else:
+    JSON_DECODER = "json"
+    _json_loads = json.loads
+    _JSON_ERRORS = (ValueError,)
 
 
 ANSI_ESCAPE_RE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
@@ -78,34 +109,138 @@ def strip_ansi(text: str) -> str:
 
 
 def read_tail_text(file_path: str, max_bytes: int = 180_000) -> str:
-    path = Path(file_path)
-    if not file_path or not path.exists() or not path.is_file():
+    # Reads across rotation: a short active log is preceded by the tail of its
+    # newest archived segment.
+    if not file_path or Path(file_path).is_dir():
         return ""
+    return read_log_tail(file_path, max_bytes).decode("utf-8", errors="replace")
 
-    try:
-        with path.open("rb") as handle:
-            handle.seek(0, 2)
-            size = handle.tell()
-            start = max(0, size - max_bytes)
-            handle.seek(start)
-            raw = handle.read()
-    except OSError:
-        return ""
 
-    return raw.decode("utf-8", errors="replace")
+@dataclass
+class _TailLine:
+    size: int
+    text: str
+    event: dict[str, Any] | None
+
+
+class SessionLogTail:
+    # Incremental replacement for read_tail_text + _iter_json_objects on a log
+    # that is polled repeatedly. It remembers the byte offset and any partial
+    # trailing line, decodes only lines appended since the last poll, and keeps
+    # a sliding window of roughly the last <max_bytes> bytes of lines.
+    # Truncation, rotation (a new inode at the same path) and bursts larger
+    # than the window restart the window and bump `generation`.
+    def __init__(self, file_path: str, max_bytes: int = 180_000) -> None:
+        self.file_path = file_path
+        self.max_bytes = max_bytes
+        self.generation = 0
+        self._identity: tuple[int, int] | None = None
+        self._offset = 0
+        self._partial = b""
+        self._lines: deque[_TailLine] = deque()
+        self._window_bytes = 0
+        self._event_count = 0
+
+    def _restart(self, identity: tuple[int, int] | None, offset: int) -> None:
+        self.generation += 1
+        self._identity = identity
+        self._offset = offset
+        self._partial = b""
+        self._lines.clear()
+        self._window_bytes = 0
+        self._event_count = 0
+
+    def poll(self) -> list[dict[str, Any]]:
+        # Returns the JSON events that entered the window with this poll; after
+        # a restart that is the whole new window.
+        try:
+            handle = open(self.file_path, "rb")
+        except OSError:
+            if self._identity is not None:
+                self._restart(None, 0)
+            return []
+
+        with handle:
+            try:
+                st = os.fstat(handle.fileno())
+            except OSError:
+                return []
+            identity = (st.st_dev, st.st_ino)
+            size = st.st_size
+            skip_fragment = False
+            seed = b""
+            if identity != self._identity or size < self._offset:
+                start = max(0, size - self.max_bytes)
+                self._restart(identity, start)
+                skip_fragment = start > 0
+                if not start:
+                    # Fresh or just-rotated log: fill the rest of the window
+                    # from the newest archived segment.
+                    seed = archived_tail(self.file_path, self.max_bytes - size)
+            elif size - self._offset > self.max_bytes:
+                # More arrived than the window holds; older lines would be
+                # evicted right away, so do not decode them at all.
+                self._restart(identity, size - self.max_bytes)
+                skip_fragment = True
+            if size == self._offset and not seed:
+                return []
+
+            handle.seek(self._offset)
+            chunk = handle.read(size - self._offset)
+
+        self._offset += len(chunk)
+        data = seed + self._partial + chunk
+        if skip_fragment:
+            cut = data.find(b"\n")
+            data = data[cut + 1 :] if cut >= 0 else b""
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            self._partial = data
+            return []
+        self._partial = data[cut + 1 :]
+
+        new_events: list[dict[str, Any]] = []
+        for raw_line in data[:cut].split(b"\n"):
+            text = raw_line.decode("utf-8", errors="replace")
+            event = _parse_json_line(text)
+            self._lines.append(_TailLine(len(raw_line) + 1, text, event))
+            self._window_bytes += len(raw_line) + 1
+            if event is not None:
+                new_events.append(event)
+                self._event_count += 1
+        while self._lines and self._window_bytes > self.max_bytes:
+            dropped = self._lines.popleft()
+            self._window_bytes -= dropped.size
+            if dropped.event is not None:
+                self._event_count -= 1
+        return new_events[-self._event_count :] if self._event_count else []
+
+    def events(self) -> list[dict[str, Any]]:
+        return [line.event for line in self._lines if line.event is not None]
+
+    def text(self) -> str:
+        lines = [line.text for line in self._lines]
+        if self._partial:
+            lines.append(self._partial.decode("utf-8", errors="replace"))
+        return "\n".join(lines)
+
+
+def _parse_json_line(raw_line: str) -> dict[str, Any] | None:
+    line = raw_line.strip()
+    if not line or not line.startswith("{"):
+        return None
+    try:
+        item = _json_loads(line)
+    except _JSON_ERRORS:
+        return None
+    return item if isinstance(item, dict) else None
 
 
 def _iter_json_objects(text: str) -> list[dict[str, Any]]:
     parsed: list[dict[str, Any]] = []
     for raw_line in text.splitlines():
-        line = raw_line.strip()
-        if not line or not line.startswith("{"):
-            continue
-        try:
-            item = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        if isinstance(item, dict):
+        item = _parse_json_line(raw_line)
+        if item is not None:
             parsed.append(item)
     return parsed
 
@@ -1213,17 +1348,20 @@ def _event_to_blocks(event: dict[str, Any]) -> list[SessionBlock]:
     ]
 
 
+def _same_block(left: SessionBlock, right: SessionBlock) -> bool:
+    return (
+        left.kind == right.kind
+        and left.body == right.body
+        and left.event_type == right.event_type
+        and left.item_type == right.item_type
+        and left.role == right.role
+        and left.item_id == right.item_id
+        and left.item_status == right.item_status
+    )
+
+
 def _append_unique(blocks: list[SessionBlock], block: SessionBlock) -> None:
-    if (
-        blocks
-        and block.kind == blocks[-1].kind
-        and block.body == blocks[-1].body
-        and block.event_type == blocks[-1].event_type
-        and block.item_type == blocks[-1].item_type
-        and block.role == blocks[-1].role
-        and block.item_id == blocks[-1].item_id
-        and block.item_status == blocks[-1].item_status
-    ):
+    if blocks and _same_block(blocks[-1], block):
         return
     blocks.append(block)
 
@@ -1273,140 +1411,397 @@ def _flush_delta_buffers(
     return {}, {}
 
 
-def _render_from_json_events(events: list[dict[str, Any]], max_blocks: int) -> list[SessionBlock]:
-    blocks: list[SessionBlock] = []
-    text_delta_buffers: dict[str, str] = {}
-    think_delta_buffers: dict[str, str] = {}
-
-    for event in events:
-        event_type = _event_type(event)
-        delta = event.get("delta")
-        stream_id = _stream_id_from_event(event) or "__default__"
-        if isinstance(delta, str) and ("assistant" in event_type or "output_text" in event_type):
-            text_delta_buffers[stream_id] = f"{text_delta_buffers.get(stream_id, '')}{delta}"
-            continue
-        if isinstance(delta, str) and any(token in event_type for token in ("reasoning", "thinking", "thought", "analysis")):
-            think_delta_buffers[stream_id] = f"{think_delta_buffers.get(stream_id, '')}{delta}"
-            continue
-
-        text_delta_buffers, think_delta_buffers = _flush_delta_buffers(
-            blocks,
-            text_delta_buffers,
-            think_delta_buffers,
-            timestamp=_event_timestamp(event),
-        )
-
-        for block in _event_to_blocks(event):
-            _append_unique(blocks, block)
+# Keep the high-level conversational surface and hide low-level transport noise.
+CLI_VIEW_KINDS = {
+    "chat_agent",
+    "chat_codex",
+    "think",
+    "code",
+    "tool_call",
+    "tool_result",
+    "error",
+    "terminal",
+}
+MERGED_TOOL_ITEM_TYPES = {"command_execution", "command", "shell_command", "collab_tool_call"}
+
+
+def _merge_cli_block(
+    merged: "deque[SessionBlock] | list[SessionBlock]",
+    block: SessionBlock,
+    tool_calls: dict[tuple[str, str], SessionBlock] | None = None,
+) -> SessionBlock | None:
+    # Folds one raw block into the CLI view: drops noise, updates an earlier
+    # tool call with the same item id, merges consecutive chat/think/terminal
+    # text, else appends. Returns the appended block, if any. `tool_calls`
+    # indexes tool calls by (item_type, item_id) instead of scanning `merged`.
+    if block.kind not in CLI_VIEW_KINDS:
+        return None
+    body = _normalize_fragment(block.body)
+    if not body:
+        return None
+
+    if block.kind == "tool_call" and block.item_type in MERGED_TOOL_ITEM_TYPES and block.item_id:
+        existing: SessionBlock | None = None
+        if tool_calls is not None:
+            existing = tool_calls.get((block.item_type, block.item_id))
+        else:
+            for candidate in reversed(merged):
+                if (
+                    candidate.kind == "tool_call"
+                    and candidate.item_type == block.item_type
+                    and candidate.item_id == block.item_id
+                ):
+                    existing = candidate
+                    break
+        if existing is not None:
+            if body and body not in {"(command unavailable)", "(no payload)"}:
+                existing.body = _truncate(body)
+            if block.item_status:
+                existing.item_status = block.item_status
+            if block.label:
+                existing.label = block.label
+            if block.timestamp:
+                existing.timestamp = block.timestamp
+            return None
 
-    text_delta_buffers, think_delta_buffers = _flush_delta_buffers(
-        blocks,
-        text_delta_buffers,
-        think_delta_buffers,
-        timestamp="",
+    if (
+        merged
+        and merged[-1].kind == block.kind
+        and merged[-1].label == block.label
+        and merged[-1].item_type == block.item_type
+        and merged[-1].role == block.role
+        and (merged[-1].item_id == block.item_id or (not merged[-1].item_id and not block.item_id))
+        and block.kind in {"chat_agent", "chat_codex", "think", "terminal"}
+    ):
+        merged[-1].body = _truncate(f"{merged[-1].body}\n\n{body}")
+        if not merged[-1].timestamp and block.timestamp:
+            merged[-1].timestamp = block.timestamp
+        return None
+
+    appended = SessionBlock(
+        kind=block.kind,
+        label=block.label,
+        body=_truncate(body),
+        event_type="",
+        timestamp=block.timestamp,
+        item_type=block.item_type,
+        role=block.role,
+        item_id=block.item_id,
+        item_status=block.item_status,
+    )
+    merged.append(appended)
+    if tool_calls is not None and appended.kind == "tool_call" and appended.item_type in MERGED_TOOL_ITEM_TYPES and appended.item_id:
+        tool_calls[(appended.item_type, appended.item_id)] = appended
+    return appended
+
+
+def _fallback_cli_block(tail: SessionBlock) -> SessionBlock:
+    # If everything was filtered out, show the latest meaningful raw block.
+    return SessionBlock(
+        kind="terminal",
+        label="Terminal",
+        body=_truncate(_normalize_fragment(tail.body) or "(No output yet)"),
+        event_type="",
+        timestamp=tail.timestamp,
+        item_type=tail.item_type or "terminal",
+        role=tail.role,
+        item_id=tail.item_id,
+        item_status=tail.item_status,
     )
 
-    if not blocks:
-        return []
-
-    return blocks[-max_blocks:]
-
-
-def _normalize_cli_view_blocks(blocks: list[SessionBlock], max_blocks: int) -> list[SessionBlock]:
-    if not blocks:
-        return []
-
-    # Keep the high-level conversational surface and hide low-level transport noise.
-    allowed_kinds = {
-        "chat_agent",
-        "chat_codex",
-        "think",
-        "code",
-        "tool_call",
-        "tool_result",
-        "error",
-        "terminal",
-    }
-    merged: list[SessionBlock] = []
 
-    for block in blocks:
-        if block.kind not in allowed_kinds:
-            continue
-        body = _normalize_fragment(block.body)
-        if not body:
-            continue
-
-        if (
-            block.kind == "tool_call"
-            and block.item_type in {"command_execution", "command", "shell_command", "collab_tool_call"}
-            and block.item_id
-        ):
-            updated = False
-            for existing in reversed(merged):
-                if (
-                    existing.kind == "tool_call"
-                    and existing.item_type == block.item_type
-                    and existing.item_id == block.item_id
-                ):
-                    if body and body not in {"(command unavailable)", "(no payload)"}:
-                        existing.body = _truncate(body)
-                    if block.item_status:
-                        existing.item_status = block.item_status
-                    if block.label:
-                        existing.label = block.label
-                    if block.timestamp:
-                        existing.timestamp = block.timestamp
-                    updated = True
-                    break
-            if updated:
+class SessionParser:
+    # Incremental JSONL session renderer. ingest() folds new events into the
+    # delta buffers and a bounded ring of finalized CLI-view blocks; view()
+    # only touches the last <max_blocks> of them, so following a long session
+    # costs O(new events) per refresh instead of re-rendering the window.
+    def __init__(self, max_blocks: int = 256) -> None:
+        self.max_blocks = max(1, max_blocks)
+        self.events_seen = 0
+        self._text_deltas: dict[str, str] = {}
+        self._think_deltas: dict[str, str] = {}
+        self._last_raw: SessionBlock | None = None
+        self._blocks: deque[SessionBlock] = deque()
+        self._tool_calls: dict[tuple[str, str], SessionBlock] = {}
+
+    def _commit(self, block: SessionBlock) -> None:
+        self._last_raw = block
+        if _merge_cli_block(self._blocks, block, self._tool_calls) is None:
+            return
+        while len(self._blocks) > self.max_blocks:
+            dropped = self._blocks.popleft()
+            key = (dropped.item_type, dropped.item_id)
+            if self._tool_calls.get(key) is dropped:
+                del self._tool_calls[key]
+
+    def _staged_flush(self, timestamp: str) -> list[SessionBlock]:
+        # Blocks the pending delta buffers turn into, deduplicated against the
+        # last finalized raw block like _append_unique does.
+        staged = [self._last_raw] if self._last_raw is not None else []
+        _flush_delta_buffers(staged, self._text_deltas, self._think_deltas, timestamp=timestamp)
+        return staged[1:] if self._last_raw is not None else staged
+
+    def ingest(self, events: Iterable[dict[str, Any]]) -> None:
+        for event in events:
+            self.events_seen += 1
+            event_type = _event_type(event)
+            delta = event.get("delta")
+            stream_id = _stream_id_from_event(event) or "__default__"
+            if isinstance(delta, str) and ("assistant" in event_type or "output_text" in event_type):
+                self._text_deltas[stream_id] = f"{self._text_deltas.get(stream_id, '')}{delta}"
+                continue
+            if isinstance(delta, str) and any(token in event_type for token in ("reasoning", "thinking", "thought", "analysis")):
+                self._think_deltas[stream_id] = f"{self._think_deltas.get(stream_id, '')}{delta}"
                 continue
 
-        if (
-            merged
-            and merged[-1].kind == block.kind
-            and merged[-1].label == block.label
-            and merged[-1].item_type == block.item_type
-            and merged[-1].role == block.role
-            and (merged[-1].item_id == block.item_id or (not merged[-1].item_id and not block.item_id))
-            and block.kind in {"chat_agent", "chat_codex", "think", "terminal"}
-        ):
-            merged[-1].body = _truncate(f"{merged[-1].body}\n\n{body}")
-            if not merged[-1].timestamp and block.timestamp:
-                merged[-1].timestamp = block.timestamp
-            continue
+            if self._text_deltas or self._think_deltas:
+                for block in self._staged_flush(_event_timestamp(event)):
+                    self._commit(block)
+                self._text_deltas, self._think_deltas = {}, {}
+
+            for block in _event_to_blocks(event):
+                if self._last_raw is None or not _same_block(self._last_raw, block):
+                    self._commit(block)
+
+    def view(self, max_blocks: int = 12) -> list[SessionBlock]:
+        # The last <max_blocks> CLI blocks, with still-open delta streams
+        # rendered as if flushed now. Returns copies; [] before any block.
+        limit = max(1, min(max_blocks, self.max_blocks))
+        pending = self._staged_flush("") if (self._text_deltas or self._think_deltas) else []
+        last_raw = pending[-1] if pending else self._last_raw
+        if last_raw is None:
+            return []
+
+        tail = [replace(block) for block in islice(reversed(self._blocks), limit)]
+        tail.reverse()
+        for block in pending:
+            _merge_cli_block(tail, block)
+        if not tail:
+            return [_fallback_cli_block(last_raw)]
+        return tail[-limit:]
+
+
+# Sidecar byte-offset index for worker session logs. <log>.idx.<every> is an
+# append-only text file next to the log, one per page size:
+#
+#   v1 <dev> <ino> <every>   header; another inode means the log was rotated
+#   c <event> <offset>       byte offset of every <every>-th JSON event
+#   i <offset> <item_id>     where the events of an item start
+#   m <offset> <events>      indexed up to <offset> (a line boundary)
+#
+# Records after the last `m` belong to an interrupted update and are cut off
+# by the next one. A page is the run of events between two checkpoints, so
+# reading any page of a multi-hour session costs one seek and <every> lines
+# no matter how far back it is.
+SESSION_INDEX_SUFFIX = ".idx"
+SESSION_INDEX_VERSION = "v1"
+SESSION_INDEX_EVERY = 256
+_INDEX_READ_CHUNK = 1 << 20
+
+
+def session_index_path(log_path: str | Path, every: int = SESSION_INDEX_EVERY) -> Path:
+    path = Path(log_path)
+    return path.with_name(f"{path.name}{SESSION_INDEX_SUFFIX}.{max(1, every)}")
+
+
+class SessionIndex:
+    # Keeps only the checkpoint offsets in memory (8 bytes per <every>
+    # events); item records stay on disk and are scanned by find_item().
+    def __init__(self, log_path: str | Path, every: int = SESSION_INDEX_EVERY, index_path: str | Path | None = None) -> None:
+        self.log_path = Path(log_path)
+        self.every = max(1, every)
+        self.index_path = Path(index_path) if index_path is not None else session_index_path(self.log_path, self.every)
+        self.events = 0
+        self.indexed_bytes = 0
+        self._checkpoints = array("q")
+        self._identity: tuple[int, int] | None = None
+        self._index_identity: tuple[int, int] | None = None
+        self._index_pos = 0
+        self._last_item = ""
+
+    def _reset(self) -> None:
+        self.events = 0
+        self.indexed_bytes = 0
+        self._checkpoints = array("q")
+        self._identity = None
+        self._index_identity = None
+        self._index_pos = 0
+        self._last_item = ""
+
+    def _load(self, handle: Any) -> None:
+        # Reads index records appended (by us or another process) since the
+        # last load; a replaced or shrunk index file is reread from the start.
+        st = os.fstat(handle.fileno())
+        if (st.st_dev, st.st_ino) != self._index_identity or st.st_size < self._index_pos:
+            self._reset()
+            self._index_identity = (st.st_dev, st.st_ino)
+        handle.seek(self._index_pos)
+        pos = self._index_pos
+        pending: list[int] = []
+        last_item = self._last_item
+        for raw in handle:
+            if not raw.endswith(b"\n"):
+                break
+            pos += len(raw)
+            fields = raw.rstrip(b"\n").decode("utf-8", errors="replace").split(" ", 2)
+            kind = fields[0]
+            try:
+                if kind == SESSION_INDEX_VERSION:
+                    dev, ino, every = map(int, raw.split()[1:])
+                    if every != self.every:
+                        break
+                    self._identity = (dev, ino)
+                    self._index_pos = pos
+                elif kind == "c":
+                    pending.append(int(fields[2]))
+                elif kind == "i":
+                    last_item = fields[2]
+                elif kind == "m":
+                    self.indexed_bytes, self.events = int(fields[1]), int(fields[2])
+                    self._checkpoints.extend(pending)
+                    pending = []
+                    self._last_item = last_item
+                    self._index_pos = pos
+                else:
+                    break
+            except (IndexError, ValueError):
+                break
 
-        merged.append(
-            SessionBlock(
-                kind=block.kind,
-                label=block.label,
-                body=_truncate(body),
-                event_type="",
-                timestamp=block.timestamp,
-                item_type=block.item_type,
-                role=block.role,
-                item_id=block.item_id,
-                item_status=block.item_status,
-            )
-        )
+    def update(self, max_bytes: int = 0) -> int:
+        # Indexes the complete lines appended since the last update and
+        # returns how many events they held; with max_bytes it stops at the
+        # first line boundary past that many bytes so a caller on a timer
+        # catches up over several calls. Concurrent updaters (overlay,
+        # `engine.py session`) serialize on a flock of the index file.
+        try:
+            log = open(self.log_path, "rb")
+        except OSError:
+            return 0
+        with log:
+            st = os.fstat(log.fileno())
+            identity = (st.st_dev, st.st_ino)
+            fd = os.open(str(self.index_path), os.O_RDWR | os.O_CREAT, 0o644)
+            with os.fdopen(fd, "r+b") as index:
+                fcntl.flock(index.fileno(), fcntl.LOCK_EX)
+                self._load(index)
+                if self._identity != identity or st.st_size < self.indexed_bytes:
+                    # New, rotated or truncated log: start the index over.
+                    index.truncate(0)
+                    self._reset()
+                    st_index = os.fstat(index.fileno())
+                    self._index_identity = (st_index.st_dev, st_index.st_ino)
+                    self._identity = identity
+                    self._append(index, f"{SESSION_INDEX_VERSION} {identity[0]} {identity[1]} {self.every}\n")
+                if st.st_size == self.indexed_bytes:
+                    return 0
+                index.truncate(self._index_pos)
+                return self._index_range(log, index, st.st_size, max_bytes)
+
+    def _append(self, index: Any, text: str) -> None:
+        index.seek(self._index_pos)
+        index.write(text.encode("utf-8"))
+        index.flush()
+        self._index_pos = index.tell()
+
+    def _index_range(self, log: Any, index: Any, size: int, max_bytes: int = 0) -> int:
+        offset = self.indexed_bytes
+        events = self.events
+        last_item = self._last_item
+        checkpoints: list[int] = []
+        records: list[str] = []
+        log.seek(offset)
+        partial = b""
+        while offset + len(partial) < size:
+            chunk = log.read(min(_INDEX_READ_CHUNK, size - offset - len(partial)))
+            if not chunk:
+                break
+            data = partial + chunk
+            start = 0
+            while True:
+                end = data.find(b"\n", start)
+                if end < 0:
+                    break
+                event = _parse_json_line(data[start:end].decode("utf-8", errors="replace"))
+                if event is not None:
+                    if events % self.every == 0:
+                        checkpoints.append(offset)
+                        records.append(f"c {events} {offset}\n")
+                    events += 1
+                    item_id = _stream_id_from_event(event)
+                    if item_id and item_id != last_item and "\n" not in item_id and "\r" not in item_id:
+                        records.append(f"i {offset} {item_id}\n")
+                        last_item = item_id
+                offset += end + 1 - start
+                start = end + 1
+            partial = data[start:]
+            if max_bytes and offset - self.indexed_bytes >= max_bytes:
+                break
 
-    if not merged:
-        # Fallback: if everything was filtered out, show the latest meaningful raw block.
-        tail = blocks[-1]
-        return [
-            SessionBlock(
-                kind="terminal",
-                label="Terminal",
-                body=_truncate(_normalize_fragment(tail.body) or "(No output yet)"),
-                event_type="",
-                timestamp=tail.timestamp,
-                item_type=tail.item_type or "terminal",
-                role=tail.role,
-                item_id=tail.item_id,
-                item_status=tail.item_status,
-            )
-        ]
+        added = events - self.events
+        if offset == self.indexed_bytes:
+            return 0
+        records.append(f"m {offset} {events}\n")
+        self._append(index, "".join(records))
+        self._checkpoints.extend(checkpoints)
+        self.events = events
+        self.indexed_bytes = offset
+        self._last_item = last_item
+        return added
+
+    def page_count(self) -> int:
+        return len(self._checkpoints)
+
+    def page_span(self, page: int) -> tuple[int, int]:
+        # [first, last) event numbers of a page.
+        first = page * self.every
+        return first, min(first + self.every, self.events)
+
+    def page_of_offset(self, offset: int) -> int:
+        return max(0, bisect_right(self._checkpoints, offset) - 1)
+
+    def read_page(self, page: int) -> list[dict[str, Any]]:
+        if page < 0 or page >= len(self._checkpoints):
+            return []
+        start = self._checkpoints[page]
+        end = self._checkpoints[page + 1] if page + 1 < len(self._checkpoints) else self.indexed_bytes
+        try:
+            with open(self.log_path, "rb") as handle:
+                handle.seek(start)
+                data = handle.read(end - start)
+        except OSError:
+            return []
+        events: list[dict[str, Any]] = []
+        for raw_line in data.split(b"\n"):
+            event = _parse_json_line(raw_line.decode("utf-8", errors="replace"))
+            if event is not None:
+                events.append(event)
+        return events
+
+    def find_item(self, item_id: str) -> int | None:
+        # Page holding the first event of <item_id>; streams the index file.
+        prefix = b"i "
+        try:
+            with open(self.index_path, "rb") as handle:
+                consumed = 0
+                for raw in handle:
+                    consumed += len(raw)
+                    if consumed > self._index_pos:
+                        break
+                    if not raw.startswith(prefix):
+                        continue
+                    fields = raw.rstrip(b"\n").decode("utf-8", errors="replace").split(" ", 2)
+                    if len(fields) == 3 and fields[2] == item_id:
+                        return self.page_of_offset(int(fields[1]))
+        except (OSError, ValueError):
+            return None
+        return None
 
-    return merged[-max_blocks:]
+    def render_page(self, page: int, max_blocks: int = 220) -> SessionView:
+        # A delta stream that began on an earlier page renders from where
+        # this page starts.
+        parser = SessionParser(max_blocks=max_blocks)
+        parser.ingest(self.read_page(page))
+        return SessionView(source="jsonl", parsed_events=parser.events_seen, blocks=parser.view(max_blocks))
 
 
 def _render_transcript(text: str, max_lines: int) -> str:
@@ -1430,13 +1825,23 @@ def _render_transcript(text: str, max_lines: int) -> str:
     return body or "(No output yet)"
 
 
-def parse_session_structured(raw_capture: str, log_tail: str = "", max_blocks: int = 12, max_lines: int = 260) -> SessionView:
+def parse_session_structured(
+    raw_capture: str,
+    log_tail: str = "",
+    max_blocks: int = 12,
+    max_lines: int = 260,
+    events: list[dict[str, Any]] | None = None,
+) -> SessionView:
+    # `events` are the already-decoded JSON lines of `log_tail` (see
+    # SessionLogTail); without them the source text is decoded here.
     source_text = log_tail if log_tail.strip() else raw_capture
-    events = _iter_json_objects(source_text)
+    if events is None or not log_tail.strip():
+        events = _iter_json_objects(source_text)
     if events:
-        raw_blocks = _render_from_json_events(events, max_blocks=max(64, max_blocks * 4))
-        if raw_blocks:
-            cli_blocks = _normalize_cli_view_blocks(raw_blocks, max_blocks=max_blocks)
+        parser = SessionParser(max_blocks=max(64, max_blocks * 4))
+        parser.ingest(events)
+        cli_blocks = parser.view(max_blocks)
+        if cli_blocks:
             return SessionView(source="jsonl", parsed_events=len(events), blocks=cli_blocks)
 
     fallback = source_text if source_text.strip() else raw_capture
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+# Shared freshness rule for caches keyed on a file's stat (size, mtime_ns,
+# sometimes the inode): the TODO parse cache, the spec index and the pid/lock
+# metadata cache. An entry verified within RACY_WINDOW_NS of the file's mtime
+# is "racily clean" -- a same-size rewrite inside one mtime tick would look
+# unchanged -- so it is only trusted once the file has aged past the window.
+
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def stat_is_fresh(verified_ns: int, mtime_ns: int) -> bool:
+    # True when an entry verified at <verified_ns> can be trusted for a file
+    # whose stat still shows <mtime_ns>.
+    return verified_ns - mtime_ns > RACY_WINDOW_NS
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+# Record API behind the shell's meta_* helpers and append_update_log under
+# runtime.state_backend = "sqlite". Every lock/pid read or write runs it, so
+# like engine_daemon.py it imports nothing but the state store: no config,
+# board or TUI modules, and no git calls.
+
+import argparse
+import sys
+from datetime import datetime, timezone
+
+from state_store import StateStore, StateStoreError
+
+RECORD_ACTIONS = ("get", "create", "put", "set", "append", "remove", "glob", "update")
+
+
+def meta_field(text: str, key: str) -> str:
+    # read_field() semantics: first matching line, value up to the next "=".
+    for line in text.splitlines():
+        parts = line.split("=")
+        if parts[0] == key:
+            return parts[1].lstrip() if len(parts) > 1 else ""
+    return ""
+
+
+def _fail(msg: str) -> int:
+    print(f"Error: {msg}", file=sys.stderr)
+    return 1
+
+
+def run_action(store: StateStore, args: argparse.Namespace) -> int:
+    # Shared with `engine.py state`; returns the exit status.
+    action = args.action
+    if action != "update" and not args.target:
+        return _fail(f"state {action} requires a metadata path")
+
+    try:
+        if action == "get":
+            text = store.get(args.target)
+            if text is None:
+                return 1
+            if args.field:
+                print(meta_field(text, args.field))
+            else:
+                sys.stdout.write(text)
+        elif action == "create":
+            if not store.create(args.target, sys.stdin.read()):
+                return _fail(f"record exists: {args.target}")
+        elif action == "put":
+            store.put(args.target, sys.stdin.read())
+        elif action == "set":
+            if not args.field or args.value is None:
+                return _fail("state set requires --field and --value")
+            if not store.set_field(args.target, args.field, args.value):
+                return 1
+        elif action == "append":
+            if not store.append(args.target, sys.stdin.read()):
+                return 1
+        elif action == "remove":
+            store.remove(args.target)
+        elif action == "glob":
+            if not args.pattern:
+                return _fail("state glob requires --pattern")
+            for path in store.glob(args.target, args.pattern):
+                print(path)
+        elif action == "update":
+            store.append_update(
+                args.timestamp or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                args.source or "",
+                args.task or "",
+                args.status or "",
+                args.summary or "",
+            )
+    except StateStoreError as exc:
+        return _fail(str(exc))
+    return 0
+
+
+def add_record_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("target", nargs="?")
+    parser.add_argument("--field")
+    parser.add_argument("--value")
+    parser.add_argument("--pattern", help="File name pattern for glob")
+    parser.add_argument("--timestamp")
+    parser.add_argument("--source")
+    parser.add_argument("--task")
+    parser.add_argument("--status")
+    parser.add_argument("--summary")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="codex-tasks state records (sqlite backend)")
+    parser.add_argument("action", choices=RECORD_ACTIONS)
+    parser.add_argument("--db", required=True, help="State database path")
+    add_record_arguments(parser)
+    args = parser.parse_args()
+    raise SystemExit(run_action(StateStore(args.db), args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import fnmatch
+import functools
 import os
+import re
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from proc_table import ProcessTable, process_matches
+from stat_cache import stat_is_fresh
 
 ACTIVE_STATES = {"RUNNING", "LOCKED", "FINALIZING"}
 STALE_STATES = {
     "LOCK_STALE",
+    "HEARTBEAT_STALE",
     "FINALIZING_EXITED",
     "ORPHAN_LOCK",
     "ORPHAN_PID",
@@ -31,126 +39,249 @@ def is_stale_state(state: str) -> bool:
     return state in STALE_STATES
 
 
-def read_field(file_path: Path, key: str) -> str:
-    if not file_path.exists():
-        return ""
-    for line in file_path.read_text(encoding="utf-8").splitlines():
+def parse_metadata(text: str) -> dict[str, str]:
+    # key=value lines; the first occurrence of a key wins, like read_field().
+    meta: dict[str, str] = {}
+    for line in text.splitlines():
         if "=" not in line:
             continue
         lhs, rhs = line.split("=", 1)
-        if lhs.strip() == key:
-            return rhs.strip()
-    return ""
+        meta.setdefault(lhs.strip(), rhs.strip())
+    return meta
 
 
-def is_pid_alive(pid_value: str) -> bool:
-    if not pid_value or not pid_value.isdigit():
-        return False
-    pid = int(pid_value)
+# Parsed pid/lock metadata keyed by path. A fresh hit on (inode, mtime_ns,
+# size) skips the open entirely. Long-lived processes (daemon, dashboard,
+# supervisor) keep this across scans; results are shared, so callers must
+# treat them as read-only.
+_META_CACHE: dict[str, tuple[tuple[int, int, int], int, dict[str, str]]] = {}
+
+
+def load_metadata(file_path: str | Path) -> dict[str, str] | None:
+    path = str(file_path)
     try:
-        os.kill(pid, 0)
-        return True
+        st = os.stat(path)
     except OSError:
-        return False
+        _META_CACHE.pop(path, None)
+        return None
 
+    sig = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _META_CACHE.get(path)
+    if cached is not None and cached[0] == sig and stat_is_fresh(cached[1], st.st_mtime_ns):
+        return cached[2]
 
-def _has_owner_key(file_path: Path) -> bool:
-    if not file_path.exists() or not file_path.is_file():
-        return False
+    read_ns = time.time_ns()
     try:
-        for line in file_path.read_text(encoding="utf-8").splitlines():
-            if "=" not in line:
-                continue
-            key, _ = line.split("=", 1)
-            if key.strip() == "owner":
-                return True
-    except OSError:
+        with open(path, encoding="utf-8") as fh:
+            meta = parse_metadata(fh.read())
+    except (OSError, UnicodeDecodeError):
+        _META_CACHE.pop(path, None)
+        return None
+    _META_CACHE[path] = (sig, read_ns, meta)
+    return meta
+
+
+def scan_metadata(base: str | Path, pattern: str) -> list[tuple[Path, dict[str, str]]]:
+    base_path = Path(base)
+    if not base_path.exists():
+        return []
+
+    rows: list[tuple[Path, dict[str, str]]] = []
+    seen: set[str] = set()
+    for meta_path in sorted(base_path.glob(pattern)):
+        meta = load_metadata(meta_path)
+        if meta is None:
+            continue
+        seen.add(str(meta_path))
+        rows.append((meta_path, meta))
+
+    # Forget files that disappeared from this directory.
+    gone = [
+        path for path in _META_CACHE
+        if path not in seen and os.path.dirname(path) == str(base_path)
+        and fnmatch.fnmatch(os.path.basename(path), pattern)
+    ]
+    for path in gone:
+        del _META_CACHE[path]
+    return rows
+
+
+def read_field(file_path: Path, key: str) -> str:
+    meta = load_metadata(file_path)
+    if meta is None:
+        return ""
+    return meta.get(key, "")
+
+
+def is_pid_alive(pid_value: str, start_time: str = "") -> bool:
+    # Single-pid probe; inventories classify against one ProcessTable.
+    if not pid_value or not pid_value.isdigit():
         return False
-    return False
+    return process_matches(pid_value, start_time)
 
 
 def legacy_owner_metadata_files(orch_dir: str | Path, lock_dir: str | Path) -> list[str]:
     files: list[str] = []
     for base, pattern in ((Path(lock_dir), "*.lock"), (Path(orch_dir), "*.pid")):
-        if not base.exists():
-            continue
-        for meta in sorted(base.glob(pattern)):
-            if _has_owner_key(meta):
-                files.append(str(meta))
+        for meta_path, meta in scan_metadata(base, pattern):
+            if "owner" in meta:
+                files.append(str(meta_path))
     return files
 
 
-def load_pid_inventory(orch_dir: str | Path) -> list[dict[str, Any]]:
-    base = Path(orch_dir)
-    rows: list[dict[str, Any]] = []
-    if not base.exists():
-        return rows
+def pid_row(pid_meta: Path, meta: dict[str, str]) -> dict[str, Any]:
+    task_id = meta.get("task_id", "")
+    task_branch = meta.get("task_branch", "")
+    task_key = meta.get("task_key", "")
 
-    for pid_meta in sorted(base.glob("*.pid")):
-        if not pid_meta.is_file():
-            continue
-        task_id = read_field(pid_meta, "task_id")
-        task_branch = read_field(pid_meta, "task_branch")
-        task_key = read_field(pid_meta, "task_key")
-        scope = read_field(pid_meta, "scope")
-        pid = read_field(pid_meta, "pid")
-        worktree = read_field(pid_meta, "worktree")
-        tmux_session = read_field(pid_meta, "tmux_session")
-        launch_backend = read_field(pid_meta, "launch_backend")
-        log_file = read_field(pid_meta, "log_file")
-
-        key = task_key if task_key else _task_key(task_id, task_branch)
-        if not key:
-            key = f"PIDONLY:{pid_meta.stem}"
-        rows.append(
-            {
-                "key": key,
-                "task_id": task_id,
-                "task_branch": task_branch,
-                "task_key": key,
-                "scope": scope,
-                "pid": pid,
-                "pid_file": str(pid_meta),
-                "worktree": worktree,
-                "tmux_session": tmux_session,
-                "launch_backend": launch_backend,
-                "log_file": log_file,
-            }
-        )
-    return rows
+    key = task_key if task_key else _task_key(task_id, task_branch)
+    if not key:
+        key = f"PIDONLY:{pid_meta.stem}"
+    return {
+        "key": key,
+        "task_id": task_id,
+        "task_branch": task_branch,
+        "task_key": key,
+        "scope": meta.get("scope", ""),
+        "pid": meta.get("pid", ""),
+        "pid_file": str(pid_meta),
+        "worktree": meta.get("worktree", ""),
+        "tmux_session": meta.get("tmux_session", ""),
+        "launch_backend": meta.get("launch_backend", ""),
+        "log_file": meta.get("log_file", ""),
+        "proc_start": meta.get("proc_start", ""),
+        "started_at": meta.get("started_at", ""),
+        "launch_label": meta.get("launch_label", ""),
+    }
 
 
-def load_lock_inventory(lock_dir: str | Path) -> list[dict[str, Any]]:
-    base = Path(lock_dir)
-    rows: list[dict[str, Any]] = []
-    if not base.exists():
-        return rows
-
-    for lock_meta in sorted(base.glob("*.lock")):
-        task_id = read_field(lock_meta, "task_id")
-        task_branch = read_field(lock_meta, "task_branch")
-        task_key = read_field(lock_meta, "task_key")
-        scope = read_field(lock_meta, "scope")
-        worktree = read_field(lock_meta, "worktree")
-
-        key = task_key if task_key else _task_key(task_id, task_branch)
-        if not key:
-            key = f"LOCKONLY:{scope}:{lock_meta.name}"
-        rows.append(
-            {
-                "key": key,
-                "task_id": task_id,
-                "task_branch": task_branch,
-                "task_key": key,
-                "scope": scope,
-                "lock_file": str(lock_meta),
-                "worktree": worktree,
-            }
-        )
-    return rows
+def lock_row(lock_meta: Path, meta: dict[str, str]) -> dict[str, Any]:
+    task_id = meta.get("task_id", "")
+    task_branch = meta.get("task_branch", "")
+    task_key = meta.get("task_key", "")
+    scope = meta.get("scope", "")
+
+    key = task_key if task_key else _task_key(task_id, task_branch)
+    if not key:
+        key = f"LOCKONLY:{scope}:{lock_meta.name}"
+    return {
+        "key": key,
+        "task_id": task_id,
+        "task_branch": task_branch,
+        "task_key": key,
+        "scope": scope,
+        "lock_file": str(lock_meta),
+        "worktree": meta.get("worktree", ""),
+        # Locks taken before heartbeats existed fall back to their creation.
+        "heartbeat_at": meta.get("heartbeat_at", "") or meta.get("created_at", ""),
+    }
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_timestamp(value: str) -> float | None:
+    # timestamp_utc() format (2026-01-01T00:00:00Z) as epoch seconds.
+    try:
+        stamp = datetime.strptime(value.strip(), "%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        return None
+    return stamp.replace(tzinfo=timezone.utc).timestamp()
+
+
+def heartbeat_path_for(lock_file: str) -> str:
+    # `task heartbeat --file` touches this sibling instead of rewriting the lock.
+    base = lock_file[: -len(".lock")] if lock_file.endswith(".lock") else lock_file
+    return base + ".heartbeat"
+
+
+def last_heartbeat(lock_row: dict[str, Any]) -> float | None:
+    # Newest of the lock's heartbeat_at field and its heartbeat file's mtime.
+    stamps = [parse_timestamp(lock_row.get("heartbeat_at", ""))]
+    try:
+        stamps.append(os.stat(heartbeat_path_for(lock_row["lock_file"])).st_mtime)
+    except OSError:
+        pass
+    known = [stamp for stamp in stamps if stamp is not None]
+    return max(known) if known else None
+
+
+def load_pid_inventory(orch_dir: str | Path) -> list[dict[str, Any]]:
+    return [pid_row(pid_meta, meta) for pid_meta, meta in scan_metadata(orch_dir, "*.pid")]
 
 
-def classify_records(pid_rows: list[dict[str, Any]], lock_rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def load_lock_inventory(lock_dir: str | Path) -> list[dict[str, Any]]:
+    return [lock_row(lock_meta, meta) for lock_meta, meta in scan_metadata(lock_dir, "*.lock")]
+
+
+def identity_slug(value: str) -> str:
+    # Same as the shell's sanitize(), which names pid/lock metadata files.
+    return re.sub(r"[^a-z0-9._-]+", "-", value.lower()).strip("-")
+
+
+def task_metadata_paths(
+    orch_dir: str | Path,
+    lock_dir: str | Path,
+    task_id: str,
+    task_branch: str | None = None,
+) -> tuple[list[Path], list[Path]]:
+    # Candidate (pid, lock) metadata paths for one task, derived the way
+    # pid_meta_path_for_task/lock_meta_path_for_task name them. Without a
+    # branch every branch-qualified variant of the task id is included.
+    orch = Path(orch_dir)
+    locks = Path(lock_dir)
+    task_slug = identity_slug(task_id) or "task"
+    if task_branch:
+        branch_slug = identity_slug(task_branch) or "branch"
+        ident = f"{branch_slug}--{task_slug}"
+        return [orch / f"{ident}.pid"], [locks / f"task-{ident}.lock"]
+
+    pid_paths = [orch / f"{task_slug}.pid"]
+    lock_paths = [locks / f"task-{task_slug}.lock"]
+    if orch.is_dir():
+        pid_paths.extend(sorted(orch.glob(f"*--{task_slug}.pid")))
+    if locks.is_dir():
+        lock_paths.extend(sorted(locks.glob(f"task-*--{task_slug}.lock")))
+    return pid_paths, lock_paths
+
+
+def record_matches_task(record: dict[str, Any], task_id: str, task_branch: str | None = None) -> bool:
+    if record["task_id"] != task_id:
+        return False
+    return task_branch is None or str(record.get("task_branch") or "") == task_branch
+
+
+def lookup_task_records(
+    orch_dir: str | Path,
+    lock_dir: str | Path,
+    task_id: str,
+    task_branch: str | None = None,
+    heartbeat_ttl: int = 0,
+) -> list[dict[str, Any]]:
+    # classify_records() restricted to one task: only that task's pid/lock
+    # files are read and only its pids probed. Files that do not follow the
+    # slug naming are not found; callers fall back to the full inventory.
+    pid_paths, lock_paths = task_metadata_paths(orch_dir, lock_dir, task_id, task_branch)
+    by_key: dict[str, dict[str, Any]] = {}
+    for path in pid_paths:
+        meta = load_metadata(path)
+        if meta is not None:
+            row = pid_row(path, meta)
+            by_key.setdefault(row["key"], {})["pid"] = row
+    for path in lock_paths:
+        meta = load_metadata(path)
+        if meta is not None:
+            row = lock_row(path, meta)
+            by_key.setdefault(row["key"], {})["lock"] = row
+    records = classify_grouped(by_key, heartbeat_ttl=heartbeat_ttl)
+    return [record for record in records if record_matches_task(record, task_id, task_branch)]
+
+
+def classify_records(
+    pid_rows: list[dict[str, Any]],
+    lock_rows: list[dict[str, Any]],
+    processes: ProcessTable | None = None,
+    heartbeat_ttl: int = 0,
+    now: float | None = None,
+) -> list[dict[str, Any]]:
     by_key: dict[str, dict[str, Any]] = {}
 
     for row in pid_rows:
@@ -158,73 +289,150 @@ def classify_records(pid_rows: list[dict[str, Any]], lock_rows: list[dict[str, A
     for row in lock_rows:
         by_key.setdefault(row["key"], {})["lock"] = row
 
-    records: list[dict[str, Any]] = []
-
-    for key in sorted(by_key.keys()):
-        combined = by_key[key]
-        pid_row = combined.get("pid", {})
-        lock_row = combined.get("lock", {})
-
-        task_id = pid_row.get("task_id") or lock_row.get("task_id") or key
-        task_branch = pid_row.get("task_branch") or lock_row.get("task_branch") or ""
-        task_key = pid_row.get("task_key") or lock_row.get("task_key") or _task_key(str(task_id), str(task_branch)) or key
-        scope = pid_row.get("scope") or lock_row.get("scope") or ""
-        worktree = pid_row.get("worktree") or lock_row.get("worktree") or ""
-
-        pid = pid_row.get("pid", "")
-        pid_file = pid_row.get("pid_file", "")
-        lock_file = lock_row.get("lock_file", "")
-        tmux_session = pid_row.get("tmux_session", "")
-        launch_backend = pid_row.get("launch_backend", "")
-        log_file = pid_row.get("log_file", "")
-
-        pid_alive = bool(pid_file) and is_pid_alive(pid)
-        worktree_exists = bool(worktree) and Path(worktree).exists()
-
-        state = "UNKNOWN"
-        if worktree and not worktree_exists:
-            if lock_file and not pid_file:
-                state = "ORPHAN_LOCK"
-            elif pid_file and not lock_file:
-                state = "ORPHAN_PID"
-            else:
-                state = "MISSING_WORKTREE"
-        elif pid_file and lock_file and pid_alive:
-            state = "RUNNING"
-        elif pid_file and lock_file:
-            state = "LOCK_STALE"
-        elif pid_file and not lock_file and pid_alive:
-            state = "FINALIZING"
-        elif pid_file and not lock_file:
-            state = "FINALIZING_EXITED"
-        elif lock_file:
-            # Lock-only is valid for manual work in a dedicated worktree.
-            state = "LOCKED"
-
-        stale = is_stale_state(state)
-
-        records.append(
-            {
-                "key": task_key,
-                "task_id": task_id,
-                "task_branch": task_branch,
-                "task_key": task_key,
-                "scope": scope,
-                "state": state,
-                "pid": int(pid) if pid.isdigit() else None,
-                "pid_alive": pid_alive,
-                "pid_file": pid_file or None,
-                "lock_file": lock_file or None,
-                "worktree": worktree or None,
-                "tmux_session": tmux_session or None,
-                "launch_backend": launch_backend or None,
-                "log_file": log_file or None,
-                "worktree_exists": worktree_exists,
-                "stale": stale,
-            }
+    return classify_grouped(by_key, processes, heartbeat_ttl, now)
+
+
+def classify_grouped(
+    by_key: dict[str, dict[str, Any]],
+    processes: ProcessTable | None = None,
+    heartbeat_ttl: int = 0,
+    now: float | None = None,
+) -> list[dict[str, Any]]:
+    # by_key maps key -> {"pid": pid_row, "lock": lock_row} (either optional).
+    # Every pid is probed in one ProcessTable snapshot and every worktree is
+    # stat'ed once, so all records are classified against the same view.
+    # heartbeat_ttl > 0 turns LOCKED records whose last heartbeat (field or
+    # heartbeat file) is older than that many seconds into HEARTBEAT_STALE.
+    if processes is None:
+        processes = ProcessTable.snapshot(
+            pair["pid"].get("pid", "") for pair in by_key.values() if "pid" in pair
+        )
+    expired: set[str] = set()
+    if heartbeat_ttl > 0:
+        now = time.time() if now is None else now
+        for pair in by_key.values():
+            row = pair.get("lock")
+            if row is None:
+                continue
+            stamp = last_heartbeat(row)
+            if stamp is not None and now - stamp > heartbeat_ttl:
+                expired.add(row["lock_file"])
+    worktrees: dict[str, bool] = {}
+    return [
+        classify_pair(
+            key,
+            by_key[key].get("pid", {}),
+            by_key[key].get("lock", {}),
+            processes,
+            worktrees,
+            by_key[key].get("lock", {}).get("lock_file") in expired,
         )
+        for key in sorted(by_key.keys())
+    ]
+
+
+def classify_pair(
+    key: str,
+    pid_row: dict[str, Any],
+    lock_row: dict[str, Any],
+    processes: ProcessTable | None = None,
+    worktrees: dict[str, bool] | None = None,
+    heartbeat_expired: bool = False,
+) -> dict[str, Any]:
+    # pid_row/lock_row are pid_row()/lock_row() results sharing `key`, or {}
+    # when that side is missing. A pid recorded with proc_start is only live
+    # while the process holding it has that start time (pid reuse).
+    task_id = pid_row.get("task_id") or lock_row.get("task_id") or key
+    task_branch = pid_row.get("task_branch") or lock_row.get("task_branch") or ""
+    task_key = pid_row.get("task_key") or lock_row.get("task_key") or _task_key(str(task_id), str(task_branch)) or key
+    scope = pid_row.get("scope") or lock_row.get("scope") or ""
+    worktree = pid_row.get("worktree") or lock_row.get("worktree") or ""
+
+    pid = pid_row.get("pid", "")
+    pid_file = pid_row.get("pid_file", "")
+    lock_file = lock_row.get("lock_file", "")
+    tmux_session = pid_row.get("tmux_session", "")
+    launch_backend = pid_row.get("launch_backend", "")
+    log_file = pid_row.get("log_file", "")
+
+    proc_start = pid_row.get("proc_start", "")
+
+    if not pid_file:
+        pid_alive = False
+    elif processes is not None:
+        pid_alive = processes.alive(pid, proc_start)
+    else:
+        pid_alive = is_pid_alive(pid, proc_start)
+
+    if worktrees is None:
+        worktrees = {}
+    if worktree and worktree not in worktrees:
+        worktrees[worktree] = Path(worktree).exists()
+    worktree_exists = bool(worktree) and worktrees[worktree]
+
+    state = "UNKNOWN"
+    if worktree and not worktree_exists:
+        if lock_file and not pid_file:
+            state = "ORPHAN_LOCK"
+        elif pid_file and not lock_file:
+            state = "ORPHAN_PID"
+        else:
+            state = "MISSING_WORKTREE"
+    elif pid_file and lock_file and pid_alive:
+        state = "RUNNING"
+    elif pid_file and lock_file:
+        state = "LOCK_STALE"
+    elif pid_file and not lock_file and pid_alive:
+        state = "FINALIZING"
+    elif pid_file and not lock_file:
+        state = "FINALIZING_EXITED"
+    elif lock_file and heartbeat_expired:
+        # Lock-only, and nobody has run `task heartbeat` within the TTL.
+        state = "HEARTBEAT_STALE"
+    elif lock_file:
+        # Lock-only is valid for manual work in a dedicated worktree.
+        state = "LOCKED"
+
+    stale = is_stale_state(state)
 
-    return records
+    return {
+        "key": task_key,
+        "task_id": task_id,
+        "task_branch": task_branch,
+        "task_key": task_key,
+        "scope": scope,
+        "state": state,
+        "pid": int(pid) if pid.isdigit() else None,
+        "pid_alive": pid_alive,
+        "proc_start": proc_start or None,
+        "pid_file": pid_file or None,
+        "lock_file": lock_file or None,
+        "heartbeat_at": lock_row.get("heartbeat_at") or None,
+        "worktree": worktree or None,
+        "tmux_session": tmux_session or None,
+        "launch_backend": launch_backend or None,
+        "log_file": log_file or None,
+        "worktree_exists": worktree_exists,
+        "stale": stale,
+    }
+
+
+def diff_records(
+    previous: dict[str, dict[str, Any]],
+    records: list[dict[str, Any]],
+) -> list[tuple[dict[str, Any] | None, dict[str, Any] | None]]:
+    # (before, after) per key whose state changed between two
+    # classify_records results; None marks a record that appeared or went
+    # away. `previous` is keyed by record["key"].
+    current = {row["key"]: row for row in records}
+    changes: list[tuple[dict[str, Any] | None, dict[str, Any] | None]] = []
+    for key in sorted(set(previous) | set(current)):
+        before = previous.get(key)
+        after = current.get(key)
+        if before is not None and after is not None and before["state"] == after["state"]:
+            continue
+        changes.append((before, after))
+    return changes
 
 
 def summarize(records: list[dict[str, Any]]) -> dict[str, Any]:
@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+# SQLite backend for runtime coordination state (runtime.state_backend =
+# "sqlite"): lock and pid metadata, heartbeats and the updates journal live
+# in one WAL-mode database instead of locks/*.lock, orchestrator/*.pid and
+# LATEST_UPDATES.md. Records are keyed by the path they would have in the
+# file layout, so inventory rows, TSV contracts and shell callers address a
+# record the same way under either backend.
+
+import fnmatch
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from state_model import classify_grouped, lock_row, parse_metadata, pid_row, record_matches_task
+
+DB_NAME = "state.db"
+
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS locks (
+    path TEXT PRIMARY KEY,
+    task_key TEXT NOT NULL,
+    meta TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS locks_task_key ON locks(task_key);
+CREATE TABLE IF NOT EXISTS workers (
+    path TEXT PRIMARY KEY,
+    task_key TEXT NOT NULL,
+    meta TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS workers_task_key ON workers(task_key);
+CREATE TABLE IF NOT EXISTS updates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    source TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    summary TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS changes (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    counter INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO changes (id, counter) VALUES (1, 0);
+"""
+# Every write bumps changes.counter, so watchers can tell a real change from
+# the WAL traffic that any connection (readers included) causes.
+_SCHEMA += "".join(
+    f"CREATE TRIGGER IF NOT EXISTS {table}_{op.lower()} AFTER {op} ON {table} "
+    "BEGIN UPDATE changes SET counter = counter + 1 WHERE id = 1; END;\n"
+    for table in ("locks", "workers", "updates")
+    for op in ("INSERT", "UPDATE", "DELETE")
+)
+
+# Workers joined to locks on the indexed task_key, plus locks with no
+# worker: the pairs classify_records() would build from two directory walks.
+_INVENTORY_SQL = """
+SELECT w.task_key, w.path, w.meta, l.path, l.meta
+FROM workers AS w LEFT JOIN locks AS l ON l.task_key = w.task_key
+UNION ALL
+SELECT l.task_key, NULL, NULL, l.path, l.meta
+FROM locks AS l
+WHERE NOT EXISTS (SELECT 1 FROM workers AS w WHERE w.task_key = l.task_key)
+ORDER BY 1, 2, 4
+"""
+
+UPDATES_HEADER = """# Latest Updates
+
+| Timestamp (UTC) | Source | Task | Status | Summary |
+|---|---|---|---|---|
+"""
+
+
+class StateStoreError(RuntimeError):
+    pass
+
+
+def db_path_for(state_dir: str | Path) -> Path:
+    return Path(state_dir) / DB_NAME
+
+
+def table_for(path: str | Path) -> str:
+    suffix = Path(path).suffix
+    if suffix == ".lock":
+        return "locks"
+    if suffix == ".pid":
+        return "workers"
+    raise StateStoreError(f"not a lock or pid metadata path: {path}")
+
+
+def _row_key(table: str, path: str, meta: dict[str, str]) -> str:
+    if table == "locks":
+        return lock_row(Path(path), meta)["key"]
+    return pid_row(Path(path), meta)["key"]
+
+
+def _normalize_text(text: str) -> str:
+    return text if not text or text.endswith("\n") else text + "\n"
+
+
+def set_meta_field(text: str, key: str, value: str) -> str:
+    # Same edit as the shell heartbeat awk: every `key=` line is rewritten;
+    # a missing key is appended.
+    lines = text.splitlines()
+    found = False
+    for idx, line in enumerate(lines):
+        if line.split("=", 1)[0] == key:
+            lines[idx] = f"{key}={value}"
+            found = True
+    if not found:
+        lines.append(f"{key}={value}")
+    return "\n".join(lines) + "\n"
+
+
+def escape_update_cell(text: str) -> str:
+    return text.replace("|", "\\|")
+
+
+class StateStore:
+    def __init__(self, db_path: str | Path, timeout: float = 30.0) -> None:
+        self.path = Path(db_path)
+        self.timeout = timeout
+        self._ready = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: CLI calls, the engine
+        # daemon and the worker supervisor all share the file, and closing
+        # lets the last connection checkpoint the WAL.
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=self.timeout, isolation_level=None)
+        try:
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                    conn.executescript(_SCHEMA)
+                    conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+                self._ready = True
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE takes the write lock up front, so read-modify-write
+        # sequences cannot interleave with another writer.
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def change_counter(self) -> int | None:
+        # Read through a read-only connection: no mkdir, no migration and no
+        # checkpoint on close. None until a writer has created the counter.
+        try:
+            conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True, timeout=self.timeout)
+        except sqlite3.Error:
+            return None
+        try:
+            row = conn.execute("SELECT counter FROM changes WHERE id = 1").fetchone()
+        except sqlite3.Error:
+            return None
+        finally:
+            conn.close()
+        return None if row is None else int(row[0])
+
+    def get(self, path: str | Path) -> str | None:
+        table = table_for(path)
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT meta FROM {table} WHERE path = ?", (str(path),)).fetchone()
+        return None if row is None else str(row[0])
+
+    def create(self, path: str | Path, text: str) -> bool:
+        # Atomic acquisition: the primary key rejects a second writer.
+        table = table_for(path)
+        text = _normalize_text(text)
+        key = _row_key(table, str(path), parse_metadata(text))
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    f"INSERT INTO {table} (path, task_key, meta) VALUES (?, ?, ?)",
+                    (str(path), key, text),
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def put(self, path: str | Path, text: str) -> None:
+        table = table_for(path)
+        text = _normalize_text(text)
+        key = _row_key(table, str(path), parse_metadata(text))
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {table} (path, task_key, meta) VALUES (?, ?, ?)",
+                (str(path), key, text),
+            )
+
+    def set_field(self, path: str | Path, key: str, value: str) -> bool:
+        table = table_for(path)
+        with self._transaction() as conn:
+            row = conn.execute(f"SELECT meta FROM {table} WHERE path = ?", (str(path),)).fetchone()
+            if row is None:
+                return False
+            text = set_meta_field(str(row[0]), key, value)
+            conn.execute(
+                f"UPDATE {table} SET meta = ?, task_key = ? WHERE path = ?",
+                (text, _row_key(table, str(path), parse_metadata(text)), str(path)),
+            )
+        return True
+
+    def append(self, path: str | Path, text: str) -> bool:
+        # Like an O_APPEND write without O_CREAT: a removed record stays gone.
+        table = table_for(path)
+        with self._connect() as conn:
+            cur = conn.execute(
+                f"UPDATE {table} SET meta = meta || ? WHERE path = ?",
+                (_normalize_text(text), str(path)),
+            )
+        return cur.rowcount > 0
+
+    def remove(self, path: str | Path) -> bool:
+        table = table_for(path)
+        with self._connect() as conn:
+            cur = conn.execute(f"DELETE FROM {table} WHERE path = ?", (str(path),))
+        return cur.rowcount > 0
+
+    def glob(self, directory: str | Path, pattern: str) -> list[str]:
+        # `find DIR -maxdepth 1 -name PATTERN` over record paths.
+        table = table_for(pattern)
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT path FROM {table} ORDER BY path").fetchall()
+        base = str(directory)
+        return [
+            str(path) for (path,) in rows
+            if os.path.dirname(path) == base and fnmatch.fnmatchcase(os.path.basename(path), pattern)
+        ]
+
+    def records(self, table: str) -> list[tuple[Path, dict[str, str]]]:
+        if table not in ("locks", "workers"):
+            raise StateStoreError(f"unknown table: {table}")
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT path, meta FROM {table} ORDER BY path").fetchall()
+        return [(Path(path), parse_metadata(meta)) for path, meta in rows]
+
+    def lookup(self, table: str, task_key: str) -> list[tuple[Path, dict[str, str]]]:
+        if table not in ("locks", "workers"):
+            raise StateStoreError(f"unknown table: {table}")
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT path, meta FROM {table} WHERE task_key = ? ORDER BY path", (task_key,)
+            ).fetchall()
+        return [(Path(path), parse_metadata(meta)) for path, meta in rows]
+
+    def inventory(self, heartbeat_ttl: int = 0) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+        # Same (pid_rows, lock_rows, records) as load_pid_inventory +
+        # load_lock_inventory + classify_records, from one query.
+        with self._connect() as conn:
+            rows = conn.execute(_INVENTORY_SQL).fetchall()
+
+        pid_rows: dict[str, dict[str, Any]] = {}
+        lock_rows: dict[str, dict[str, Any]] = {}
+        by_key: dict[str, dict[str, dict[str, Any]]] = {}
+        for key, pid_path, pid_meta, lock_path, lock_meta in rows:
+            pair = by_key.setdefault(key, {})
+            if pid_path is not None:
+                pid_rows.setdefault(pid_path, pid_row(Path(pid_path), parse_metadata(pid_meta)))
+                pair["pid"] = pid_rows[pid_path]
+            if lock_path is not None:
+                lock_rows.setdefault(lock_path, lock_row(Path(lock_path), parse_metadata(lock_meta)))
+                pair["lock"] = lock_rows[lock_path]
+
+        records = classify_grouped(by_key, heartbeat_ttl=heartbeat_ttl)
+        return (
+            [pid_rows[path] for path in sorted(pid_rows)],
+            [lock_rows[path] for path in sorted(lock_rows)],
+            records,
+        )
+
+    def task_inventory(
+        self,
+        task_id: str,
+        task_branch: str | None = None,
+        heartbeat_ttl: int = 0,
+    ) -> list[dict[str, Any]]:
+        # lookup_task_records() for this backend: only rows keyed by the
+        # task (any branch when task_branch is None) are read.
+        if task_branch:
+            where, params = "task_key = ?", (f"{task_branch}::{task_id}",)
+        else:
+            where = "task_key = ? OR substr(task_key, -length(?) - 2) = '::' || ?"
+            params = (task_id, task_id, task_id)
+        by_key: dict[str, dict[str, dict[str, Any]]] = {}
+        with self._connect() as conn:
+            for table, side, make_row in (("workers", "pid", pid_row), ("locks", "lock", lock_row)):
+                for path, meta in conn.execute(f"SELECT path, meta FROM {table} WHERE {where} ORDER BY path", params):
+                    row = make_row(Path(path), parse_metadata(meta))
+                    by_key.setdefault(row["key"], {})[side] = row
+        records = classify_grouped(by_key, heartbeat_ttl=heartbeat_ttl)
+        return [record for record in records if record_matches_task(record, task_id, task_branch)]
+
+    def append_update(self, timestamp: str, source: str, task_id: str, status: str, summary: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO updates (timestamp, source, task_id, status, summary) VALUES (?, ?, ?, ?, ?)",
+                (timestamp, source, task_id, status, summary),
+            )
+
+    def updates(self, limit: int = 0) -> list[dict[str, str]]:
+        # Oldest first, like the rows of LATEST_UPDATES.md.
+        sql = "SELECT timestamp, source, task_id, status, summary FROM updates ORDER BY id DESC"
+        params: tuple[Any, ...] = ()
+        if limit > 0:
+            sql += " LIMIT ?"
+            params = (limit,)
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [
+            {"timestamp": ts, "source": source, "task_id": task_id, "status": status, "summary": summary}
+            for ts, source, task_id, status, summary in reversed(rows)
+        ]
+
+    def import_files(
+        self,
+        meta_files: list[tuple[Path, str]],
+        updates: list[dict[str, str]],
+    ) -> None:
+        with self._transaction() as conn:
+            for path, text in meta_files:
+                table = table_for(path)
+                text = _normalize_text(text)
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {table} (path, task_key, meta) VALUES (?, ?, ?)",
+                    (str(path), _row_key(table, str(path), parse_metadata(text)), text),
+                )
+            conn.executemany(
+                "INSERT INTO updates (timestamp, source, task_id, status, summary) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (u["timestamp"], u["source"], u["task_id"], u["status"], u["summary"])
+                    for u in updates
+                ],
+            )
+
+    def drain(self, sink: Callable[[list[tuple[Path, str]], list[dict[str, str]]], None]) -> None:
+        # Hands every record and update to `sink`, then deletes them in the
+        # same transaction; nothing is deleted when `sink` raises.
+        with self._transaction() as conn:
+            meta_files: list[tuple[Path, str]] = []
+            for table in ("locks", "workers"):
+                rows = conn.execute(f"SELECT path, meta FROM {table} ORDER BY path").fetchall()
+                meta_files.extend((Path(path), str(meta)) for path, meta in rows)
+            rows = conn.execute(
+                "SELECT timestamp, source, task_id, status, summary FROM updates ORDER BY id"
+            ).fetchall()
+            updates = [
+                {"timestamp": ts, "source": source, "task_id": task_id, "status": status, "summary": summary}
+                for ts, source, task_id, status, summary in rows
+            ]
+            sink(meta_files, updates)
+            for table in ("locks", "workers", "updates"):
+                conn.execute(f"DELETE FROM {table}")
+
+
+def open_state_store(ctx: dict[str, Any]) -> StateStore | None:
+    # None under the default "files" backend.
+    if ctx["runtime"].get("state_backend") != "sqlite":
+        return None
+    return StateStore(ctx["state_db"])
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from typing import Any
+
+from todo_parser import make_task_key, resolve_dep, split_deps
+
+
+DEPS_CYCLE = "deps_cycle"
+DEPS_DANGLING = "deps_dangling"
+DEPS_NOT_READY = "deps_not_ready"
+
+# Gate nodes share the status map with task keys; the prefix keeps a gate
+# `G1` apart from a task whose id happens to be `G1`.
+_GATE_PREFIX = "gate:"
+
+
+def gate_node(gate_id: str) -> str:
+    return f"{_GATE_PREFIX}{gate_id}"
+
+
+def node_label(node: str) -> str:
+    if node.startswith(_GATE_PREFIX):
+        return node[len(_GATE_PREFIX):]
+    return node.replace("::", ":")
+
+
+class TaskGraph:
+    # Built once per board: every deps reference is resolved to a node up
+    # front so readiness checks are a status lookup per edge.
+    def __init__(self, tasks: list[dict[str, str]], gates: dict[str, str]) -> None:
+        self.status: dict[str, str] = {gate_node(gate_id): state for gate_id, state in gates.items()}
+        self.deps: dict[str, tuple[str, ...]] = {}
+        self.dependents: dict[str, list[str]] = {}
+        self.dangling: dict[str, tuple[str, ...]] = {}
+
+        for task in tasks:
+            self.status[make_task_key(task.get("id", ""), task.get("branch", ""))] = task.get("status", "")
+
+        # Duplicate keys follow build_indexes(): the last row wins.
+        for task in tasks:
+            task_branch = str(task.get("branch") or "")
+            key = make_task_key(task.get("id", ""), task_branch)
+            resolved: list[str] = []
+            missing: list[str] = []
+            for dep in split_deps(task.get("deps", "")):
+                node = self._resolve(dep, task_branch)
+                if node is None:
+                    missing.append(dep)
+                elif node not in resolved:
+                    resolved.append(node)
+            self.deps[key] = tuple(resolved)
+            if missing:
+                self.dangling[key] = tuple(missing)
+            else:
+                self.dangling.pop(key, None)
+
+        for key, nodes in self.deps.items():
+            for node in nodes:
+                self.dependents.setdefault(node, []).append(key)
+
+        self.cycles = self._find_cycles()
+        self.cycle_of: dict[str, tuple[str, ...]] = {}
+        for cycle in self.cycles:
+            for key in cycle:
+                self.cycle_of[key] = cycle
+
+        self._metrics: dict[str, tuple[int, int]] | None = None
+
+    def _resolve(self, dep: str, task_branch: str) -> str | None:
+        kind, candidates = resolve_dep(dep, task_branch)
+        if kind == "gate":
+            node = gate_node(dep)
+            return node if node in self.status else None
+        # Like deps_ready(): any DONE candidate satisfies the reference (a
+        # legacy unbranched row can stand in for the branch-qualified one),
+        # otherwise the first candidate on the board is the blocking node.
+        present = [key for key in candidates if key in self.status]
+        for key in present:
+            if self.status[key] == "DONE":
+                return key
+        return present[0] if present else None
+
+    def _find_cycles(self) -> list[tuple[str, ...]]:
+        # Iterative Tarjan SCC over unfinished tasks only: an edge into a DONE
+        # task can never block anything, so a loop through one is harmless.
+        def edges(node: str) -> list[str]:
+            return [
+                nxt for nxt in self.deps.get(node, ())
+                if nxt in self.deps and self.status.get(nxt, "") != "DONE"
+            ]
+
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        cycles: list[tuple[str, ...]] = []
+
+        for root in self.deps:
+            if root in index or self.status.get(root, "") == "DONE":
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work: list[tuple[str, Any]] = [(root, iter(edges(root)))]
+
+            while work:
+                node, it = work[-1]
+                descended = False
+                for nxt in it:
+                    if nxt not in index:
+                        index[nxt] = low[nxt] = len(index)
+                        stack.append(nxt)
+                        on_stack.add(nxt)
+                        work.append((nxt, iter(edges(nxt))))
+                        descended = True
+                        break
+                    if nxt in on_stack:
+                        low[node] = min(low[node], index[nxt])
+                if descended:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] != index[node]:
+                    continue
+
+                component: list[str] = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1 or node in self.deps.get(node, ()):
+                    cycles.append(tuple(sorted(component)))
+
+        return cycles
+
+    def blocked(self, key: str) -> tuple[str, list[str]]:
+        # Returns ("", []) when every dependency is DONE, otherwise the
+        # exclusion reason and the references responsible for it.
+        cycle = self.cycle_of.get(key)
+        if cycle is not None:
+            return DEPS_CYCLE, [node_label(node) for node in cycle]
+
+        missing = self.dangling.get(key)
+        if missing:
+            return DEPS_DANGLING, list(missing)
+
+        pending = [node_label(node) for node in self.deps.get(key, ()) if self.status.get(node, "") != "DONE"]
+        if pending:
+            return DEPS_NOT_READY, pending
+        return "", []
+
+    def is_ready(self, key: str) -> bool:
+        return not self.blocked(key)[0]
+
+    def rank_metrics(self) -> dict[str, tuple[int, int]]:
+        # (critical_path, fanout) per unfinished task: the longest chain of
+        # unfinished tasks starting at it (itself included) and the number of
+        # distinct unfinished tasks transitively waiting on it. Cycle members
+        # are left out; they are blocked until the board is fixed.
+        if self._metrics is not None:
+            return self._metrics
+
+        nodes = [
+            key for key in self.deps
+            if self.status.get(key, "") != "DONE" and key not in self.cycle_of
+        ]
+        node_set = set(nodes)
+        indegree = {key: 0 for key in nodes}
+        for key in nodes:
+            for dep in self.deps[key]:
+                if dep in node_set:
+                    indegree[key] += 1
+
+        order = [key for key in nodes if indegree[key] == 0]
+        for key in order:
+            for child in self.dependents.get(key, ()):
+                if child in node_set:
+                    indegree[child] -= 1
+                    if indegree[child] == 0:
+                        order.append(child)
+
+        # Downstream sets as int bitsets keep the transitive fan-out at one
+        # OR per edge.
+        bit = {key: 1 << idx for idx, key in enumerate(order)}
+        downstream: dict[str, int] = {}
+        metrics: dict[str, tuple[int, int]] = {}
+        for key in reversed(order):
+            longest = 0
+            reach = 0
+            for child in self.dependents.get(key, ()):
+                if child not in node_set:
+                    continue
+                longest = max(longest, metrics[child][0])
+                reach |= bit[child] | downstream[child]
+            downstream[key] = reach
+            metrics[key] = (longest + 1, bin(reach).count("1"))
+
+        self._metrics = metrics
+        return metrics
+
+    def schedule_order(self, tasks: list[dict[str, str]]) -> list[dict[str, str]]:
+        # Longest critical path first, then widest fan-out; the sort is stable
+        # so ties keep board order.
+        metrics = self.rank_metrics()
+
+        def sort_key(task: dict[str, str]) -> tuple[int, int]:
+            critical_path, fanout = metrics.get(make_task_key(task.get("id", ""), task.get("branch", "")), (0, 0))
+            return -critical_path, -fanout
+
+        return sorted(tasks, key=sort_key)
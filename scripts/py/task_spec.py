@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import json
+import os
 import re
+import tempfile
+import time
 from pathlib import Path
 from typing import Any
 
+from stat_cache import stat_is_fresh
+
 REQUIRED_SECTIONS = ("Goal", "In Scope", "Acceptance Criteria")
 SUMMARY_SECTIONS = REQUIRED_SECTIONS + ("Subtasks",)
 
@@ -138,20 +144,8 @@ def _subtasks_summary(section: str) -> str:
     return _first_nonempty_line(section)
 
 
-def evaluate_task_spec(
-    repo_root: str | Path,
-    task_id: str,
-    spec_dir: str = ".codex-tasks/planning/specs",
-    task_branch: str = "",
-) -> dict[str, Any]:
-    rel_path = task_spec_rel_path_for_branch(task_id, task_branch, spec_dir)
-    spec_path = task_spec_abs_path(repo_root, task_id, spec_dir, task_branch)
-
+def _evaluate_spec_file(spec_path: Path) -> dict[str, Any]:
     result: dict[str, Any] = {
-        "task_id": task_id,
-        "task_branch": task_branch,
-        "spec_rel_path": rel_path,
-        "spec_path": str(spec_path),
         "exists": False,
         "valid": False,
         "errors": [],
@@ -202,3 +196,139 @@ def evaluate_task_spec(
     result["subtasks_summary"] = _subtasks_summary(sections.get("Subtasks", ""))
     result["valid"] = True
     return result
+
+
+def evaluate_task_spec(
+    repo_root: str | Path,
+    task_id: str,
+    spec_dir: str = ".codex-tasks/planning/specs",
+    task_branch: str = "",
+) -> dict[str, Any]:
+    rel_path = task_spec_rel_path_for_branch(task_id, task_branch, spec_dir)
+    spec_path = task_spec_abs_path(repo_root, task_id, spec_dir, task_branch)
+
+    return {
+        "task_id": task_id,
+        "task_branch": task_branch,
+        "spec_rel_path": rel_path,
+        "spec_path": str(spec_path),
+        **_evaluate_spec_file(spec_path),
+    }
+
+
+SPEC_INDEX_FORMAT = 1
+
+
+def spec_index_path(state_dir: str | Path) -> Path:
+    return Path(state_dir) / "cache" / "spec-index.json"
+
+
+class SpecIndex:
+    def __init__(self, index_file: str | Path | None = None) -> None:
+        self.index_file = Path(index_file) if index_file else None
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        if self.index_file is not None:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.index_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("format") != SPEC_INDEX_FORMAT:
+            return
+        entries = data.get("entries")
+        if isinstance(entries, dict):
+            self.entries = entries
+
+    def evaluate_file(self, spec_path: str | Path) -> dict[str, Any]:
+        path = Path(spec_path)
+        key = str(path)
+        try:
+            st = path.stat()
+        except OSError:
+            if self.entries.pop(key, None) is not None:
+                self.dirty = True
+            return _evaluate_spec_file(path)
+
+        entry = self.entries.get(key)
+        if (
+            entry is not None
+            and entry.get("mtime_ns") == st.st_mtime_ns
+            and entry.get("size") == st.st_size
+            and stat_is_fresh(int(entry.get("verified_ns", 0)), st.st_mtime_ns)
+        ):
+            self.hits += 1
+            result = dict(entry["result"])
+            result["errors"] = list(result.get("errors") or [])
+            return result
+
+        self.misses += 1
+        verified_ns = time.time_ns()
+        result = _evaluate_spec_file(path)
+        self.entries[key] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "verified_ns": verified_ns,
+            "result": result,
+        }
+        self.dirty = True
+        return dict(result, errors=list(result["errors"]))
+
+    def evaluate(
+        self,
+        repo_root: str | Path,
+        task_id: str,
+        spec_dir: str = ".codex-tasks/planning/specs",
+        task_branch: str = "",
+    ) -> dict[str, Any]:
+        rel_path = task_spec_rel_path_for_branch(task_id, task_branch, spec_dir)
+        spec_path = task_spec_abs_path(repo_root, task_id, spec_dir, task_branch)
+        return {
+            "task_id": task_id,
+            "task_branch": task_branch,
+            "spec_rel_path": rel_path,
+            "spec_path": str(spec_path),
+            **self.evaluate_file(spec_path),
+        }
+
+    def rebuild(self, spec_root: str | Path) -> int:
+        self.entries = {}
+        self.dirty = True
+        count = 0
+        root = Path(spec_root)
+        if root.is_dir():
+            for spec_path in sorted(root.rglob("*.md")):
+                if spec_path.is_file():
+                    self.evaluate_file(spec_path)
+                    count += 1
+        return count
+
+    def save(self) -> None:
+        if self.index_file is None or not self.dirty:
+            return
+        payload = json.dumps(
+            {"format": SPEC_INDEX_FORMAT, "entries": self.entries},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        # Best effort: an unwritable state dir only costs re-evaluation later.
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(prefix=f".{self.index_file.name}.", dir=str(self.index_file.parent))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    handle.write(payload)
+                os.replace(tmp_name, self.index_file)
+            except BaseException:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            return
+        self.dirty = False
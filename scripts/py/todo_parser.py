@@ -1,14 +1,33 @@
 from __future__ import annotations
 
+import fcntl
+import hashlib
+import json
+import marshal
+import os
 import re
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+from stat_cache import stat_is_fresh
 
 
 class TodoError(RuntimeError):
     pass
 
 
+class TodoTaskNotFound(TodoError):
+    pass
+
+
+class TodoTaskAmbiguous(TodoError):
+    pass
+
+
 _GATE_DEP_RE = re.compile(r"G\d+")
 _LEGACY_TASK_DEP_RE = re.compile(r"T\d+-\d+")
 _NUMERIC_TASK_DEP_RE = re.compile(r"\d{3}")
@@ -55,6 +74,12 @@ def _parse_markdown_row(line: str) -> list[str] | None:
     return ["", *cells, ""]
 
 
+def _serialize_markdown_row(cols: list[str]) -> str:
+    cells = cols[1:-1] if len(cols) >= 2 else cols
+    escaped_cells = [str(cell).strip().replace("|", "\\|") for cell in cells]
+    return "| " + " | ".join(escaped_cells) + " |"
+
+
 def _resolve_columns(lines: list[str], schema: dict[str, Any]) -> dict[str, int]:
     resolved = {
         "id_col": int(schema["id_col"]),
@@ -103,20 +128,17 @@ def make_task_key(task_id: str, task_branch: str = "") -> str:
     return tid
 
 
-def parse_todo(todo_file: str | Path, schema: dict[str, Any]) -> tuple[list[dict[str, str]], dict[str, str]]:
-    path = Path(todo_file)
-    if not path.exists():
-        raise TodoError(f"TODO file not found: {path}")
-
-    lines = path.read_text(encoding="utf-8").splitlines()
+def _parse_todo_lines(
+    lines: list[str], schema: dict[str, Any]
+) -> tuple[list[dict[str, str]], dict[str, str], dict[str, int]]:
     tasks: list[dict[str, str]] = []
 
-    cols = _resolve_columns(lines, schema)
-    id_col = int(cols["id_col"])
-    branch_col = int(cols["branch_col"])
-    title_col = int(cols["title_col"])
-    deps_col = int(cols["deps_col"])
-    status_col = int(cols["status_col"])
+    resolved = _resolve_columns(lines, schema)
+    id_col = int(resolved["id_col"])
+    branch_col = int(resolved["branch_col"])
+    title_col = int(resolved["title_col"])
+    deps_col = int(resolved["deps_col"])
+    status_col = int(resolved["status_col"])
 
     for line in lines:
         cols = _parse_markdown_row(line)
@@ -158,6 +180,152 @@ def parse_todo(todo_file: str | Path, schema: dict[str, Any]) -> tuple[list[dict
         state = (state_m.group(1) if state_m else "").strip().lower()
         gates[gate_id] = "DONE" if state in done_keywords else "PENDING"
 
+    return tasks, gates, resolved
+
+
+# Persistent parse cache (one file per board under <state_dir>/cache).
+#
+# A hit on (size, mtime_ns) skips reading the board entirely. Entries that are
+# not yet fresh (stat_cache.stat_is_fresh) fall back to the content hash.
+_CACHE_FORMAT = 1
+_COLUMN_KEYS = ("id_col", "branch_col", "title_col", "deps_col", "status_col")
+
+# Long-lived processes (daemon, dashboard) skip even the cache-file read when
+# the board's stat still matches the entry they last loaded. Results are shared,
+# so callers must treat them as read-only.
+_LOADED: dict[str, tuple[tuple[Any, ...], tuple[list[dict[str, str]], dict[str, str], dict[str, int]]]] = {}
+
+
+def _schema_digest(schema: dict[str, Any]) -> str:
+    blob = json.dumps(schema, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
+def todo_cache_path(cache_dir: str | Path, todo_file: str | Path) -> Path:
+    key = hashlib.blake2b(str(Path(todo_file).resolve()).encode("utf-8"), digest_size=8).hexdigest()
+    return Path(cache_dir) / f"todo-{key}.cache"
+
+
+def _read_parse_cache(cache_file: Path) -> tuple[Any, ...] | None:
+    try:
+        entry = marshal.loads(cache_file.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if (
+        not isinstance(entry, tuple)
+        or len(entry) != 10
+        or entry[0] != _CACHE_FORMAT
+        or entry[1] != tuple(sys.version_info[:2])
+    ):
+        return None
+    return entry
+
+
+def _write_parse_cache(cache_file: Path, entry: tuple[Any, ...]) -> None:
+    # Best effort: a read-only or full state dir only costs the next parse.
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{cache_file.name}.", dir=str(cache_file.parent))
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(marshal.dumps(entry))
+            os.replace(tmp_name, cache_file)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+    except OSError:
+        pass
+
+
+def _unpack_parse_cache(entry: tuple[Any, ...]) -> tuple[list[dict[str, str]], dict[str, str], dict[str, int]]:
+    tasks = [
+        {"id": task_id, "branch": branch, "title": title, "deps": deps, "status": status}
+        for task_id, branch, title, deps, status in entry[8]
+    ]
+    return tasks, dict(entry[9]), dict(zip(_COLUMN_KEYS, entry[7]))
+
+
+def load_todo(
+    todo_file: str | Path,
+    schema: dict[str, Any],
+    cache_dir: str | Path | None = None,
+) -> tuple[list[dict[str, str]], dict[str, str], dict[str, int]]:
+    path = Path(todo_file)
+    if not path.exists():
+        raise TodoError(f"TODO file not found: {path}")
+
+    if cache_dir is None:
+        return _parse_todo_lines(path.read_text(encoding="utf-8").splitlines(), schema)
+
+    st = path.stat()
+    schema_key = _schema_digest(schema)
+    cache_file = todo_cache_path(cache_dir, path)
+
+    loaded = _LOADED.get(str(cache_file))
+    if loaded is not None:
+        size, mtime_ns, verified_ns, loaded_schema = loaded[0]
+        if (
+            loaded_schema == schema_key
+            and size == st.st_size
+            and mtime_ns == st.st_mtime_ns
+            and stat_is_fresh(verified_ns, mtime_ns)
+        ):
+            return loaded[1]
+
+    entry = _read_parse_cache(cache_file)
+    if entry is not None and entry[2] != schema_key:
+        entry = None
+
+    if (
+        entry is not None
+        and entry[3] == st.st_size
+        and entry[4] == st.st_mtime_ns
+        and stat_is_fresh(entry[6], st.st_mtime_ns)
+    ):
+        result = _unpack_parse_cache(entry)
+        _LOADED[str(cache_file)] = ((entry[3], entry[4], entry[6], schema_key), result)
+        return result
+
+    raw = path.read_bytes()
+    content_key = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    if entry is not None and entry[5] == content_key:
+        result = _unpack_parse_cache(entry)
+        tasks_blob = entry[8]
+    else:
+        result = _parse_todo_lines(raw.decode("utf-8").splitlines(), schema)
+        tasks_blob = tuple(
+            (t["id"], t["branch"], t["title"], t["deps"], t["status"]) for t in result[0]
+        )
+
+    verified_ns = time.time_ns()
+    _write_parse_cache(
+        cache_file,
+        (
+            _CACHE_FORMAT,
+            tuple(sys.version_info[:2]),
+            schema_key,
+            st.st_size,
+            st.st_mtime_ns,
+            content_key,
+            verified_ns,
+            tuple(int(result[2][k]) for k in _COLUMN_KEYS),
+            tasks_blob,
+            dict(result[1]),
+        ),
+    )
+    _LOADED[str(cache_file)] = ((st.st_size, st.st_mtime_ns, verified_ns, schema_key), result)
+    return result
+
+
+def parse_todo(
+    todo_file: str | Path,
+    schema: dict[str, Any],
+    cache_dir: str | Path | None = None,
+) -> tuple[list[dict[str, str]], dict[str, str]]:
+    tasks, gates, _ = load_todo(todo_file, schema, cache_dir=cache_dir)
     return tasks, gates
 
 
@@ -168,42 +336,249 @@ def build_indexes(tasks: list[dict[str, str]]) -> dict[str, str]:
     }
 
 
+def split_deps(deps: str) -> list[str]:
+    raw = (deps or "").strip()
+    if not raw or raw == "-":
+        return []
+    return [dep.strip() for dep in raw.split(",") if dep.strip()]
+
+
+def resolve_dep(dep: str, task_branch: str = "") -> tuple[str, list[str]]:
+    # Returns ("gate", [gate_id]), ("task", [candidate keys...]) or ("", [])
+    # for references that match no known form.
+    if _GATE_DEP_RE.fullmatch(dep):
+        return "gate", [dep]
+
+    if _LEGACY_TASK_DEP_RE.fullmatch(dep):
+        dep_key = make_task_key(dep, "")
+    elif _NUMERIC_TASK_DEP_RE.fullmatch(dep):
+        dep_key = make_task_key(dep, task_branch)
+    else:
+        qualified = _QUALIFIED_TASK_DEP_RE.fullmatch(dep)
+        if not qualified:
+            return "", []
+        dep_key = make_task_key(qualified.group(2), qualified.group(1))
+
+    # Backward compatibility: if branch-qualified lookup misses,
+    # allow plain-id lookup for legacy boards without branch metadata.
+    if dep_key == dep:
+        return "task", [dep_key]
+    return "task", [dep_key, dep]
+
+
 def deps_ready(
     deps: str,
     task_status: dict[str, str],
     gate_status: dict[str, str],
     task_branch: str = "",
 ) -> bool:
-    raw = (deps or "").strip()
-    if not raw or raw == "-":
-        return True
+    for dep in split_deps(deps):
+        kind, candidates = resolve_dep(dep, task_branch)
+        if kind == "gate":
+            if gate_status.get(dep, "") != "DONE":
+                return False
+            continue
+        if not candidates:
+            return False
+        if not any(task_status.get(key, "") == "DONE" for key in candidates):
+            return False
+
+    return True
+
+
+def _index_task_rows(
+    lines: list[str], schema: dict[str, Any]
+) -> tuple[dict[str, int], dict[str, list[int]]]:
+    cols = _resolve_columns(lines, schema)
+    id_col = int(cols["id_col"])
 
-    for dep_raw in raw.split(","):
-        dep = dep_raw.strip()
-        if not dep:
+    rows_by_id: dict[str, list[int]] = {}
+    for idx, line in enumerate(lines):
+        row = _parse_markdown_row(line)
+        if row is None:
             continue
 
-        if _GATE_DEP_RE.fullmatch(dep):
-            if gate_status.get(dep, "") != "DONE":
-                return False
+        candidate_id = _field(row, id_col)
+        if not candidate_id or candidate_id == "ID" or set(candidate_id) == {"-"}:
             continue
+        rows_by_id.setdefault(candidate_id, []).append(idx)
+    return cols, rows_by_id
 
-        dep_key = ""
-        if _LEGACY_TASK_DEP_RE.fullmatch(dep):
-            dep_key = make_task_key(dep, "")
-        elif _NUMERIC_TASK_DEP_RE.fullmatch(dep):
-            dep_key = make_task_key(dep, task_branch)
-        else:
-            qualified = _QUALIFIED_TASK_DEP_RE.fullmatch(dep)
-            if qualified:
-                dep_key = make_task_key(qualified.group(2), qualified.group(1))
-            else:
-                return False
 
-        if task_status.get(dep_key, "") != "DONE":
-            # Backward compatibility: if branch-qualified lookup misses,
-            # allow plain-id lookup for legacy boards without branch metadata.
-            if task_status.get(dep, "") != "DONE":
-                return False
+def _match_task_row(
+    lines: list[str],
+    cols: dict[str, int],
+    rows_by_id: dict[str, list[int]],
+    task_id: str,
+    task_branch: str = "",
+) -> int:
+    task_id = (task_id or "").strip()
+    task_branch = (task_branch or "").strip()
+    if not task_id:
+        raise TodoError("task id missing")
 
-    return True
+    branch_col = int(cols["branch_col"])
+    matches = rows_by_id.get(task_id, [])
+    if branch_col > 0 and task_branch:
+        matches = [
+            idx for idx in matches
+            if _field(_parse_markdown_row(lines[idx]) or [], branch_col) == task_branch
+        ]
+
+    if not matches:
+        raise TodoTaskNotFound("task not found in TODO board")
+    if branch_col > 0 and not task_branch and len(matches) > 1:
+        raise TodoTaskAmbiguous("task id is ambiguous across branches; pass --branch")
+    return matches[0]
+
+
+def _find_task_row(
+    lines: list[str],
+    schema: dict[str, Any],
+    task_id: str,
+    task_branch: str = "",
+) -> tuple[int, list[str], dict[str, int]]:
+    if not (task_id or "").strip():
+        raise TodoError("task id missing")
+    cols, rows_by_id = _index_task_rows(lines, schema)
+    idx = _match_task_row(lines, cols, rows_by_id, task_id, task_branch)
+    return idx, _parse_markdown_row(lines[idx]) or [], cols
+
+
+def get_task_status(
+    todo_file: str | Path,
+    schema: dict[str, Any],
+    task_id: str,
+    task_branch: str = "",
+) -> str:
+    path = Path(todo_file)
+    if not path.exists():
+        raise TodoError(f"TODO file not found: {path}")
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    _, row, cols = _find_task_row(lines, schema, task_id, task_branch)
+    return _field(row, int(cols["status_col"]))
+
+
+@contextmanager
+def board_write_lock(todo_file: str | Path) -> Iterator[None]:
+    # Lock the board's directory rather than the board itself: writes replace
+    # the file, so a lock held on the old inode would not exclude the next
+    # writer.
+    fd = os.open(str(Path(todo_file).parent), os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _replace_text(path: Path, text: str) -> None:
+    # Readers never see a half-written board.
+    mode = path.stat().st_mode & 0o777
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _with_status(row: list[str], status_col: int, status: str) -> str:
+    status_idx = status_col - 1
+    if status_idx < 1:
+        raise TodoError(f"invalid column index: {status_col}")
+    # Keep the trailing split("|") sentinel after the last real cell.
+    cells = row[1:-1]
+    if status_idx - 1 >= len(cells):
+        cells.extend([""] * (status_idx - len(cells)))
+    cells[status_idx - 1] = status
+    return _serialize_markdown_row(["", *cells, ""])
+
+
+def apply_task_statuses(
+    todo_file: str | Path,
+    schema: dict[str, Any],
+    mutations: list[tuple[str, str, str]],
+    keep_statuses: tuple[str, ...] = (),
+) -> list[dict[str, str]]:
+    # Applies (task_id, task_branch, status) rows with one parse and at most
+    # one write. Rows whose current status is in keep_statuses (compared
+    # case-insensitively) are left alone. Row problems are reported per row;
+    # only board-level problems raise.
+    path = Path(todo_file)
+    if not path.exists():
+        raise TodoError(f"TODO file not found: {path}")
+    keep = {value.strip().upper() for value in keep_statuses if value.strip()}
+
+    results: list[dict[str, str]] = []
+    # Concurrent `run start --parallel` workers update the board at once; the
+    # read-modify-write must not lose another task's update.
+    with board_write_lock(path):
+        lines = path.read_text(encoding="utf-8").splitlines()
+        cols, rows_by_id = _index_task_rows(lines, schema)
+        status_col = int(cols["status_col"])
+        changed = False
+
+        for task_id, task_branch, status in mutations:
+            task_id = (task_id or "").strip()
+            task_branch = (task_branch or "").strip()
+            status = (status or "").strip()
+            result = {"task_id": task_id, "task_branch": task_branch, "status": status, "previous": ""}
+            results.append(result)
+
+            if not task_id or not status:
+                result.update({"result": "invalid", "detail": "task id and status are required"})
+                continue
+            try:
+                idx = _match_task_row(lines, cols, rows_by_id, task_id, task_branch)
+            except TodoTaskNotFound as exc:
+                result.update({"result": "not_found", "detail": str(exc)})
+                continue
+            except TodoTaskAmbiguous as exc:
+                result.update({"result": "ambiguous", "detail": str(exc)})
+                continue
+
+            row = _parse_markdown_row(lines[idx]) or []
+            previous = _field(row, status_col)
+            result["previous"] = previous
+            if previous.upper() in keep:
+                result.update({"result": "kept", "detail": f"task status is {previous}"})
+                continue
+            if previous == status:
+                result.update({"result": "unchanged", "detail": ""})
+                continue
+
+            lines[idx] = _with_status(row, status_col, status)
+            changed = True
+            result.update({"result": "updated", "detail": ""})
+
+        if changed:
+            _replace_text(path, "\n".join(lines) + "\n")
+
+    return results
+
+
+def set_task_status(
+    todo_file: str | Path,
+    schema: dict[str, Any],
+    task_id: str,
+    status: str,
+    task_branch: str = "",
+) -> None:
+    if not (task_id or "").strip():
+        raise TodoError("task id missing")
+
+    result = apply_task_statuses(todo_file, schema, [(task_id, task_branch, status)])[0]
+    if result["result"] == "not_found":
+        raise TodoTaskNotFound(result["detail"])
+    if result["result"] == "ambiguous":
+        raise TodoTaskAmbiguous(result["detail"])
+    if result["result"] == "invalid":
+        raise TodoError(result["detail"])
@@ -0,0 +1,453 @@
+from __future__ import annotations
+
+# One long-lived process per state dir that waits on every tmux worker pid
+# and runs `task auto-cleanup-exit` when one exits. It replaces the
+# per-worker `while kill -0 PID; do sleep 1; done` watcher shells.
+
+import errno
+import fcntl
+import os
+import select
+import signal
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from proc_table import ProcessTable, process_matches, read_proc_stat
+from state_model import load_metadata, parse_metadata, scan_metadata
+from state_store import StateStore
+
+LOCK_NAME = "supervisor.lock"
+
+# Only tmux workers ever had an exit watcher; exec/launchd workers keep
+# their existing lifecycle.
+SUPERVISED_BACKENDS = ("tmux",)
+
+
+def lock_path_for(orch_dir: str | Path) -> Path:
+    return Path(orch_dir) / LOCK_NAME
+
+
+def timestamp_utc() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def read_meta(path: str | Path, store: StateStore | None = None) -> dict[str, str]:
+    if store is not None:
+        return parse_metadata(store.get(path) or "")
+    return load_metadata(path) or {}
+
+
+def record_exit(pid_meta: str | Path, exited_at: str, exit_code: str = "", store: StateStore | None = None) -> bool:
+    # Append without O_CREAT: a concurrent `task stop` may already have
+    # removed the file, and it must not be resurrected.
+    lines = [f"exited_at={exited_at}"]
+    if exit_code:
+        lines.append(f"exit_code={exit_code}")
+    if store is not None:
+        return store.append(pid_meta, "\n".join(lines))
+    try:
+        fd = os.open(str(pid_meta), os.O_WRONLY | os.O_APPEND)
+    except FileNotFoundError:
+        return False
+    try:
+        os.write(fd, ("\n".join(lines) + "\n").encode("utf-8"))
+    finally:
+        os.close(fd)
+    return True
+
+
+def read_exit_status(exit_file: str) -> str:
+    # tmux workers append `printf '%s\n' "$?" > exit_file` to the worker
+    # command; empty when the pane was killed before it could write.
+    if not exit_file:
+        return ""
+    try:
+        text = Path(exit_file).read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return ""
+    return text if text.isdigit() else ""
+
+
+class PidfdWatcher:
+    # Linux: a pidfd becomes readable once the process exits, so one poll()
+    # covers every worker with no periodic wakeups.
+    def __init__(self, wake_fd: int) -> None:
+        self._poll = select.poll()
+        self._poll.register(wake_fd, select.POLLIN)
+        self._wake_fd = wake_fd
+        self._fds: dict[int, int] = {}
+        self._pids: dict[int, int] = {}
+
+    @staticmethod
+    def available() -> bool:
+        if not hasattr(os, "pidfd_open"):
+            return False
+        try:
+            fd = os.pidfd_open(os.getpid())
+        except OSError:
+            return False
+        os.close(fd)
+        return True
+
+    def add(self, pid: int, start_time: str = "") -> bool:
+        if pid in self._pids:
+            return True
+        # The pidfd pins whatever holds the pid now, so check it is still the
+        # recorded worker and not a reuse.
+        if not process_matches(pid, start_time):
+            return False
+        try:
+            fd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return False
+        self._pids[pid] = fd
+        self._fds[fd] = pid
+        self._poll.register(fd, select.POLLIN)
+        return True
+
+    def remove(self, pid: int) -> None:
+        fd = self._pids.pop(pid, None)
+        if fd is None:
+            return
+        self._fds.pop(fd, None)
+        self._poll.unregister(fd)
+        os.close(fd)
+
+    def pids(self) -> list[int]:
+        return list(self._pids)
+
+    def wait(self, timeout: float) -> list[int]:
+        events = self._poll.poll(max(0, int(timeout * 1000)))
+        exited: list[int] = []
+        for fd, _ in events:
+            if fd == self._wake_fd:
+                continue
+            pid = self._fds.get(fd)
+            if pid is not None:
+                exited.append(pid)
+        return exited
+
+
+class PollingWatcher:
+    # Fallback for kernels/platforms without pidfd: one ProcessTable
+    # snapshot of every worker per interval, all in this process.
+    def __init__(self, wake_fd: int, interval: float) -> None:
+        self._wake_fd = wake_fd
+        self._interval = max(0.05, interval)
+        # pid -> recorded proc_start ("" when unknown).
+        self._pids: dict[int, str] = {}
+
+    def add(self, pid: int, start_time: str = "") -> bool:
+        if not process_matches(pid, start_time):
+            return False
+        self._pids[pid] = start_time
+        return True
+
+    def remove(self, pid: int) -> None:
+        self._pids.pop(pid, None)
+
+    def pids(self) -> list[int]:
+        return list(self._pids)
+
+    def wait(self, timeout: float) -> list[int]:
+        timeout = min(timeout, self._interval) if self._pids else timeout
+        select.select([self._wake_fd], [], [], max(0.0, timeout))
+        processes = ProcessTable.snapshot(self._pids)
+        return [pid for pid, start in self._pids.items() if not processes.alive(pid, start)]
+
+
+class Supervisor:
+    def __init__(
+        self,
+        orch_dir: str | Path,
+        cleanup_argv: list[str],
+        idle_timeout: float = 60.0,
+        rescan_interval: float = 5.0,
+        poll_interval: float = 1.0,
+        log: Callable[[str], None] | None = None,
+        store: StateStore | None = None,
+        log_gc: Callable[[], dict[str, int] | None] | None = None,
+        log_gc_interval: float = 300.0,
+        max_cleanups: int = 4,
+    ) -> None:
+        self.orch_dir = Path(orch_dir)
+        # Set under runtime.state_backend = "sqlite": pid records live there.
+        self.store = store
+        self.cleanup_argv = list(cleanup_argv)
+        self.idle_timeout = idle_timeout
+        self.rescan_interval = rescan_interval
+        self.poll_interval = poll_interval
+        self._log = log or (lambda msg: print(msg, flush=True))
+        self._lock_fd: int | None = None
+        # pid -> pid metadata path it was adopted from.
+        self._watched: dict[int, Path] = {}
+        # (pid_meta, pid) pairs already cleaned up, so a failed cleanup is
+        # not retried on every rescan.
+        self._handled: set[tuple[str, int]] = set()
+        self._pending: list[int] = []
+        # auto-cleanup-exit children run alongside the watch loop, at most
+        # max_cleanups at once; the rest wait in _cleanup_queue.
+        self.max_cleanups = max(1, max_cleanups)
+        self._cleanups: list[tuple[subprocess.Popen, str]] = []
+        self._cleanup_queue: list[tuple[list[str], str]] = []
+        # Periodic ORCH_DIR/logs rotation/retention pass, run off the watch
+        # loop so compressing a large log never delays exit handling.
+        self.log_gc = log_gc
+        self.log_gc_interval = log_gc_interval
+        self._log_gc_thread: threading.Thread | None = None
+
+    def acquire(self) -> bool:
+        self.orch_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(lock_path_for(self.orch_dir)), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as exc:
+            os.close(fd)
+            if exc.errno in (errno.EAGAIN, errno.EACCES):
+                return False
+            raise
+        # "<pid> <proc_start>": launchers read it without python to decide
+        # between a SIGHUP and starting a supervisor (ensure_worker_supervisor).
+        stat = read_proc_stat(os.getpid())
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()} {stat[1] if stat else ''}\n".encode("ascii"))
+        self._lock_fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._lock_fd is None:
+            return
+        # Cleared first, so a launcher never mistakes an exiting supervisor
+        # for one that will still rescan.
+        os.ftruncate(self._lock_fd, 0)
+        os.close(self._lock_fd)
+        self._lock_fd = None
+
+    def _candidates(self) -> dict[int, tuple[Path, str]]:
+        # pid -> (pid metadata path, recorded proc_start).
+        found: dict[int, tuple[Path, str]] = {}
+        if self.store is not None:
+            records = self.store.records("workers")
+        else:
+            records = scan_metadata(self.orch_dir, "*.pid")
+        for pid_meta, meta in records:
+            if meta.get("launch_backend", "") not in SUPERVISED_BACKENDS:
+                continue
+            pid_text = meta.get("pid", "")
+            if not pid_text.isdigit():
+                continue
+            pid = int(pid_text)
+            if (str(pid_meta), pid) in self._handled:
+                continue
+            found[pid] = (pid_meta, meta.get("proc_start", ""))
+        return found
+
+    def rescan(self, watcher: PidfdWatcher | PollingWatcher) -> None:
+        # Adopts every tmux worker recorded under orch_dir, including ones
+        # launched before this supervisor started. Pids already gone (or
+        # reused) when adopted are queued for handling on the next loop pass.
+        candidates = self._candidates()
+        for pid in list(self._watched):
+            if pid not in candidates and pid not in self._pending:
+                watcher.remove(pid)
+                del self._watched[pid]
+        for pid, (pid_meta, start_time) in candidates.items():
+            if pid in self._watched:
+                continue
+            self._watched[pid] = pid_meta
+            if not watcher.add(pid, start_time):
+                self._pending.append(pid)
+
+    def handle_exit(self, pid: int) -> None:
+        pid_meta = self._watched.pop(pid, None)
+        if pid_meta is None:
+            return
+        self._handled.add((str(pid_meta), pid))
+
+        meta = read_meta(pid_meta, self.store)
+        if meta.get("pid", "") != str(pid):
+            # Stopped or relaunched by someone else in the meantime.
+            return
+
+        exit_code = read_exit_status(meta.get("exit_file", ""))
+        if "exited_at" not in meta:
+            record_exit(pid_meta, timestamp_utc(), exit_code, self.store)
+
+        task_id = meta.get("task_id", "")
+        if not task_id:
+            return
+        reason = f"worker exited (backend={meta.get('launch_backend', '')})"
+        if exit_code:
+            reason += f" exit_code={exit_code}"
+        argv = [*self.cleanup_argv, "task", "auto-cleanup-exit", task_id, str(pid)]
+        if meta.get("task_branch"):
+            argv.extend(["--branch", meta["task_branch"]])
+        argv.extend(["--reason", reason])
+
+        self._log(f"[SUPERVISOR] pid={pid} task={task_id} exited exit_code={exit_code or 'N/A'}")
+        self._cleanup_queue.append((argv, task_id))
+        self.reap_cleanups()
+
+    def reap_cleanups(self, wait: bool = False) -> bool:
+        # Collects finished cleanups and starts queued ones up to the cap;
+        # wait=True blocks until none is left. True while any is outstanding.
+        while True:
+            running: list[tuple[subprocess.Popen, str]] = []
+            for proc, task_id in self._cleanups:
+                if proc.poll() is None:
+                    running.append((proc, task_id))
+                elif proc.returncode != 0:
+                    self._log(f"[SUPERVISOR] cleanup exited with {proc.returncode} for task={task_id}")
+            self._cleanups = running
+            while self._cleanup_queue and len(self._cleanups) < self.max_cleanups:
+                argv, task_id = self._cleanup_queue.pop(0)
+                try:
+                    proc = subprocess.Popen(argv, stdin=subprocess.DEVNULL, stdout=sys.stdout, stderr=sys.stderr)
+                except OSError as exc:
+                    self._log(f"[SUPERVISOR] cleanup failed to start for task={task_id}: {exc}")
+                    continue
+                self._cleanups.append((proc, task_id))
+            if not wait or not self._cleanups:
+                return bool(self._cleanups)
+            self._cleanups[0][0].wait()
+
+    def _log_gc_pass(self) -> None:
+        assert self.log_gc is not None
+        try:
+            report = self.log_gc()
+        except OSError as exc:
+            self._log(f"[SUPERVISOR] logs gc failed: {exc}")
+            return
+        if report and (report["rotated"] or report["removed"]):
+            self._log(
+                f"[SUPERVISOR] logs gc rotated={report['rotated']} removed={report['removed']} "
+                f"freed_bytes={report['freed_bytes']}"
+            )
+
+    def start_log_gc(self) -> None:
+        if self.log_gc is None or (self._log_gc_thread is not None and self._log_gc_thread.is_alive()):
+            return
+        self._log_gc_thread = threading.Thread(target=self._log_gc_pass, name="log-gc", daemon=True)
+        self._log_gc_thread.start()
+
+    def run(self) -> None:
+        wake_r, wake_w = os.pipe()
+        os.set_blocking(wake_r, False)
+        os.set_blocking(wake_w, False)
+        # SIGHUP from a launcher means "new pid metadata, rescan now"; the
+        # wakeup fd turns it into a readable event for poll/select.
+        signal.set_wakeup_fd(wake_w)
+        woken = [True]
+
+        def on_hup(_signum: int, _frame: object) -> None:
+            woken[0] = True
+
+        def on_term(_signum: int, _frame: object) -> None:
+            raise SystemExit(0)
+
+        signal.signal(signal.SIGHUP, on_hup)
+        signal.signal(signal.SIGTERM, on_term)
+
+        if PidfdWatcher.available():
+            watcher: PidfdWatcher | PollingWatcher = PidfdWatcher(wake_r)
+        else:
+            watcher = PollingWatcher(wake_r, self.poll_interval)
+        self._log(f"[SUPERVISOR] watching {self.orch_dir} pid={os.getpid()} mode={type(watcher).__name__}")
+
+        next_scan = 0.0
+        next_log_gc = 0.0
+        idle_since: float | None = None
+        try:
+            while self.orch_dir.is_dir():
+                now = time.monotonic()
+                if woken[0] or now >= next_scan:
+                    woken[0] = False
+                    self.rescan(watcher)
+                    next_scan = now + self.rescan_interval
+                if self.log_gc is not None and now >= next_log_gc:
+                    self.start_log_gc()
+                    next_log_gc = now + self.log_gc_interval
+
+                busy = self.reap_cleanups()
+                if not self._pending:
+                    timeout = max(0.0, next_scan - time.monotonic())
+                    if busy:
+                        timeout = min(timeout, self.poll_interval)
+                    self._pending.extend(watcher.wait(timeout))
+                    try:
+                        while os.read(wake_r, 512):
+                            pass
+                    except BlockingIOError:
+                        pass
+
+                while self._pending:
+                    pid = self._pending.pop(0)
+                    watcher.remove(pid)
+                    self.handle_exit(pid)
+
+                if self._watched or self._cleanups or self._cleanup_queue:
+                    idle_since = None
+                    continue
+                if idle_since is None:
+                    idle_since = time.monotonic()
+                if self.idle_timeout <= 0 or time.monotonic() - idle_since < self.idle_timeout:
+                    continue
+
+                # Release before the last look: a launcher that wrote pid
+                # metadata and found the lock held is covered by this rescan,
+                # one that found it free starts its own supervisor.
+                self.release()
+                self.rescan(watcher)
+                if not self._watched or not self.acquire():
+                    break
+                idle_since = None
+        finally:
+            signal.set_wakeup_fd(-1)
+            for pid in watcher.pids():
+                watcher.remove(pid)
+            os.close(wake_r)
+            os.close(wake_w)
+            # Started cleanups run to completion; queued ones are redone by
+            # the next supervisor, which re-adopts their pid records.
+            self._cleanup_queue = []
+            self.reap_cleanups(wait=True)
+            if self._log_gc_thread is not None:
+                # Let a rotation in progress finish rather than cut it off
+                # between writing the segment and truncating the log.
+                self._log_gc_thread.join()
+            self.release()
+        self._log(f"[SUPERVISOR] exiting pid={os.getpid()}")
+
+
+def signal_running(orch_dir: str | Path) -> int:
+    # Returns the pid of the supervisor holding the lock after nudging it to
+    # rescan, or 0 when none is running.
+    path = lock_path_for(orch_dir)
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except FileNotFoundError:
+        return 0
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except OSError:
+            pass
+        else:
+            # Nobody holds it: the recorded pid is stale.
+            return 0
+        fields = os.read(fd, 64).decode("ascii", "replace").split()
+    finally:
+        os.close(fd)
+    if not fields or not fields[0].isdigit():
+        return 0
+    pid = int(fields[0])
+    try:
+        os.kill(pid, signal.SIGHUP)
+    except ProcessLookupError:
+        return 0
+    return pid
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+# Deferred worktree deletion. Instead of `git worktree remove --force`
+# deleting every file in the caller's critical path, a finished worktree is
+# renamed into <worktree_parent>/.trash (one rename on the same filesystem)
+# and its git admin entry is dropped; a detached low-priority reaper deletes
+# the trash afterwards.
+
+import errno
+import fcntl
+import os
+import stat
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+TRASH_DIR_NAME = ".trash"
+REAPER_LOCK_NAME = ".reaper.lock"
+
+
+class TrashError(RuntimeError):
+    pass
+
+
+def trash_dir_for(worktree_parent: str | Path) -> Path:
+    return Path(worktree_parent) / TRASH_DIR_NAME
+
+
+def worktree_admin_dir(worktree: str | Path) -> Path | None:
+    # A linked worktree's `.git` is a file: "gitdir: <common>/worktrees/<name>".
+    try:
+        text = (Path(worktree) / ".git").read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not text.startswith("gitdir:"):
+        return None
+    admin = Path(text[len("gitdir:") :].strip())
+    if not admin.is_absolute():
+        admin = (Path(worktree) / admin).resolve()
+    return admin if admin.parent.name == "worktrees" else None
+
+
+def move_to_trash(path: str | Path, trash_dir: str | Path) -> Path:
+    # os.rename never copies: a cross-device move raises EXDEV and the caller
+    # falls back to deleting in place.
+    source = Path(path)
+    trash = Path(trash_dir)
+    trash.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    base = f"{source.name}.{stamp}-{os.getpid()}"
+    target = trash / base
+    attempt = 0
+    while True:
+        try:
+            os.rename(source, target)
+            return target
+        except OSError as exc:
+            if exc.errno not in (errno.EEXIST, errno.ENOTEMPTY) or not target.exists():
+                raise
+        attempt += 1
+        target = trash / f"{base}-{attempt}"
+
+
+def detach_worktree(worktree: str | Path, trash_dir: str | Path) -> Path:
+    path = Path(worktree)
+    admin = worktree_admin_dir(path)
+    if admin is None:
+        raise TrashError(f"not a linked worktree: {path}")
+    if (admin / "locked").exists():
+        raise TrashError(f"worktree is locked: {path}")
+    target = move_to_trash(path, trash_dir)
+    # With the checkout gone the admin entry is what `git worktree prune`
+    # would drop; removing just this one leaves other entries alone.
+    _remove_tree(admin)
+    return target
+
+
+def _make_writable(path: str) -> None:
+    try:
+        os.chmod(path, stat.S_IRWXU)
+    except OSError:
+        pass
+
+
+def _remove_tree(root: Path, throttle: "_Throttle | None" = None) -> int:
+    # Bottom-up unlink that tolerates read-only directories; returns the
+    # number of entries removed.
+    removed = 0
+    if root.is_symlink() or not root.is_dir():
+        try:
+            os.unlink(root)
+            return 1
+        except FileNotFoundError:
+            return 0
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        for name in filenames + [d for d in dirnames if os.path.islink(os.path.join(dirpath, d))]:
+            entry = os.path.join(dirpath, name)
+            try:
+                os.unlink(entry)
+            except FileNotFoundError:
+                continue
+            except PermissionError:
+                _make_writable(dirpath)
+                os.unlink(entry)
+            removed += 1
+            if throttle is not None:
+                throttle.tick()
+        try:
+            os.rmdir(dirpath)
+        except FileNotFoundError:
+            continue
+        except PermissionError:
+            _make_writable(os.path.dirname(dirpath))
+            os.rmdir(dirpath)
+        removed += 1
+    return removed
+
+
+class _Throttle:
+    # Yields the disk for <pause> seconds after every <batch> unlinks so a
+    # large trash does not starve foreground git operations.
+    def __init__(self, batch: int, pause: float) -> None:
+        self.batch = max(1, batch)
+        self.pause = pause
+        self._count = 0
+
+    def tick(self) -> None:
+        self._count += 1
+        if self.pause > 0 and self._count % self.batch == 0:
+            time.sleep(self.pause)
+
+
+def _pending(trash: Path) -> list[Path]:
+    return [p for p in trash.iterdir() if p.name != REAPER_LOCK_NAME]
+
+
+def reap(trash_dir: str | Path, batch: int = 500, pause: float = 0.01) -> int | None:
+    # Deletes everything in the trash dir, including entries trashed while it
+    # runs. Returns the number of trashed paths removed, or None when another
+    # reaper already holds the lock.
+    trash = Path(trash_dir)
+    if not trash.is_dir():
+        return 0
+    throttle = _Throttle(batch, pause)
+    reaped = 0
+    while True:
+        fd = os.open(str(trash / REAPER_LOCK_NAME), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError as exc:
+                if exc.errno in (errno.EAGAIN, errno.EACCES):
+                    return reaped or None
+                raise
+            entries = _pending(trash)
+            while entries:
+                for entry in entries:
+                    try:
+                        _remove_tree(entry, throttle)
+                    except OSError:
+                        # Leave it for the next reaper run rather than spinning.
+                        return reaped
+                    reaped += 1
+                entries = _pending(trash)
+        finally:
+            os.close(fd)
+        # A path trashed between the last scan and the unlock saw the lock
+        # held and did not start its own reaper; pick it up here.
+        if not _pending(trash):
+            return reaped
@@ -17,14 +17,21 @@ python3 -m unittest discover -s tests -p 'test_*.py'
 
 smoke_tests=(
   tests/smoke/test_run_start_dry_run.sh
+  tests/smoke/test_engine_daemon_routing.sh
   tests/smoke/test_run_start_lock_cleanup.sh
   tests/smoke/test_task_lock_atomicity.sh
+  tests/smoke/test_state_backend_sqlite.sh
+  tests/smoke/test_cleanup_stale_heartbeat.sh
+  tests/smoke/test_task_stop_parallel_teardown.sh
+  tests/smoke/test_worktree_trash_reaper.sh
+  tests/smoke/test_logs_rotation_gc.sh
   tests/smoke/test_run_start_requires_task_spec.sh
   tests/smoke/test_run_start_after_done.sh
   tests/smoke/test_run_start_launch_codex_exec.sh
   tests/smoke/test_run_start_tmux_missing_policy.sh
   tests/smoke/test_run_start_auto_cleanup_on_exit.sh
   tests/smoke/test_run_start_rollback_kills_codex_on_launch_error.sh
+  tests/smoke/test_run_start_parallel_launch.sh
   tests/smoke/test_run_start_orphan_worktree_path_recovery.sh
   tests/smoke/test_run_start_scenario.sh
   tests/smoke/test_run_start_creates_missing_task_branch.sh
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Simulated plan makespan under each runtime.schedule_policy.
+
+Every task takes one round; each round starts up to --max-start ready tasks
+in policy order, then marks them DONE.
+
+Usage: python3 tests/benchmarks/bench_schedule_policy.py [--tasks N] [--max-start N] [--seed N]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts" / "py"))
+
+from task_graph import TaskGraph
+
+
+def _build_plan(tasks: int, seed: int) -> list[dict[str, str]]:
+    # A few deep chains listed after many independent leaves, which is the
+    # shape that makes board order launch leaves first.
+    rng = random.Random(seed)
+    rows: list[dict[str, str]] = []
+    leaves = tasks // 2
+    for idx in range(1, leaves + 1):
+        rows.append({"id": f"T1-{idx:03d}", "branch": "", "title": "leaf", "deps": "-", "status": "TODO"})
+    for idx in range(1, tasks - leaves + 1):
+        deps = "-"
+        if idx > 1 and rng.random() < 0.85:
+            deps = f"T2-{rng.randint(max(1, idx - 3), idx - 1):03d}"
+        rows.append({"id": f"T2-{idx:03d}", "branch": "", "title": "chain", "deps": deps, "status": "TODO"})
+    return rows
+
+
+def _makespan(tasks: list[dict[str, str]], max_start: int, policy: str) -> int:
+    tasks = [dict(task) for task in tasks]
+    rounds = 0
+    while any(task["status"] != "DONE" for task in tasks):
+        graph = TaskGraph(tasks, {})
+        candidates = [task for task in tasks if task["status"] == "TODO" and graph.is_ready(task["id"])]
+        if policy == "critical_path":
+            candidates = graph.schedule_order(candidates)
+        for task in candidates[:max_start]:
+            task["status"] = "DONE"
+        rounds += 1
+    return rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--max-start", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    plan = _build_plan(args.tasks, args.seed)
+    board = _makespan(plan, args.max_start, "board")
+    critical = _makespan(plan, args.max_start, "critical_path")
+    print(f"tasks={args.tasks} max_start={args.max_start}")
+    print(f"board:         {board} rounds")
+    print(f"critical_path: {critical} rounds ({board / critical:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
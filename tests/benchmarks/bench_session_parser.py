@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""JSONL decode cost of a worker session log: json.loads per line vs the active decoder (orjson/msgspec).
+
+Usage: python3 tests/benchmarks/bench_session_parser.py [--log PATH ...] [--events N] [--iterations N]
+
+Without --log a Codex `--json`-shaped log is synthesized; pass recorded worker
+logs (ORCH_DIR/logs/*.log) to measure real sessions.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts" / "py"))
+
+import session_parser
+from session_parser import SessionParser
+
+
+def _synthetic_log(events: int) -> str:
+    rng = random.Random(7)
+    words = ["the", "worker", "updates", "`scripts/py/engine.py`", "{", "}", "so", "tests", "pass", "\n", "é"]
+    lines: list[str] = [json.dumps({"type": "thread.started", "thread_id": "th_1"})]
+    item = 0
+    while len(lines) < events:
+        item += 1
+        for _ in range(rng.randint(5, 40)):
+            lines.append(json.dumps({
+                "type": "response.reasoning_summary_text.delta",
+                "item_id": f"rs_{item}",
+                "output_index": 0,
+                "delta": " ".join(rng.choice(words) for _ in range(rng.randint(1, 4))),
+            }, separators=(",", ":")))
+        for _ in range(rng.randint(20, 120)):
+            lines.append(json.dumps({
+                "type": "response.output_text.delta",
+                "item_id": f"msg_{item}",
+                "output_index": 1,
+                "content_index": 0,
+                "delta": " ".join(rng.choice(words) for _ in range(rng.randint(1, 3))),
+            }, separators=(",", ":")))
+        command = {"id": f"item_{item}", "type": "command_execution", "command": f"bash -lc 'rg -n item_{item} scripts'"}
+        lines.append(json.dumps({"type": "item.started", "item": {**command, "status": "in_progress"}}))
+        lines.append(json.dumps({
+            "type": "item.completed",
+            "item": {**command, "status": "completed", "exit_code": 0, "aggregated_output": "match\n" * rng.randint(1, 30)},
+        }))
+    return "\n".join(lines[:events]) + "\n"
+
+
+def _stdlib_every_line(text: str) -> list[dict]:
+    # The stdlib fallback: every `{` line goes through json.loads.
+    parsed = []
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(item, dict):
+            parsed.append(item)
+    return parsed
+
+
+def _measure(fn, text: str, iterations: int) -> float:
+    # Best-of-N keeps page-cache and scheduler noise out of the comparison.
+    fn(text)
+    best = float("inf")
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0
+
+
+def _render(events: list[dict]) -> list:
+    parser = SessionParser(max_blocks=220)
+    parser.ingest(events)
+    return parser.view(220)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log", action="append", default=[], help="Recorded worker log (repeatable)")
+    parser.add_argument("--events", type=int, default=60000)
+    parser.add_argument("--iterations", type=int, default=5)
+    opts = parser.parse_args()
+
+    if opts.log:
+        text = "".join(Path(p).read_text(encoding="utf-8", errors="replace") for p in opts.log)
+    else:
+        text = _synthetic_log(opts.events)
+    size_mb = len(text.encode("utf-8")) / (1024 * 1024)
+
+    baseline = _stdlib_every_line(text)
+    current = session_parser._iter_json_objects(text)
+    if len(baseline) != len(current) or _render(baseline) != _render(current):
+        raise SystemExit(f"{session_parser.JSON_DECODER} decode changed the rendered session")
+
+    baseline_ms = _measure(_stdlib_every_line, text, opts.iterations)
+    current_ms = _measure(session_parser._iter_json_objects, text, opts.iterations)
+
+    print(f"log={size_mb:.1f} MB events={len(current)} decoder={session_parser.JSON_DECODER}")
+    print(f"json.loads per line:         {baseline_ms:8.1f} ms ({baseline_ms / size_mb:6.1f} ms/MB)")
+    print(f"active decoder:              {current_ms:8.1f} ms ({current_ms / size_mb:6.1f} ms/MB)")
+    print(f"speedup:                     {baseline_ms / current_ms:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
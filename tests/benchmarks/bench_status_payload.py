@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Per-refresh cost of the status payload: independent section builds vs one snapshot.
+
+Usage: python3 tests/benchmarks/bench_status_payload.py [--tasks N] [--workers N] [--iterations N]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts" / "py"))
+
+import engine
+
+
+def _build_repo(repo_root: Path, tasks: int, workers: int) -> None:
+    repo_root.mkdir(parents=True, exist_ok=True)
+    subprocess.run(["git", "init", "-q"], cwd=repo_root, check=True)
+
+    planning = repo_root / ".codex-tasks" / "planning"
+    spec_dir = planning / "specs"
+    spec_dir.mkdir(parents=True, exist_ok=True)
+
+    rows = [
+        "# TODO Board",
+        "",
+        "| ID | Branch | Title | Deps | Notes | Status |",
+        "|---|---|---|---|---|---|",
+    ]
+    for idx in range(1, tasks + 1):
+        task_id = f"{idx % 1000:03d}"
+        branch = f"feature/b{idx // 1000}"
+        deps = f"{(idx - 1) % 1000:03d}" if idx % 3 else "-"
+        status = "DONE" if idx % 4 == 0 else "TODO"
+        rows.append(f"| {task_id} | {branch} | Task {idx} | {deps} | note | {status} |")
+        branch_dir = spec_dir / branch
+        branch_dir.mkdir(parents=True, exist_ok=True)
+        (branch_dir / f"{task_id}.md").write_text(
+            f"# Task Spec: {task_id}\n\n## Goal\nGoal {idx}.\n\n## In Scope\n- scope\n\n"
+            "## Acceptance Criteria\n- done\n",
+            encoding="utf-8",
+        )
+    (planning / "TODO.md").write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    state_dir = repo_root / ".codex-tasks"
+    lock_dir = state_dir / "locks"
+    orch_dir = state_dir / "orchestrator"
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    orch_dir.mkdir(parents=True, exist_ok=True)
+    for idx in range(workers):
+        task_id = f"{idx:03d}"
+        meta = [
+            f"task_id={task_id}",
+            "task_branch=feature/b0",
+            f"task_key=feature/b0::{task_id}",
+            f"scope=task-feature-b0-{task_id}",
+            f"worktree={repo_root}",
+        ]
+        (lock_dir / f"task-feature-b0--{task_id}.lock").write_text("\n".join(meta) + "\n", encoding="utf-8")
+        (orch_dir / f"feature-b0--{task_id}.pid").write_text(
+            "\n".join([*meta, f"pid={os.getpid()}", "launch_backend=tmux"]) + "\n",
+            encoding="utf-8",
+        )
+
+
+def _independent_refresh(args: argparse.Namespace) -> None:
+    # Pre-snapshot behaviour: every section resolves context and reloads its inputs.
+    engine._ready_payload(args)
+    engine._inventory_payload(args)
+    engine._task_board_payload(args)
+    engine._updates_payload(args)
+
+
+def _snapshot_refresh(args: argparse.Namespace) -> None:
+    engine._status_payload(args)
+
+
+def _measure(fn, args: argparse.Namespace, iterations: int) -> float:
+    # Best-of-N keeps page-cache and scheduler noise out of the comparison.
+    fn(args)
+    best = float("inf")
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn(args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=3000)
+    parser.add_argument("--workers", type=int, default=40)
+    parser.add_argument("--iterations", type=int, default=7)
+    opts = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        repo_root = Path(td) / "repo"
+        _build_repo(repo_root, opts.tasks, opts.workers)
+        args = engine.build_parser().parse_args(["status", "--repo", str(repo_root)])
+
+        independent_ms = _measure(_independent_refresh, args, opts.iterations)
+        snapshot_ms = _measure(_snapshot_refresh, args, opts.iterations)
+
+    print(f"tasks={opts.tasks} workers={opts.workers} iterations={opts.iterations}")
+    print(f"independent sections: {independent_ms:8.1f} ms/refresh")
+    print(f"shared snapshot:      {snapshot_ms:8.1f} ms/refresh")
+    print(f"speedup:              {independent_ms / snapshot_ms:8.2f}x")
+    if snapshot_ms >= independent_ms:
+        raise SystemExit("shared snapshot is not cheaper than independent section builds")
+
+
+if __name__ == "__main__":
+    main()
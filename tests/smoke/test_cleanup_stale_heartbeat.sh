@@ -0,0 +1,97 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
+CLI="$ROOT/scripts/codex-tasks"
+ENGINE="$ROOT/scripts/py/engine.py"
+
+TMP_DIR="$(mktemp -d)"
+trap 'rm -rf "$TMP_DIR"' EXIT
+
+REPO="$TMP_DIR/repo"
+WORKTREE="$TMP_DIR/worker"
+STATE_DIR="$REPO/.codex-tasks"
+LOCK_FILE="$STATE_DIR/locks/task-main--101.lock"
+HEARTBEAT_FILE="$STATE_DIR/locks/task-main--101.heartbeat"
+
+mkdir -p "$REPO"
+git -C "$REPO" init -q
+git -C "$REPO" checkout -q -b main
+
+cat > "$REPO/README.md" <<'EOF'
+# Heartbeat staleness
+EOF
+
+git -C "$REPO" add README.md
+git -C "$REPO" commit -q -m "chore: init"
+
+"$CLI" --repo "$REPO" task init >/dev/null
+cat >> "$STATE_DIR/planning/TODO.md" <<'EOF'
+| 101 | main | Hung task | - | note | TODO |
+EOF
+git -C "$REPO" worktree add -q -b codex/heartbeat-check "$WORKTREE" main
+
+worker_cli() {
+  (cd "$WORKTREE" && "$CLI" --repo "$WORKTREE" --state-dir "$STATE_DIR" "$@")
+}
+
+lock_state() {
+  python3 "$ENGINE" inventory --repo "$REPO" --format tsv | awk -F'\t' '$2 == "101" {print $6}'
+}
+
+age_heartbeat() {
+  sed -i.bak 's/^heartbeat_at=.*/heartbeat_at=2020-01-01T00:00:00Z/' "$LOCK_FILE"
+  rm -f "$LOCK_FILE.bak"
+  touch -t 202001010000 "$HEARTBEAT_FILE"
+}
+
+lock_out="$(worker_cli task lock 101 --branch main)"
+[[ "$lock_out" == *"Heartbeat file: $HEARTBEAT_FILE"* && -f "$HEARTBEAT_FILE" ]] || {
+  echo "task lock should create and report the heartbeat file"
+  printf '%s\n' "$lock_out"
+  exit 1
+}
+worker_cli task update 101 IN_PROGRESS "started" --branch main >/dev/null
+
+# TTL disabled (default): an old heartbeat stays LOCKED.
+age_heartbeat
+[[ "$(lock_state)" == "LOCKED" ]] || { echo "expected LOCKED with heartbeat_ttl_seconds = 0"; exit 1; }
+
+sed -i.bak 's/^heartbeat_ttl_seconds = .*/heartbeat_ttl_seconds = 600/' "$STATE_DIR/orchestrator.toml"
+[[ "$(lock_state)" == "HEARTBEAT_STALE" ]] || { echo "expected HEARTBEAT_STALE, got $(lock_state)"; exit 1; }
+python3 "$ENGINE" select-stale --repo "$REPO" --format tsv | grep -q $'\tHEARTBEAT_STALE\t' || {
+  echo "select-stale should include HEARTBEAT_STALE records"
+  exit 1
+}
+
+worker_cli task heartbeat 101 --branch main >/dev/null
+[[ "$(lock_state)" == "LOCKED" ]] || { echo "a fresh heartbeat should restore LOCKED"; exit 1; }
+
+# Fast path: no repo/context needed, only the heartbeat file.
+age_heartbeat
+[[ "$(lock_state)" == "HEARTBEAT_STALE" ]] || { echo "expected HEARTBEAT_STALE after aging"; exit 1; }
+lock_before="$(cat "$LOCK_FILE")"
+(cd "$TMP_DIR" && "$CLI" task heartbeat --file "$HEARTBEAT_FILE" >/dev/null)
+[[ "$(lock_state)" == "LOCKED" ]] || { echo "touching the heartbeat file should restore LOCKED"; exit 1; }
+[[ "$(cat "$LOCK_FILE")" == "$lock_before" ]] || { echo "fast heartbeat must not rewrite the lock"; exit 1; }
+
+age_heartbeat
+cleanup_out="$("$CLI" --repo "$REPO" task cleanup-stale --apply)"
+if [[ "$cleanup_out" != *"state=HEARTBEAT_STALE"* || "$cleanup_out" != *"[OK] lock removed"* ]]; then
+  echo "cleanup-stale did not act on the HEARTBEAT_STALE lock"
+  printf '%s\n' "$cleanup_out"
+  exit 1
+fi
+[[ ! -e "$LOCK_FILE" && ! -e "$HEARTBEAT_FILE" ]] || { echo "lock and heartbeat file should be removed"; exit 1; }
+if "$CLI" task heartbeat --file "$HEARTBEAT_FILE" >/dev/null 2>&1; then
+  echo "fast heartbeat should fail once the lock is gone"
+  exit 1
+fi
+[[ ! -e "$HEARTBEAT_FILE" ]] || { echo "fast heartbeat recreated the heartbeat file"; exit 1; }
+grep -q '^| 101 | main | Hung task | - | note | TODO |$' "$STATE_DIR/planning/TODO.md" || {
+  echo "TODO row should be rolled back to TODO"
+  cat "$STATE_DIR/planning/TODO.md"
+  exit 1
+}
+
+echo "cleanup-stale heartbeat smoke test passed"
@@ -0,0 +1,54 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
+CLI="$ROOT/scripts/codex-tasks"
+
+TMP_DIR="$(mktemp -d)"
+REPO="$TMP_DIR/repo"
+
+cleanup() {
+  if [[ -d "$REPO" ]]; then
+    "$CLI" --repo "$REPO" daemon stop >/dev/null 2>&1 || true
+  fi
+  rm -rf "$TMP_DIR"
+}
+trap cleanup EXIT
+
+mkdir -p "$REPO"
+git -C "$REPO" init -q
+mkdir -p "$REPO/.codex-tasks/planning/specs"
+
+cat > "$REPO/.codex-tasks/planning/TODO.md" <<'EOF'
+# TODO Board
+
+| ID | Branch | Title | Deps | Notes | Status |
+|---|---|---|---|---|---|
+| T1-001 |  | First task | - | | TODO |
+| T1-002 |  | Depends on first | T1-001 | | TODO |
+EOF
+
+"$CLI" --repo "$REPO" task scaffold-specs >/dev/null
+
+START_OUT="$("$CLI" --repo "$REPO" daemon start)"
+echo "$START_OUT"
+echo "$START_OUT" | grep -q "Engine daemon started"
+
+SOCKET="$REPO/.codex-tasks/orchestrator/engine.sock"
+[[ -S "$SOCKET" ]] || { echo "missing daemon socket: $SOCKET"; exit 1; }
+
+"$CLI" --repo "$REPO" daemon status | grep -q "Engine daemon: running"
+
+OUTPUT="$("$CLI" --repo "$REPO" --state-dir .codex-tasks run start --dry-run --trigger smoke)"
+echo "$OUTPUT"
+echo "$OUTPUT" | grep -q "reason=deps_not_ready"
+echo "$OUTPUT" | grep -q "\[DRY-RUN\].*T1-001"
+
+"$CLI" --repo "$REPO" daemon stop | grep -q "Engine daemon stopped"
+[[ ! -e "$SOCKET" ]] || { echo "daemon socket left behind: $SOCKET"; exit 1; }
+
+# Without a daemon the same command spawns the engine directly.
+OUTPUT="$("$CLI" --repo "$REPO" run start --dry-run --trigger smoke)"
+echo "$OUTPUT" | grep -q "\[DRY-RUN\].*T1-001"
+
+echo "engine daemon routing smoke test passed"
@@ -80,6 +80,17 @@ fi
 grep -q '^launch_backend=tmux$' "$PID_META"
 grep -q '^task_id=T8-001$' "$PID_META"
 
+if [[ -r "/proc/$PID/stat" ]]; then
+  PROC_START="$(awk -F'=' '$1=="proc_start"{print $2}' "$PID_META")"
+  STAT="$(cat "/proc/$PID/stat")"
+  read -r -a STAT_FIELDS <<< "${STAT##*) }"
+  if [[ "$PROC_START" != "${STAT_FIELDS[19]}" ]]; then
+    echo "pid metadata should record the worker start time: $PROC_START"
+    exit 1
+  fi
+  grep -q '^proc_cmd=.' "$PID_META"
+fi
+
 SESSION="$(awk -F'=' '$1=="tmux_session"{print $2}' "$PID_META" | sed 's/^[[:space:]]*//; s/[[:space:]]*$//')"
 if [[ -z "$SESSION" || "$SESSION" == "N/A" ]]; then
   echo "missing tmux session in metadata: $SESSION"
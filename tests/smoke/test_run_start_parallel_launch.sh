@@ -0,0 +1,105 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
+CLI="$ROOT/scripts/codex-tasks"
+
+TMP_DIR="$(mktemp -d)"
+REPO="$TMP_DIR/repo"
+FAKE_BIN="$TMP_DIR/fake-bin"
+
+cleanup() {
+  if [[ -d "$REPO" ]]; then
+    PATH="$FAKE_BIN:$PATH" \
+      "$CLI" --repo "$REPO" task stop --all --apply --reason "smoke parallel cleanup" >/dev/null 2>&1 || true
+  fi
+  rm -rf "$TMP_DIR"
+}
+trap cleanup EXIT
+
+mkdir -p "$REPO" "$FAKE_BIN"
+git -C "$REPO" init -q
+mkdir -p "$REPO/.codex-tasks/planning/specs"
+git -C "$REPO" checkout -q -b main
+
+cat > "$REPO/README.md" <<'EOF2'
+# Parallel Launch Repo
+EOF2
+git -C "$REPO" add README.md
+git -C "$REPO" commit -q -m "chore: init"
+
+cat > "$FAKE_BIN/codex" <<'EOF2'
+#!/usr/bin/env bash
+set -euo pipefail
+[[ "${1:-}" == "exec" ]] || exit 2
+while true; do sleep 5; done
+EOF2
+chmod +x "$FAKE_BIN/codex"
+
+"$CLI" --repo "$REPO" task init
+
+cat > "$REPO/.codex-tasks/planning/TODO.md" <<'EOF2'
+# TODO Board
+
+| ID | Branch | Title | Deps | Notes | Status |
+|---|---|---|---|---|---|
+| T9-001 |  | Parallel one | - | seed | TODO |
+| T9-002 |  | Parallel two | - | seed | TODO |
+| T9-003 |  | Parallel three | - | force launch failure | TODO |
+| T9-004 |  | Parallel four | - | seed | TODO |
+| T9-005 |  | Parallel five | - | seed | TODO |
+| T9-006 |  | Blocked | T9-001 | seed | TODO |
+EOF2
+git -C "$REPO" add -f .codex-tasks/planning/TODO.md
+git -C "$REPO" commit -q -m "chore: seed todo"
+"$CLI" --repo "$REPO" task scaffold-specs
+git -C "$REPO" add -f .codex-tasks/planning/specs
+git -C "$REPO" commit -q -m "chore: scaffold task specs"
+
+# Force a launch metadata write failure for one task so its rollback runs
+# while the other starts are in flight.
+mkdir -p "$REPO/.codex-tasks/orchestrator/t9-003.pid"
+
+OUT="$(PATH="$FAKE_BIN:$PATH" "$CLI" --repo "$REPO" run start --parallel 3 --trigger smoke-parallel)"
+echo "$OUT"
+
+echo "$OUT" | grep -q "Launch pool: parallel=3"
+echo "$OUT" | grep -q "Failed to launch codex worker: task=T9-003"
+echo "$OUT" | grep -q "Started tasks: 4"
+echo "$OUT" | grep -q "Coordination: locks=4"
+
+# Every concurrent board write landed; the failed start was rolled back.
+TODO_FILE="$REPO/.codex-tasks/planning/TODO.md"
+for task_id in T9-001 T9-002 T9-004 T9-005; do
+  grep -q "| $task_id | .* | IN_PROGRESS |$" "$TODO_FILE"
+done
+grep -q "| T9-003 | .* | TODO |$" "$TODO_FILE"
+grep -q "| T9-006 | .* | TODO |$" "$TODO_FILE"
+
+if git -C "$REPO" rev-parse --verify codex/t9-003 >/dev/null 2>&1; then
+  echo "rolled-back branch still exists: codex/t9-003"
+  exit 1
+fi
+WT_COUNT="$(git -C "$REPO" worktree list | wc -l | tr -d ' ')"
+if [[ "$WT_COUNT" != "5" ]]; then
+  echo "unexpected worktree count: $WT_COUNT (expected 5)"
+  exit 1
+fi
+
+# Stopping every worker rolls the board back in one batched write.
+STOP_OUT="$(PATH="$FAKE_BIN:$PATH" "$CLI" --repo "$REPO" task stop --all --apply --reason "smoke parallel stop")"
+echo "$STOP_OUT"
+echo "$STOP_OUT" | grep -q "Summary: success=4 failed=0"
+if [[ "$(echo "$STOP_OUT" | grep -c "\[OK\] TODO rollback: updated TODO to TODO")" != "4" ]]; then
+  echo "expected 4 TODO rollbacks"
+  exit 1
+fi
+for task_id in T9-001 T9-002 T9-003 T9-004 T9-005; do
+  grep -q "| $task_id | .* | TODO |$" "$TODO_FILE"
+done
+if [[ "$(grep -c "Stopped by codex-tasks: smoke parallel stop" "$REPO/.codex-tasks/LATEST_UPDATES.md")" != "4" ]]; then
+  echo "expected 4 rollback update log rows"
+  exit 1
+fi
+
+echo "run start parallel launch smoke test passed"
@@ -0,0 +1,123 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
+CLI="$ROOT/scripts/codex-tasks"
+ENGINE="$ROOT/scripts/py/engine.py"
+
+TMP_DIR="$(mktemp -d)"
+trap 'rm -rf "$TMP_DIR"' EXIT
+
+REPO="$TMP_DIR/repo"
+WORKTREE="$TMP_DIR/worker"
+STATE_DIR="$REPO/.codex-tasks"
+LOCK_101="$STATE_DIR/locks/task-main--101.lock"
+LOCK_102="$STATE_DIR/locks/task-main--102.lock"
+
+mkdir -p "$REPO"
+git -C "$REPO" init -q
+git -C "$REPO" checkout -q -b main
+
+cat > "$REPO/README.md" <<'EOF'
+# SQLite state backend
+EOF
+
+git -C "$REPO" add README.md
+git -C "$REPO" commit -q -m "chore: init"
+
+"$CLI" --repo "$REPO" task init >/dev/null
+cat >> "$STATE_DIR/planning/TODO.md" <<'EOF'
+| 101 | main | First | - | note | TODO |
+| 102 | main | Second | - | note | TODO |
+EOF
+git -C "$REPO" worktree add -q -b codex/sqlite-check "$WORKTREE" main
+
+worker_cli() {
+  (cd "$WORKTREE" && "$CLI" --repo "$WORKTREE" --state-dir "$STATE_DIR" "$@")
+}
+
+# Start on the file layout, then switch and migrate.
+worker_cli task lock 101 --branch main >/dev/null
+worker_cli task update 101 IN_PROGRESS "started | from files" --branch main >/dev/null
+[[ -f "$LOCK_101" ]] || { echo "file lock missing before migrate"; exit 1; }
+
+if "$CLI" --repo "$REPO" state migrate >"$TMP_DIR/refused.out" 2>&1; then
+  echo "state migrate should require runtime.state_backend = sqlite"
+  exit 1
+fi
+
+sed -i.bak 's/^state_backend = "files"/state_backend = "sqlite"/' "$STATE_DIR/orchestrator.toml"
+migrate_out="$("$CLI" --repo "$REPO" state migrate)"
+if [[ "$migrate_out" != *"locks=1 workers=0 updates=1"* ]]; then
+  echo "unexpected migrate output: $migrate_out"
+  exit 1
+fi
+if [[ -e "$LOCK_101" || -e "$STATE_DIR/LATEST_UPDATES.md" ]]; then
+  echo "migrate left file-layout state behind"
+  ls -R "$STATE_DIR"
+  exit 1
+fi
+
+# Lock acquisition stays atomic across concurrent CLIs.
+for i in $(seq 1 20); do
+  (
+    if worker_cli task lock 102 --branch main >"$TMP_DIR/lock-$i.out" 2>&1; then
+      echo "ok" > "$TMP_DIR/lock-$i.status"
+    else
+      echo "fail" > "$TMP_DIR/lock-$i.status"
+    fi
+  ) &
+done
+wait
+
+successes=0
+for i in $(seq 1 20); do
+  if [[ "$(cat "$TMP_DIR/lock-$i.status")" == "ok" ]]; then
+    successes=$((successes + 1))
+  elif ! grep -q "Error: Lock exists:" "$TMP_DIR/lock-$i.out"; then
+    echo "unexpected failure output for worker $i"
+    cat "$TMP_DIR/lock-$i.out"
+    exit 1
+  fi
+done
+if [[ "$successes" -ne 1 ]]; then
+  echo "expected exactly one successful lock acquisition, got $successes"
+  exit 1
+fi
+[[ ! -e "$LOCK_102" ]] || { echo "sqlite backend wrote a lock file"; exit 1; }
+
+worker_cli task heartbeat 101 --branch main >/dev/null
+worker_cli task update 102 IN_PROGRESS "second" --branch main >/dev/null
+
+inventory_tsv="$(python3 "$ENGINE" inventory --repo "$REPO" --format tsv)"
+if [[ "$(printf '%s\n' "$inventory_tsv" | awk -F'\t' '$6 == "LOCKED"' | wc -l | tr -d ' ')" != "2" ]]; then
+  echo "expected two LOCKED records"
+  printf '%s\n' "$inventory_tsv"
+  exit 1
+fi
+if ! printf '%s\n' "$inventory_tsv" | awk -F'\t' -v p="$LOCK_101" '$10 == p {found=1} END {exit(found ? 0 : 1)}'; then
+  echo "inventory should report the file-layout lock path"
+  printf '%s\n' "$inventory_tsv"
+  exit 1
+fi
+
+updates_total="$(python3 "$ENGINE" status --repo "$REPO" --format json | python3 -c 'import json,sys; print(json.load(sys.stdin)["updates"]["summary"]["total"])')"
+[[ "$updates_total" == "2" ]] || { echo "expected 2 journal entries, got $updates_total"; exit 1; }
+
+worker_cli task unlock 102 --branch main >/dev/null
+
+export_out="$("$CLI" --repo "$REPO" state export)"
+if [[ "$export_out" != *"records=1 updates=2"* ]]; then
+  echo "unexpected export output: $export_out"
+  exit 1
+fi
+[[ -f "$LOCK_101" && ! -e "$LOCK_102" ]] || { echo "export wrote the wrong lock files"; ls "$STATE_DIR/locks"; exit 1; }
+heartbeat_at="$(awk -F'=' '$1=="heartbeat_at"{print $2; exit}' "$LOCK_101")"
+[[ -n "$heartbeat_at" ]] || { echo "exported lock lost heartbeat_at"; cat "$LOCK_101"; exit 1; }
+grep -q 'started \\| from files' "$STATE_DIR/LATEST_UPDATES.md" || {
+  echo "exported journal lost the migrated entry"
+  cat "$STATE_DIR/LATEST_UPDATES.md"
+  exit 1
+}
+
+echo "sqlite state backend smoke test passed"
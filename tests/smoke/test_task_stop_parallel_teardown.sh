@@ -0,0 +1,114 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
+CLI="$ROOT/scripts/codex-tasks"
+
+TMP_DIR="$(mktemp -d)"
+WORKER_PIDS=()
+
+cleanup() {
+  local pid
+  for pid in ${WORKER_PIDS[@]+"${WORKER_PIDS[@]}"}; do
+    kill -9 "$pid" >/dev/null 2>&1 || true
+  done
+  rm -rf "$TMP_DIR"
+}
+trap cleanup EXIT
+
+REPO="$TMP_DIR/repo"
+STATE_DIR="$REPO/.codex-tasks"
+mkdir -p "$REPO"
+git -C "$REPO" init -q
+git -C "$REPO" checkout -q -b main
+
+cat > "$REPO/README.md" <<'EOF2'
+# Parallel teardown
+EOF2
+git -C "$REPO" add README.md
+git -C "$REPO" commit -q -m "chore: init"
+
+"$CLI" --repo "$REPO" task init >/dev/null
+cat >> "$STATE_DIR/planning/TODO.md" <<'EOF2'
+| 201 | main | One | - | note | IN_PROGRESS |
+| 202 | main | Two | - | note | IN_PROGRESS |
+| 203 | main | Three | - | note | IN_PROGRESS |
+| 204 | main | Four | - | note | IN_PROGRESS |
+EOF2
+
+# Workers that ignore SIGTERM: a serial teardown would wait out the full grace
+# period once per worker before escalating to SIGKILL.
+spawn_stubborn_worker() {
+  python3 - <<'PY'
+import subprocess
+
+proc = subprocess.Popen(
+    ["bash", "-c", "trap '' TERM; while :; do sleep 1; done"],
+    stdin=subprocess.DEVNULL,
+    stdout=subprocess.DEVNULL,
+    stderr=subprocess.DEVNULL,
+    start_new_session=True,
+)
+print(proc.pid)
+PY
+}
+
+mkdir -p "$STATE_DIR/orchestrator"
+for task_id in 201 202 203 204; do
+  worktree="$TMP_DIR/wt-$task_id"
+  git -C "$REPO" worktree add -q -b "codex/main-$task_id" "$worktree" main
+  (cd "$worktree" && "$CLI" --repo "$worktree" --state-dir "$STATE_DIR" task lock "$task_id" --branch main >/dev/null)
+  pid="$(spawn_stubborn_worker)"
+  WORKER_PIDS+=("$pid")
+  cat > "$STATE_DIR/orchestrator/main--$task_id.pid" <<EOF2
+scope=task-main--$task_id
+task_id=$task_id
+task_branch=main
+task_key=main::$task_id
+pid=$pid
+worktree=$worktree
+started_at=2026-01-01T00:00:00Z
+launch_backend=codex_exec
+tmux_session=N/A
+launch_label=N/A
+EOF2
+done
+sleep 1
+
+start_ts="$(date +%s)"
+STOP_OUT="$("$CLI" --repo "$REPO" task emergency-stop --yes --reason "parallel teardown smoke")"
+elapsed=$(( $(date +%s) - start_ts ))
+echo "$STOP_OUT"
+
+echo "$STOP_OUT" | grep -q "Summary: success=4 failed=0"
+if [[ "$(echo "$STOP_OUT" | grep -c "\[OK\] pid terminated:")" != "4" ]]; then
+  echo "expected 4 terminated pids"
+  exit 1
+fi
+if [[ "$elapsed" -ge 15 ]]; then
+  echo "teardown took ${elapsed}s; workers were not stopped under one shared deadline"
+  exit 1
+fi
+
+# Records are still reported in selection order.
+order="$(echo "$STOP_OUT" | sed -n 's/^- task=\([0-9]*\) .*/\1/p' | tr '\n' ' ')"
+[[ "$order" == "201 202 203 204 " ]] || { echo "unexpected record order: $order"; exit 1; }
+
+for pid in "${WORKER_PIDS[@]}"; do
+  if kill -0 "$pid" >/dev/null 2>&1 && [[ "$(ps -o stat= -p "$pid" 2>/dev/null | tr -d ' ')" != Z* ]]; then
+    echo "worker still alive: $pid"
+    exit 1
+  fi
+done
+for task_id in 201 202 203 204; do
+  [[ ! -d "$TMP_DIR/wt-$task_id" ]] || { echo "worktree left behind: $task_id"; exit 1; }
+  if git -C "$REPO" rev-parse --verify "codex/main-$task_id" >/dev/null 2>&1; then
+    echo "branch left behind: codex/main-$task_id"
+    exit 1
+  fi
+  grep -q "| $task_id | main | .* | TODO |$" "$STATE_DIR/planning/TODO.md"
+done
+[[ -z "$(ls "$STATE_DIR/locks" | grep '\.lock$' || true)" ]] || { echo "locks left behind"; ls "$STATE_DIR/locks"; exit 1; }
+[[ -z "$(ls "$STATE_DIR/orchestrator" | grep '\.pid$' || true)" ]] || { echo "pid metadata left behind"; exit 1; }
+
+echo "task stop parallel teardown smoke test passed"
@@ -0,0 +1,93 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
+CLI="$ROOT/scripts/codex-tasks"
+
+TMP_DIR="$(mktemp -d)"
+trap 'rm -rf "$TMP_DIR"' EXIT
+
+REPO="$TMP_DIR/repo"
+STATE_DIR="$REPO/.codex-tasks"
+PARENT="$TMP_DIR/repo-worktrees"
+TRASH="$PARENT/.trash"
+
+mkdir -p "$REPO"
+git -C "$REPO" init -q
+git -C "$REPO" checkout -q -b main
+cat > "$REPO/README.md" <<'EOF2'
+# Worktree trash
+EOF2
+git -C "$REPO" add README.md
+git -C "$REPO" commit -q -m "chore: init"
+
+"$CLI" --repo "$REPO" task init >/dev/null
+sed -i.bak 's/^worktree_removal = "sync"/worktree_removal = "trash"/' "$STATE_DIR/orchestrator.toml"
+grep -q '^worktree_removal = "trash"' "$STATE_DIR/orchestrator.toml"
+cat >> "$STATE_DIR/planning/TODO.md" <<'EOF2'
+| 301 |  | Trash one | - | note | IN_PROGRESS |
+| 302 |  | Trash two | - | note | TODO |
+EOF2
+
+wait_for_empty_trash() {
+  for _ in $(seq 1 50); do
+    if [[ -z "$(ls -A "$TRASH" 2>/dev/null | grep -v '^\.reaper\.lock$' || true)" ]]; then
+      return 0
+    fi
+    sleep 0.2
+  done
+  echo "trash was not reaped"
+  ls -A "$TRASH"
+  cat "$STATE_DIR/orchestrator/logs/trash-reaper.log" 2>/dev/null || true
+  exit 1
+}
+
+# Teardown: the worktree is detached and renamed, not deleted in place.
+"$CLI" --repo "$REPO" worktree create 301 >/dev/null
+WT="$PARENT/repo-301"
+[[ -d "$WT" ]] || { echo "worktree not created: $WT"; exit 1; }
+mkdir -p "$WT/build/cache"
+for i in $(seq 1 200); do
+  echo "$i" > "$WT/build/cache/blob-$i"
+done
+chmod 500 "$WT/build/cache"
+(cd "$WT" && "$CLI" --repo "$WT" --state-dir "$STATE_DIR" task lock 301 >/dev/null)
+cat > "$STATE_DIR/orchestrator/301.pid" <<EOF2
+scope=task-301
+task_id=301
+task_key=301
+pid=99999999
+worktree=$WT
+launch_backend=codex_exec
+EOF2
+
+STOP_OUT="$("$CLI" --repo "$REPO" task stop --task 301 --apply --reason "trash smoke")"
+echo "$STOP_OUT"
+echo "$STOP_OUT" | grep -q "Summary: success=1 failed=0"
+[[ ! -e "$WT" ]] || { echo "worktree path still present: $WT"; exit 1; }
+if git -C "$REPO" rev-parse --verify codex/301 >/dev/null 2>&1; then
+  echo "task branch should be deleted"
+  exit 1
+fi
+if [[ "$(git -C "$REPO" worktree list | wc -l | tr -d ' ')" != "1" ]]; then
+  echo "git still lists the removed worktree"
+  git -C "$REPO" worktree list
+  exit 1
+fi
+[[ -z "$(git -C "$REPO" worktree prune -n -v 2>&1)" ]] || { echo "dangling worktree admin entry"; exit 1; }
+wait_for_empty_trash
+grep -q "Trash reaped: entries=" "$STATE_DIR/orchestrator/logs/trash-reaper.log" || {
+  echo "worktree was not removed through the trash reaper"
+  exit 1
+}
+
+# Orphan leftovers at a worktree path are quarantined into the same trash.
+mkdir -p "$PARENT/repo-302/node_modules/pkg"
+echo "stale" > "$PARENT/repo-302/node_modules/pkg/index.js"
+CREATE_OUT="$("$CLI" --repo "$REPO" worktree create 302 2>&1)"
+echo "$CREATE_OUT"
+echo "$CREATE_OUT" | grep -q "quarantined stale worktree path: $PARENT/repo-302 -> $TRASH/repo-302.orphan-"
+[[ -f "$PARENT/repo-302/README.md" ]] || { echo "fresh worktree missing after quarantine"; exit 1; }
+wait_for_empty_trash
+
+echo "worktree trash reaper smoke test passed"
@@ -58,6 +58,12 @@ done_keywords = ["DONE", "완료", "complete"] # inline comment
             self.assertEqual(config["repo"]["worktree_parent"], "../sample-repo-worktrees")
             self.assertEqual(config["repo"]["spec_dir"], ".codex-tasks/planning/specs")
             self.assertEqual(config["runtime"]["launch_backend"], "tmux")
+            self.assertEqual(config["runtime"]["schedule_policy"], "board")
+            self.assertEqual(config["runtime"]["state_backend"], "files")
+            self.assertEqual(config["runtime"]["heartbeat_ttl_seconds"], 0)
+            self.assertEqual(config["runtime"]["worktree_removal"], "sync")
+            self.assertEqual(config["logs"]["compression"], "gzip")
+            self.assertIn("[logs]", config_path.read_text(encoding="utf-8"))
 
     def test_resolve_context_state_dir_priority(self) -> None:
         with tempfile.TemporaryDirectory() as td:
@@ -133,6 +139,91 @@ launch_backend = "invalid"
             with self.assertRaises(ConfigError):
                 load_config(repo_root, str(cfg_path))
 
+    def test_schedule_policy_is_normalized_and_validated(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "policy-repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            cfg_path = repo_root / ".codex-tasks" / "orchestrator.toml"
+            cfg_path.parent.mkdir(parents=True, exist_ok=True)
+
+            cfg_path.write_text('[runtime]\nschedule_policy = "Critical_Path"\n', encoding="utf-8")
+            config, _ = load_config(repo_root, str(cfg_path))
+            self.assertEqual(config["runtime"]["schedule_policy"], "critical_path")
+
+            cfg_path.write_text('[runtime]\nschedule_policy = "fifo"\n', encoding="utf-8")
+            with self.assertRaises(ConfigError):
+                load_config(repo_root, str(cfg_path))
+
+    def test_state_backend_is_normalized_validated_and_resolved(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "backend-repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            cfg_path = repo_root / ".codex-tasks" / "orchestrator.toml"
+            cfg_path.parent.mkdir(parents=True, exist_ok=True)
+
+            cfg_path.write_text('[runtime]\nstate_backend = "SQLite"\n', encoding="utf-8")
+            config, _ = load_config(repo_root, str(cfg_path))
+            self.assertEqual(config["runtime"]["state_backend"], "sqlite")
+            ctx = resolve_context(repo_root, config, config_path=cfg_path)
+            self.assertEqual(ctx["runtime"]["state_backend"], "sqlite")
+            self.assertEqual(ctx["state_db"], str(repo_root / ".codex-tasks" / "state.db"))
+
+            cfg_path.write_text('[runtime]\nstate_backend = "redis"\n', encoding="utf-8")
+            with self.assertRaises(ConfigError):
+                load_config(repo_root, str(cfg_path))
+
+    def test_heartbeat_ttl_must_be_a_non_negative_integer(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "ttl-repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            cfg_path = repo_root / ".codex-tasks" / "orchestrator.toml"
+            cfg_path.parent.mkdir(parents=True, exist_ok=True)
+
+            cfg_path.write_text("[runtime]\nheartbeat_ttl_seconds = 900\n", encoding="utf-8")
+            config, _ = load_config(repo_root, str(cfg_path))
+            ctx = resolve_context(repo_root, config, config_path=cfg_path)
+            self.assertEqual(ctx["runtime"]["heartbeat_ttl_seconds"], 900)
+
+            for bad in ("-1", '"15m"', "true"):
+                cfg_path.write_text(f"[runtime]\nheartbeat_ttl_seconds = {bad}\n", encoding="utf-8")
+                with self.assertRaises(ConfigError):
+                    load_config(repo_root, str(cfg_path))
+
+    def test_worktree_removal_mode_is_normalized_and_validated(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "trash-repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            cfg_path = repo_root / ".codex-tasks" / "orchestrator.toml"
+            cfg_path.parent.mkdir(parents=True, exist_ok=True)
+
+            cfg_path.write_text('[runtime]\nworktree_removal = "Trash"\n', encoding="utf-8")
+            config, _ = load_config(repo_root, str(cfg_path))
+            ctx = resolve_context(repo_root, config, config_path=cfg_path)
+            self.assertEqual(ctx["runtime"]["worktree_removal"], "trash")
+
+            cfg_path.write_text('[runtime]\nworktree_removal = "background"\n', encoding="utf-8")
+            with self.assertRaises(ConfigError):
+                load_config(repo_root, str(cfg_path))
+
+    def test_logs_retention_policy_is_validated(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "logs-repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            cfg_path = repo_root / ".codex-tasks" / "orchestrator.toml"
+            cfg_path.parent.mkdir(parents=True, exist_ok=True)
+
+            cfg_path.write_text('[logs]\ncompression = "ZSTD"\nretention_days = 0\nmax_total_bytes = 1024\n', encoding="utf-8")
+            config, _ = load_config(repo_root, str(cfg_path))
+            ctx = resolve_context(repo_root, config, config_path=cfg_path)
+            self.assertEqual(ctx["logs"]["compression"], "zstd")
+            self.assertEqual((ctx["logs"]["retention_days"], ctx["logs"]["max_total_bytes"]), (0, 1024))
+            self.assertEqual(ctx["logs"]["rotate_bytes"], 64 * 1024 * 1024)
+
+            for body in ('[logs]\ncompression = "xz"\n', "[logs]\nrotate_bytes = -1\n", "[logs]\nretention_days = true\n"):
+                cfg_path.write_text(body, encoding="utf-8")
+                with self.assertRaises(ConfigError):
+                    load_config(repo_root, str(cfg_path))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,200 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+ENGINE = ROOT / "scripts" / "py" / "engine.py"
+DAEMON = ROOT / "scripts" / "py" / "engine_daemon.py"
+
+
+def _init_repo(repo_root: Path) -> None:
+    repo_root.mkdir(parents=True, exist_ok=True)
+    subprocess.run(["git", "init", "-q"], cwd=repo_root, check=True)
+    todo_path = repo_root / ".codex-tasks" / "planning" / "TODO.md"
+    todo_path.parent.mkdir(parents=True, exist_ok=True)
+    todo_path.write_text(
+        "\n".join(
+            [
+                "# TODO Board",
+                "",
+                "| ID | Branch | Title | Deps | Notes | Status |",
+                "|---|---|---|---|---|---|",
+                "| 001 | main | First | - | note | TODO |",
+                "| 002 | main | Second | 001 | note | TODO |",
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+def _call(socket_path: Path, *argv: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, str(DAEMON), "call", str(socket_path), "--", *argv],
+        capture_output=True,
+        text=True,
+    )
+
+
+class EngineDaemonTests(unittest.TestCase):
+    def test_call_without_daemon_reports_unavailable(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            proc = _call(Path(td) / "engine.sock", "paths", "--format", "env")
+            self.assertEqual(proc.returncode, 75)
+            self.assertEqual(proc.stdout, "")
+
+    def test_daemon_matches_direct_engine_and_tracks_board_writes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "repo"
+            _init_repo(repo_root)
+            socket_path = repo_root / ".codex-tasks" / "orchestrator" / "engine.sock"
+
+            server = subprocess.Popen(
+                [sys.executable, str(ENGINE), "serve", "--repo", str(repo_root)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                for _ in range(100):
+                    if socket_path.exists():
+                        break
+                    time.sleep(0.05)
+                self.assertTrue(socket_path.exists())
+
+                direct = subprocess.run(
+                    [sys.executable, str(ENGINE), "paths", "--format", "env", "--repo", str(repo_root)],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                served = _call(socket_path, "paths", "--format", "env", "--repo", str(repo_root))
+                self.assertEqual(served.returncode, 0)
+                self.assertEqual(served.stdout, direct.stdout)
+
+                board = _call(socket_path, "todo-status", "get", "--task", "001", "--repo", str(repo_root))
+                self.assertEqual(board.stdout.strip(), "TODO")
+
+                updated = _call(
+                    socket_path,
+                    "todo-status",
+                    "set",
+                    "--task",
+                    "001",
+                    "--status",
+                    "DONE",
+                    "--repo",
+                    str(repo_root),
+                )
+                self.assertEqual(updated.returncode, 0)
+                board = _call(socket_path, "todo-status", "get", "--task", "001", "--repo", str(repo_root))
+                self.assertEqual(board.stdout.strip(), "DONE")
+
+                missing = _call(socket_path, "todo-status", "get", "--task", "009", "--repo", str(repo_root))
+                self.assertEqual(missing.returncode, 2)
+                self.assertIn("task not found", missing.stderr)
+
+                batch = subprocess.run(
+                    [
+                        sys.executable,
+                        str(DAEMON),
+                        "call",
+                        "--stdin",
+                        str(socket_path),
+                        "--",
+                        "todo-apply",
+                        "--keep-status",
+                        "DONE",
+                        "--repo",
+                        str(repo_root),
+                    ],
+                    input="001\t__EMPTY__\tTODO\n002\t__EMPTY__\tIN_PROGRESS\n",
+                    capture_output=True,
+                    text=True,
+                )
+                self.assertEqual(batch.returncode, 0)
+                self.assertEqual(
+                    [line.split("\t")[2] for line in batch.stdout.splitlines()],
+                    ["kept", "updated"],
+                )
+                board = _call(socket_path, "todo-status", "get", "--task", "002", "--repo", str(repo_root))
+                self.assertEqual(board.stdout.strip(), "IN_PROGRESS")
+
+                rejected = _call(socket_path, "status", "--repo", str(repo_root))
+                self.assertEqual(rejected.returncode, 75)
+
+                stop = subprocess.run(
+                    [sys.executable, str(DAEMON), "shutdown", str(socket_path)],
+                    capture_output=True,
+                    text=True,
+                )
+                self.assertEqual(stop.returncode, 0)
+                server.wait(timeout=10)
+                self.assertFalse(socket_path.exists())
+            finally:
+                if server.poll() is None:
+                    server.kill()
+                    server.wait()
+
+    def test_stalled_client_does_not_block_other_requests(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "repo"
+            _init_repo(repo_root)
+            socket_path = repo_root / ".codex-tasks" / "orchestrator" / "engine.sock"
+
+            server = subprocess.Popen(
+                [sys.executable, str(ENGINE), "serve", "--repo", str(repo_root)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            stalled = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                for _ in range(100):
+                    if socket_path.exists():
+                        break
+                    time.sleep(0.05)
+                self.assertTrue(socket_path.exists())
+
+                # Connected but never sends its request line.
+                stalled.connect(str(socket_path))
+                started = time.monotonic()
+                served = subprocess.run(
+                    [sys.executable, str(DAEMON), "call", "--timeout", "10", str(socket_path), "--",
+                     "paths", "--format", "env", "--repo", str(repo_root)],
+                    capture_output=True,
+                    text=True,
+                    env={**os.environ, "AI_STATE_DIR": "alt-state"},
+                )
+                self.assertLess(time.monotonic() - started, 5.0)
+                self.assertEqual(served.returncode, 0, served.stderr)
+                direct = subprocess.run(
+                    [sys.executable, str(ENGINE), "paths", "--format", "env", "--repo", str(repo_root)],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    env={**os.environ, "AI_STATE_DIR": "alt-state"},
+                )
+                self.assertEqual(served.stdout, direct.stdout)
+                self.assertIn("alt-state", served.stdout)
+
+                # The daemon's environment is untouched by that request.
+                plain = _call(socket_path, "paths", "--format", "env", "--repo", str(repo_root))
+                self.assertNotIn("alt-state", plain.stdout)
+
+                stop = subprocess.run([sys.executable, str(DAEMON), "shutdown", str(socket_path)], capture_output=True)
+                self.assertEqual(stop.returncode, 0)
+                stalled.close()
+                server.wait(timeout=40)
+            finally:
+                stalled.close()
+                if server.poll() is None:
+                    server.kill()
+                    server.wait()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,21 @@
+import io
 import json
 import os
+import queue
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 ROOT = Path(__file__).resolve().parents[1]
 ENGINE = ROOT / "scripts" / "py" / "engine.py"
+sys.path.insert(0, str(ROOT / "scripts" / "py"))
+
+import engine
 
 
 def _run_engine_raw(repo_root: Path, *args: str) -> subprocess.CompletedProcess[str]:
@@ -194,6 +202,66 @@ class EngineReadyTests(unittest.TestCase):
             self.assertEqual(excluded["T1-001"]["source"], "pid")
             self.assertEqual(excluded["T1-002"]["reason"], "deps_not_ready")
 
+    def test_ready_reports_dependency_cycles_and_dangling_refs(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            _init_git_repo(repo_root)
+
+            _write_todo(
+                repo_root,
+                [
+                    ("T1-001", "cycle a", "T1-002", "", "TODO"),
+                    ("T1-002", "cycle b", "T1-001", "", "TODO"),
+                    ("T1-003", "typo", "T1-09", "", "TODO"),
+                    ("T1-004", "ready", "-", "", "TODO"),
+                ],
+            )
+            _write_specs(repo_root, ["T1-001", "T1-002", "T1-003", "T1-004"])
+
+            payload = _run_engine(repo_root, "ready")
+            excluded = {item["task_id"]: item for item in payload["excluded_tasks"]}
+
+            self.assertEqual([item["task_id"] for item in payload["ready_tasks"]], ["T1-004"])
+            self.assertEqual(excluded["T1-001"]["reason"], "deps_cycle")
+            self.assertEqual(excluded["T1-001"]["blocked_by"], "T1-001,T1-002")
+            self.assertEqual(excluded["T1-002"]["reason"], "deps_cycle")
+            self.assertEqual(excluded["T1-003"]["reason"], "deps_dangling")
+            self.assertEqual(excluded["T1-003"]["blocked_by"], "T1-09")
+
+    def test_critical_path_policy_starts_blocking_tasks_first(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            _init_git_repo(repo_root)
+
+            _write_todo(
+                repo_root,
+                [
+                    ("T1-001", "leaf", "-", "", "TODO"),
+                    ("T1-002", "leaf", "-", "", "TODO"),
+                    ("T1-003", "root", "-", "", "TODO"),
+                    ("T1-004", "mid", "T1-003", "", "TODO"),
+                    ("T1-005", "tail", "T1-004", "", "TODO"),
+                ],
+            )
+            _write_specs(repo_root, ["T1-001", "T1-002", "T1-003", "T1-004", "T1-005"])
+
+            board = _run_engine(repo_root, "ready", "--max-start", "2")
+            self.assertEqual(board["schedule_policy"], "board")
+            self.assertEqual([t["task_id"] for t in board["ready_tasks"]], ["T1-001", "T1-002"])
+            self.assertNotIn("rank", board["ready_tasks"][0])
+
+            ranked = _run_engine(repo_root, "ready", "--max-start", "2", "--policy", "critical_path")
+            self.assertEqual([t["task_id"] for t in ranked["ready_tasks"]], ["T1-003", "T1-001"])
+            self.assertEqual(ranked["ready_tasks"][0]["rank"], 1)
+            self.assertEqual(ranked["ready_tasks"][0]["critical_path"], 3)
+            self.assertEqual(ranked["ready_tasks"][0]["fanout"], 2)
+
+            text = _run_engine_raw(repo_root, "ready", "--format", "rank", "--policy", "critical_path").stdout
+            self.assertIn("Schedule policy: critical_path", text)
+            self.assertIn("1. T1-003 critical_path=3 fanout=2", text)
+
     def test_status_payload_contains_unified_sections(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             repo_root = Path(td) / "repo"
@@ -224,6 +292,96 @@ class EngineReadyTests(unittest.TestCase):
             self.assertEqual(payload["task_board"]["tasks"][0]["task_id"], "T2-001")
             self.assertEqual(payload["task_board"]["tasks"][0]["status"], "TODO")
 
+    def test_status_payload_loads_context_board_and_inventory_once(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            _init_git_repo(repo_root)
+
+            _write_todo(
+                repo_root,
+                [
+                    ("T2-001", "ready", "-", "", "TODO"),
+                    ("T2-002", "blocked", "T2-001", "", "TODO"),
+                ],
+            )
+            _write_specs(repo_root, ["T2-001", "T2-002"])
+
+            args = engine.build_parser().parse_args(["status", "--repo", str(repo_root)])
+            with patch.object(engine, "resolve_repo_root", wraps=engine.resolve_repo_root) as repo_spy, \
+                    patch.object(engine, "parse_todo", wraps=engine.parse_todo) as board_spy, \
+                    patch.object(engine, "load_pid_inventory", wraps=engine.load_pid_inventory) as pid_spy, \
+                    patch.object(engine, "classify_records", wraps=engine.classify_records) as classify_spy:
+                payload = engine._status_payload(args)
+
+            self.assertEqual(repo_spy.call_count, 1)
+            self.assertEqual(board_spy.call_count, 1)
+            self.assertEqual(pid_spy.call_count, 1)
+            self.assertEqual(classify_spy.call_count, 1)
+            self.assertEqual(payload["scheduler"]["summary"]["ready"], 1)
+            self.assertEqual(payload["task_board"]["summary"]["total"], 2)
+
+    def test_status_payload_rebuilds_only_requested_sections(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            _init_git_repo(repo_root)
+
+            _write_todo(repo_root, [("T2-001", "ready", "-", "", "TODO")])
+            _write_specs(repo_root, ["T2-001"])
+
+            args = engine.build_parser().parse_args(["status", "--repo", str(repo_root)])
+            payload = engine._status_payload(args)
+            updates_file = repo_root / ".codex-tasks" / "LATEST_UPDATES.md"
+            updates_file.write_text(
+                "| 2026-01-01T00:00:00Z | smoke | T2-001 | TODO | note |\n", encoding="utf-8")
+
+            with patch.object(engine, "parse_todo", wraps=engine.parse_todo) as board_spy, \
+                    patch.object(engine, "load_pid_inventory", wraps=engine.load_pid_inventory) as pid_spy:
+                refreshed = engine._status_payload(args, payload, ["updates"])
+
+            self.assertEqual(board_spy.call_count, 0)
+            self.assertEqual(pid_spy.call_count, 0)
+            self.assertEqual(refreshed["updates"]["summary"]["total"], 1)
+            self.assertEqual(payload["updates"]["summary"]["total"], 0)
+            for section in ("scheduler", "runtime", "task_board", "coordination"):
+                self.assertIs(refreshed[section], payload[section])
+
+    def test_idle_sqlite_board_triggers_no_status_refresh(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            _init_git_repo(repo_root)
+            _write_todo(repo_root, [("T2-001", "ready", "-", "", "TODO")])
+            _write_specs(repo_root, ["T2-001"])
+            state_dir = repo_root / ".codex-tasks"
+            (state_dir / "orchestrator.toml").write_text('[runtime]\nstate_backend = "sqlite"\n', encoding="utf-8")
+
+            args = engine.build_parser().parse_args(["status", "--repo", str(repo_root)])
+            store = engine.StateStore(state_dir / "state.db")
+            store.append_update("2026-01-01T00:00:00Z", "smoke", "T2-001", "TODO", "note")
+            watcher = engine._open_status_watcher(args)
+            try:
+                # The dashboard's own reads open and close connections (and
+                # so rewrite the WAL files) without counting as a change.
+                refreshes = 0
+                deadline = time.monotonic() + 3.0
+                while time.monotonic() < deadline:
+                    engine._status_payload(args)
+                    if watcher.wait(0.2):
+                        refreshes += 1
+                self.assertEqual(refreshes, 0)
+
+                store.create(state_dir / "locks" / "app-shell.lock", "scope=app-shell\ntask_id=T2-001\n")
+                seen: set[str] = set()
+                for _ in range(10):
+                    seen |= watcher.wait(0.5)
+                    if seen:
+                        break
+                self.assertEqual(seen, {"store"})
+            finally:
+                watcher.close()
+
     def test_status_tui_falls_back_to_text_in_non_interactive_mode(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             repo_root = Path(td) / "repo"
@@ -278,6 +436,146 @@ class EngineReadyTests(unittest.TestCase):
             self.assertEqual(worker["tmux_session"], "session-t6")
             self.assertEqual(worker["log_file"], "/tmp/t6.log")
 
+    def test_inventory_watch_streams_state_transitions(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            _init_git_repo(repo_root)
+            state_dir = repo_root / ".codex-tasks"
+            (state_dir / "locks").mkdir(parents=True)
+            (state_dir / "orchestrator").mkdir(parents=True)
+
+            watch = subprocess.Popen(
+                [sys.executable, str(ENGINE), "inventory", "--watch", "--interval", "0.2", "--repo", str(repo_root)],
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            worker = subprocess.Popen(["sleep", "30"])
+            lines: queue.Queue[str] = queue.Queue()
+            threading.Thread(target=lambda: [lines.put(line) for line in watch.stdout], daemon=True).start()
+
+            def next_event() -> dict:
+                return json.loads(lines.get(timeout=10.0))
+
+            try:
+                snapshot = next_event()
+                self.assertEqual((snapshot["event"], snapshot["workers"]), ("snapshot", []))
+
+                _write_pid(state_dir, "worker.pid", "app-shell", "T6-001", worker.pid, repo_root)
+                _write_lock(state_dir, "app-shell.lock", "app-shell", "T6-001", repo_root)
+                event = next_event()
+                if event["to"] == "FINALIZING":
+                    # The pid file landed in an earlier batch than the lock.
+                    event = next_event()
+                self.assertEqual((event["task_id"], event["to"]), ("T6-001", "RUNNING"))
+                self.assertTrue(event["ts"].endswith("Z"))
+
+                # A process exit touches no file: the timer notices it.
+                worker.kill()
+                worker.wait()
+                event = next_event()
+                self.assertEqual(
+                    (event["event"], event["from"], event["to"], event["stale"]),
+                    ("transition", "RUNNING", "LOCK_STALE", True),
+                )
+
+                (state_dir / "locks" / "app-shell.lock").unlink()
+                (state_dir / "orchestrator" / "worker.pid").unlink()
+                event = next_event()
+                if event["event"] == "transition":
+                    event = next_event()
+                self.assertEqual((event["event"], event["to"]), ("removed", None))
+            finally:
+                watch.terminate()
+                watch.wait()
+                watch.stdout.close()
+                if worker.poll() is None:
+                    worker.kill()
+                    worker.wait()
+
+    def test_inventory_watch_does_not_rescan_an_idle_sqlite_board(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            _init_git_repo(repo_root)
+            state_dir = repo_root / ".codex-tasks"
+            state_dir.mkdir(parents=True)
+            (state_dir / "orchestrator.toml").write_text('[runtime]\nstate_backend = "sqlite"\n', encoding="utf-8")
+            engine.StateStore(state_dir / "state.db").append_update("2026-01-01T00:00:00Z", "smoke", "T1", "TODO", "x")
+
+            args = engine.build_parser().parse_args(
+                ["inventory", "--watch", "--interval", "0.2", "--repo", str(repo_root)])
+            deadline = time.monotonic() + 3.0
+
+            def stop_after_window(real):
+                # Rescans and timer ticks both end the watch once the window is over.
+                def call(*a, **kw):
+                    if time.monotonic() >= deadline:
+                        raise KeyboardInterrupt
+                    return real(*a, **kw)
+                return call
+
+            out = io.StringIO()
+            with patch.object(engine, "classify_records", side_effect=stop_after_window(engine.classify_records)), \
+                    patch.object(engine.StatusSnapshot, "inventory", autospec=True,
+                                 side_effect=stop_after_window(engine.StatusSnapshot.inventory)) as inventory_spy, \
+                    patch.object(sys, "stdout", out):
+                engine._inventory_watch(args)
+
+            # Only the initial snapshot; the snapshot's own reads are not changes.
+            self.assertEqual(inventory_spy.call_count, 1)
+            self.assertEqual(json.loads(out.getvalue().splitlines()[0])["event"], "snapshot")
+
+    def test_pid_registry_is_written_in_one_pass(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            _init_git_repo(repo_root)
+            state_dir = repo_root / ".codex-tasks"
+            _write_pid(state_dir, "a.pid", "app-shell", "T1-001", os.getpid(), repo_root)
+            _write_pid(state_dir, "b.pid", "domain-core", "T2-001", 999999, repo_root, launch_backend="codex_exec")
+            # Field values the old tab-separated rebuild could not carry.
+            odd_worktree = Path(td) / "work\ttree"
+            _write_pid(state_dir, "c.pid", "ui", "T3-001", 999998, odd_worktree)
+            (state_dir / "orchestrator" / "d.pid").write_text("task_id=T4-001\npid=\n", encoding="utf-8")
+
+            registry = state_dir / "orchestrator" / "active_pids.tsv"
+            out = _run_engine_raw(repo_root, "pid-registry", "--output", str(registry)).stdout
+            self.assertEqual(out.strip(), "Registry entries: total=3 alive=1")
+            rows = [line.split("\t") for line in registry.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual([row[:3] for row in rows], [[str(os.getpid()), "1", "T1-001"], ["999999", "0", "T2-001"], ["999998", "0", "T3-001"]])
+            self.assertEqual(rows[1][5], "codex_exec")
+            self.assertEqual(rows[2][8], str(odd_worktree).replace("\t", " "))
+
+            raw = subprocess.run(
+                [sys.executable, str(ENGINE), "pid-registry", "--format", "nul", "--repo", str(repo_root)],
+                check=True,
+                capture_output=True,
+            ).stdout
+            fields = raw.split(b"\0")[:-1]
+            self.assertEqual(len(fields), 3 * len(engine.PID_REGISTRY_FIELDS))
+            self.assertEqual(fields[-1], str(odd_worktree).encode("utf-8"))
+
+    def test_session_pages_a_task_log_through_its_index(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td) / "repo"
+            repo_root.mkdir(parents=True, exist_ok=True)
+            _init_git_repo(repo_root)
+            state_dir = repo_root / ".codex-tasks"
+            log_file = Path(td) / "worker.log"
+            lines = [json.dumps({"type": "item.completed", "item": {"id": f"item_{i}", "type": "agent_message", "text": f"note {i}"}}) for i in range(10)]
+            log_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            _write_pid(state_dir, "T1-001.pid", "app-shell", "T1-001", 999999, repo_root, log_file=str(log_file))
+
+            newest = _run_engine(repo_root, "session", "--task", "T1-001", "--page-size", "4", "--format", "json")
+            self.assertEqual((newest["page"], newest["pages"], newest["events"]), (2, 3, 10))
+            self.assertEqual([b["body"] for b in newest["blocks"]], ["note 8", "note 9"])
+            self.assertTrue(Path(str(log_file) + ".idx.4").is_file())
+
+            text = _run_engine_raw(repo_root, "session", str(log_file), "--page-size", "4", "--item", "item_5").stdout
+            self.assertTrue(text.startswith("Session page 2/3: events 4-7 of 10"))
+            self.assertIn("note 5", text)
+
     def test_ready_excludes_task_when_spec_missing(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             repo_root = Path(td) / "repo"
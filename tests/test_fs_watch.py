@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts" / "py"))
+
+from fs_watch import InotifyWatcher, PollingWatcher, WatchTarget
+
+
+def _watcher_classes() -> list[type]:
+    classes: list[type] = [PollingWatcher]
+    if InotifyWatcher.available():
+        classes.append(InotifyWatcher)
+    return classes
+
+
+class FsWatchTests(unittest.TestCase):
+    def test_reports_tags_of_changed_targets_only(self) -> None:
+        for watcher_cls in _watcher_classes():
+            with self.subTest(watcher=watcher_cls.__name__), tempfile.TemporaryDirectory() as td:
+                root = Path(td)
+                planning = root / "planning"
+                (planning / "specs").mkdir(parents=True)
+                todo = planning / "TODO.md"
+                todo.write_text("# TODO\n", encoding="utf-8")
+                locks = root / "locks"
+
+                watcher = watcher_cls(
+                    [
+                        WatchTarget("todo", todo),
+                        WatchTarget("specs", planning / "specs", "tree", ".md"),
+                        WatchTarget("locks", locks, "dir", ".lock"),
+                    ],
+                    poll_interval=0.05,
+                )
+                try:
+                    self.assertEqual(watcher.wait(0.1), set())
+
+                    # Neighbours of a watched file are ignored.
+                    (planning / "notes.txt").write_text("x", encoding="utf-8")
+                    self.assertEqual(watcher.wait(0.2), set())
+
+                    # Atomic replace, as done by board writers.
+                    tmp = planning / ".TODO.md.tmp"
+                    tmp.write_text("# TODO\n| T1 |\n", encoding="utf-8")
+                    os.replace(tmp, todo)
+                    self.assertEqual(watcher.wait(1.0), {"todo"})
+
+                    branch_dir = planning / "specs" / "release"
+                    branch_dir.mkdir()
+                    watcher.wait(0.2)
+                    (branch_dir / "T1-001.md").write_text("# spec\n", encoding="utf-8")
+                    self.assertEqual(watcher.wait(1.0), {"specs"})
+
+                    # A directory created after the watcher started is picked up.
+                    locks.mkdir()
+                    (locks / "task-t1-001.lock").write_text("scope=x\n", encoding="utf-8")
+                    seen: set[str] = set()
+                    for _ in range(20):
+                        seen |= watcher.wait(0.2)
+                        if seen:
+                            break
+                    self.assertEqual(seen, {"locks"})
+                finally:
+                    watcher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import fcntl
+import gzip
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts" / "py"))
+
+import log_rotation
+
+
+def _age(path: Path, seconds: float) -> None:
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+class LogRotationTests(unittest.TestCase):
+    def test_rotate_copies_into_segments_and_truncates_in_place(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            log = Path(td) / "main--101-20260101T000000Z.log"
+            log.write_bytes(b"line 1\nline 2\n")
+            index = Path(str(log) + ".idx.256")
+            index.write_text("v1 0 0 256\n", encoding="utf-8")
+            inode = log.stat().st_ino
+
+            now = time.time()
+            first = log_rotation.rotate_log(log, "gzip", now=now)
+            self.assertIsNotNone(first)
+            self.assertEqual((log.stat().st_ino, log.stat().st_size), (inode, 0))
+            self.assertFalse(index.exists())
+            with gzip.open(first, "rb") as handle:
+                self.assertEqual(handle.read(), b"line 1\nline 2\n")
+
+            # Same second: a second segment, never an overwrite.
+            log.write_bytes(b"line 3\n")
+            second = log_rotation.rotate_log(log, "zstd" if log_rotation.zstd_available() else "gzip", now=now)
+            self.assertEqual(log_rotation.segment_paths(log), [first, second])
+            self.assertIsNone(log_rotation.rotate_log(log))
+            self.assertEqual(sorted(p.name for p in Path(td).iterdir() if p.name.startswith(".")), [])
+
+            # zstd without the zstandard module falls back to gzip.
+            log.write_bytes(b"line 4\n")
+            with mock.patch.object(log_rotation, "_zstd", None):
+                third = log_rotation.rotate_log(log, "zstd")
+            self.assertTrue(str(third).endswith(".gz"))
+
+    def test_readers_continue_into_the_newest_segment(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            log = Path(td) / "worker.log"
+            history = b"".join(f"old {i}\n".encode() for i in range(100))
+            log.write_bytes(history)
+            log_rotation.rotate_log(log)
+            with log.open("ab") as handle:
+                handle.write(b"new 0\n")
+
+            self.assertEqual(log_rotation.read_log_tail(log, 6), b"new 0\n")
+            self.assertEqual(log_rotation.read_log_tail(log, 18), (history + b"new 0\n")[-18:])
+            self.assertEqual(log_rotation.archived_tail(log, 15), b"old 98\nold 99\n")
+            self.assertEqual(log_rotation.read_log_tail(log, 1 << 20), history + b"new 0\n")
+
+            log.unlink()
+            self.assertEqual(log_rotation.read_log_tail(log, 7), b"old 99\n")
+
+    def test_gc_rotates_expires_and_caps_the_logs_dir(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            logs = Path(td)
+            big = logs / "big.log"
+            big.write_bytes(b"b" * 4096 + b"\n")
+            idle = logs / "idle.log"
+            idle.write_bytes(b"idle\n")
+            _age(idle, 3 * 3600)
+            fresh = logs / "fresh.log"
+            fresh.write_bytes(b"fresh\n")
+            expired = logs / "gone.log.20250101T000000Z.gz"
+            expired.write_bytes(gzip.compress(b"gone\n"))
+            _age(expired, 10 * 86400)
+            empty = logs / "empty.log"
+            empty.touch()
+            _age(empty, 10 * 86400)
+            # Empty and idle, but a live worker's writer still has it open.
+            held = logs / "held.log"
+            held.touch()
+            _age(held, 10 * 86400)
+            stale_tmp = logs / ".rotate-big.log.1.gz"
+            stale_tmp.write_bytes(b"partial")
+            _age(stale_tmp, 2 * 3600)
+            # Exit status files go with their log or after retention_days.
+            fresh_exit = logs / "fresh.exit"
+            fresh_exit.write_bytes(b"0\n")
+            orphan_exit = logs / "empty.exit"
+            orphan_exit.write_bytes(b"0\n")
+            old_exit = logs / "big.exit"
+            old_exit.write_bytes(b"1\n")
+            _age(old_exit, 10 * 86400)
+
+            policy = {"rotate_bytes": 1024, "rotate_idle_hours": 1, "compression": "gzip", "retention_days": 7, "max_total_bytes": 0}
+            report = log_rotation.gc_logs(logs, policy, in_use=[str(held)])
+            self.assertEqual((report["rotated"], report["removed"]), (2, 4))
+            self.assertEqual(report["compression"], "gzip")
+            self.assertTrue(held.exists())
+            self.assertEqual((big.stat().st_size, idle.stat().st_size, fresh.read_bytes()), (0, 0, b"fresh\n"))
+            self.assertEqual(len(log_rotation.segment_paths(big)), 1)
+            self.assertEqual(len(log_rotation.segment_paths(idle)), 1)
+            self.assertFalse(expired.exists() or empty.exists() or stale_tmp.exists())
+            self.assertFalse(orphan_exit.exists() or old_exit.exists())
+            self.assertTrue(fresh_exit.exists())
+
+            # Over the cap only segments go, oldest first; active logs stay.
+            _age(log_rotation.segment_paths(big)[0], 60)
+            cap = sum(p.stat().st_size for p in logs.iterdir()) - 1
+            report = log_rotation.gc_logs(logs, {**policy, "max_total_bytes": cap}, in_use=[str(held)])
+            self.assertEqual((report["rotated"], report["removed"]), (0, 1))
+            self.assertEqual(log_rotation.segment_paths(big), [])
+            self.assertEqual(len(log_rotation.segment_paths(idle)), 1)
+            self.assertTrue(fresh.exists())
+            self.assertLessEqual(report["total_bytes"], cap)
+
+            with open(logs / log_rotation.GC_LOCK_NAME, "w") as holder:
+                fcntl.flock(holder.fileno(), fcntl.LOCK_EX)
+                self.assertIsNone(log_rotation.gc_logs(logs, policy))
+
+    def test_gc_reports_the_gzip_fallback_for_zstd(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            logs = Path(td)
+            big = logs / "big.log"
+            big.write_bytes(b"b" * 4096 + b"\n")
+            policy = {"rotate_bytes": 1024, "rotate_idle_hours": 0, "compression": "zstd", "retention_days": 0, "max_total_bytes": 0}
+            with mock.patch.object(log_rotation, "_zstd", None):
+                report = log_rotation.gc_logs(logs, policy)
+            self.assertEqual((report["rotated"], report["compression"]), (1, "gzip"))
+            self.assertTrue(log_rotation.segment_paths(big)[0].name.endswith(".gz"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,25 @@
+import json
+import os
 import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "scripts" / "py"))
 
-from session_parser import parse_session_structured, read_tail_text, strip_ansi
+import log_rotation
+import session_parser
+from session_parser import (
+    SessionIndex,
+    SessionLogTail,
+    SessionParser,
+    parse_session_structured,
+    read_tail_text,
+    session_index_path,
+    strip_ansi,
+)
 
 
 class SessionParserTests(unittest.TestCase):
@@ -281,6 +294,199 @@ class SessionParserTests(unittest.TestCase):
 
             self.assertIn("line3", tail)
 
+    def test_log_tail_decodes_only_appended_lines(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "worker.log"
+            first = '{"type":"response.output_text.delta","delta":"Hello"}\n'
+            second = '{"type":"response.output_text.delta","delta":" world"}\n'
+            done = '{"type":"response.completed","response":{"output":[{"type":"message","role":"assistant","content":[{"type":"output_text","text":"# Done"}]}]}}\n'
+            path.write_text("boot banner\n" + first + second + done[:30], encoding="utf-8")
+
+            tail = SessionLogTail(str(path))
+            self.assertEqual(len(tail.poll()), 2)
+            self.assertEqual(tail.text(), read_tail_text(str(path)))
+
+            with mock.patch.object(session_parser, "_json_loads", wraps=session_parser._json_loads) as loads:
+                self.assertEqual(tail.poll(), [])
+                with path.open("a", encoding="utf-8") as handle:
+                    handle.write(done[30:])
+                new_events = tail.poll()
+            self.assertEqual(loads.call_count, 1)
+            self.assertEqual([e["type"] for e in new_events], ["response.completed"])
+
+            text = path.read_text(encoding="utf-8")
+            self.assertEqual(tail.text(), text.rstrip("\n"))
+            incremental = parse_session_structured("", log_tail=tail.text(), events=tail.events())
+            self.assertEqual(incremental, parse_session_structured("", log_tail=text))
+            self.assertEqual(incremental.parsed_events, 3)
+
+    def test_active_json_decoder_matches_stdlib(self) -> None:
+        lines = [
+            '{"type":"response.output_text.delta","item_id":"msg_1","output_index":1,"delta":"say \\"hi\\"\\n\\u00e9"}',
+            '{ "type": "item.completed", "item": {"type": "agent_message", "text": "done"} }',
+            '{"type":"response.output_text.delta","delta":"cut',
+            '["not", "an", "object"]',
+            "{not json}",
+            "banner line",
+        ]
+        text = "\n".join(lines) + "\n"
+        expected = [json.loads(lines[0]), json.loads(lines[1])]
+        self.assertEqual(session_parser._iter_json_objects(text), expected)
+        with mock.patch.object(session_parser, "_json_loads", json.loads):
+            self.assertEqual(session_parser._iter_json_objects(text), expected)
+
+    def test_log_tail_restarts_on_truncation_rotation_and_bursts(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "worker.log"
+            line = '{"type":"item.completed","item":{"id":"%s"}}\n'
+            path.write_text(line % "a" + line % "b", encoding="utf-8")
+            tail = SessionLogTail(str(path), max_bytes=100)
+            tail.poll()
+            generation = tail.generation
+            self.assertEqual(len(tail.events()), 2)
+
+            path.write_text(line % "c", encoding="utf-8")
+            self.assertEqual([e["item"]["id"] for e in tail.poll()], ["c"])
+            self.assertEqual(tail.generation, generation + 1)
+
+            os.rename(path, Path(td) / "worker.log.1")
+            path.write_text(line % "d" + line % "e", encoding="utf-8")
+            self.assertEqual([e["item"]["id"] for e in tail.poll()], ["d", "e"])
+            self.assertEqual(tail.generation, generation + 2)
+
+            # A burst larger than the window skips straight to its last lines
+            # and never decodes the rest.
+            with path.open("a", encoding="utf-8") as handle:
+                for idx in range(50):
+                    handle.write(line % f"x{idx}")
+            burst = tail.poll()
+            self.assertEqual([e["item"]["id"] for e in burst], ["x48", "x49"])
+            self.assertEqual([e["item"]["id"] for e in tail.events()], ["x48", "x49"])
+
+            path.unlink()
+            self.assertEqual(tail.poll(), [])
+            self.assertEqual(tail.events(), [])
+
+    def test_log_tail_reads_across_a_rotation(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "worker.log"
+            first = '{"type":"item.completed","item":{"id":"a","type":"agent_message","text":"before"}}\n'
+            second = '{"type":"item.completed","item":{"id":"b","type":"agent_message","text":"after"}}\n'
+            path.write_text(first, encoding="utf-8")
+            tail = SessionLogTail(str(path))
+            self.assertEqual(len(tail.poll()), 1)
+
+            log_rotation.rotate_log(path)
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write(second)
+            events = tail.poll()
+            self.assertEqual([e["item"]["text"] for e in events], ["before", "after"])
+            self.assertEqual(tail.generation, 2)
+            self.assertEqual(read_tail_text(str(path)), first + second)
+
+    def test_session_parser_ingests_in_chunks_like_one_pass(self) -> None:
+        events = [
+            {"type": "response.reasoning.delta", "delta": "plan "},
+            {"type": "response.reasoning.delta", "delta": "first"},
+            {"type": "item.started", "item": {"id": "cmd_1", "type": "command_execution", "command": "ls", "status": "in_progress"}},
+            {"type": "response.output_text.delta", "delta": "Hello"},
+            {"type": "response.output_text.delta", "delta": " world"},
+            {"type": "item.completed", "item": {"id": "cmd_1", "type": "command_execution", "command": "ls -la", "status": "completed"}},
+            {"type": "response.output_text.delta", "delta": "still typing"},
+        ]
+        whole = SessionParser()
+        whole.ingest(events)
+        expected = whole.view(12)
+        self.assertEqual(expected, parse_session_structured("", log_tail="\n".join(json.dumps(e) for e in events)).blocks)
+        # The tool call is updated in place, so both chat runs stay adjacent.
+        self.assertEqual(expected[-1].body, "Hello world\n\nstill typing")
+        self.assertEqual([b.item_status for b in expected if b.kind == "tool_call"], ["completed"])
+
+        for cut in range(len(events) + 1):
+            chunked = SessionParser()
+            chunked.ingest(events[:cut])
+            chunked.view(12)
+            chunked.ingest(events[cut:])
+            self.assertEqual(chunked.view(12), expected, f"split at {cut}")
+
+        # view() hands out copies and leaves open delta streams open.
+        expected[-1].body = "mutated"
+        self.assertEqual(whole.view(12)[-1].body, "Hello world\n\nstill typing")
+        whole.ingest([{"type": "response.output_text.delta", "delta": "!"}])
+        self.assertEqual(whole.view(12)[-1].body, "Hello world\n\nstill typing!")
+
+    def test_session_parser_keeps_a_bounded_ring(self) -> None:
+        parser = SessionParser(max_blocks=8)
+        self.assertEqual(parser.view(), [])
+        for idx in range(200):
+            parser.ingest(
+                [
+                    {"type": "item.started", "item": {"id": f"cmd_{idx}", "type": "command_execution", "command": f"echo {idx}"}},
+                    {"type": "item.completed", "item": {"id": f"cmd_{idx}", "type": "command_execution", "command": f"echo {idx}", "status": "completed"}},
+                ]
+            )
+        self.assertEqual(parser.events_seen, 400)
+        self.assertLessEqual(len(parser._blocks), 8)
+        self.assertLessEqual(len(parser._tool_calls), 8)
+        view = parser.view(3)
+        self.assertEqual([b.item_id for b in view if b.kind == "tool_call"][-1], "cmd_199")
+        self.assertLessEqual(len(view), 3)
+
+    def test_session_index_pages_history_incrementally(self) -> None:
+        def delta(idx: int) -> str:
+            return json.dumps({"type": "response.output_text.delta", "item_id": f"msg_{idx // 10}", "delta": f"w{idx} "}) + "\n"
+
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "worker.log"
+            path.write_text("boot banner\n" + "".join(delta(i) for i in range(25)) + delta(25)[:12], encoding="utf-8")
+
+            index = SessionIndex(str(path), every=8)
+            self.assertEqual(index.update(), 25)
+            self.assertEqual((index.events, index.page_count()), (25, 4))
+            self.assertEqual([e["delta"] for e in index.read_page(1)], [f"w{i} " for i in range(8, 16)])
+            self.assertEqual(index.find_item("msg_1"), 1)
+            self.assertIsNone(index.find_item("msg_9"))
+
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write(delta(25)[12:] + "".join(delta(i) for i in range(26, 40)))
+            # An update interrupted after writing records but before its `m`
+            # mark: the next updater cuts those records off.
+            with session_index_path(str(path)).open("a", encoding="utf-8") as handle:
+                handle.write("c 99 12345\ni 12345 bogus\n")
+            fresh = SessionIndex(str(path), every=8)
+            self.assertEqual(fresh.update(), 15)
+            self.assertEqual(index.update(), 0)
+            self.assertEqual((fresh.events, fresh.page_count(), index.page_count()), (40, 5, 5))
+            self.assertIsNone(fresh.find_item("bogus"))
+            self.assertEqual(fresh.find_item("msg_3"), 3)
+            self.assertEqual([e["delta"] for e in fresh.read_page(4)], [f"w{i} " for i in range(32, 40)])
+            self.assertEqual(fresh.render_page(3).blocks[-1].body, " ".join(f"w{i}" for i in range(30, 32)))
+
+            # Rotation: a new file at the same path restarts the index.
+            path.unlink()
+            path.write_text(delta(0), encoding="utf-8")
+            self.assertEqual(fresh.update(), 1)
+            self.assertEqual((fresh.events, fresh.page_count()), (1, 1))
+            # Another page size keeps its own sidecar instead of rebuilding ours.
+            self.assertEqual(SessionIndex(str(path), every=4).update(), 1)
+            self.assertTrue(session_index_path(str(path), 4).exists())
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write(delta(1))
+            self.assertEqual(fresh.update(), 1)
+            self.assertEqual(fresh.events, 2)
+
+    def test_session_index_update_honours_a_byte_budget(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "worker.log"
+            line = json.dumps({"type": "response.output_text.delta", "item_id": "msg_0", "delta": "x" * 100}) + "\n"
+            path.write_text(line * 100, encoding="utf-8")
+            index = SessionIndex(str(path), every=8)
+            with mock.patch("session_parser._INDEX_READ_CHUNK", len(line) * 10):
+                self.assertEqual(index.update(max_bytes=len(line) * 25), 30)
+                while index.update(max_bytes=len(line) * 25):
+                    pass
+            self.assertEqual((index.events, index.indexed_bytes), (100, len(line) * 100))
+
 
 if __name__ == "__main__":
     unittest.main()
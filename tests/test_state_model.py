@@ -1,3 +1,5 @@
+import os
+import subprocess
 import sys
 import tempfile
 import unittest
@@ -8,6 +10,7 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "scripts" / "py"))
 
 import state_model
+from proc_table import ProcessTable, proc_available, read_proc_stat
 
 
 class StateModelTests(unittest.TestCase):
@@ -178,9 +181,12 @@ worktree=/tmp/wt
                 },
             ]
 
-            alive_pids = {"101", "301", "601", "701"}
-            with patch.object(state_model, "is_pid_alive", side_effect=lambda pid: pid in alive_pids):
-                records = state_model.classify_records(pid_rows, lock_rows)
+            alive_pids = {101, 301, 601, 701}
+            processes = ProcessTable(
+                {pid: ("" if pid in alive_pids else None) for pid in (101, 301, 401, 601, 701, 901)},
+                has_start_times=True,
+            )
+            records = state_model.classify_records(pid_rows, lock_rows, processes)
 
             by_task = {row["task_id"]: row for row in records}
 
@@ -199,6 +205,90 @@ worktree=/tmp/wt
             self.assertEqual(summary["state_counts"]["RUNNING"], 1)
             self.assertEqual(summary["state_counts"]["LOCK_STALE"], 1)
 
+    @unittest.skipUnless(proc_available(), "needs /proc")
+    def test_reused_pid_is_not_live_when_start_time_differs(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            worktree = Path(td)
+            worker = subprocess.Popen(["sleep", "30"])
+            try:
+                stat = read_proc_stat(worker.pid)
+                assert stat is not None
+                pid_rows = [
+                    {
+                        "key": task_id,
+                        "task_id": task_id,
+                        "pid": str(worker.pid),
+                        "pid_file": f"{task_id}.pid",
+                        "worktree": str(worktree),
+                        "proc_start": proc_start,
+                    }
+                    for task_id, proc_start in (("T1-001", stat[1]), ("T2-001", "1"), ("T3-001", ""))
+                ]
+                lock_rows = [
+                    {"key": row["key"], "task_id": row["task_id"], "lock_file": f"{row['key']}.lock", "worktree": str(worktree)}
+                    for row in pid_rows
+                ]
+                records = state_model.classify_records(pid_rows, lock_rows)
+            finally:
+                worker.kill()
+                worker.wait()
+
+            by_task = {row["task_id"]: row for row in records}
+            self.assertEqual(by_task["T1-001"]["state"], "RUNNING")
+            # Same pid, different start time: the worker is gone and the pid reused.
+            self.assertEqual(by_task["T2-001"]["state"], "LOCK_STALE")
+            # Metadata written before proc_start was recorded keeps the plain probe.
+            self.assertEqual(by_task["T3-001"]["state"], "RUNNING")
+            self.assertFalse(state_model.is_pid_alive(str(worker.pid), stat[1]))
+
+    def test_heartbeat_ttl_marks_only_expired_lock_only_records(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            worktree = Path(td)
+            now = state_model.parse_timestamp("2026-01-01T01:00:00Z")
+            assert now is not None
+            lock_rows = [
+                {
+                    "key": task_id,
+                    "task_id": task_id,
+                    "lock_file": str(worktree / f"{task_id}.lock"),
+                    "worktree": str(worktree),
+                    "heartbeat_at": heartbeat_at,
+                }
+                for task_id, heartbeat_at in (
+                    ("T1-001", "2026-01-01T00:59:00Z"),
+                    ("T2-001", "2026-01-01T00:00:00Z"),
+                    ("T3-001", ""),
+                    ("T4-001", "2026-01-01T00:00:00Z"),
+                )
+            ]
+            pid_rows = [
+                {"key": "T4-001", "task_id": "T4-001", "pid": "401", "pid_file": "T4.pid", "worktree": str(worktree)}
+            ]
+            processes = ProcessTable({401: ""}, has_start_times=True)
+
+            def states(ttl: int, at: float) -> dict[str, str]:
+                records = state_model.classify_records(pid_rows, lock_rows, processes, heartbeat_ttl=ttl, now=at)
+                return {row["task_id"]: row["state"] for row in records}
+
+            self.assertEqual(set(states(0, now).values()), {"LOCKED", "RUNNING"})
+            self.assertEqual(
+                states(600, now),
+                # Running workers and unparsable heartbeats are left alone.
+                {"T1-001": "LOCKED", "T2-001": "HEARTBEAT_STALE", "T3-001": "LOCKED", "T4-001": "RUNNING"},
+            )
+            self.assertTrue(state_model.is_stale_state("HEARTBEAT_STALE"))
+
+            # A renewed heartbeat replaces the expired deadline.
+            lock_rows[1]["heartbeat_at"] = "2026-01-01T00:58:00Z"
+            self.assertEqual(states(600, now)["T2-001"], "LOCKED")
+            self.assertEqual(states(600, now + 3600)["T1-001"], "HEARTBEAT_STALE")
+
+            # Touching the heartbeat file counts as a heartbeat too.
+            heartbeat_file = Path(state_model.heartbeat_path_for(str(worktree / "T1-001.lock")))
+            heartbeat_file.touch()
+            os.utime(heartbeat_file, (now + 3500, now + 3500))
+            self.assertEqual(states(600, now + 3600)["T1-001"], "LOCKED")
+
     def test_legacy_owner_metadata_files_detects_owner_keys(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             base = Path(td)
@@ -216,6 +306,78 @@ worktree=/tmp/wt
             self.assertTrue(any(path.endswith("legacy.lock") for path in files))
             self.assertTrue(any(path.endswith("legacy.pid") for path in files))
 
+    def test_metadata_scan_reopens_only_changed_files(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            orch = Path(td) / "orchestrator"
+            lock = Path(td) / "locks"
+            orch.mkdir()
+            lock.mkdir()
+            old = 1_700_000_000
+            for idx in range(3):
+                pid_meta = orch / f"t1-00{idx}.pid"
+                pid_meta.write_text(f"task_id=T1-00{idx}\npid={100 + idx}\n", encoding="utf-8")
+                os.utime(pid_meta, (old, old))
+
+            real_open = open
+            with patch.object(state_model, "open", side_effect=real_open, create=True) as open_spy:
+                first = state_model.load_pid_inventory(orch)
+                state_model.legacy_owner_metadata_files(orch, lock)
+                self.assertEqual(open_spy.call_count, 3)
+
+                (orch / "t1-001.pid").write_text("task_id=T1-001\npid=4242\nowner=AgentA\n", encoding="utf-8")
+                (orch / "t1-002.pid").unlink()
+                second = state_model.load_pid_inventory(orch)
+                self.assertEqual(open_spy.call_count, 4)
+
+                # Written just now: still inside the racy window, so re-read.
+                state_model.legacy_owner_metadata_files(orch, lock)
+                self.assertEqual(open_spy.call_count, 5)
+
+            self.assertEqual([row["pid"] for row in first], ["100", "101", "102"])
+            self.assertEqual([row["pid"] for row in second], ["100", "4242"])
+            self.assertNotIn(str(orch / "t1-002.pid"), state_model._META_CACHE)
+
+
+    def test_task_lookup_reads_only_that_tasks_metadata(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            orch = Path(td) / "orchestrator"
+            lock = Path(td) / "locks"
+            orch.mkdir()
+            lock.mkdir()
+            worktree = Path(td)
+
+            def write(path: Path, task_id: str, branch: str, extra: str = "") -> None:
+                key = f"{branch}::{task_id}" if branch else task_id
+                path.write_text(
+                    f"task_id={task_id}\ntask_branch={branch}\ntask_key={key}\nworktree={worktree}\n{extra}",
+                    encoding="utf-8",
+                )
+
+            for idx in range(20):
+                write(lock / f"task-main--t{idx}.lock", f"T{idx}", "main")
+            write(orch / "main--t7.pid", "T7", "main", "pid=999999\n")
+            write(lock / "task-release-1.0--t7.lock", "T7", "release/1.0")
+            write(lock / "task-t7.lock", "T7", "")
+
+            real_open = open
+            with patch.object(state_model, "open", side_effect=real_open, create=True) as open_spy:
+                records = state_model.lookup_task_records(orch, lock, "T7", "main")
+                self.assertEqual(open_spy.call_count, 2)
+            self.assertEqual([(r["task_key"], r["state"]) for r in records], [("main::T7", "LOCK_STALE")])
+
+            every_branch = state_model.lookup_task_records(orch, lock, "T7")
+            self.assertEqual(
+                sorted(r["task_key"] for r in every_branch),
+                ["T7", "main::T7", "release/1.0::T7"],
+            )
+            full = state_model.classify_records(
+                state_model.load_pid_inventory(orch), state_model.load_lock_inventory(lock)
+            )
+            self.assertEqual(
+                sorted(every_branch, key=lambda r: r["key"]),
+                [r for r in full if r["task_id"] == "T7"],
+            )
+            self.assertEqual(state_model.lookup_task_records(orch, lock, "T99"), [])
 
 if __name__ == "__main__":
     unittest.main()
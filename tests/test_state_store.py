@@ -0,0 +1,187 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+STATE_CLI = ROOT / "scripts" / "py" / "state_cli.py"
+sys.path.insert(0, str(ROOT / "scripts" / "py"))
+
+import state_model
+from state_store import StateStore, StateStoreError
+
+
+def _meta(**fields: str) -> str:
+    return "".join(f"{key}={value}\n" for key, value in fields.items())
+
+
+class StateStoreTests(unittest.TestCase):
+    def test_create_is_atomic_across_connections(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db = Path(td) / "state.db"
+            lock_path = Path(td) / "locks" / "task-main--101.lock"
+            text = _meta(scope="task-main--101", task_id="101", task_branch="main", task_key="main::101")
+
+            results: list[bool] = []
+            barrier = threading.Barrier(8)
+
+            def acquire() -> None:
+                store = StateStore(db)
+                barrier.wait()
+                results.append(store.create(lock_path, text))
+
+            threads = [threading.Thread(target=acquire) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(sorted(results), [False] * 7 + [True])
+            store = StateStore(db)
+            self.assertEqual(store.get(lock_path), text)
+            self.assertEqual([p for p, _ in store.lookup("locks", "main::101")], [lock_path])
+            self.assertFalse(lock_path.exists())
+
+            with self.assertRaises(StateStoreError):
+                store.get(Path(td) / "locks" / "notes.txt")
+
+    def test_field_updates_append_and_remove(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = StateStore(Path(td) / "state.db")
+            pid_path = Path(td) / "orchestrator" / "main--101.pid"
+            self.assertIsNone(store.change_counter())
+
+            self.assertFalse(store.append(pid_path, "exited_at=x"))
+            self.assertIsNone(store.get(pid_path))
+            self.assertEqual(store.change_counter(), 0)
+
+            store.put(pid_path, _meta(pid="42", task_id="101", task_branch="main", task_key="main::101"))
+            self.assertTrue(store.set_field(pid_path, "pid", "43"))
+            self.assertTrue(store.append(pid_path, "exit_code=3"))
+            meta = state_model.parse_metadata(store.get(pid_path) or "")
+            self.assertEqual((meta["pid"], meta["exit_code"]), ("43", "3"))
+            # One bump per write; reads leave the counter alone.
+            self.assertEqual(store.change_counter(), 3)
+
+            self.assertEqual(store.glob(pid_path.parent, "*--101.pid"), [str(pid_path)])
+            self.assertEqual(store.glob(pid_path.parent, "*--102.pid"), [])
+            self.assertTrue(store.remove(pid_path))
+            self.assertFalse(store.set_field(pid_path, "pid", "44"))
+            self.assertEqual(store.change_counter(), 4)
+
+    def test_inventory_query_matches_directory_classification(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base = Path(td)
+            orch = base / "orchestrator"
+            locks = base / "locks"
+            orch.mkdir()
+            locks.mkdir()
+            worktree = base / "wt"
+            worktree.mkdir()
+
+            files = {
+                # Worker + lock for a live pid -> RUNNING.
+                orch / "main--101.pid": _meta(
+                    pid=str(os.getpid()), task_id="101", task_branch="main", task_key="main::101", worktree=str(worktree)
+                ),
+                locks / "task-main--101.lock": _meta(
+                    scope="task-main--101", task_id="101", task_branch="main", task_key="main::101", worktree=str(worktree)
+                ),
+                # Exited worker without a lock -> FINALIZING_EXITED.
+                orch / "main--102.pid": _meta(
+                    pid="999999", task_id="102", task_branch="main", task_key="main::102", worktree=str(worktree)
+                ),
+                # Lock only -> LOCKED; legacy lock without task_key.
+                locks / "task-103.lock": _meta(scope="task-103", task_id="103", worktree=str(worktree)),
+                # Lock whose worktree is gone -> ORPHAN_LOCK.
+                locks / "task-main--104.lock": _meta(
+                    scope="task-main--104", task_id="104", task_branch="main", task_key="main::104", worktree=str(base / "gone")
+                ),
+            }
+            for path, text in files.items():
+                path.write_text(text, encoding="utf-8")
+
+            pid_rows = state_model.load_pid_inventory(orch)
+            lock_rows = state_model.load_lock_inventory(locks)
+            expected = (pid_rows, lock_rows, state_model.classify_records(pid_rows, lock_rows))
+
+            store = StateStore(base / "state.db")
+            store.import_files(sorted(files.items()), [])
+            self.assertEqual(store.inventory(), expected)
+            self.assertEqual(store.task_inventory("101", "main"), [expected[2][1]])
+            self.assertEqual(store.task_inventory("103"), [expected[2][0]])
+            self.assertEqual(store.task_inventory("104"), [expected[2][3]])
+            self.assertEqual(store.task_inventory("10"), [])
+            self.assertEqual(
+                [(r["task_key"], r["state"]) for r in expected[2]],
+                [
+                    ("103", "LOCKED"),
+                    ("main::101", "RUNNING"),
+                    ("main::102", "FINALIZING_EXITED"),
+                    ("main::104", "ORPHAN_LOCK"),
+                ],
+            )
+
+    def test_updates_journal_and_drain(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = StateStore(Path(td) / "state.db")
+            lock_path = Path(td) / "locks" / "task-101.lock"
+            store.create(lock_path, _meta(task_id="101"))
+            for idx in range(3):
+                store.append_update(f"2026-01-01T00:00:0{idx}Z", "main", "101", "TODO", f"entry {idx} | x")
+
+            self.assertEqual([u["summary"] for u in store.updates(2)], ["entry 1 | x", "entry 2 | x"])
+
+            def failing_sink(meta_files: list, updates: list) -> None:
+                raise StateStoreError("export target exists")
+
+            with self.assertRaises(StateStoreError):
+                store.drain(failing_sink)
+            self.assertIsNotNone(store.get(lock_path))
+
+            drained: list = []
+            store.drain(lambda meta_files, updates: drained.extend([meta_files, updates]))
+            self.assertEqual(drained[0], [(lock_path, "task_id=101\n")])
+            self.assertEqual(len(drained[1]), 3)
+            self.assertIsNone(store.get(lock_path))
+            self.assertEqual(store.updates(), [])
+
+    def test_state_cli_serves_the_shell_record_api_without_the_engine(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db = str(Path(td) / "state.db")
+            lock = "/state/locks/task-main--101.lock"
+
+            def cli(*argv: str, stdin: str = "") -> subprocess.CompletedProcess[str]:
+                return subprocess.run(
+                    [sys.executable, str(STATE_CLI), *argv, "--db", db], input=stdin, capture_output=True, text=True
+                )
+
+            # Runs state_cli in-process and lists any engine-side module it pulled in.
+            probe = subprocess.run(
+                [sys.executable, "-c",
+                 "import os, runpy, sys; sys.argv = sys.argv[1:]; sys.path.insert(0, os.path.dirname(sys.argv[0]))\n"
+                 "try:\n    runpy.run_path(sys.argv[0], run_name='__main__')\n"
+                 "except SystemExit:\n    pass\n"
+                 "print(sorted(m for m in ('engine', 'config', 'todo_parser', 'session_parser') if m in sys.modules))",
+                 str(STATE_CLI), "glob", "/state/locks", "--pattern", "*.lock", "--db", db],
+                capture_output=True, text=True,
+            )
+            self.assertEqual(probe.stdout.strip(), "[]", probe.stderr)
+
+            self.assertEqual(cli("create", lock, stdin=_meta(task_id="101", task_branch="main")).returncode, 0)
+            again = cli("create", lock, stdin=_meta(task_id="101"))
+            self.assertEqual((again.returncode, again.stderr.strip()), (1, f"Error: record exists: {lock}"))
+            self.assertEqual(cli("set", lock, "--field=heartbeat_at", "--value=2026-01-01T00:00:00Z").returncode, 0)
+            self.assertEqual(cli("get", lock, "--field", "heartbeat_at").stdout, "2026-01-01T00:00:00Z\n")
+            self.assertEqual(cli("glob", "/state/locks", "--pattern", "task-*.lock").stdout, lock + "\n")
+            self.assertEqual(cli("update", "--source=t", "--task=101", "--status=DONE", "--summary=a | b").returncode, 0)
+            self.assertEqual(cli("remove", lock).returncode, 0)
+            self.assertEqual(cli("get", lock).returncode, 1)
+            self.assertEqual(len(StateStore(db).updates()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts" / "py"))
+
+from task_graph import DEPS_CYCLE, DEPS_DANGLING, DEPS_NOT_READY, TaskGraph
+from todo_parser import build_indexes, deps_ready
+
+
+def _task(task_id: str, deps: str, status: str = "TODO", branch: str = "") -> dict[str, str]:
+    return {"id": task_id, "branch": branch, "title": task_id, "deps": deps, "status": status}
+
+
+class TaskGraphTests(unittest.TestCase):
+    def test_resolves_gates_legacy_numeric_and_qualified_refs(self) -> None:
+        tasks = [
+            _task("T1-001", "-", "DONE"),
+            _task("T1-002", "T1-001,G1"),
+            _task("T1-003", "G2"),
+            _task("001", "-", "DONE", branch="main"),
+            _task("001", "main:001", branch="release/1.0"),
+            _task("002", "001", branch="release/1.0"),
+            _task("003", "001", branch="main"),
+        ]
+        gates = {"G1": "DONE", "G2": "PENDING"}
+        graph = TaskGraph(tasks, gates)
+        task_status = build_indexes(tasks)
+
+        for task in tasks:
+            key = task["id"] if not task["branch"] else f"{task['branch']}::{task['id']}"
+            self.assertEqual(
+                graph.is_ready(key),
+                deps_ready(task["deps"], task_status, gates, task_branch=task["branch"]),
+                key,
+            )
+
+        self.assertEqual(graph.deps["release/1.0::002"], ("release/1.0::001",))
+        self.assertEqual(graph.dependents["release/1.0::001"], ["release/1.0::002"])
+        self.assertEqual(graph.blocked("T1-003"), (DEPS_NOT_READY, ["G2"]))
+        self.assertEqual(graph.blocked("release/1.0::002"), (DEPS_NOT_READY, ["release/1.0:001"]))
+
+    def test_done_legacy_row_satisfies_a_branch_qualified_dep(self) -> None:
+        tasks = [
+            _task("101", "-", "TODO", branch="release"),
+            _task("101", "-", "DONE"),
+            _task("102", "101", branch="release"),
+        ]
+        graph = TaskGraph(tasks, {})
+        task_status = build_indexes(tasks)
+
+        # release::101 is not DONE, but the legacy unbranched 101 is.
+        self.assertTrue(deps_ready("101", task_status, {}, task_branch="release"))
+        self.assertTrue(graph.is_ready("release::102"))
+        self.assertEqual(graph.deps["release::102"], ("101",))
+
+    def test_reports_dangling_refs_and_unfinished_cycles(self) -> None:
+        tasks = [
+            _task("T1-001", "T1-003"),
+            _task("T1-002", "T1-001"),
+            _task("T1-003", "T1-002"),
+            _task("T1-004", "T1-004"),
+            _task("T1-005", "T1-06,G9"),
+            _task("T1-006", "T1-007"),
+            _task("T1-007", "T1-006", "DONE"),
+            _task("T1-008", "T1-001"),
+        ]
+        graph = TaskGraph(tasks, {})
+
+        self.assertEqual(graph.blocked("T1-001"), (DEPS_CYCLE, ["T1-001", "T1-002", "T1-003"]))
+        self.assertEqual(graph.blocked("T1-004")[0], DEPS_CYCLE)
+        self.assertEqual(graph.blocked("T1-005"), (DEPS_DANGLING, ["T1-06", "G9"]))
+        # A loop through a DONE task cannot block anything.
+        self.assertTrue(graph.is_ready("T1-006"))
+        self.assertEqual(graph.blocked("T1-008"), (DEPS_NOT_READY, ["T1-001"]))
+        self.assertEqual(len(graph.cycles), 2)
+
+    def test_rank_metrics_and_schedule_order(self) -> None:
+        tasks = [
+            _task("T1-001", "-"),
+            _task("T1-002", "-"),
+            _task("T1-003", "T1-002"),
+            _task("T1-004", "T1-003"),
+            _task("T1-005", "T1-002"),
+            _task("T1-006", "-"),
+            _task("T1-007", "T1-006"),
+            _task("T1-008", "T1-006"),
+            _task("T1-009", "T1-006"),
+            _task("T1-010", "T1-010"),
+        ]
+        graph = TaskGraph(tasks, {})
+        metrics = graph.rank_metrics()
+
+        self.assertEqual(metrics["T1-001"], (1, 0))
+        self.assertEqual(metrics["T1-002"], (3, 3))
+        self.assertEqual(metrics["T1-006"], (2, 3))
+        self.assertNotIn("T1-010", metrics)
+
+        roots = [task for task in tasks if task["deps"] == "-"]
+        ordered = [task["id"] for task in graph.schedule_order(roots)]
+        self.assertEqual(ordered, ["T1-002", "T1-006", "T1-001"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import os
 import sys
 import tempfile
 import unittest
@@ -6,7 +7,13 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "scripts" / "py"))
 
-from task_spec import evaluate_task_spec, task_spec_rel_path, task_spec_rel_path_for_branch
+from task_spec import (
+    SpecIndex,
+    evaluate_task_spec,
+    spec_index_path,
+    task_spec_rel_path,
+    task_spec_rel_path_for_branch,
+)
 
 
 class TaskSpecTests(unittest.TestCase):
@@ -216,5 +223,40 @@ class TaskSpecTests(unittest.TestCase):
             )
 
 
+    def test_spec_index_reuses_unchanged_specs_and_detects_edits(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo_root = Path(td)
+            spec_path = repo_root / task_spec_rel_path("001")
+            spec_path.parent.mkdir(parents=True, exist_ok=True)
+            spec_path.write_text(
+                "# Task Spec: 001\n\n## Goal\nGoal\n\n## In Scope\n- a\n\n## Acceptance Criteria\n- b\n",
+                encoding="utf-8",
+            )
+            # Push the mtime out of the racy window so the entry is trusted.
+            old_ns = spec_path.stat().st_mtime_ns - 10_000_000_000
+            os.utime(spec_path, ns=(old_ns, old_ns))
+
+            index_file = spec_index_path(repo_root / ".codex-tasks")
+            index = SpecIndex(index_file)
+            first = index.evaluate(repo_root, "001")
+            self.assertTrue(first["valid"])
+            self.assertEqual(first, evaluate_task_spec(repo_root, "001"))
+            self.assertEqual(index.misses, 1)
+            index.save()
+            self.assertTrue(index_file.is_file())
+
+            reloaded = SpecIndex(index_file)
+            self.assertEqual(reloaded.evaluate(repo_root, "001"), first)
+            self.assertEqual((reloaded.hits, reloaded.misses), (1, 0))
+
+            spec_path.write_text("# Task Spec: 001\n\n## Goal\nGoal\n", encoding="utf-8")
+            edited = reloaded.evaluate(repo_root, "001")
+            self.assertFalse(edited["valid"])
+            self.assertEqual(reloaded.misses, 1)
+
+            self.assertEqual(reloaded.rebuild(spec_path.parent), 1)
+            self.assertEqual(list(reloaded.entries), [str(spec_path)])
+
+
 if __name__ == "__main__":
     unittest.main()
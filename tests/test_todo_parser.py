@@ -1,12 +1,27 @@
+import json
+import os
+import subprocess
 import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "scripts" / "py"))
 
-from todo_parser import TodoError, build_indexes, deps_ready, parse_todo
+import todo_parser
+from todo_parser import (
+    TodoError,
+    TodoTaskAmbiguous,
+    TodoTaskNotFound,
+    apply_task_statuses,
+    build_indexes,
+    deps_ready,
+    get_task_status,
+    parse_todo,
+    set_task_status,
+)
 
 
 SCHEMA = {
@@ -124,6 +139,176 @@ Gate state: `G2 (PENDING)`
             )
             self.assertTrue(deps_ready("001", task_status, gates, task_branch="main"))
 
+    def test_get_and_set_task_status_by_branch(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            todo_path = Path(td) / "TODO.md"
+            todo_path.write_text(
+                """
+# TODO Board
+
+| ID | Branch | Title | Deps | Notes | Status |
+|---|---|---|---|---|---|
+| 001 | main | First \\| piped | - | note | TODO |
+| 001 | release/1.0 | Second | main:001 | note | TODO |
+""".strip()
+                + "\n",
+                encoding="utf-8",
+            )
+
+            schema = dict(SCHEMA)
+            schema.update({"branch_col": 3, "title_col": 4, "deps_col": 5, "status_col": 7})
+
+            with self.assertRaises(TodoTaskAmbiguous):
+                get_task_status(todo_path, schema, "001")
+            with self.assertRaises(TodoTaskNotFound):
+                set_task_status(todo_path, schema, "009", "DONE", "main")
+
+            set_task_status(todo_path, schema, "001", "DONE", "main")
+            self.assertEqual(get_task_status(todo_path, schema, "001", "main"), "DONE")
+            self.assertEqual(get_task_status(todo_path, schema, "001", "release/1.0"), "TODO")
+
+            lines = todo_path.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(lines[4], "| 001 | main | First \\| piped | - | note | DONE |")
+
+    def test_apply_task_statuses_reports_each_row_and_writes_once(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            todo_path = Path(td) / "TODO.md"
+            todo_path.write_text(
+                """
+# TODO Board
+
+| ID | Branch | Title | Deps | Notes | Status |
+|---|---|---|---|---|---|
+| 001 | main | First | - | note | IN_PROGRESS |
+| 001 | release/1.0 | Second | - | note | IN_PROGRESS |
+| 002 | main | Third | - | note | DONE |
+| 003 | main | Fourth | - | note | TODO |
+""".strip()
+                + "\n",
+                encoding="utf-8",
+            )
+            schema = dict(SCHEMA)
+            schema.update({"branch_col": 3, "title_col": 4, "deps_col": 5, "status_col": 7})
+
+            with patch.object(todo_parser, "_replace_text", wraps=todo_parser._replace_text) as write:
+                results = apply_task_statuses(
+                    todo_path,
+                    schema,
+                    [
+                        ("001", "main", "TODO"),
+                        ("001", "release/1.0", "TODO"),
+                        ("001", "", "TODO"),
+                        ("002", "main", "TODO"),
+                        ("003", "main", "TODO"),
+                        ("009", "main", "TODO"),
+                        ("", "main", "TODO"),
+                    ],
+                    keep_statuses=("done",),
+                )
+            self.assertEqual(write.call_count, 1)
+
+            self.assertEqual(
+                [r["result"] for r in results],
+                ["updated", "updated", "ambiguous", "kept", "unchanged", "not_found", "invalid"],
+            )
+            self.assertEqual(results[0]["previous"], "IN_PROGRESS")
+            self.assertEqual(results[3]["detail"], "task status is DONE")
+
+            tasks, _ = parse_todo(todo_path, schema)
+            self.assertEqual([t["status"] for t in tasks], ["TODO", "TODO", "DONE", "TODO"])
+
+    def test_concurrent_status_writes_are_not_lost(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            todo_path = Path(td) / "TODO.md"
+            rows = [f"| T1-{idx:03d} | Task {idx} | - | note | TODO |" for idx in range(1, 13)]
+            todo_path.write_text(
+                "# TODO Board\n\n| ID | Title | Deps | Notes | Status |\n|---|---|---|---|---|\n"
+                + "\n".join(rows)
+                + "\n",
+                encoding="utf-8",
+            )
+            todo_path.chmod(0o644)
+
+            script = (
+                "import sys; sys.path.insert(0, sys.argv[1]); "
+                "import json; from todo_parser import set_task_status; "
+                "set_task_status(sys.argv[2], json.loads(sys.argv[3]), sys.argv[4], 'IN_PROGRESS')"
+            )
+            procs = [
+                subprocess.Popen(
+                    [
+                        sys.executable,
+                        "-c",
+                        script,
+                        str(ROOT / "scripts" / "py"),
+                        str(todo_path),
+                        json.dumps(SCHEMA),
+                        f"T1-{idx:03d}",
+                    ]
+                )
+                for idx in range(1, 13)
+            ]
+            for proc in procs:
+                self.assertEqual(proc.wait(timeout=30), 0)
+
+            tasks, _ = parse_todo(todo_path, SCHEMA)
+            self.assertEqual({task["status"] for task in tasks}, {"IN_PROGRESS"})
+            self.assertEqual(todo_path.stat().st_mode & 0o777, 0o644)
+            self.assertEqual(sorted(p.name for p in Path(td).iterdir()), ["TODO.md"])
+
+    def test_parse_cache_reuses_unchanged_board_and_detects_edits(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            todo_path = Path(td) / "TODO.md"
+            cache_dir = Path(td) / "cache"
+            todo_path.write_text(
+                """
+# TODO Board
+
+| ID | Title | Deps | Notes | Status |
+|---|---|---|---|---|
+| T1-001 | First | - | note | TODO |
+| T1-002 | Second | T1-001,G1 | note | TODO |
+
+Gate state: `G1 (DONE)`
+""".strip()
+                + "\n",
+                encoding="utf-8",
+            )
+            # Age the board past the racy window so the stat fast path applies.
+            old_ns = todo_path.stat().st_mtime_ns - 10_000_000_000
+            os.utime(todo_path, ns=(old_ns, old_ns))
+
+            expected = parse_todo(todo_path, SCHEMA)
+            self.assertEqual(parse_todo(todo_path, SCHEMA, cache_dir=cache_dir), expected)
+            self.assertEqual(len(list(cache_dir.iterdir())), 1)
+
+            with patch.object(todo_parser, "_parse_todo_lines", wraps=todo_parser._parse_todo_lines) as spy:
+                self.assertEqual(parse_todo(todo_path, SCHEMA, cache_dir=cache_dir), expected)
+                self.assertEqual(spy.call_count, 0)
+
+                # Same size and mtime, different content: caught by the content hash
+                # because the rewrite is recent relative to the cache entry.
+                todo_path.write_text(
+                    todo_path.read_text(encoding="utf-8").replace("| TODO |", "| DONE |", 1),
+                    encoding="utf-8",
+                )
+                recent_ns = todo_path.stat().st_mtime_ns
+                os.utime(todo_path, ns=(recent_ns, recent_ns))
+                tasks, _ = parse_todo(todo_path, SCHEMA, cache_dir=cache_dir)
+                self.assertEqual(tasks[0]["status"], "DONE")
+                self.assertEqual(spy.call_count, 1)
+
+                os.utime(todo_path, ns=(recent_ns, recent_ns))
+                tasks, _ = parse_todo(todo_path, SCHEMA, cache_dir=cache_dir)
+                self.assertEqual(tasks[0]["status"], "DONE")
+                self.assertEqual(spy.call_count, 1)
+
+                schema = dict(SCHEMA)
+                schema["done_keywords"] = ["finished"]
+                _, gates = parse_todo(todo_path, schema, cache_dir=cache_dir)
+                self.assertEqual(gates["G1"], "PENDING")
+                self.assertEqual(spy.call_count, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,258 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+ENGINE = ROOT / "scripts" / "py" / "engine.py"
+sys.path.insert(0, str(ROOT / "scripts" / "py"))
+
+from proc_table import proc_available
+from worker_supervisor import PidfdWatcher, PollingWatcher, Supervisor, read_meta, record_exit
+
+
+def _write_pid_meta(path: Path, pid: int, task_id: str, backend: str = "tmux", session: str = "N/A") -> None:
+    path.write_text(
+        "\n".join(
+            [
+                f"pid={pid}",
+                f"task_id={task_id}",
+                "task_branch=",
+                f"task_key={task_id}",
+                f"launch_backend={backend}",
+                f"tmux_session={session}",
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+def _fake_team_bin(root: Path) -> tuple[Path, Path]:
+    # Stands in for codex-tasks: records each invocation instead of cleaning up.
+    calls = root / "calls.log"
+    script = root / "fake-codex-tasks"
+    script.write_text(
+        "#!/usr/bin/env bash\n"
+        f"printf '%s\\n' \"$*\" >> {calls}\n",
+        encoding="utf-8",
+    )
+    script.chmod(0o755)
+    return script, calls
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return predicate()
+
+
+class WorkerSupervisorTests(unittest.TestCase):
+    def test_watchers_report_exits_and_adoption_skips_other_backends(self) -> None:
+        watchers = [lambda fd: PollingWatcher(fd, 0.05)]
+        if PidfdWatcher.available():
+            watchers.append(PidfdWatcher)
+
+        for make_watcher in watchers:
+            with tempfile.TemporaryDirectory() as td:
+                orch_dir = Path(td)
+                team_bin, calls = _fake_team_bin(orch_dir)
+                worker = subprocess.Popen(["sleep", "0.3"])
+                _write_pid_meta(orch_dir / "t1-001.pid", worker.pid, "T1-001")
+                _write_pid_meta(orch_dir / "t1-002.pid", os.getpid(), "T1-002", backend="exec")
+                # Already gone when the supervisor starts: handled on adoption.
+                _write_pid_meta(orch_dir / "t1-003.pid", 999999, "T1-003")
+
+                wake_r, wake_w = os.pipe()
+                try:
+                    watcher = make_watcher(wake_r)
+                    supervisor = Supervisor(orch_dir, [str(team_bin)], log=lambda _msg: None)
+                    supervisor.rescan(watcher)
+                    self.assertEqual(sorted(supervisor._watched), sorted([worker.pid, 999999]))
+
+                    exited = list(supervisor._pending)
+                    self.assertEqual(exited, [999999])
+                    worker.wait()
+                    exited.extend(watcher.wait(5.0))
+                    for pid in exited:
+                        watcher.remove(pid)
+                        supervisor.handle_exit(pid)
+                    self.assertFalse(supervisor.reap_cleanups(wait=True))
+                finally:
+                    os.close(wake_r)
+                    os.close(wake_w)
+
+                # Cleanups run concurrently, so they may finish in either order.
+                lines = calls.read_text(encoding="utf-8").splitlines()
+                self.assertEqual(
+                    sorted(lines),
+                    sorted([
+                        "task auto-cleanup-exit T1-003 999999 --reason worker exited (backend=tmux)",
+                        f"task auto-cleanup-exit T1-001 {worker.pid} --reason worker exited (backend=tmux)",
+                    ]),
+                )
+                self.assertTrue(read_meta(orch_dir / "t1-001.pid")["exited_at"].endswith("Z"))
+
+                # Handled pairs are not re-adopted even though the metadata stays.
+                supervisor.rescan(watcher)
+                self.assertEqual(supervisor._watched, {})
+
+    @unittest.skipUnless(proc_available(), "needs /proc")
+    def test_adoption_treats_a_reused_pid_as_exited(self) -> None:
+        watchers = [lambda fd: PollingWatcher(fd, 0.05)]
+        if PidfdWatcher.available():
+            watchers.append(PidfdWatcher)
+
+        for make_watcher in watchers:
+            with tempfile.TemporaryDirectory() as td:
+                orch_dir = Path(td)
+                worker = subprocess.Popen(["sleep", "30"])
+                pid_meta = orch_dir / "t1-001.pid"
+                _write_pid_meta(pid_meta, worker.pid, "T1-001")
+                with pid_meta.open("a", encoding="utf-8") as fh:
+                    # Recorded for an earlier process that held the same pid.
+                    fh.write("proc_start=1\n")
+
+                wake_r, wake_w = os.pipe()
+                try:
+                    watcher = make_watcher(wake_r)
+                    supervisor = Supervisor(orch_dir, ["true"], log=lambda _msg: None)
+                    supervisor.rescan(watcher)
+                    self.assertEqual(supervisor._pending, [worker.pid])
+                    self.assertEqual(watcher.pids(), [])
+                finally:
+                    os.close(wake_r)
+                    os.close(wake_w)
+                    worker.kill()
+                    worker.wait()
+
+    def test_cleanups_run_off_the_watch_loop_up_to_the_cap(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            orch_dir = Path(td)
+            calls = orch_dir / "calls.log"
+            slow_bin = orch_dir / "slow-codex-tasks"
+            slow_bin.write_text(f"#!/usr/bin/env bash\nsleep 0.5\nprintf '%s\\n' \"$4\" >> {calls}\n", encoding="utf-8")
+            slow_bin.chmod(0o755)
+            for idx in range(3):
+                _write_pid_meta(orch_dir / f"t1-00{idx}.pid", 999990 + idx, f"T1-00{idx}")
+
+            wake_r, wake_w = os.pipe()
+            try:
+                watcher = PollingWatcher(wake_r, 0.05)
+                supervisor = Supervisor(orch_dir, [str(slow_bin)], log=lambda _msg: None, max_cleanups=2)
+                supervisor.rescan(watcher)
+                started = time.monotonic()
+                for pid in list(supervisor._pending):
+                    supervisor.handle_exit(pid)
+                self.assertLess(time.monotonic() - started, 0.4)
+                self.assertEqual((len(supervisor._cleanups), len(supervisor._cleanup_queue)), (2, 1))
+                self.assertTrue(supervisor.reap_cleanups())
+                self.assertFalse(supervisor.reap_cleanups(wait=True))
+            finally:
+                os.close(wake_r)
+                os.close(wake_w)
+            self.assertEqual(sorted(calls.read_text(encoding="utf-8").split()), ["999990", "999991", "999992"])
+
+    def test_record_exit_does_not_recreate_removed_metadata(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            pid_meta = Path(td) / "t1-001.pid"
+            self.assertFalse(record_exit(pid_meta, "2026-01-01T00:00:00Z", "0"))
+            self.assertFalse(pid_meta.exists())
+
+            _write_pid_meta(pid_meta, 123, "T1-001")
+            self.assertTrue(record_exit(pid_meta, "2026-01-01T00:00:00Z", "3"))
+            meta = read_meta(pid_meta)
+            self.assertEqual((meta["pid"], meta["exit_code"]), ("123", "3"))
+
+    def test_log_gc_runs_off_the_watch_loop_one_pass_at_a_time(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            calls: list[int] = []
+            release = threading.Event()
+
+            def log_gc() -> dict:
+                calls.append(1)
+                release.wait(5)
+                return {"rotated": 1, "removed": 0, "freed_bytes": 10, "total_bytes": 0}
+
+            messages: list[str] = []
+            supervisor = Supervisor(Path(td), ["true"], log=messages.append, log_gc=log_gc)
+            supervisor.start_log_gc()
+            supervisor.start_log_gc()
+            release.set()
+            supervisor._log_gc_thread.join(5)
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(messages, ["[SUPERVISOR] logs gc rotated=1 removed=0 freed_bytes=10"])
+
+    def test_supervise_is_singleton_and_records_worker_exit_code(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            repo = root / "repo"
+            repo.mkdir()
+            subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+            orch_dir = repo / ".codex-tasks" / "orchestrator"
+            orch_dir.mkdir(parents=True)
+            team_bin, calls = _fake_team_bin(root)
+            exit_file = root / "worker.exit"
+
+            # Detached like a tmux pane: the supervisor is not its parent.
+            worker_pid = subprocess.run(
+                ["sh", "-c", f"(sleep 1; printf '%s\\n' 3 > {exit_file}; exit 3) >/dev/null 2>&1 & echo $!"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+            pid_meta = orch_dir / "t1-001.pid"
+            _write_pid_meta(pid_meta, int(worker_pid), "T1-001")
+            with pid_meta.open("a", encoding="utf-8") as fh:
+                fh.write(f"exit_file={exit_file}\n")
+
+            cmd = [
+                sys.executable,
+                str(ENGINE),
+                "supervise",
+                "--repo",
+                str(repo),
+                "--team-bin",
+                str(team_bin),
+                "--idle-timeout",
+                "0.2",
+            ]
+            lock_file = orch_dir / "supervisor.lock"
+            first = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+            try:
+                self.assertTrue(_wait_for(lambda: lock_file.exists() and lock_file.read_text().strip() != ""))
+                self.assertEqual(lock_file.read_text().split()[0], str(first.pid))
+                second = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+                self.assertEqual(second.returncode, 0)
+                self.assertIn(f"already running: pid={first.pid}", second.stdout)
+
+                out, _ = first.communicate(timeout=20)
+                self.assertEqual(first.returncode, 0, out)
+                # Emptied on release, so launchers start a new one.
+                self.assertEqual(lock_file.read_text(), "")
+            finally:
+                if first.poll() is None:
+                    first.kill()
+                    first.wait()
+
+            self.assertEqual(
+                calls.read_text(encoding="utf-8").splitlines(),
+                [
+                    f"--repo {repo.resolve()} --state-dir {repo.resolve() / '.codex-tasks'} task auto-cleanup-exit "
+                    f"T1-001 {worker_pid} --reason worker exited (backend=tmux) exit_code=3"
+                ],
+            )
+            meta = read_meta(pid_meta)
+            self.assertEqual(meta["exit_code"], "3")
+            self.assertIn("exited_at", meta)
+
+
+if __name__ == "__main__":
+    unittest.main()
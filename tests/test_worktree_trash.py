@@ -0,0 +1,72 @@
+import fcntl
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts" / "py"))
+
+import worktree_trash
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", "-C", str(cwd), *args], check=True, capture_output=True)
+
+
+class WorktreeTrashTests(unittest.TestCase):
+    def test_detach_renames_checkout_and_drops_admin_entry(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo = Path(td) / "repo"
+            repo.mkdir()
+            _git(repo, "init", "-q")
+            _git(repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "init")
+            worktree = Path(td) / "wt" / "repo-101"
+            _git(repo, "worktree", "add", "-q", "-b", "codex/101", str(worktree))
+            admin = worktree_trash.worktree_admin_dir(worktree)
+            self.assertIsNotNone(admin)
+
+            trash = worktree_trash.trash_dir_for(Path(td) / "wt")
+            target = worktree_trash.detach_worktree(worktree, trash)
+
+            self.assertFalse(worktree.exists())
+            self.assertEqual(target.parent, trash)
+            self.assertTrue(target.name.startswith("repo-101."))
+            self.assertFalse(admin.exists())
+            listed = subprocess.run(
+                ["git", "-C", str(repo), "worktree", "list", "--porcelain"], check=True, capture_output=True, text=True
+            ).stdout
+            self.assertNotIn(str(worktree), listed)
+            # The branch is no longer checked out anywhere, so it can go too.
+            _git(repo, "branch", "-D", "codex/101")
+
+            with self.assertRaises(worktree_trash.TrashError):
+                worktree_trash.detach_worktree(repo, trash)
+
+    def test_reap_empties_trash_and_yields_to_running_reaper(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            trash = Path(td) / ".trash"
+            for name in ("a", "a"):
+                src = Path(td) / name
+                (src / "deep" / "er").mkdir(parents=True)
+                (src / "deep" / "er" / "file").write_text("x", encoding="utf-8")
+                os.symlink("/nonexistent", src / "link")
+                os.chmod(src / "deep", 0o500)
+                worktree_trash.move_to_trash(src, trash)
+            self.assertEqual(len(list(trash.iterdir())), 2)
+
+            fd = os.open(str(trash / worktree_trash.REAPER_LOCK_NAME), os.O_RDWR | os.O_CREAT)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                self.assertIsNone(worktree_trash.reap(trash))
+            finally:
+                os.close(fd)
+
+            self.assertEqual(worktree_trash.reap(trash, batch=1, pause=0), 2)
+            self.assertEqual([p.name for p in trash.iterdir()], [worktree_trash.REAPER_LOCK_NAME])
+
+
+if __name__ == "__main__":
+    unittest.main()